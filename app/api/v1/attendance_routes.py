@@ -1,13 +1,19 @@
 # routers/attendance.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import pytz
 from app.services.attendance_service import AttendanceService
-from app.db.database_setup import get_db
+from app.services.attendance_ingest_service import AttendanceIngestService
+from app.db.database_setup import get_async_db, get_db
+from app.repositories.attendance_repo import AsyncAttendanceRepository
 from app.models.attendance_model import Attendance
 from app.models.employee_model import Employee
-from app.core.security import get_current_employee, admin_access, hr_access
-from app.schemas.attendance_schema import AttendanceResponse, CheckInRequest, CheckOutRequest
+from app.core.security import get_current_employee, get_current_employee_async, admin_access, hr_access
+from app.schemas.attendance_schema import (
+    AttendanceIngestReport, AttendancePeriodSummary, AttendanceResponse, CheckInRequest, CheckOutRequest)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import select, func
 from app.domain.exceptions.base import DomainError
@@ -26,6 +32,9 @@ def get_attendance_service(db: Session = Depends(get_db)) -> AttendanceService:
     uow = UnitOfWork(db)
     return AttendanceService(uow)
 
+def get_ingest_service(db: Session = Depends(get_db)) -> AttendanceIngestService:
+    return AttendanceIngestService(UnitOfWork(db))
+
 
 #===================================================================================================
 #--------------------------- CHECK IN OR OUT -------------------------------------------------------
@@ -60,8 +69,43 @@ def check_out(
         return attendance
 
 
+
+#=======================================================================================================
+#------------------------- BULK EVENTS (badge/turnstile feeds) -----------------------------------------
+@router.post(
+    "/attendance/events",
+    response_model=AttendanceIngestReport,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admin_access)]
+)
+def ingest_attendance_events(
+    events: List[Dict[str, Any]],
+    service: AttendanceIngestService = Depends(get_ingest_service),
+):
+    """Record a batch of check-in/check-out events; every event gets its own result."""
+    return service.ingest_events(events)
+
     
 
+#=======================================================================================================
+#------------------------- MY ATTENDANCE (read-only, async) --------------------------------------------
+@router.get("/attendance/me", response_model=AttendanceResponse)
+async def get_my_attendance(
+    attendance_date: Optional[date] = None,
+    employee: dict = Depends(get_current_employee_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return the caller's attendance for `attendance_date`, or their latest record."""
+    repo = AsyncAttendanceRepository(db)
+    if attendance_date is None:
+        attendance = await repo.get_latest_attendance(employee["employee_id"])
+    else:
+        attendance = await repo.get_by_employee_and_date(employee["employee_id"], attendance_date)
+    if attendance is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attendance record not found")
+    return attendance
+
+
 #=======================================================================================================
 #------------------------- APPROVE ATTENDANCE ----------------------------------------------------------
 @router.post(
@@ -75,4 +119,40 @@ def approve_employee_attendance(
 ):
           attendance = service.approve_attendance(id)
           return attendance
-    
\ No newline at end of file
+
+
+#=======================================================================================================
+#------------------------- PENDING APPROVALS -----------------------------------------------------------
+@router.get(
+    "/attendance/pending",
+    response_model=List[AttendanceResponse],
+    dependencies=[Depends(admin_access)]
+)
+def get_pending_attendance(
+    limit: int = Query(100, ge=1, le=1000),
+    after_date: Optional[date] = Query(None, description="attendance_date of the last record of the previous page"),
+    after_id: Optional[int] = Query(None, description="id of the last record of the previous page"),
+    service: AttendanceService = Depends(get_attendance_service),
+):
+    """Attendance records awaiting approval, oldest first."""
+    after = (after_date, after_id) if after_date is not None and after_id is not None else None
+    return service.get_pending_approvals(limit=limit, after=after)
+
+
+#=======================================================================================================
+#------------------------- PERIOD SUMMARY --------------------------------------------------------------
+@router.get(
+    "/attendance/summary",
+    response_model=List[AttendancePeriodSummary],
+    dependencies=[Depends(admin_access)]
+)
+def get_attendance_summary(
+    period_start: date,
+    period_end: date,
+    employee_id: List[int] = Query(..., description="Employees to summarize; repeat for several"),
+    service: AttendanceService = Depends(get_attendance_service),
+):
+    """Worked and approved days and hours per employee over a period."""
+    summaries = service.summarize_period(employee_id, period_start, period_end)
+    return [summaries[key] for key in sorted(summaries)]
+
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
-from app.db.database_setup import get_db
-from app.repositories.audit_repo import AuditRepository
+from app.db.database_setup import get_async_db, get_async_sessionmaker, get_db
+from app.repositories.audit_repo import AsyncAuditRepository, AuditRepository, decode_cursor
 from app.core.security import admin_access
-from typing import List
+from typing import AsyncIterator, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from app.services.audit_service import AuditService
@@ -30,14 +32,70 @@ class AuditLogResponse(BaseModel):
 router = APIRouter(prefix="/audit", tags=["Audit"])
 
 
+# Rows fetched per query while streaming; each batch uses its own short-lived session
+STREAM_BATCH_SIZE = 1000
+
+
+class AuditLogFilters:
+    """Query parameters shared by the audit log listing and export."""
+    def __init__(
+        self,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+        until: Optional[datetime] = Query(None, description="Only logs before this time"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    ):
+        self.user_id = user_id
+        self.action = action
+        self.since = since
+        self.until = until
+        self.cursor = cursor
+
+    def as_kwargs(self) -> dict:
+        return {"user_id": self.user_id, "action": self.action, "since": self.since, "until": self.until}
+
+
 @router.get("/logs", response_model=List[AuditLogResponse])
-def get_audit_log(
-    service: AuditService = Depends(get_audit_service),
+async def get_audit_log(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    filters: AuditLogFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     _current=Depends(admin_access)
 ):
-    logs = service.get_audit_logs()
+    # Read-only, so it skips the UnitOfWork and runs on the event loop
+    logs, next_cursor = await AsyncAuditRepository(db).get_logs_page(limit, filters.cursor, **filters.as_kwargs())
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return logs
 
+
+@router.get("/logs/stream", response_class=StreamingResponse)
+async def stream_audit_log(
+    filters: AuditLogFilters = Depends(),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker),
+    _current=Depends(admin_access)
+):
+    """Every matching log as newline-delimited JSON, newest first, without holding the result in memory."""
+    if filters.cursor is not None:
+        decode_cursor(filters.cursor)  # fail with a 400 before the 200 is sent
+
+    async def lines() -> AsyncIterator[str]:
+        # The request's dependencies are closed before the body is sent, so open sessions here
+        cursor = filters.cursor
+        while True:
+            async with sessions() as db:
+                logs, cursor = await AsyncAuditRepository(db).get_logs_page(
+                    STREAM_BATCH_SIZE, cursor, **filters.as_kwargs()
+                )
+            for log in logs:
+                yield AuditLogResponse.model_validate(log).model_dump_json() + "\n"
+            if cursor is None:
+                break
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.delete("/logs/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_audit_log(
     log_id: int,
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Form
 from sqlalchemy.orm import Session
 from app.core.unit_of_work import UnitOfWork
 from app.services.auth_service import AuthService
-from app.domain.exceptions.base import DomainError, InvalidCredentialsError, UserNotFoundError
+from app.domain.exceptions.base import DomainError, InvalidCredentialsError, ServiceUnavailableError, UserNotFoundError
 from fastapi.security import OAuth2PasswordRequestForm
 from app.schemas.auth_schema import LoginResponse
 from app.core.security import get_current_employee
@@ -30,7 +30,7 @@ def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
 #-------------------------- LOGIN ROUTE -------------------------------------------------------------------------
 #================================================================================================================
 @router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: AuthService = Depends(get_auth_service),
 ):
@@ -44,15 +44,18 @@ def login(
         LoginResponse containing access token, token type, password change flag, and role.
         
     Raises:
-        HTTPException: 401 if credentials are invalid, 400 if service error occurs.
+        HTTPException: 401 if credentials are invalid, 400 if service error occurs,
+            503 if the password hashing pool is saturated.
     """
     username = form_data.username
     password = form_data.password
     try:
-        token_data = service.authenticate_user(username, password)
+        token_data = await service.authenticate_user_async(username, password)
         return token_data
     except InvalidCredentialsError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except ServiceUnavailableError:
+        raise
     except DomainError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -60,7 +63,7 @@ def login(
 #----------------------- CHANGE PASSWORD ------------------------------------------------------------------------
 #================================================================================================================
 @router.post("/password")
-def change_password(
+async def change_password(
     new_password: str = Form(...),
     current_employee: dict = Depends(get_current_employee),
     db: Session = Depends(get_db)
@@ -76,13 +79,16 @@ def change_password(
         Dictionary with success message.
         
     Raises:
-        HTTPException: 404 if user not found, 400 if validation or database error occurs.
+        HTTPException: 404 if user not found, 400 if validation or database error occurs,
+            503 if the password hashing pool is saturated.
     """
     service = AuthService(UnitOfWork(db))
     try:
-        return service.change_password(current_employee["user_id"], new_password)
+        return await service.change_password_async(current_employee["user_id"], new_password)
     except UserNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ServiceUnavailableError:
+        raise
     except DomainError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -1,13 +1,26 @@
-from typing import List
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database_setup import get_db
-from app.schemas.payroll_schema import PayrollRunRequest, PayrollRunResponse
+from app.db.database_setup import get_async_db, get_db
+from app.repositories.employee_repo import AsyncEmployeeRepository
+from app.repositories.payroll_repo import AsyncPayrollRepository
+from app.schemas.payroll_schema import (
+    PayrollRunRequest, PayrollRunResponse, PayrollBatchReport, PayrollJobCreate, PayrollJobResponse, PayslipResponse,
+    RetroPayrollReport, RetroPayrollRequest,
+)
+from app.services.payroll_job_service import PayrollJobService
+from app.services.payroll_export_service import PayrollExportService
+from fastapi.responses import StreamingResponse
+from typing import Literal
 from app.payroll.payroll_engine import PayrollEngine
+from app.payroll.batch_runner import PayrollBatchRunner
+from app.payroll.retro_engine import RetroPayrollEngine
 from app.services.payroll_service import PayrollService
 from app.domain.exceptions.base import EmployeeNotFoundError, PayrollEngineError
-from app.core.security import get_current_employee, admin_hr_or_self
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.security import get_current_employee, get_current_employee_async, admin_hr_or_self
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.services.user_service import EmployeeService
+from app.core.unit_of_work import UnitOfWork
 from app.schemas.payroll_schema import PayrollInput, PayrollResult
 from datetime import date
 from app.domain.exceptions.base import PayrollComputeError
@@ -26,7 +39,7 @@ def compute_employee_payroll(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Employee ID must be positive")
 
     try:
-        employee_service = EmployeeService(db)
+        employee_service = EmployeeService(UnitOfWork(db))
         employee = employee_service.get_employee_by_id(employee_id)
     except EmployeeNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
@@ -54,7 +67,7 @@ def compute_payroll(payload: PayrollInput, db: Session = Depends(get_db), curren
     # Open compute endpoint: allow admin/hr or the employee themself
     try:
         # verify employee exists to provide minimal audit info
-        employee_service = EmployeeService(db)
+        employee_service = EmployeeService(UnitOfWork(db))
         employee = employee_service.get_employee_by_id(payload.employee_id)
     except EmployeeNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
@@ -91,36 +104,154 @@ def run_payroll(payload: PayrollRunRequest, db: Session = Depends(get_db), curre
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
-@router.post("/payroll/batch", response_model=List[PayrollRunResponse])
+@router.post("/payroll/batch", response_model=PayrollJobResponse, status_code=status.HTTP_202_ACCEPTED)
 def run_batch_payroll(
     period_start: date,
     period_end: date,
-    db: Session = Depends(get_db),
+    tax_ids: List[int] = Query(default=[]),
+    allowance_type_ids: List[int] = Query(default=[]),
+    draft: bool = False,
+    payment_date: Optional[date] = None,
     current_employee: dict = Depends(get_current_employee)
 ):
     # Only admin or hr can run batch
     role = current_employee.get("role")
     if role not in ("admin", "hr"):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or HR access required")
+    if period_end < period_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="period_end must not be before period_start")
+
+    # Runs as a background job so large companies do not hit the worker timeout; poll /payroll/jobs/{id}
+    service = PayrollJobService()
+    return service.submit(
+        period_start,
+        period_end,
+        current_employee["user_id"],
+        allowance_type_ids=allowance_type_ids,
+        tax_ids=tax_ids,
+        draft=draft,
+        payment_date=payment_date,
+    )
+
+
+@router.post("/payroll/batch/recompute", response_model=PayrollBatchReport)
+def recompute_dirty_drafts(
+    period_start: date,
+    period_end: date,
+    tax_ids: List[int] = Query(default=[]),
+    allowance_type_ids: List[int] = Query(default=[]),
+    payment_date: Optional[date] = None,
+    current_employee: dict = Depends(get_current_employee)
+):
+    role = current_employee.get("role")
+    if role not in ("admin", "hr"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or HR access required")
+    if period_end < period_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="period_end must not be before period_start")
+
+    # Only drafts whose salary, allowances, attendance or rules changed since the draft run are recomputed
+    runner = PayrollBatchRunner()
+    return runner.recompute_dirty(
+        period_start,
+        period_end,
+        current_employee["user_id"],
+        allowance_type_ids=allowance_type_ids,
+        tax_ids=tax_ids,
+        payment_date=payment_date,
+    )
+
+
+@router.post("/payroll/retro", response_model=RetroPayrollReport)
+def run_retro_payroll(payload: RetroPayrollRequest, current_employee: dict = Depends(get_current_employee)):
+    role = current_employee.get("role")
+    if role not in ("admin", "hr"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or HR access required")
+    if not payload.changes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one change is required")
+
+    # Only the (employee, period) pairs the changes touch are recomputed; changed ones get a new version
+    engine = RetroPayrollEngine()
+    return engine.run(payload.changes, current_employee["user_id"], payload.reason, tax_ids=payload.tax_ids)
+
+
+# --- Background payroll jobs: submit returns immediately, progress is polled ---
+@router.post("/payroll/jobs", response_model=PayrollJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_payroll_job(payload: PayrollJobCreate, current_employee: dict = Depends(get_current_employee)):
+    role = current_employee.get("role")
+    if role not in ("admin", "hr"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or HR access required")
+
+    service = PayrollJobService()
+    return service.submit(
+        payload.period_start,
+        payload.period_end,
+        current_employee["user_id"],
+        allowance_type_ids=payload.allowance_type_ids,
+        tax_ids=payload.tax_ids,
+        draft=payload.draft,
+        payment_date=payload.payment_date,
+    )
+
+
+@router.get("/payroll/jobs/{job_id}", response_model=PayrollJobResponse)
+def get_payroll_job(job_id: int, current_employee: dict = Depends(get_current_employee)):
+    role = current_employee.get("role")
+    if role not in ("admin", "hr"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or HR access required")
+
+    return PayrollJobService().get_job(job_id)
+
+
+# --- Payroll register export, streamed so large registers are never held in memory ---
+_REGISTER_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@router.get("/payroll/register")
+def export_payroll_register(
+    period_start: date,
+    period_end: date,
+    format: Literal["csv", "xlsx"] = "csv",
+    current_employee: dict = Depends(get_current_employee)
+):
+    role = current_employee.get("role")
+    if role not in ("admin", "hr"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or HR access required")
+    if period_end < period_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="period_end must not be before period_start")
+
+    # The generators open their own session; the request-scoped one is closed before streaming ends
+    service = PayrollExportService()
+    content = service.register_xlsx if format == "xlsx" else service.register_csv
+    filename = f"payroll_register_{period_start.isoformat()}_{period_end.isoformat()}.{format}"
+    return StreamingResponse(
+        content(period_start, period_end),
+        media_type=_REGISTER_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# --- Payslip views: read-only and high-traffic, served on the event loop through an AsyncSession ---
+@router.get("/payrolls/me", response_model=List[PayslipResponse])
+async def get_my_payslips(
+    current_employee: dict = Depends(get_current_employee_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncPayrollRepository(db).get_by_employee(current_employee["employee_id"])
+
+
+@router.get("/employees/{employee_id}/payrolls", response_model=List[PayslipResponse])
+async def get_employee_payslips(
+    employee_id: int,
+    current_employee: dict = Depends(get_current_employee_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    role = current_employee.get("role")
+    if role not in ("admin", "hr") and current_employee["employee_id"] != employee_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin/HR or owner access required")
+    if await AsyncEmployeeRepository(db).get_by_id(employee_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
 
-    # Get all employees
-    from app.repositories.employee_repo import EmployeeRepository
-    employee_repo = EmployeeRepository(db)
-    employees = employee_repo.get_all_employees()
-
-    results = []
-    for emp in employees:
-        request = PayrollRunRequest(
-            employee_id=emp.id,
-            pay_period_start=period_start,
-            pay_period_end=period_end
-        )
-        try:
-            service = PayrollService(db)
-            payroll = service.run_payroll(request, current_employee["user_id"])
-            results.append(payroll)
-        except Exception as e:
-            # Log error, but continue
-            pass
-
-    return results
\ No newline at end of file
+    return await AsyncPayrollRepository(db).get_by_employee(employee_id)
@@ -1,12 +1,19 @@
 """Employee management API routes."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from app.core.unit_of_work import UnitOfWork
-from app.schemas.employee_schema import EmployeeCreate, EmployeeResponse, EmployeeCreateResponse, EmployeeUpdate
+from app.schemas.employee_schema import (
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeCreateResponse,
+    EmployeeImportReport,
+    EmployeeUpdate,
+)
 from app.services.user_service import (
     EmployeeService,
 )
+from app.services.employee_import_service import EmployeeImportService, read_import_file
 from app.core.security import admin_access
 from app.db.database_setup import get_db
 
@@ -27,6 +34,10 @@ def get_service(db: Session = Depends(get_db)) -> EmployeeService:
     uow = UnitOfWork(db)
     return EmployeeService(uow)
 
+def get_import_service(db: Session = Depends(get_db)) -> EmployeeImportService:
+    """Dependency to get EmployeeImportService with UnitOfWork."""
+    return EmployeeImportService(UnitOfWork(db))
+
 #======================================================================================================
 #----------------------------- CREATE EMPLOYEE ------------------------------------------------------
 #======================================================================================================
@@ -44,6 +55,39 @@ def create_employee(employee: EmployeeCreate, service: EmployeeService = Depends
     result = service.create_employee(employee)
     return result
 
+#======================================================================================================
+#----------------------------- BULK IMPORT EMPLOYEES ------------------------------------------------
+#======================================================================================================
+@router.post("/employees/import", response_model=EmployeeImportReport, status_code=status.HTTP_200_OK)
+def import_employees(rows: List[Dict[str, Any]], service: EmployeeImportService = Depends(get_import_service)):
+    """Create many employees from a JSON array of employee objects.
+    
+    Args:
+        rows: Objects with the same fields as a single employee creation.
+        service: EmployeeImportService instance.
+        
+    Returns:
+        EmployeeImportReport with the outcome of every row, including temporary passwords.
+    """
+    return service.import_employees(list(enumerate(rows, start=1)))
+
+
+@router.post("/employees/import/file", response_model=EmployeeImportReport, status_code=status.HTTP_200_OK)
+def import_employees_file(
+    file: UploadFile = File(..., description="CSV or XLSX with a header row of employee field names"),
+    service: EmployeeImportService = Depends(get_import_service)
+):
+    """Create many employees from an uploaded CSV or XLSX file.
+    
+    Args:
+        file: The uploaded file; the first row names the fields.
+        service: EmployeeImportService instance.
+        
+    Returns:
+        EmployeeImportReport with the outcome of every row, including temporary passwords.
+    """
+    return service.import_employees(read_import_file(file.filename, file.file.read()))
+
 #======================================================================================================
 #----------------------------- GET EMPLOYEE BY ID ---------------------------------------------------
 #======================================================================================================
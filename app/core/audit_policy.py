@@ -0,0 +1,127 @@
+"""Audit policy for read events.
+
+Write events (create, update, delete, payroll runs, logins) are always
+recorded. Read events can be very frequent: a payroll run reads every
+employee, position and department. The policy decides how they are kept:
+
+- ``aggregate`` (default): count reads in memory per actor, action,
+  resource and time window. `ReadAuditCounters.drain` turns closed windows
+  into one summary row each, which are written outside the read path.
+- ``sample``: record roughly `sample_rate` of read events as normal rows.
+- ``record``: record every read event as a row, as before.
+- ``off``: drop read events.
+
+With any policy other than ``record``, a read never issues an INSERT.
+"""
+
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import AUDIT_READ_MODE, AUDIT_READ_SAMPLE_RATE, AUDIT_READ_WINDOW_SECONDS
+
+READ_MODES = ("aggregate", "sample", "record", "off")
+
+# (user_id, action, resource, window start)
+_CounterKey = Tuple[int, str, str, datetime]
+
+
+@dataclass(frozen=True)
+class AuditPolicy:
+    """How read events reach the audit trail."""
+    read_mode: str = "aggregate"
+    sample_rate: float = 0.01
+    window_seconds: int = 3600
+
+    def __post_init__(self):
+        if self.read_mode not in READ_MODES:
+            raise ValueError(f"read_mode must be one of {', '.join(READ_MODES)}, got {self.read_mode!r}")
+        if not 0 <= self.sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if self.window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+
+    def sampled(self, draw: Callable[[], float] = random.random) -> bool:
+        """Whether a read event falls into the sample."""
+        return draw() < self.sample_rate
+
+
+@dataclass(frozen=True)
+class ReadSummary:
+    """Read count for one actor, action and resource over one window."""
+    user_id: int
+    action: str
+    resource: str
+    window_start: datetime
+    window_end: datetime
+    count: int
+
+    def as_metadata(self) -> dict:
+        return {
+            "resource": self.resource,
+            "count": self.count,
+            "window_start": self.window_start.isoformat(),
+            "window_end": self.window_end.isoformat(),
+        }
+
+
+class ReadAuditCounters:
+    """Thread-safe in-memory read counters, bucketed into fixed time windows.
+
+    Times are naive UTC, like `AuditLog.timestamp`, so windows line up across
+    servers and summary rows sort with the rows written directly.
+    """
+
+    def __init__(self, window_seconds: int):
+        self.window = timedelta(seconds=window_seconds)
+        self._lock = threading.Lock()
+        self._counts: Dict[_CounterKey, int] = {}
+
+    def _window_start(self, at: datetime) -> datetime:
+        seconds = int(self.window.total_seconds())
+        epoch = int(at.replace(tzinfo=timezone.utc).timestamp())
+        return datetime.fromtimestamp(epoch // seconds * seconds, tz=timezone.utc).replace(tzinfo=None)
+
+    def increment(self, user_id: int, action: str, resource: str, at: Optional[datetime] = None) -> None:
+        key = (user_id, action, resource, self._window_start(at or datetime.utcnow()))
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def drain(self, now: Optional[datetime] = None, include_open: bool = False) -> List[ReadSummary]:
+        """
+        Remove and return the counts of finished windows.
+
+        :param now: Current UTC time; windows ending after it are kept unless `include_open`
+        :param include_open: Also drain the current window, e.g. on shutdown
+        :return: One summary per actor, action, resource and window
+        """
+        open_window = self._window_start(now or datetime.utcnow())
+        with self._lock:
+            keys = [key for key in self._counts if include_open or key[3] < open_window]
+            drained = [(key, self._counts.pop(key)) for key in keys]
+        return [
+            ReadSummary(user_id, action, resource, start, start + self.window, count)
+            for (user_id, action, resource, start), count in drained
+        ]
+
+    def restore(self, summaries: List[ReadSummary]) -> None:
+        """Put drained counts back, e.g. when writing them failed."""
+        with self._lock:
+            for s in summaries:
+                key = (s.user_id, s.action, s.resource, s.window_start)
+                self._counts[key] = self._counts.get(key, 0) + s.count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._counts)
+
+
+# Process-wide defaults used by AuditRepository
+default_policy = AuditPolicy(
+    read_mode=AUDIT_READ_MODE,
+    sample_rate=AUDIT_READ_SAMPLE_RATE,
+    window_seconds=AUDIT_READ_WINDOW_SECONDS,
+)
+read_counters = ReadAuditCounters(default_policy.window_seconds)
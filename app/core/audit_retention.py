@@ -0,0 +1,192 @@
+"""Retention and archival of the monthly audit partitions.
+
+`AuditArchiver.run` first makes sure the current month's partition is in
+place (see `app.db.audit_partitions`). It then takes every partition whose
+month is more than `retention_months` before the current one and:
+
+1. detaches it, so new queries and inserts no longer see it,
+2. writes its rows, oldest first, to ``<archive_dir>/<partition>.jsonl.gz``
+   and fsyncs the file,
+3. records the file, row count, time span and SHA-256 in
+   ``<archive_dir>/manifest.json``,
+4. drops the table.
+
+The table is dropped only once its archive is on disk and in the manifest,
+so a crash at any step leaves the rows in the database and the next run
+repeats that partition. Archives are gzip JSON lines rather than Parquet,
+which would add pyarrow as a dependency. Workers on one host take a file
+lock, so only one of them runs maintenance at a time.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+
+try:
+    import fcntl
+except ImportError:  # Windows: maintenance runs are not serialized across workers
+    fcntl = None
+
+from app.core.config import AUDIT_ARCHIVE_DIR, AUDIT_RETENTION_MONTHS
+from app.db.audit_partitions import AuditPartitions, add_months, month_start, partition_month, partition_table
+from app.db.database_setup import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+_ARCHIVE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class ArchivedPartition:
+    """Manifest entry for one archived partition."""
+    partition: str
+    file: str
+    rows: int
+    sha256: str
+    first_timestamp: Optional[str]
+    last_timestamp: Optional[str]
+    archived_at: str
+
+
+@contextmanager
+def _exclusive(lock_path: Path) -> Iterator[bool]:
+    """Yield True if this process holds the lock, False if another one does."""
+    if fcntl is None:
+        yield True
+        return
+    with open(lock_path, "a") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class AuditArchiver:
+    """Archives and drops audit partitions older than the retention period."""
+
+    def __init__(
+            self,
+            engine: Engine = default_engine,
+            archive_dir: str = AUDIT_ARCHIVE_DIR,
+            retention_months: int = AUDIT_RETENTION_MONTHS,
+    ):
+        self.engine = engine
+        self.partitions = AuditPartitions(engine)
+        self.archive_dir = Path(archive_dir)
+        self.retention_months = retention_months
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.archive_dir / MANIFEST_NAME
+
+    def run(self, now: Optional[datetime] = None) -> List[ArchivedPartition]:
+        """
+        Maintain the partitions, then archive and drop the expired ones.
+
+        :param now: Current time (UTC)
+        :return: Manifest entries of the partitions archived by this run
+        """
+        now = now or datetime.utcnow()
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        with _exclusive(self.archive_dir / ".lock") as acquired:
+            if not acquired:
+                logger.info("Audit partition maintenance is running in another worker")
+                return []
+            self.partitions.ensure(now)
+            if self.retention_months <= 0:
+                return []
+            cutoff = add_months(month_start(now), -self.retention_months)
+            with self.engine.connect() as conn:
+                expired = [name for name in self.partitions.names(conn) if partition_month(name) < cutoff]
+            return [self._archive(name) for name in expired]
+
+    def manifest(self) -> List[ArchivedPartition]:
+        if not self.manifest_path.exists():
+            return []
+        with open(self.manifest_path, encoding="utf-8") as manifest:
+            return [ArchivedPartition(**entry) for entry in json.load(manifest)["partitions"]]
+
+    def _archive(self, name: str) -> ArchivedPartition:
+        with self.engine.begin() as conn:
+            self.partitions.detach(conn, name)
+        with self.engine.connect() as conn:
+            entry = self._write(conn, name)
+        self._record(entry)
+        with self.engine.begin() as conn:
+            self.partitions.drop(conn, name)
+        logger.info("Archived %d audit rows from %s to %s", entry.rows, name, entry.file)
+        return entry
+
+    def _write(self, conn: Connection, name: str) -> ArchivedPartition:
+        table = partition_table(name)
+        path = self.archive_dir / f"{name}.jsonl.gz"
+        partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        rows = 0
+        first = last = None
+        result = conn.execution_options(yield_per=_ARCHIVE_BATCH_SIZE).execute(
+            select(table).order_by(table.c.timestamp, table.c.id)
+        )
+        with open(partial, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as archive:
+                for row in result:
+                    timestamp = row.timestamp.isoformat()
+                    line = {**row._asdict(), "timestamp": timestamp}
+                    archive.write((json.dumps(line) + "\n").encode())
+                    first = first or timestamp
+                    last = timestamp
+                    rows += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(partial, path)
+        return ArchivedPartition(
+            partition=name,
+            file=path.name,
+            rows=rows,
+            sha256=_sha256(path),
+            first_timestamp=first,
+            last_timestamp=last,
+            archived_at=datetime.utcnow().isoformat(),
+        )
+
+    def _record(self, entry: ArchivedPartition) -> None:
+        entries = [existing for existing in self.manifest() if existing.partition != entry.partition]
+        entries.append(entry)
+        entries.sort(key=lambda archived: archived.partition)
+        partial = self.manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(partial, "w", encoding="utf-8") as manifest:
+            json.dump({"partitions": [asdict(archived) for archived in entries]}, manifest, indent=2)
+            manifest.flush()
+            os.fsync(manifest.fileno())
+        os.replace(partial, self.manifest_path)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as archive:
+        for chunk in iter(lambda: archive.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def maintain_audit_partitions() -> None:
+    """Scheduled job: keep the current partition in place and archive expired ones."""
+    try:
+        AuditArchiver().run()
+    except Exception:
+        logger.exception("Audit partition maintenance failed")
@@ -0,0 +1,255 @@
+"""Buffered, batched audit log writer.
+
+`AuditRepository.log_action` no longer inserts on the request's
+transaction. Events wait on the session until it commits and are then put
+on a bounded in-process queue. A rolled-back transaction drops its events,
+so the trail never records an action that did not happen. A background
+thread drains the queue and writes the events with one executemany per
+batch, after `batch_size` events or `flush_interval_ms` milliseconds,
+whichever comes first.
+
+When the database cannot be written, or the queue is full, events are
+appended as JSON lines to a per-process spill file in `spill_dir`. Spill
+files are replayed after the next successful write and on start-up,
+including files left behind by processes that died. A replay claims a
+file by renaming it to `*.replaying`, so two processes never replay the
+same file. If a process dies during a replay, that file is left for manual
+recovery. `stop()` drains the queue before returning.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    AUDIT_SINK_BATCH_SIZE,
+    AUDIT_SINK_ENABLED,
+    AUDIT_SINK_FLUSH_MS,
+    AUDIT_SINK_QUEUE_SIZE,
+    AUDIT_SPILL_DIR,
+)
+from app.db.database_setup import SessionLocal
+from app.models.audit_model import AuditLog
+from app.utils.bulk_insert import bulk_insert
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_audit_events"
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    """One audit row waiting to be written."""
+    user_id: int
+    action: str
+    meta_data: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+    def as_row(self) -> Dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps({**asdict(self), "timestamp": self.timestamp.isoformat()})
+
+    @classmethod
+    def from_json(cls, line: str) -> "AuditEvent":
+        data = json.loads(line)
+        return cls(data["user_id"], data["action"], data["meta_data"], datetime.fromisoformat(data["timestamp"]))
+
+
+class AuditSink:
+    """Bounded queue plus a background thread that writes audit events in batches."""
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            batch_size: int = AUDIT_SINK_BATCH_SIZE,
+            flush_interval_ms: int = AUDIT_SINK_FLUSH_MS,
+            max_queue: int = AUDIT_SINK_QUEUE_SIZE,
+            spill_dir: str = AUDIT_SPILL_DIR,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.spill_dir = Path(spill_dir)
+        self.spill_path = self.spill_dir / f"audit-{socket.gethostname()}-{os.getpid()}.jsonl"
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.spilled = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread and replay spill files left by earlier processes."""
+        if self.running:
+            return
+        self._replay_orphans()
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write everything still queued, then stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def emit(self, events: List[AuditEvent]) -> None:
+        """Queue events without blocking; spill them to disk if the queue is full."""
+        overflow = []
+        for audit_event in events:
+            try:
+                self._queue.put_nowait(audit_event)
+            except queue.Full:
+                overflow.append(audit_event)
+        if overflow:
+            logger.warning("Audit queue full, spilling %d events to %s", len(overflow), self.spill_path)
+            self._spill(overflow)
+
+    # ------------ Writer thread --------------------------------------------------------------
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[AuditEvent] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                if stopping:
+                    # Drain whatever is left without waiting
+                    try:
+                        item = self._queue.get_nowait()
+                        continue
+                    except queue.Empty:
+                        break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: List[AuditEvent]) -> None:
+        try:
+            self._write(batch)
+        except Exception:
+            logger.exception("Audit write failed, spilling %d events to %s", len(batch), self.spill_path)
+            self._spill(batch)
+            return
+        if self.spill_path.exists():
+            self._replay(self.spill_path)
+
+    def _write(self, batch: List[AuditEvent]) -> None:
+        db = self.session_factory()
+        try:
+            bulk_insert(db, AuditLog, [audit_event.as_row() for audit_event in batch])
+            db.commit()
+            self.written += len(batch)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ------------ Spill file -----------------------------------------------------------------
+    def _spill(self, events: List[AuditEvent]) -> None:
+        with self._spill_lock:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as spill:
+                spill.writelines(audit_event.to_json() + "\n" for audit_event in events)
+                spill.flush()
+                os.fsync(spill.fileno())
+            self.spilled += len(events)
+
+    def _replay(self, path: Path) -> None:
+        """Write a spill file's events to the database and delete it; keep it if that fails."""
+        claimed = path.with_name(f"{path.name}.{os.getpid()}.replaying")
+        with self._spill_lock:
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                return  # Another process claimed it
+        with open(claimed, encoding="utf-8") as spill:
+            events = [AuditEvent.from_json(line) for line in spill if line.strip()]
+        try:
+            for start in range(0, len(events), self.batch_size):
+                self._write(events[start:start + self.batch_size])
+        except Exception:
+            logger.exception("Audit spill replay failed; re-spilling %d events", len(events) - start)
+            # Put the unwritten tail back so the next replay picks it up
+            self._spill(events[start:])
+            os.remove(claimed)
+            return
+        os.remove(claimed)
+        logger.info("Replayed %d spilled audit events from %s", len(events), path.name)
+
+    def _replay_orphans(self) -> None:
+        if not self.spill_dir.is_dir():
+            return
+        for path in sorted(self.spill_dir.glob("audit-*.jsonl")):
+            try:
+                self._replay(path)
+            except Exception:
+                logger.exception("Could not replay audit spill file %s", path)
+
+
+#=============================================================================================
+# ------------ Transaction hooks -------------------------------------------------------------
+def defer_until_commit(session: Session, sink: AuditSink, audit_event: AuditEvent) -> None:
+    """Hold an event on the session; it reaches `sink` only if the transaction commits."""
+    if not session.in_transaction():
+        # Start the transaction now, as session.add() would, so a rollback ends it and discards the event
+        session.begin()
+    session.info.setdefault(_PENDING_KEY, []).append((sink, audit_event))
+
+
+@event.listens_for(Session, "after_commit")
+def _emit_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    by_sink: Dict[AuditSink, List[AuditEvent]] = {}
+    for sink, audit_event in pending:
+        by_sink.setdefault(sink, []).append(audit_event)
+    for sink, events in by_sink.items():
+        sink.emit(events)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_rolled_back(session: Session, transaction) -> None:
+    # after_commit has already emitted committed events; anything left was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+default_sink = AuditSink()
+
+
+def active_sink() -> Optional[AuditSink]:
+    """The process-wide sink if audit writes should go through it, else None."""
+    return default_sink if AUDIT_SINK_ENABLED and default_sink.running else None
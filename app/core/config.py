@@ -18,6 +18,17 @@ except Exception:
 
 # Default to a local SQLite file if DATABASE_URL not provided
 DATABASE_URL = os.getenv("DATABASE_URL") or "sqlite:///./payroll.db"
+# Connection pool per engine and process (PostgreSQL and file-backed SQLite). Each gunicorn
+# worker has a sync engine and, once an async route is hit, an async one, so 4 workers
+# hold at most 4 * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 5)
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT") or 30)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 1800)
+DB_POOL_PRE_PING = (os.getenv("DB_POOL_PRE_PING") or "true").lower() not in ("0", "false", "no")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS") or 5000)
+# Same database through an asyncio driver (aiosqlite/asyncpg), used by async read routes
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL
 SECRET_KEY = os.getenv("SECRET_KEY") or "dev-secret-change-me"
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME") or "admin"
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL") or "admin@example.com"
@@ -33,6 +44,62 @@ if ADMIN_PASSWORD == "AdminPass123!":
     import warnings
     warnings.warn("Using default ADMIN_PASSWORD — change ADMIN_PASSWORD via environment in production", RuntimeWarning)
 LOGIN_TOKEN_EXPIRE_MINUTES = int(os.getenv("LOGIN_TOKEN_EXPIRE_MINUTES") or 60)
+# Verified tokens and the employee they resolve to are cached per worker, for at most this long
+# (and never past the token's exp). Other workers drop changed users through the cache invalidation bus.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE") or 10000)
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS") or 300)
+# Cache invalidation bus: every worker reads the events other workers published at least this often
+# (PostgreSQL LISTEN/NOTIFY wakes it sooner), and events are kept in the database for RETENTION seconds
+CACHE_INVALIDATION_ENABLED = (os.getenv("CACHE_INVALIDATION_ENABLED") or "true").lower() not in ("0", "false", "no")
+CACHE_INVALIDATION_POLL_MS = int(os.getenv("CACHE_INVALIDATION_POLL_MS") or 1000)
+CACHE_INVALIDATION_RETENTION_SECONDS = int(os.getenv("CACHE_INVALIDATION_RETENTION_SECONDS") or 3600)
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL") or "cache_invalidation"
+# Argon2 calls (~100 MiB each) run on a bounded pool per worker: at most PASSWORD_HASH_WORKERS at once,
+# PASSWORD_HASH_QUEUE_SIZE more waiting; beyond that, or after waiting PASSWORD_HASH_QUEUE_TIMEOUT_MS, callers get a 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or 2)
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE") or 32)
+PASSWORD_HASH_QUEUE_TIMEOUT_MS = int(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_MS") or 5000)
+# Bulk employee imports hash their temporary passwords in at most this many processes, one import at a time
+# per worker, on top of PASSWORD_HASH_WORKERS
+EMPLOYEE_IMPORT_HASH_WORKERS = int(os.getenv("EMPLOYEE_IMPORT_HASH_WORKERS") or 2)
+# Hashes made with outdated Argon2 parameters are upgraded after login by a background thread,
+# using idle hashing workers only, and written back in batches
+PASSWORD_REHASH_ENABLED = (os.getenv("PASSWORD_REHASH_ENABLED") or "true").lower() not in ("0", "false", "no")
+PASSWORD_REHASH_QUEUE_SIZE = int(os.getenv("PASSWORD_REHASH_QUEUE_SIZE") or 1000)
+PASSWORD_REHASH_BATCH_SIZE = int(os.getenv("PASSWORD_REHASH_BATCH_SIZE") or 50)
+PASSWORD_REHASH_FLUSH_MS = int(os.getenv("PASSWORD_REHASH_FLUSH_MS") or 1000)
 # Get the base project directory path
 BASE_DIR = Path(__file__).parent
 
+# Payroll batch runs: employees per chunk, and worker processes (0 = one per CPU)
+PAYROLL_BATCH_CHUNK_SIZE = int(os.getenv("PAYROLL_BATCH_CHUNK_SIZE") or 500)
+PAYROLL_BATCH_WORKERS = int(os.getenv("PAYROLL_BATCH_WORKERS") or 0)
+# Background payroll jobs are taken over by another process after this many seconds without a heartbeat
+PAYROLL_JOB_STALE_SECONDS = int(os.getenv("PAYROLL_JOB_STALE_SECONDS") or 300)
+# How often the owner of a running job refreshes its heartbeat; keep well below the stale timeout
+PAYROLL_JOB_HEARTBEAT_SECONDS = int(os.getenv("PAYROLL_JOB_HEARTBEAT_SECONDS") or 30)
+# Bulk employee imports: rows per upload and rows inserted per transaction
+EMPLOYEE_IMPORT_MAX_ROWS = int(os.getenv("EMPLOYEE_IMPORT_MAX_ROWS") or 10000)
+EMPLOYEE_IMPORT_BATCH_SIZE = int(os.getenv("EMPLOYEE_IMPORT_BATCH_SIZE") or 500)
+# Bulk attendance ingestion (badge/turnstile feeds): events per request, and employee-days written per transaction
+ATTENDANCE_INGEST_MAX_EVENTS = int(os.getenv("ATTENDANCE_INGEST_MAX_EVENTS") or 20000)
+ATTENDANCE_INGEST_BATCH_SIZE = int(os.getenv("ATTENDANCE_INGEST_BATCH_SIZE") or 500)
+# Rows fetched per round trip when streaming payroll register exports
+PAYROLL_EXPORT_BATCH_SIZE = int(os.getenv("PAYROLL_EXPORT_BATCH_SIZE") or 1000)
+# Audit trail for read events: aggregate (counts per actor/resource/window), sample, record or off.
+# Writes are always recorded.
+AUDIT_READ_MODE = (os.getenv("AUDIT_READ_MODE") or "aggregate").lower()
+AUDIT_READ_SAMPLE_RATE = float(os.getenv("AUDIT_READ_SAMPLE_RATE") or 0.01)
+AUDIT_READ_WINDOW_SECONDS = int(os.getenv("AUDIT_READ_WINDOW_SECONDS") or 3600)
+# Audit rows are queued after commit and written in batches by a background thread
+AUDIT_SINK_ENABLED = (os.getenv("AUDIT_SINK_ENABLED") or "true").lower() not in ("0", "false", "no")
+AUDIT_SINK_BATCH_SIZE = int(os.getenv("AUDIT_SINK_BATCH_SIZE") or 500)
+AUDIT_SINK_FLUSH_MS = int(os.getenv("AUDIT_SINK_FLUSH_MS") or 200)
+AUDIT_SINK_QUEUE_SIZE = int(os.getenv("AUDIT_SINK_QUEUE_SIZE") or 50000)
+# Events that cannot be written (database down, queue full) are kept here and replayed later
+AUDIT_SPILL_DIR = os.getenv("AUDIT_SPILL_DIR") or "./audit_spill"
+# audit_logs is split by month. Partitions are created this many months ahead (PostgreSQL), and
+# partitions older than AUDIT_RETENTION_MONTHS are archived to AUDIT_ARCHIVE_DIR and dropped (0 keeps everything)
+AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD") or 2)
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS") or 24)
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR") or "./audit_archive"
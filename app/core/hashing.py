@@ -2,11 +2,38 @@
 
 This module provides secure password hashing and verification using the Argon2
 password hashing algorithm with normalized Unicode passwords.
+
+Argon2 calls for logins and single passwords run on `hashing_pool`, a small
+dedicated thread pool, so a login burst cannot run more than
+`PASSWORD_HASH_WORKERS` hashes (about 100 MiB each) at once in a worker. Up to
+`PASSWORD_HASH_QUEUE_SIZE` further calls wait their turn; anything beyond that,
+or anything that waited longer than `PASSWORD_HASH_QUEUE_TIMEOUT_MS`, raises
+`PasswordHashingBusyError` (a 503). Async routes use `hash_password_async` and
+`verify_password_async`, which do not hold a request thread while waiting.
+
+Bulk imports hash thousands of temporary passwords with `hash_passwords`,
+which uses up to `EMPLOYEE_IMPORT_HASH_WORKERS` processes and runs one batch
+at a time per worker. The pool's admission limits are meant for requests
+that wait on one hash each, so batches are bounded separately. A worker
+therefore runs at most `PASSWORD_HASH_WORKERS + EMPLOYEE_IMPORT_HASH_WORKERS`
+hashes at once.
 """
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHashError
+import asyncio
+import multiprocessing
+import threading
+import time
 import unicodedata
-from typing import Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from app.core.config import (
+    EMPLOYEE_IMPORT_HASH_WORKERS,
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_QUEUE_TIMEOUT_MS,
+    PASSWORD_HASH_WORKERS,
+)
+from app.domain.exceptions.base import PasswordHashingBusyError
 
 
 ph = PasswordHasher(
@@ -29,7 +56,7 @@ def _normalize_password(password: str) -> str:
     return unicodedata.normalize("NFKC", password)
 
 
-def hash_password(password: str) -> str:
+def _hash(password: str) -> str:
     """Hash a password using Argon2 algorithm.
     
     Args:
@@ -43,16 +70,17 @@ def hash_password(password: str) -> str:
     return hashed
 
 
-def verify_password(stored_hash: str, password: str) -> Optional[str]:
-    """Verify a password against a stored hash and optionally rehash.
+def _verify(stored_hash: str, password: str) -> Optional[str]:
+    """Verify a password against a stored hash.
     
     Args:
         stored_hash: The previously hashed password.
         password: The plain text password to verify.
         
     Returns:
-        A new hash if rehashing is needed, the original hash if password matches,
-        or None if verification fails.
+        The original hash if password matches, or None if verification fails.
+        Hashes made with outdated parameters are not upgraded here; see
+        `needs_rehash` and `app.core.rehash_queue`.
         
     Raises:
         RuntimeError: If the stored hash is invalid.
@@ -64,11 +92,180 @@ def verify_password(stored_hash: str, password: str) -> Optional[str]:
         return None
     except InvalidHashError:
         raise RuntimeError("Stored password hash is invalid!")
-    if ph.check_needs_rehash(stored_hash):
-        return ph.hash(password)
     return stored_hash
 
 
+def needs_rehash(stored_hash: str) -> bool:
+    """Whether a hash was made with other parameters than the current ones; cheap, no hashing.
+    
+    Args:
+        stored_hash: The previously hashed password.
+        
+    Returns:
+        True if the hash should be upgraded.
+    """
+    return ph.check_needs_rehash(stored_hash)
+
+
+class HashingPool:
+    """Bounded thread pool with admission control for Argon2 calls."""
+
+    def __init__(
+            self,
+            workers: int = PASSWORD_HASH_WORKERS,
+            queue_size: int = PASSWORD_HASH_QUEUE_SIZE,
+            queue_timeout_ms: int = PASSWORD_HASH_QUEUE_TIMEOUT_MS,
+    ):
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self.queue_timeout = queue_timeout_ms / 1000
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.rejected = 0
+        self.expired = 0
+        self.wait_seconds_max = 0.0
+        self._latency: Dict[str, list] = {}
+
+    def submit(self, operation: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a call, or raise PasswordHashingBusyError if the pool is full."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusyError()
+            self._pending += 1
+            if self._executor is None:
+                # Created on first use so importing the module starts no threads
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+        try:
+            return self._executor.submit(self._run, operation, time.perf_counter(), fn, args)
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def submit_if_idle(self, operation: str, fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+        """Queue background work only if a worker is free, so it never delays requests; else None."""
+        with self._lock:
+            if self._pending >= self.workers:
+                return None
+        try:
+            return self.submit(operation, fn, *args)
+        except PasswordHashingBusyError:
+            return None
+
+    def call(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        return self.submit(operation, fn, *args).result()
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(operation, fn, *args))
+
+    def _run(self, operation: str, queued_at: float, fn: Callable[..., Any], args: tuple) -> Any:
+        started = time.perf_counter()
+        waited = started - queued_at
+        try:
+            with self._lock:
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+                if waited > self.queue_timeout:
+                    # The caller has most likely given up already; do not spend 100 MiB on it
+                    self.expired += 1
+                    raise PasswordHashingBusyError()
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._running -= 1
+                    stats = self._latency.setdefault(operation, [0, 0.0, 0.0])
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    stats[2] = max(stats[2], elapsed)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, rejections and per-operation latency for this worker."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "operations": {
+                    operation: {
+                        "calls": calls,
+                        "latency_seconds_avg": round(total / calls, 6) if calls else 0.0,
+                        "latency_seconds_max": round(slowest, 6),
+                    }
+                    for operation, (calls, total, slowest) in self._latency.items()
+                },
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool()
 
 
+def hash_password(password: str) -> str:
+    """Hash a password on the hashing pool, blocking the calling thread until it is done.
+
+    Raises:
+        PasswordHashingBusyError: If the hashing pool is saturated.
+    """
+    return hashing_pool.call("hash", _hash, password)
+
+
+def verify_password(stored_hash: str, password: str) -> Optional[str]:
+    """Verify a password on the hashing pool; see `_verify` for the return value.
+
+    Raises:
+        PasswordHashingBusyError: If the hashing pool is saturated.
+    """
+    return hashing_pool.call("verify", _verify, stored_hash, password)
+
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` for coroutines; waits on the event loop instead of a thread."""
+    return await hashing_pool.run("hash", _hash, password)
 
+
+async def verify_password_async(stored_hash: str, password: str) -> Optional[str]:
+    """`verify_password` for coroutines; waits on the event loop instead of a thread."""
+    return await hashing_pool.run("verify", _verify, stored_hash, password)
+
+
+# One batch at a time per worker, so concurrent imports queue instead of multiplying the processes
+_batch_lock = threading.Lock()
+
+
+def hash_passwords(passwords: Sequence[str], workers: int = EMPLOYEE_IMPORT_HASH_WORKERS) -> List[str]:
+    """Hash many passwords, e.g. an import's temporary passwords, in a bounded process pool.
+    
+    Runs in this process when there is a single worker or password. Waits
+    while another batch is being hashed in this worker.
+    
+    Args:
+        passwords: Plain-text passwords.
+        workers: Processes to use at most.
+        
+    Returns:
+        The hashes, in the same order as `passwords`.
+    """
+    workers = min(max(workers, 1), len(passwords))
+    with _batch_lock:
+        if workers <= 1:
+            return [_hash(password) for password in passwords]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(_hash, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
@@ -0,0 +1,301 @@
+"""Cross-worker cache invalidation.
+
+Every gunicorn worker, on every node, keeps its own in-process caches. A
+writer publishes `(entity, entity_id, version)` events with
+`publish_invalidations`, in the transaction that changed the data (see
+`cache_invalidation_model`). Caches subscribe to the entities they hold with
+`InvalidationBus.subscribe`, and the bus calls them:
+
+* in the writing worker, as soon as the session commits;
+* in every other worker, when its background thread next reads the log.
+
+`InvalidationBus` polls `cache_invalidations` every `poll_interval_ms`
+milliseconds and works on any database. `PostgresInvalidationBus` also
+LISTENs on the channel that publishers NOTIFY, so it reads the log as soon
+as an event is committed. NOTIFY only wakes the reader. The log stays the
+source of truth, so a notification lost while the listening connection was
+down only delays the events until the next poll.
+
+PostgreSQL allocates sequence ids before commit, so a row can appear below
+ids already read. Missing ids are therefore re-read for `_GAP_SECONDS`
+before they are given up on. Events older than `retention_seconds` are
+pruned. A worker that could not read the log for that long may have missed
+events, so it tells every subscriber to drop everything, by sending events
+with no `entity_id`. It does the same when the log ends below the ids it has
+already read, e.g. after the table was recreated, since ids restarting from
+the bottom would never be read.
+
+Handlers run on the committing thread or on the bus thread. They must be
+quick and thread-safe, and treat repeated events as harmless.
+"""
+
+import logging
+import select as _select
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, event, func, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    CACHE_INVALIDATION_CHANNEL,
+    CACHE_INVALIDATION_POLL_MS,
+    CACHE_INVALIDATION_RETENTION_SECONDS,
+)
+from app.db.database_setup import SessionLocal, engine as default_engine
+from app.models.cache_invalidation_model import CacheInvalidation, InvalidationEvent, pop_published
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[InvalidationEvent], None]
+
+# How long an id missing below the read position is re-read, waiting for its transaction to commit
+_GAP_SECONDS = 300
+_MAX_GAPS = 1000
+_PRUNE_INTERVAL_SECONDS = 60
+
+
+class InvalidationBus:
+    """Delivers invalidation events to subscribed caches, reading other workers' events from the log."""
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            poll_interval_ms: int = CACHE_INVALIDATION_POLL_MS,
+            retention_seconds: int = CACHE_INVALIDATION_RETENTION_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval_ms / 1000
+        self.retention_seconds = retention_seconds
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._handlers_lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._cursor: Optional[int] = None
+        self._gaps: Dict[int, float] = {}
+        self._last_read: Optional[float] = None
+        self._last_prune = 0.0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.delivered = 0
+        self.resets = 0
+
+    # ------------ Subscribers ----------------------------------------------------------------
+    def subscribe(self, entity: str, handler: Handler) -> Callable[[], None]:
+        """
+        Call `handler` with every event published for `entity`.
+
+        :param entity: Entity name, e.g. `cache_invalidation_model.USER`
+        :param handler: Called with each event; `entity_id` None means drop everything
+        :return: A callable that unsubscribes the handler
+        """
+        with self._handlers_lock:
+            self._handlers.setdefault(entity, []).append(handler)
+
+        def unsubscribe() -> None:
+            with self._handlers_lock:
+                handlers = self._handlers.get(entity, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+
+        return unsubscribe
+
+    def dispatch(self, events: List[InvalidationEvent]) -> None:
+        """Hand events to their subscribers; a failing handler does not stop the others."""
+        with self._handlers_lock:
+            handlers = {entity: list(entity_handlers) for entity, entity_handlers in self._handlers.items()}
+        for invalidation in events:
+            for handler in handlers.get(invalidation.entity, ()):
+                try:
+                    handler(invalidation)
+                except Exception:
+                    logger.exception("Cache invalidation handler failed for %s", invalidation)
+            self.delivered += 1
+
+    def reset(self) -> None:
+        """Tell every subscriber to drop everything it holds."""
+        with self._handlers_lock:
+            entities = [entity for entity, handlers in self._handlers.items() if handlers]
+        self.resets += 1
+        self.dispatch([InvalidationEvent(entity) for entity in entities])
+
+    # ------------ Reading the log ------------------------------------------------------------
+    def poll(self) -> int:
+        """
+        Deliver the events committed since the last poll.
+
+        The first poll only records where the log ends: caches built after
+        it cannot hold data older than the events before it.
+
+        :return: How many events were delivered
+        """
+        with self._poll_lock:
+            table = CacheInvalidation.__table__
+            db = self.session_factory()
+            try:
+                if self._cursor is None:
+                    self._cursor = db.scalar(select(func.max(table.c.id))) or 0
+                    self._last_read = time.monotonic()
+                    return 0
+                condition = table.c.id > self._cursor
+                if self._gaps:
+                    condition = or_(condition, table.c.id.in_(sorted(self._gaps)))
+                rows = db.execute(
+                    select(table.c.id, table.c.entity, table.c.entity_id, table.c.version)
+                    .where(condition)
+                    .order_by(table.c.id)
+                ).all()
+                # An empty log is normal after pruning; ids below the cursor are not
+                last_id = None if rows else db.scalar(select(func.max(table.c.id)))
+            finally:
+                db.close()
+
+            now = time.monotonic()
+            missed_too_long = now - self._last_read > self.retention_seconds
+            self._last_read = now
+            restarted = last_id is not None and last_id < self._cursor
+            if restarted:
+                self._cursor, self._gaps = last_id, {}
+            for row in rows:
+                self._gaps.pop(row.id, None)
+                if row.id > self._cursor:
+                    self._gaps.update(dict.fromkeys(range(max(self._cursor + 1, row.id - _MAX_GAPS), row.id), now))
+                    self._cursor = row.id
+            self._gaps = {gap: since for gap, since in self._gaps.items() if now - since < _GAP_SECONDS}
+
+        if missed_too_long or restarted:
+            # Events may have been pruned, or written below the cursor, before this worker read them
+            self.reset()
+        self.dispatch([InvalidationEvent(row.entity, row.entity_id, row.version) for row in rows])
+        return len(rows)
+
+    def prune(self) -> int:
+        """Delete events older than the retention period; returns how many were deleted."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        db = self.session_factory()
+        try:
+            result = db.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < cutoff))
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    # ------------ Background thread ----------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self.poll()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wait(self.poll_interval)
+            if self._stopping.is_set():
+                break
+            try:
+                self.poll()
+                if time.monotonic() - self._last_prune >= _PRUNE_INTERVAL_SECONDS:
+                    self._last_prune = time.monotonic()
+                    self.prune()
+            except Exception:
+                logger.exception("Could not read cache invalidation events")
+
+    def _wait(self, timeout: float) -> None:
+        self._stopping.wait(timeout)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """`InvalidationBus` that also wakes up on NOTIFY, through a dedicated psycopg2 connection."""
+
+    def __init__(
+            self,
+            listen_engine: Engine,
+            session_factory: Callable[[], Session] = SessionLocal,
+            channel: str = CACHE_INVALIDATION_CHANNEL,
+            **options,
+    ):
+        super().__init__(session_factory, **options)
+        self.listen_engine = listen_engine
+        self.channel = channel
+        self._listener = None
+
+    def stop(self, timeout: float = 10.0) -> None:
+        super().stop(timeout)
+        self._close_listener()
+
+    def _wait(self, timeout: float) -> None:
+        try:
+            connection = self._listen()
+            readable, _, _ = _select.select([connection], [], [], timeout)
+            if readable:
+                connection.poll()
+                connection.notifies.clear()
+        except Exception:
+            # Fall back to polling until the listener can reconnect
+            logger.exception("Lost the cache invalidation listener; reconnecting")
+            self._close_listener()
+            self._stopping.wait(timeout)
+
+    def _listen(self):
+        if self._listener is None:
+            raw = self.listen_engine.raw_connection()
+            raw.detach()  # Held for the life of the worker; keep it out of the request pool
+            connection = raw.driver_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self._listener = raw
+        return self._listener.driver_connection
+
+    def _close_listener(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                listener.close()
+            except Exception:
+                logger.debug("Could not close the cache invalidation listener", exc_info=True)
+
+
+def create_invalidation_bus(
+        bind: Engine = default_engine,
+        session_factory: Callable[[], Session] = SessionLocal,
+        **options,
+) -> InvalidationBus:
+    """LISTEN/NOTIFY bus on PostgreSQL through psycopg2, polling bus elsewhere."""
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        return PostgresInvalidationBus(bind, session_factory, **options)
+    return InvalidationBus(session_factory, **options)
+
+
+default_bus = create_invalidation_bus()
+
+
+#=============================================================================================
+# ------------ Delivery on commit ------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed(session: Session) -> None:
+    events = pop_published(session)
+    if events:
+        default_bus.dispatch(events)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_rolled_back(session: Session, transaction) -> None:
+    # after_commit has already delivered committed events; anything left was rolled back
+    if transaction.parent is None:
+        pop_published(session)
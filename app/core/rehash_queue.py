@@ -0,0 +1,183 @@
+"""Background upgrade of password hashes made with outdated Argon2 parameters.
+
+`AuthService` verifies a password against the stored hash as it is. When
+the hash was made with other parameters than the current ones, it queues
+the user here instead of hashing a second time on the login path. A
+background thread takes queued users in batches. It computes the new
+hashes on the hashing pool, only while a hashing worker is idle, so
+logins always go first. It then writes them back with one executemany
+per batch.
+
+The update only applies while the stored hash is still the one that was
+verified, so a password changed in the meantime is never overwritten.
+Plain-text passwords stay in memory only until they are rehashed. They
+are never written anywhere. When the queue is full, or the process stops,
+queued users are dropped and upgraded at a later login.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core import hashing
+from app.core.config import (
+    PASSWORD_REHASH_BATCH_SIZE,
+    PASSWORD_REHASH_ENABLED,
+    PASSWORD_REHASH_FLUSH_MS,
+    PASSWORD_REHASH_QUEUE_SIZE,
+)
+from app.db.database_setup import SessionLocal
+from app.models.user_model import User
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_users = User.__table__
+_UPDATE_HASH = (
+    update(_users)
+    .where(_users.c.id == bindparam("b_id"), _users.c.password_hash == bindparam("b_old"))
+    .values(password_hash=bindparam("b_new"))
+)
+
+
+@dataclass(frozen=True)
+class _Rehash:
+    user_id: int
+    stored_hash: str
+    password: str = field(repr=False)
+
+
+class RehashQueue:
+    """Bounded queue plus a background thread that upgrades password hashes in batches."""
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            batch_size: int = PASSWORD_REHASH_BATCH_SIZE,
+            flush_interval_ms: int = PASSWORD_REHASH_FLUSH_MS,
+            max_queue: int = PASSWORD_REHASH_QUEUE_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._queued_users: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.rehashed = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="password-rehash", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Finish the batch in progress and drop whatever is still queued."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queued_users.clear()
+
+    def enqueue(self, user_id: int, stored_hash: str, password: str) -> bool:
+        """Queue a user whose verified hash needs upgrading; False if it was not queued."""
+        with self._lock:
+            if user_id in self._queued_users:
+                return False
+            try:
+                self._queue.put_nowait(_Rehash(user_id, stored_hash, password))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._queued_users.add(user_id)
+        return True
+
+    # ------------ Worker thread --------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            item = self._queue.get()
+            batch: List[_Rehash] = []
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP:
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: List[_Rehash]) -> None:
+        rows = []
+        try:
+            for item in batch:
+                try:
+                    new_hash = self._rehash(item)
+                except Exception:
+                    logger.exception("Could not rehash the password of user %s", item.user_id)
+                    continue
+                if new_hash is None:
+                    break  # Stopping; the rest are upgraded at a later login
+                rows.append({"b_id": item.user_id, "b_old": item.stored_hash, "b_new": new_hash})
+            if rows:
+                self._write(rows)
+        except Exception:
+            logger.exception("Could not store %d upgraded password hashes", len(rows))
+        finally:
+            self._forget(batch)
+
+    def _rehash(self, item: _Rehash) -> Optional[str]:
+        while not self._stopping.is_set():
+            future = hashing.hashing_pool.submit_if_idle("rehash", hashing._hash, item.password)
+            if future is None:
+                # Every hashing worker is serving requests; try again shortly
+                self._stopping.wait(self.flush_interval)
+                continue
+            return future.result()
+        return None
+
+    def _write(self, rows: List[dict]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(_UPDATE_HASH, rows)
+            db.commit()
+            self.rehashed += len(rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _forget(self, items: List[_Rehash]) -> None:
+        with self._lock:
+            self._queued_users.difference_update(item.user_id for item in items)
+
+
+default_rehash_queue = RehashQueue()
+
+
+def active_rehash_queue() -> Optional[RehashQueue]:
+    """The process-wide queue if hashes should be upgraded, else None."""
+    return default_rehash_queue if PASSWORD_REHASH_ENABLED and default_rehash_queue.running else None
@@ -5,11 +5,13 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from app.core.config import LOGIN_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
-from app.repositories.employee_repo import EmployeeRepository
+from app.repositories.employee_repo import AsyncEmployeeRepository, EmployeeRepository
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database_setup import get_db
+from app.db.database_setup import get_async_db, get_db
 from app.domain.exceptions.base import ValidationError
 from app.core.hashing import hash_password, verify_password
+from app.core.token_cache import TokenIdentity, token_cache
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -43,6 +45,34 @@ def create_login_token(data: dict, expires_delta: timedelta | None = None) -> st
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return token
 
+#=====================================================================================================
+#------------------------ VERIFY A LOGIN TOKEN -------------------------------------------------------
+def verify_login_token(token: str) -> TokenIdentity:
+    """Return the identity a login token carries, verifying it only on a cache miss.
+
+    Args:
+        token: JWT bearer token from request header.
+
+    Returns:
+        The cached or freshly verified TokenIdentity.
+
+    Raises:
+        HTTPException: If token is invalid or lacks the user_id or role claim.
+    """
+    identity = token_cache.get(token)
+    if identity is not None:
+        return identity
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    user_id = payload.get("sub")
+    role: str = payload.get("role")
+    if user_id is None or role is None:
+        raise credentials_exception
+    return token_cache.put(token, user_id, role, payload.get("exp"))
+
+
 #=====================================================================================================
 #------------------------ GET CURRENT USER -----------------------------------------------------------
 def get_current_user(
@@ -59,21 +89,10 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or credentials cannot be validated.
     """
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        role: str = payload.get("role")
-        
-        if user_id is None or role is None:
-            raise credentials_exception
-     
-    except JWTError:
-        raise credentials_exception
-
+    identity = verify_login_token(token)
     return {
-         "user_id": user_id, 
-         "role":role
+         "user_id": identity.user_id, 
+         "role": identity.role
     }
 
 #======================================================================================================
@@ -83,6 +102,8 @@ def get_current_employee(
     db: Session = Depends(get_db)
 ) -> dict:
     """Decode JWT token and return current employee information.
+
+    The employee is looked up once per token and then served from the token cache.
     
     Args:
         token: JWT bearer token from request header.
@@ -95,23 +116,49 @@ def get_current_employee(
         HTTPException: If token is invalid or employee record not found.
         ValidationError: If employee cannot be retrieved for the user.
     """
-    employee_repo = EmployeeRepository(db)
-    try:
-        
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        role: str = payload.get("role")
-        
-        employee = employee_repo.get_by_user_id(user_id)
+    identity = verify_login_token(token)
+    if identity.employee_id is None:
+        employee = EmployeeRepository(db).get_by_user_id(int(identity.user_id))
         if employee is None:
             raise ValidationError("Failed to get employee for current user")
-    except JWTError:
-        raise credentials_exception
+        identity = token_cache.set_employee(token, identity, employee.id)
+
+    return {
+         "user_id": identity.user_id,
+         "employee_id": identity.employee_id, 
+         "role": identity.role
+    }
+
+
+async def get_current_employee_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """Async variant of `get_current_employee` for routes that run on the event loop.
+
+    Args:
+        token: JWT bearer token from request header.
+        db: SQLAlchemy async database session.
+
+    Returns:
+        Dictionary containing user_id, employee_id, and role.
+
+    Raises:
+        HTTPException: If token is invalid or employee record not found.
+        ValidationError: If employee cannot be retrieved for the user.
+    """
+    identity = verify_login_token(token)
+    if identity.employee_id is None:
+        # "sub" is a string claim; asyncpg does not coerce it to the integer column
+        employee = await AsyncEmployeeRepository(db).get_by_user_id(int(identity.user_id))
+        if employee is None:
+            raise ValidationError("Failed to get employee for current user")
+        identity = token_cache.set_employee(token, identity, employee.id)
 
     return {
-         "user_id": user_id,
-         "employee_id":employee.id, 
-         "role":role
+         "user_id": identity.user_id,
+         "employee_id": identity.employee_id,
+         "role": identity.role
     }
 
 
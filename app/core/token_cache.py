@@ -0,0 +1,158 @@
+"""Per-process cache of verified login tokens.
+
+`get_current_user` and `get_current_employee` used to run `jwt.decode` on
+every request, and `get_current_employee` also looked the employee up by
+user id. `TokenIdentityCache` keeps the result per token: the verified
+claims (user id and role) and, once a route has needed it, the employee id.
+Entries are keyed by a SHA-256 of the token, so raw tokens are not kept in
+memory. An entry lives for at most `ttl_seconds` and never past the token's
+``exp``. The least recently used entries are evicted beyond `maxsize`.
+
+Committing a session that deletes an employee or user, or changes a user's
+role, publishes a user invalidation event that drops that user's entries.
+The committing worker drops them at once, and other workers when their
+invalidation bus next reads the log (see `invalidation_bus`). The role
+itself still comes from the token's claim, so a changed role takes effect
+when the user logs in again, as before.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+
+from app.core.config import TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS
+from app.core.invalidation_bus import default_bus
+from app.models.cache_invalidation_model import USER, InvalidationEvent, publish_invalidations
+from app.models.employee_model import Employee
+from app.models.user_model import User
+
+
+@dataclass(frozen=True)
+class TokenIdentity:
+    """Who a verified token belongs to."""
+    user_id: str
+    role: str
+    expires_at: float
+    employee_id: Optional[int] = None
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenIdentityCache:
+    """Thread-safe LRU of `TokenIdentity` by token hash, with a TTL bounded by the token's expiry."""
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl_seconds: float = TOKEN_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, TokenIdentity]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[TokenIdentity]:
+        key = token_key(token)
+        with self._lock:
+            identity = self._entries.get(key)
+            if identity is not None and identity.expires_at <= time.time():
+                self._remove(key)
+                identity = None
+            if identity is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return identity
+
+    def put(self, token: str, user_id: str, role: str, exp: Optional[float]) -> TokenIdentity:
+        """Cache the claims of a token that has just been verified."""
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        identity = TokenIdentity(user_id=str(user_id), role=role, expires_at=expires_at)
+        self._store(token_key(token), identity)
+        return identity
+
+    def set_employee(self, token: str, identity: TokenIdentity, employee_id: int) -> TokenIdentity:
+        """Remember which employee a cached token resolved to."""
+        identity = replace(identity, employee_id=employee_id)
+        self._store(token_key(token), identity)
+        return identity
+
+    def invalidate_user(self, user_id) -> None:
+        with self._lock:
+            for key in self._by_user.pop(str(user_id), set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _store(self, key: str, identity: TokenIdentity) -> None:
+        if self.maxsize <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = identity
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(identity.user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        identity = self._entries.pop(key)
+        keys = self._by_user.get(identity.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[identity.user_id]
+
+
+token_cache = TokenIdentityCache()
+
+
+def _user_invalidated(invalidation: InvalidationEvent) -> None:
+    if invalidation.entity_id is None:
+        token_cache.clear()
+    else:
+        token_cache.invalidate_user(invalidation.entity_id)
+
+
+default_bus.subscribe(USER, _user_invalidated)
+
+
+#=============================================================================================
+# ------------ Publishing on flush -----------------------------------------------------------
+def _mark_stale(target, user_id) -> None:
+    session = object_session(target)
+    if session is not None and user_id is not None:
+        publish_invalidations(session, [InvalidationEvent(USER, int(user_id))])
+
+
+@event.listens_for(Employee, "after_delete")
+def _employee_deleted(mapper, connection, target: Employee) -> None:
+    _mark_stale(target, target.user_id)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User) -> None:
+    _mark_stale(target, target.id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    if inspect(target).attrs.role_id.history.has_changes():
+        _mark_stale(target, target.id)
+
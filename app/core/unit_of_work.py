@@ -8,6 +8,8 @@ from app.repositories.salary_repo import SalaryRepository
 from app.repositories.allowance_repo import AllowanceRepository
 from app.repositories.deduction_repo import DeductionRepository
 from app.repositories.payroll_repo import PayrollRepository
+from app.repositories.payroll_input_repo import PayrollInputRepository
+from app.repositories.payroll_job_repo import PayrollJobRepository
 from app.repositories.role_repo import RoleRepository
 from app.repositories.contacts_repo import ContactsRepository
 from app.repositories.bank_details_repo import BankDetailsRepository
@@ -39,6 +41,8 @@ class UnitOfWork:
         self._allowance_repo = None
         self._deduction_repo = None
         self._payroll_repo = None
+        self._payroll_input_repo = None
+        self._payroll_job_repo = None
         self._role_repo = None
         self._contacts_repo = None
         self._bank_details_repo = None
@@ -100,6 +104,18 @@ class UnitOfWork:
             self._payroll_repo = PayrollRepository(self.session)
         return self._payroll_repo
 
+    @property
+    def payroll_input_repo(self) -> PayrollInputRepository:
+        if self._payroll_input_repo is None:
+            self._payroll_input_repo = PayrollInputRepository(self.session)
+        return self._payroll_input_repo
+
+    @property
+    def payroll_job_repo(self) -> PayrollJobRepository:
+        if self._payroll_job_repo is None:
+            self._payroll_job_repo = PayrollJobRepository(self.session)
+        return self._payroll_job_repo
+
     @property
     def role_repo(self) -> RoleRepository:
         if self._role_repo is None:
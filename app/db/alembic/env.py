@@ -8,7 +8,7 @@ from alembic import context
 from app.db.database_setup import Base
 
 #models
-from app.models import allowances_model, attendance_model,deductions_model, department_model, salary_model,tax_brackets, tax_model, Loans_advances_model, employee_bank_account, user_model, employee_contacts_details, employee_model, payroll_model,pension_model,permissions_model,Position_model,role_permission, roles_model
+from app.models import allowances_model, attendance_model,deductions_model, department_model, salary_model,tax_brackets, tax_model, Loans_advances_model, employee_bank_account, user_model, employee_contacts_details, employee_model, payroll_model, payroll_job_model,pension_model,permissions_model,Position_model,role_permission, roles_model
 from payroll_system.app.models import Insurance_model
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
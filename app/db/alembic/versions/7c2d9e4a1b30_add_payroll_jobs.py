@@ -0,0 +1,59 @@
+"""Add payroll jobs
+
+Revision ID: 7c2d9e4a1b30
+Revises: 11cb4be49ced
+Create Date: 2026-02-02 10:15:42.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d9e4a1b30'
+down_revision: Union[str, Sequence[str], None] = '11cb4be49ced'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'payroll_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('pay_period_start', sa.Date(), nullable=False),
+        sa.Column('pay_period_end', sa.Date(), nullable=False),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='payrolljobstatus'), nullable=False),
+        sa.Column('requested_by', sa.Integer(), nullable=False),
+        sa.Column('allowance_type_ids', sa.JSON(), nullable=False),
+        sa.Column('tax_ids', sa.JSON(), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('total_employees', sa.Integer(), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('succeeded', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('last_employee_id', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.JSON(), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payroll_jobs_id'), 'payroll_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_payroll_jobs_status'), 'payroll_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_payroll_jobs_status'), table_name='payroll_jobs')
+    op.drop_index(op.f('ix_payroll_jobs_id'), table_name='payroll_jobs')
+    op.drop_table('payroll_jobs')
+    sa.Enum(name='payrolljobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,31 @@
+"""Add audit log keyset indexes
+
+Revision ID: 9a4f6c1d2e57
+Revises: 7c2d9e4a1b30
+Create Date: 2026-02-09 14:02:27.530911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f6c1d2e57'
+down_revision: Union[str, Sequence[str], None] = '7c2d9e4a1b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_audit_logs_timestamp_id', 'audit_logs', ['timestamp', 'id'], unique=False)
+    op.create_index('ix_audit_logs_user_id_timestamp_id', 'audit_logs', ['user_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_audit_logs_action_timestamp_id', 'audit_logs', ['action', 'timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_logs_action_timestamp_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_user_id_timestamp_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_timestamp_id', table_name='audit_logs')
@@ -0,0 +1,28 @@
+"""Add payroll recompute generation
+
+Revision ID: a8d3c6f1e254
+Revises: c4a7f2e9d035
+Create Date: 2026-04-09 16:05:42.318470
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3c6f1e254'
+down_revision: Union[str, Sequence[str], None] = 'c4a7f2e9d035'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('payrolls', sa.Column('recompute_generation', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('payrolls', 'recompute_generation')
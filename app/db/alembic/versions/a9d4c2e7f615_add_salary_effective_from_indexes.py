@@ -0,0 +1,32 @@
+"""Add salary effective_from indexes
+
+Revision ID: a9d4c2e7f615
+Revises: e2f7a9c4b816
+Create Date: 2026-03-09 14:02:46.381275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4c2e7f615'
+down_revision: Union[str, Sequence[str], None] = 'e2f7a9c4b816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_employee_salaries_employee_id_effective_from', 'employee_salaries',
+                    ['employee_id', 'effective_from'], unique=False)
+    op.create_index('ix_position_salaries_position_id_effective_from', 'position_salaries',
+                    ['position_id', 'effective_from'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_position_salaries_position_id_effective_from', table_name='position_salaries')
+    op.drop_index('ix_employee_salaries_employee_id_effective_from', table_name='employee_salaries')
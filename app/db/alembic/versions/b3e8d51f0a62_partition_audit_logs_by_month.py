@@ -0,0 +1,124 @@
+"""Partition audit logs by month
+
+Revision ID: b3e8d51f0a62
+Revises: 9a4f6c1d2e57
+Create Date: 2026-02-16 09:41:05.672318
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d51f0a62'
+down_revision: Union[str, Sequence[str], None] = '9a4f6c1d2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_audit_logs_id': ['id'],
+    'ix_audit_logs_timestamp_id': ['timestamp', 'id'],
+    'ix_audit_logs_user_id_timestamp_id': ['user_id', 'timestamp', 'id'],
+    'ix_audit_logs_action_timestamp_id': ['action', 'timestamp', 'id'],
+}
+MONTHS_AHEAD = 2
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _set_aside(table: str) -> None:
+    """Rename the current audit_logs with its primary key and indexes, freeing the names."""
+    op.execute(f"ALTER TABLE audit_logs RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT audit_logs_pkey TO {table}_pkey")
+    for index in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index.replace('audit_logs', table)}")
+
+
+def _create_indexes() -> None:
+    for index, columns in INDEXES.items():
+        op.create_index(index, 'audit_logs', columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # Ids must stay unique once closed months move to their own tables
+        with op.batch_alter_table('audit_logs', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        return
+    if bind.dialect.name != 'postgresql':
+        return
+
+    _set_aside('audit_logs_unpartitioned')
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR(100) NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            meta_data TEXT,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    _create_indexes()
+
+    now = datetime.utcnow()
+    oldest = bind.execute(sa.text("SELECT min(timestamp) FROM audit_logs_unpartitioned")).scalar() or now
+    month = datetime(oldest.year, oldest.month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_y{month.year:04d}m{month.month:02d} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        month = end
+
+    op.execute("INSERT INTO audit_logs (id, user_id, action, timestamp, meta_data) "
+               "SELECT id, user_id, action, timestamp, meta_data FROM audit_logs_unpartitioned")
+    op.drop_table('audit_logs_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    month_tables = [
+        name for name in sa.inspect(bind).get_table_names()
+        if name.startswith('audit_logs_y')
+    ]
+    if bind.dialect.name == 'sqlite':
+        for name in month_tables:
+            op.execute(f"INSERT INTO audit_logs (id, user_id, action, timestamp, meta_data) "
+                       f"SELECT id, user_id, action, timestamp, meta_data FROM {name}")
+            op.drop_table(name)
+        with op.batch_alter_table('audit_logs', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
+        return
+    if bind.dialect.name != 'postgresql':
+        return
+
+    _set_aside('audit_logs_partitioned')
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR(100) NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            meta_data TEXT,
+            PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    _create_indexes()
+    op.execute("INSERT INTO audit_logs (id, user_id, action, timestamp, meta_data) "
+               "SELECT id, user_id, action, timestamp, meta_data FROM audit_logs_partitioned")
+    # Drops the attached partitions with it; detached ones were archived by the retention job
+    op.drop_table('audit_logs_partitioned')
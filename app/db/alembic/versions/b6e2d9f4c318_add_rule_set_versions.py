@@ -0,0 +1,39 @@
+"""Add rule set versions
+
+Revision ID: b6e2d9f4c318
+Revises: f3c8e1b9a247
+Create Date: 2026-03-30 10:26:51.847203
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d9f4c318'
+down_revision: Union[str, Sequence[str], None] = 'f3c8e1b9a247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table(
+        'rule_set_versions',
+        sa.Column('name', sa.String(length=30), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table, [
+        {'name': name, 'version': 1, 'updated_at': datetime.utcnow()}
+        for name in ('deduction', 'tax', 'allowance')
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rule_set_versions')
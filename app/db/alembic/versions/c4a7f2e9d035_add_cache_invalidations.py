@@ -0,0 +1,39 @@
+"""Add cache invalidations
+
+Revision ID: c4a7f2e9d035
+Revises: b6e2d9f4c318
+Create Date: 2026-04-06 09:41:17.530826
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7f2e9d035'
+down_revision: Union[str, Sequence[str], None] = 'b6e2d9f4c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cache_invalidations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('entity', sa.String(length=30), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_cache_invalidations_created_at', 'cache_invalidations', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cache_invalidations_created_at', table_name='cache_invalidations')
+    op.drop_table('cache_invalidations')
@@ -0,0 +1,71 @@
+"""Add attendance monthly summaries
+
+Revision ID: c4d2a7e9f183
+Revises: b3e8d51f0a62
+Create Date: 2026-02-23 10:17:48.204513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2a7e9f183'
+down_revision: Union[str, Sequence[str], None] = 'b3e8d51f0a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTH = {
+    'sqlite': "date(attendance_date, 'start of month')",
+    'postgresql': "CAST(date_trunc('month', attendance_date) AS date)",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'attendance_monthly_summaries',
+        sa.Column('employee_id', sa.Integer(), sa.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('worked_days', sa.Integer(), nullable=False),
+        sa.Column('regular_hours', sa.Float(), nullable=False),
+        sa.Column('overtime_hours', sa.Float(), nullable=False),
+        sa.Column('hours_worked', sa.Float(), nullable=False),
+        sa.Column('approved_days', sa.Integer(), nullable=False),
+        sa.Column('approved_regular_hours', sa.Float(), nullable=False),
+        sa.Column('approved_overtime_hours', sa.Float(), nullable=False),
+        sa.Column('approved_hours_worked', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('employee_id', 'month'),
+    )
+
+    month = MONTH.get(op.get_bind().dialect.name)
+    if month is None:
+        return
+    # Same contributions as app.models.attendance_summary_model.contribution
+    checked_out = "check_out IS NOT NULL"
+    approved = "approved = 'APPROVED'"
+    op.execute(f"""
+        INSERT INTO attendance_monthly_summaries (
+            employee_id, month, worked_days, regular_hours, overtime_hours, hours_worked,
+            approved_days, approved_regular_hours, approved_overtime_hours, approved_hours_worked
+        )
+        SELECT employee_id, {month},
+               SUM(CASE WHEN {checked_out} THEN 1 ELSE 0 END),
+               SUM(CASE WHEN {checked_out} THEN COALESCE(regular_hours, 0) ELSE 0 END),
+               SUM(CASE WHEN {checked_out} THEN COALESCE(overtime_hours, 0) ELSE 0 END),
+               SUM(CASE WHEN {checked_out} THEN COALESCE(hours_worked, 0) ELSE 0 END),
+               SUM(CASE WHEN {approved} THEN 1 ELSE 0 END),
+               SUM(CASE WHEN {approved} THEN COALESCE(regular_hours, 0) ELSE 0 END),
+               SUM(CASE WHEN {approved} THEN COALESCE(overtime_hours, 0) ELSE 0 END),
+               SUM(CASE WHEN {approved} THEN COALESCE(hours_worked, 0) ELSE 0 END)
+        FROM attendance
+        WHERE attendance_date IS NOT NULL AND ({checked_out} OR {approved})
+        GROUP BY employee_id, {month}
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('attendance_monthly_summaries')
@@ -0,0 +1,52 @@
+"""Add payroll adjustments
+
+Revision ID: d7b1e3a5c920
+Revises: a9d4c2e7f615
+Create Date: 2026-03-16 09:41:07.552930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b1e3a5c920'
+down_revision: Union[str, Sequence[str], None] = 'a9d4c2e7f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'payroll_adjustments',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('payroll_id', sa.Integer(), nullable=False),
+        sa.Column('previous_payroll_id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('component', sa.String(length=30), nullable=False),
+        sa.Column('previous_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('delta', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['payroll_id'], ['payrolls.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['previous_payroll_id'], ['payrolls.id'], ),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payroll_adjustments_id'), 'payroll_adjustments', ['id'], unique=False)
+    op.create_index(op.f('ix_payroll_adjustments_payroll_id'), 'payroll_adjustments', ['payroll_id'], unique=False)
+    op.create_index(op.f('ix_payroll_adjustments_employee_id'), 'payroll_adjustments', ['employee_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_payroll_adjustments_employee_id'), table_name='payroll_adjustments')
+    op.drop_index(op.f('ix_payroll_adjustments_payroll_id'), table_name='payroll_adjustments')
+    op.drop_index(op.f('ix_payroll_adjustments_id'), table_name='payroll_adjustments')
+    op.drop_table('payroll_adjustments')
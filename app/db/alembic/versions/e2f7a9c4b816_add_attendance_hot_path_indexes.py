@@ -0,0 +1,47 @@
+"""Add attendance hot path indexes
+
+Revision ID: e2f7a9c4b816
+Revises: c4d2a7e9f183
+Create Date: 2026-03-02 08:55:31.918406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f7a9c4b816'
+down_revision: Union[str, Sequence[str], None] = 'c4d2a7e9f183'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("approved = 'PENDING'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT COUNT(*) FROM (
+            SELECT employee_id, attendance_date FROM attendance
+            GROUP BY employee_id, attendance_date HAVING COUNT(*) > 1
+        ) AS duplicated
+    """)).scalar()
+    if duplicates:
+        # Which record of a day is right is a business decision; do not pick one here
+        raise RuntimeError(
+            f"{duplicates} employee/day pairs have more than one attendance record. "
+            "Merge or delete the extra records, then run this migration again."
+        )
+
+    op.create_index('uq_attendance_employee_id_attendance_date', 'attendance',
+                    ['employee_id', 'attendance_date'], unique=True)
+    op.create_index('ix_attendance_pending_attendance_date_id', 'attendance', ['attendance_date', 'id'],
+                    unique=False, postgresql_where=PENDING, sqlite_where=PENDING)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attendance_pending_attendance_date_id', table_name='attendance')
+    op.drop_index('uq_attendance_employee_id_attendance_date', table_name='attendance')
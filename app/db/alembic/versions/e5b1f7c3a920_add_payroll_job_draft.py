@@ -0,0 +1,28 @@
+"""Add payroll job draft flag
+
+Revision ID: e5b1f7c3a920
+Revises: a8d3c6f1e254
+Create Date: 2026-04-13 11:22:07.645193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1f7c3a920'
+down_revision: Union[str, Sequence[str], None] = 'a8d3c6f1e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('payroll_jobs', sa.Column('draft', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('payroll_jobs', 'draft')
@@ -0,0 +1,43 @@
+"""Add payroll dependencies
+
+Revision ID: f3c8e1b9a247
+Revises: d7b1e3a5c920
+Create Date: 2026-03-23 14:12:38.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8e1b9a247'
+down_revision: Union[str, Sequence[str], None] = 'd7b1e3a5c920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('payrolls', sa.Column('needs_recompute', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_table(
+        'payroll_dependencies',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('payroll_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=30), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['payroll_id'], ['payrolls.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payroll_dependencies_payroll_id'), 'payroll_dependencies', ['payroll_id'], unique=False)
+    op.create_index('ix_payroll_dependencies_source_source_id', 'payroll_dependencies', ['source', 'source_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payroll_dependencies_source_source_id', table_name='payroll_dependencies')
+    op.drop_index(op.f('ix_payroll_dependencies_payroll_id'), table_name='payroll_dependencies')
+    op.drop_table('payroll_dependencies')
+    op.drop_column('payrolls', 'needs_recompute')
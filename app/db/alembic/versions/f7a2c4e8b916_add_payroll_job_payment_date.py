@@ -0,0 +1,28 @@
+"""Add payroll job payment date
+
+Revision ID: f7a2c4e8b916
+Revises: e5b1f7c3a920
+Create Date: 2026-04-14 09:41:53.207816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2c4e8b916'
+down_revision: Union[str, Sequence[str], None] = 'e5b1f7c3a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('payroll_jobs', sa.Column('payment_date', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('payroll_jobs', 'payment_date')
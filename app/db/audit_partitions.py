@@ -0,0 +1,196 @@
+"""
+Monthly partitions of the ``audit_logs`` table.
+
+On PostgreSQL ``audit_logs`` is a natively range-partitioned table (see the
+``b3e8d51f0a62`` migration) with one partition per month named
+``audit_logs_yYYYYmMM``. Inserts go to the parent and land in the current
+month's partition, and the planner skips partitions outside a query's time
+range. `AuditPartitions.ensure` creates partitions ahead of time.
+
+SQLite has no partitioning, so ``audit_logs`` holds only the current month
+and `AuditPartitions.ensure` moves closed months into tables with the same
+names. `AuditRepository` reads the tables that overlap the requested time
+range together with ``audit_logs``.
+
+Either way a month's table can be detached, archived and dropped on its own;
+see `app.core.audit_retention`.
+"""
+
+import logging
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    and_,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import AUDIT_PARTITION_MONTHS_AHEAD
+from app.db.database_setup import engine as default_engine
+from app.models.audit_model import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_NAME = re.compile(r"audit_logs_y(\d{4})m(\d{2})")
+_metadata = MetaData()
+
+LIST_SQLITE_PARTITIONS = text(
+    "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'audit\\_logs\\_y%' ESCAPE '\\'"
+)
+_LIST_POSTGRES_PARTITIONS = text(
+    "SELECT tablename FROM pg_tables "
+    "WHERE schemaname = current_schema() AND tablename LIKE 'audit\\_logs\\_y%'"
+)
+_ATTACHED_POSTGRES_PARTITIONS = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "WHERE parent.relname = 'audit_logs'"
+)
+_POSTGRES_IS_PARTITIONED = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+    "JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid WHERE pg_class.relname = 'audit_logs')"
+)
+
+
+# ------------ Naming -------------------------------------------------------------------------
+def month_start(at: datetime) -> datetime:
+    return datetime(at.year, at.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"audit_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """The first day of the month a partition covers, or None if `name` is not a partition."""
+    match = _NAME.fullmatch(name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def sorted_partitions(names: Iterable[str]) -> List[str]:
+    """Partition names among `names`, oldest month first."""
+    return sorted((name for name in names if partition_month(name)), key=partition_month)
+
+
+def overlapping(names: Iterable[str], since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[str]:
+    """Partitions that can hold rows with ``since <= timestamp < until``."""
+    return [
+        name for name in sorted_partitions(names)
+        if (since is None or add_months(partition_month(name), 1) > since)
+        and (until is None or partition_month(name) < until)
+    ]
+
+
+@lru_cache(maxsize=None)
+def partition_table(name: str) -> Table:
+    """Table for one month, with the columns of ``audit_logs`` and its keyset indexes."""
+    return Table(
+        name,
+        _metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("action", String(100), nullable=False),
+        Column("timestamp", DateTime, nullable=False),
+        Column("meta_data", Text, nullable=True),
+        Index(f"ix_{name}_timestamp_id", "timestamp", "id"),
+        Index(f"ix_{name}_user_id_timestamp_id", "user_id", "timestamp", "id"),
+        Index(f"ix_{name}_action_timestamp_id", "action", "timestamp", "id"),
+    )
+
+
+#=============================================================================================
+# ------------ Partition maintenance ----------------------------------------------------------
+class AuditPartitions:
+    """Creates, rolls over, detaches and drops the monthly audit partitions of one database."""
+
+    def __init__(self, engine: Engine = default_engine):
+        self.engine = engine
+        self.native = engine.dialect.name == "postgresql"
+
+    def names(self, conn: Connection) -> List[str]:
+        """Every month table, attached or not, oldest first."""
+        listing = _LIST_POSTGRES_PARTITIONS if self.native else LIST_SQLITE_PARTITIONS
+        return sorted_partitions(conn.execute(listing).scalars())
+
+    def ensure(self, now: Optional[datetime] = None, months_ahead: int = AUDIT_PARTITION_MONTHS_AHEAD) -> List[str]:
+        """
+        Make sure new rows land in the current month's partition.
+
+        :param now: Current time (UTC)
+        :param months_ahead: PostgreSQL only; also create partitions for this many months ahead
+        :return: Names of the partitions created (PostgreSQL) or filled (SQLite)
+        """
+        current = month_start(now or datetime.utcnow())
+        with self.engine.begin() as conn:
+            if self.native:
+                return self._create_ahead(conn, current, months_ahead)
+            return self._roll_over(conn, current)
+
+    def detach(self, conn: Connection, name: str) -> None:
+        """Stop routing inserts and queries to a partition, leaving it as a standalone table."""
+        if self.native and name in conn.execute(_ATTACHED_POSTGRES_PARTITIONS).scalars().all():
+            conn.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+
+    def drop(self, conn: Connection, name: str) -> None:
+        partition_table(name).drop(conn, checkfirst=True)
+
+    def _create_ahead(self, conn: Connection, current: datetime, months_ahead: int) -> List[str]:
+        if not conn.execute(_POSTGRES_IS_PARTITIONED).scalar():
+            logger.warning("audit_logs is not partitioned; run the alembic migrations")
+            return []
+        existing = set(self.names(conn))
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+            ))
+            created.append(name)
+        return created
+
+    def _roll_over(self, conn: Connection, current: datetime) -> List[str]:
+        """Move rows of closed months out of ``audit_logs`` into their month tables."""
+        live = AuditLog.__table__
+        oldest = conn.execute(select(func.min(live.c.timestamp)).where(live.c.timestamp < current)).scalar()
+        if oldest is None:
+            return []
+        filled = []
+        month = month_start(oldest)
+        while month < current:
+            end = add_months(month, 1)
+            in_month = and_(live.c.timestamp >= month, live.c.timestamp < end)
+            table = partition_table(partition_name(month))
+            table.create(conn, checkfirst=True)
+            moved = conn.execute(insert(table).from_select(list(live.c.keys()), select(*live.c).where(in_month)))
+            if moved.rowcount:
+                conn.execute(delete(live).where(in_month))
+                filled.append(table.name)
+            month = end
+        if filled:
+            logger.info("Moved closed months of audit_logs into %s", ", ".join(filled))
+        return filled
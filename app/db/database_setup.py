@@ -1,27 +1,310 @@
-from asyncio.log import logger
+"""
+Engine and session setup.
+
+`build_engine` picks settings per dialect. On PostgreSQL it uses a bounded
+QueuePool with pre-ping and recycling taken from config. On SQLite it turns
+on WAL mode, `synchronous=NORMAL` and a busy timeout for every new
+connection. QueuePool engines record checkout counts, wait times and
+timeouts, which `pool_metrics` reports. Every gunicorn worker has its own
+engine, so each worker holds at most `DB_POOL_SIZE + DB_MAX_OVERFLOW`
+connections.
+
+`get_db` lets at most as many requests hold a session as the pool has
+connections; see `request_sessions`. Read-heavy routes can use
+`get_async_db` instead of `get_db`. It yields an
+`AsyncSession` on a second, equally bounded pool that runs through
+aiosqlite or asyncpg.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from app.core.config import DATABASE_URL
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from app.core.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
 
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class PoolMetrics:
+    """Checkout and wait counters for one connection pool."""
 
-Base = declarative_base()
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_timeout(self, waited: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class _MeteredPool:
+    """Pool mixin that times how long each caller waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting across it
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    """QueuePool with checkout and wait metrics."""
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout and wait metrics, for async engines."""
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
 
-def get_db():
+
+def engine_options(database_url: str, **overrides: Any) -> Dict[str, Any]:
     """
-    Docstring for get_db
-    
+    Build `create_engine` keyword arguments suited to the URL's dialect.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        **overrides: Settings that replace the configured pool values
+
+    Returns:
+        Keyword arguments for `create_engine`
     """
-    db = SessionLocal()
+    url = make_url(database_url)
+    poolclass = MeteredAsyncQueuePool if url.get_dialect().is_async else MeteredQueuePool
+    if url.get_backend_name() == "sqlite":
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if _is_memory_sqlite(url):
+            # In-memory databases live in one connection; keep SQLAlchemy's default pool
+            return {**options, **overrides}
+        options.update(poolclass=poolclass, pool_size=DB_POOL_SIZE,
+                       max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+        return {**options, **overrides}
 
-    try:
-        yield db
-    finally:
-        db.close()
+    options = {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    return {**options, **overrides}
+
+
+def _tune_sqlite(engine: Engine) -> None:
+    """Set WAL mode, relaxed fsync and a busy timeout on every new SQLite connection."""
+    memory = _is_memory_sqlite(engine.url)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not memory:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+        finally:
+            cursor.close()
+
+
+def build_engine(database_url: str = DATABASE_URL, **overrides: Any) -> Engine:
+    """
+    Create an engine configured for the URL's dialect.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        **overrides: Extra `create_engine` arguments, e.g. a smaller pool for worker processes
+
+    Returns:
+        The configured engine
+    """
+    engine = create_engine(database_url, **engine_options(database_url, **overrides))
+    if engine.dialect.name == "sqlite":
+        _tune_sqlite(engine)
+    return engine
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Swap a URL's driver for its asyncio counterpart.
+
+    Args:
+        database_url: Synchronous SQLAlchemy database URL
+
+    Returns:
+        The same database addressed through aiosqlite or asyncpg
+    """
+    url = make_url(database_url)
+    if url.get_dialect().is_async:
+        return database_url
+    drivers = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+    backend = url.get_backend_name()
+    if backend not in drivers:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return url.set(drivername=drivers[backend]).render_as_string(hide_password=False)
+
+
+def build_async_engine(database_url: str = DATABASE_URL, **overrides: Any) -> AsyncEngine:
+    """
+    Create an async engine with the same per-dialect settings as `build_engine`.
+
+    Args:
+        database_url: SQLAlchemy database URL, sync or async
+        **overrides: Extra `create_async_engine` arguments
+
+    Returns:
+        The configured async engine
+    """
+    url = async_database_url(database_url)
+    engine = create_async_engine(url, **engine_options(url, **overrides))
+    if engine.dialect.name == "sqlite":
+        _tune_sqlite(engine.sync_engine)
+    return engine
+
+
+def pool_metrics(engine: Engine) -> Dict[str, Any]:
+    """
+    Report the state of an engine's connection pool in this process.
 
+    Args:
+        engine: Engine to inspect; pass `AsyncEngine.sync_engine` for async engines
+
+    Returns:
+        Pool size, connections in use and checkout/wait counters when the pool records them
+    """
+    pool = engine.pool
+    report: Dict[str, Any] = {"pool": type(pool).__name__, "dialect": engine.dialect.name}
+    if isinstance(pool, QueuePool):
+        report.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            timeout_seconds=pool.timeout(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        report.update(
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_seconds_total=round(metrics.wait_seconds_total, 6),
+            wait_seconds_avg=round(metrics.wait_seconds_total / metrics.checkouts, 6) if metrics.checkouts else 0.0,
+            wait_seconds_max=round(metrics.wait_seconds_max, 6),
+        )
+    return report
+
+
+# One semaphore per event loop: asyncio primitives cannot be shared across loops
+_request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _session_slots(loop: asyncio.AbstractEventLoop, limit: int) -> asyncio.Semaphore:
+    slots = _request_slots.get(loop)
+    if slots is None:
+        slots = _request_slots[loop] = asyncio.Semaphore(limit)
+    return slots
+
+
+def request_sessions(
+        session_factory: Callable[[], Session],
+        limit: int = DB_POOL_SIZE + DB_MAX_OVERFLOW,
+) -> Callable[[], AsyncIterator[Session]]:
+    """
+    Build a FastAPI dependency that yields request-scoped sync sessions.
 
- 
\ No newline at end of file
+    A sync route keeps its connection checked out until FastAPI has
+    serialized the response, and for sync routes that also runs in the
+    threadpool. If more threads block on the pool than it has connections,
+    the requests holding connections cannot get a thread to finish, and
+    everything stalls until `pool_timeout`. At most `limit` requests hold a
+    session at once, and the rest wait on the event loop without taking a
+    thread.
+
+    Args:
+        session_factory: Factory for the sessions handed to routes
+        limit: Requests allowed to hold a session at the same time
+
+    Returns:
+        An async generator dependency
+    """
+    async def dependency() -> AsyncIterator[Session]:
+        async with _session_slots(asyncio.get_running_loop(), limit):
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                await run_in_threadpool(db.close)
+
+    return dependency
+
+
+engine = build_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base = declarative_base()
+
+# Request-scoped sync Session for routes; writes go through the UnitOfWork
+get_db = request_sessions(SessionLocal)
+
+
+# The async engine is created on first use, so sync-only entry points
+# (alembic, scripts, batch workers) never load the async driver.
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Session factory bound to the process-wide async engine."""
+    return async_sessionmaker(build_async_engine(ASYNC_DATABASE_URL), expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Yield an `AsyncSession` for read-heavy routes that run on the event loop.
+
+    Writes still go through `get_db` and the `UnitOfWork`.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -44,6 +44,10 @@ class ComputationError(DomainError):
     """Exception raised when domain computation/calculation fails."""
     pass
 
+class ServiceUnavailableError(DomainError):
+    """Exception raised when a shared resource is saturated and the request should be retried later."""
+    retry_after: int = 1
+
 #===============================================================================================
 #---------------- VALIDATION EXCEPTIONS -------------------------------------------------------
 class EmailValidationError(ValidationError):
@@ -182,6 +186,11 @@ class InvalidTokenError(ValidationError):
 class UserNotFoundError(NotFoundError):
     pass
 
+class PasswordHashingBusyError(ServiceUnavailableError):
+    """Raised when the password hashing pool has no room for another request."""
+    def __init__(self, message: str | None = None):
+        super().__init__(message or "Too many sign-in requests, please retry shortly")
+
 
 #=============================================================================================
 #-------------------- SALARY SERVICE EXCEPTIONS ------------------------------------------------
@@ -226,6 +235,18 @@ class PayrollRunError(Exception):
     pass
 
 
+class PayrollJobNotFoundError(NotFoundError):
+    pass
+
+
+# =============================================================================================
+#-------------------- AUDIT LOG EXCEPTIONS ---------------------------------------------------
+class InvalidCursorError(ValidationError):
+    """Raised when a pagination cursor cannot be decoded."""
+    def __init__(self, message: str | None = None):
+        super().__init__(message or "Invalid pagination cursor")
+
+
 
 # =============================================================================================
 #-------------------- DOMAIN ERROR TRANSLATION ------------------------------------------------
@@ -243,6 +264,12 @@ class DomainErrorTranslator:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exception)})
         elif isinstance(exception, PermissionError):
             return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": str(exception)})
+        elif isinstance(exception, ServiceUnavailableError):
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": str(exception)},
+                headers={"Retry-After": str(exception.retry_after)},
+            )
         else:
             return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": str(exception)})
             
\ No newline at end of file
@@ -17,9 +17,9 @@ def validate_check_in_time(check_in: datetime, today: date)->None:
     if check_in.date() > today:
         raise FutureCheckInError("Can not check in for a future date")
     
-def ensure_not_duplicate(existing_attendance)-> None:
-    """Ensure no duplicate attendance record exists"""
-    if existing_attendance is not None:
+def ensure_not_duplicate(inserted_attendance)-> None:
+    """Ensure the attendance record was inserted, i.e. none existed for that day"""
+    if inserted_attendance is None:
         raise AttendanceAlreadyExistsError("Attendance for this employee exists")
 
 def validate_checkout(check_in: datetime, check_out: datetime)->None:
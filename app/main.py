@@ -3,8 +3,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.db.initialize_db import init_db
 from scripts.seed_utility import seed_role_permissions,seed_salaries, seed_roles, seed_permissions, seed_departments, seed_positions
 from scripts.create_admin import seed_admin
-from app.db.database_setup import SessionLocal
+from app.db.database_setup import SessionLocal, engine, pool_metrics
+from app.core.hashing import hashing_pool
+from app.core.rehash_queue import default_rehash_queue as rehash_queue
 from app.domain.exceptions.base import DomainError, DomainErrorTranslator
+from app.services.payroll_job_service import PayrollJobService
+from app.services.audit_service import flush_read_audit_summaries
+from app.core.audit_retention import maintain_audit_partitions
+from app.core.audit_sink import default_sink as audit_sink
+from app.core.invalidation_bus import default_bus as invalidation_bus
+from app.core.config import AUDIT_SINK_ENABLED, CACHE_INVALIDATION_ENABLED, PASSWORD_REHASH_ENABLED
+from app.core.config import AUDIT_READ_WINDOW_SECONDS
+from apscheduler.schedulers.background import BackgroundScheduler
+from datetime import datetime
 
 
 # Import all routers
@@ -23,6 +34,8 @@ from app.api.v1.audit_routes import router as audit_router
 from app.api.v1.pension_routes import router as pension_router
 from app.api.v1.loan_routes import router as loan_router
 
+scheduler = BackgroundScheduler(daemon=True)
+
 app = FastAPI(
     title="Payroll System API",
     description="Comprehensive payroll management system with Swagger documentation",
@@ -53,8 +66,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db")
+def database_pool_health():
+    """Connection pool usage and wait times for the worker serving this request."""
+    return pool_metrics(engine)
+
+
+@app.get("/health/hashing")
+def password_hashing_health():
+    """Password hashing queue depth, rejections and latency for the worker serving this request."""
+    return hashing_pool.metrics()
+
+
 @app.on_event("startup")
 async def startup_event():
+    if AUDIT_SINK_ENABLED:
+        audit_sink.start()
+    if PASSWORD_REHASH_ENABLED:
+        rehash_queue.start()
     db = SessionLocal()
     init_db()
     seed_admin(db)
@@ -65,6 +94,30 @@ async def startup_event():
     seed_positions(db)
     seed_salaries(db)
     db.close()
+    # Caches in this worker follow writes made by the others
+    if CACHE_INVALIDATION_ENABLED:
+        invalidation_bus.start()
+    # Pick up payroll jobs interrupted by a restart
+    PayrollJobService().resume_pending()
+    # Aggregated read audit counts are written once their window closes
+    scheduler.add_job(flush_read_audit_summaries, "interval", seconds=AUDIT_READ_WINDOW_SECONDS,
+                      id="flush_read_audit_summaries", replace_existing=True)
+    # Monthly audit partitions: create or roll over now and daily, archiving those past retention
+    scheduler.add_job(maintain_audit_partitions, "interval", hours=24, next_run_time=datetime.now(),
+                      id="maintain_audit_partitions", replace_existing=True)
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    flush_read_audit_summaries(include_open=True)
+    # Write queued audit events before the worker exits
+    audit_sink.stop()
+    rehash_queue.stop()
+    invalidation_bus.stop()
+    hashing_pool.shutdown()
 
 # Global exception handlers can be added here if needed
 translator = DomainErrorTranslator()
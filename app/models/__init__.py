@@ -10,33 +10,57 @@ imported in different orders.
 from app.models import (
 	insurance_model,
 	allowances_model,
+	attendance_model,
+	attendance_summary_model,
+	audit_model,
+	cache_invalidation_model,
 	deductions_model,
 	department_model,
+	employee_bank_account,
+	employee_contacts_details,
 	employee_model,
 	Loans_advances_model,
 	payroll_model,
+	payroll_adjustment_model,
+	payroll_dependency_model,
+	payroll_job_model,
 	pension_model,
 	permissions_model,
 	Position_model,
 	roles_model,
 	role_permission,
+	rule_version_model,
+	salary_model,
+	tax_brackets,
 	tax_model,
 	user_model,
 )
 
 __all__ = [
 	"allowances_model",
+	"attendance_model",
+	"attendance_summary_model",
+	"audit_model",
+	"cache_invalidation_model",
 	"deductions_model",
 	"department_model",
+	"employee_bank_account",
+	"employee_contacts_details",
 	"employee_model",
 	"insurance_model",
 	"Loans_advances_model",
 	"payroll_model",
+	"payroll_adjustment_model",
+	"payroll_dependency_model",
+	"payroll_job_model",
 	"pension_model",
 	"permissions_model",
 	"Position_model",
 	"roles_model",
 	"role_permission",
+	"rule_version_model",
+	"salary_model",
+	"tax_brackets",
 	"tax_model",
 	"user_model",
 ]
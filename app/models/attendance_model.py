@@ -1,5 +1,5 @@
 from app.db.database_setup import Base
-from sqlalchemy import String, Date, Column, Integer,Enum, ForeignKey, Float, DateTime, event
+from sqlalchemy import String, Date, Column, Integer,Enum, ForeignKey, Float, DateTime, Index, event, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import pytz
@@ -9,6 +9,16 @@ EAT = pytz.timezone("Africa/Nairobi")
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # One row per employee and day; check-in relies on it with ON CONFLICT DO NOTHING
+        Index("uq_attendance_employee_id_attendance_date", "employee_id", "attendance_date", unique=True),
+        # Approval queue: only pending rows, oldest first
+        Index(
+            "ix_attendance_pending_attendance_date_id", "attendance_date", "id",
+            postgresql_where=text("approved = 'PENDING'"),
+            sqlite_where=text("approved = 'PENDING'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,163 @@
+"""Per-employee, per-month attendance totals, kept up to date as attendance changes.
+
+Each daily `Attendance` row contributes to the summary of its month:
+
+- once checked out: one worked day plus its regular, overtime and total hours;
+- once approved: one approved day plus the same hours in the approved totals.
+
+Flushing an insert, update or delete of an `Attendance` through the ORM adds
+the difference between the row's old and new contribution to the month's
+summary with a single atomic upsert. Concurrent check-outs and approvals
+therefore never overwrite each other's totals, and a rolled back transaction
+rolls its summary changes back with it. Writes that bypass the ORM must call
+`apply_attendance_deltas` themselves.
+"""
+from datetime import date
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, event, inspect, update
+from sqlalchemy.engine import Connection
+
+from app.db.database_setup import Base
+from app.domain.enums import AttendanceStatus
+from app.models.attendance_model import Attendance
+from app.utils.bulk_insert import dialect_insert
+
+COUNTERS = (
+    "worked_days",
+    "regular_hours",
+    "overtime_hours",
+    "hours_worked",
+    "approved_days",
+    "approved_regular_hours",
+    "approved_overtime_hours",
+    "approved_hours_worked",
+)
+
+SummaryKey = Tuple[int, date]  # (employee id, first day of the month)
+
+
+class AttendanceMonthlySummary(Base):
+    __tablename__ = "attendance_monthly_summaries"
+
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    worked_days = Column(Integer, nullable=False, default=0)
+    regular_hours = Column(Float, nullable=False, default=0.0)
+    overtime_hours = Column(Float, nullable=False, default=0.0)
+    hours_worked = Column(Float, nullable=False, default=0.0)
+    approved_days = Column(Integer, nullable=False, default=0)
+    approved_regular_hours = Column(Float, nullable=False, default=0.0)
+    approved_overtime_hours = Column(Float, nullable=False, default=0.0)
+    approved_hours_worked = Column(Float, nullable=False, default=0.0)
+
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+
+def contribution(check_out, approved, regular_hours, overtime_hours, hours_worked) -> Dict[str, float]:
+    """What one daily attendance row adds to its month's summary."""
+    hours = (float(regular_hours or 0), float(overtime_hours or 0), float(hours_worked or 0))
+    totals = dict.fromkeys(COUNTERS, 0)
+    if check_out is not None:
+        totals.update(worked_days=1, regular_hours=hours[0], overtime_hours=hours[1], hours_worked=hours[2])
+    if approved == AttendanceStatus.APPROVED:
+        totals.update(approved_days=1, approved_regular_hours=hours[0], approved_overtime_hours=hours[1],
+                      approved_hours_worked=hours[2])
+    return totals
+
+
+def apply_attendance_deltas(connection: Connection, deltas: Mapping[SummaryKey, Mapping[str, float]]) -> None:
+    """
+    Add counter deltas to monthly summaries, creating missing months.
+
+    :param connection: Connection of the transaction that changed the attendance
+    :param deltas: Counter changes per (employee id, month)
+    """
+    table = AttendanceMonthlySummary.__table__
+    rows = [
+        {"employee_id": employee_id, "month": month, **{name: values.get(name, 0) for name in COUNTERS}}
+        for (employee_id, month), values in deltas.items()
+        if any(values.get(name) for name in COUNTERS)
+    ]
+    if not rows:
+        return
+
+    statement = dialect_insert(connection, table)
+    if statement is not None:
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.employee_id, table.c.month],
+                set_={name: table.c[name] + statement.excluded[name] for name in COUNTERS},
+            ),
+            rows,
+        )
+        return
+
+    # Other databases: increment, and insert the months that did not exist yet
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(table.c.employee_id == row["employee_id"], table.c.month == row["month"])
+            .values({name: table.c[name] + row[name] for name in COUNTERS})
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(row))
+
+
+#=============================================================================================
+# ------------ Maintenance on flush ----------------------------------------------------------
+def _state(target: Attendance, previous: bool) -> Optional[Tuple[SummaryKey, Dict[str, float]]]:
+    """The row's summary key and contribution as it is now, or as it was loaded when `previous`."""
+    attrs = inspect(target).attrs
+
+    def value(name):
+        history = attrs[name].history
+        return history.deleted[0] if previous and history.deleted else getattr(target, name)
+
+    totals = contribution(value("check_out"), value("approved"), value("regular_hours"),
+                          value("overtime_hours"), value("hours_worked"))
+    if not any(totals.values()):
+        return None
+    attendance_date = value("attendance_date")
+    if not isinstance(attendance_date, date):
+        return None  # Still the SQL default; rows are dated before they count
+    return (value("employee_id"), month_of(attendance_date)), totals
+
+
+def _apply(connection: Connection, *changes: Tuple[Optional[Tuple[SummaryKey, Dict[str, float]]], int]) -> None:
+    deltas: Dict[SummaryKey, Dict[str, float]] = {}
+    for state, sign in changes:
+        if state is None:
+            continue
+        key, totals = state
+        summary = deltas.setdefault(key, dict.fromkeys(COUNTERS, 0))
+        for name, value in totals.items():
+            summary[name] += sign * value
+    apply_attendance_deltas(connection, deltas)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the previous value when an expired attribute is assigned, so its old contribution is known
+for _name in ("employee_id", "attendance_date", "check_out", "approved", "regular_hours", "overtime_hours",
+              "hours_worked"):
+    event.listen(getattr(Attendance, _name), "set", _keep_previous_value, active_history=True, retval=True)
+
+
+@event.listens_for(Attendance, "after_insert")
+def _attendance_inserted(mapper, connection, target: Attendance) -> None:
+    _apply(connection, (_state(target, previous=False), 1))
+
+
+@event.listens_for(Attendance, "after_update")
+def _attendance_updated(mapper, connection, target: Attendance) -> None:
+    _apply(connection, (_state(target, previous=True), -1), (_state(target, previous=False), 1))
+
+
+@event.listens_for(Attendance, "after_delete")
+def _attendance_deleted(mapper, connection, target: Attendance) -> None:
+    _apply(connection, (_state(target, previous=True), -1))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.database_setup import Base
 from datetime import datetime
@@ -6,11 +6,21 @@ from datetime import datetime
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # Partitioned by month on PostgreSQL; see app.db.audit_partitions.
+    # Keyset pagination walks (timestamp, id) newest first, optionally within one user or action
+    __table_args__ = (
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_logs_user_id_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_audit_logs_action_timestamp_id", "action", "timestamp", "id"),
+        # Closed months are moved out to their own tables on SQLite; never hand out their ids again
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     action = Column(String(100), nullable=False)  # e.g., "login", "payroll_run", "password_change"
-    timestamp = Column(DateTime, server_default=func.now(), nullable=False)
+    # Set in Python as well so ORM and batched rows store timestamps the same way and cursors compare exactly
+    timestamp = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     meta_data = Column(Text, nullable=True)  # JSON string for additional info
 
     user = relationship("User", back_populates="audit_logs")
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Log of cache invalidation events, shared by every worker through the database.
+
+Writers append `(entity, entity_id, version)` events to `cache_invalidations`
+in the transaction that changed the data, with `publish_invalidations`, so a
+rolled back change never publishes anything. `entity_id` None means every
+row of the entity. Each worker's `InvalidationBus` (see
+`app.core.invalidation_bus`) reads the rows appended since its last poll and
+hands them to the caches that subscribed. On PostgreSQL the same transaction
+also sends a NOTIFY, delivered on commit, which wakes the listeners early.
+
+Flushing an insert, update or delete of an `EmployeeSalary` or
+`PositionSalary` through the ORM publishes the employee's or the position's
+salary event. Rule writes publish their rule set's new version (see
+`rule_version_model`) and user changes are published by `token_cache`.
+Writes that bypass the ORM must call `publish_invalidations` themselves.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, event, func, inspect, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import CACHE_INVALIDATION_CHANNEL
+from app.db.database_setup import Base
+from app.models.salary_model import EmployeeSalary, PositionSalary
+
+# Entities; `entity_id` is the id of the row named
+USER = "user"                          # User id (token identities)
+EMPLOYEE_SALARY = "employee_salary"    # Employee id
+POSITION_SALARY = "position_salary"    # Position id
+# Rule sets publish under their `rule_version_model` names, with no id
+
+_PENDING_KEY = "pending_cache_invalidations"
+
+
+@dataclass(frozen=True)
+class InvalidationEvent:
+    """A change to cached data; `entity_id` None means every row of the entity."""
+    entity: str
+    entity_id: Optional[int] = None
+    version: Optional[int] = None
+
+
+class CacheInvalidation(Base):
+    __tablename__ = "cache_invalidations"
+    __table_args__ = (
+        Index("ix_cache_invalidations_created_at", "created_at"),
+        # Readers only look above the last id they saw; never hand out pruned ids again
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(30), nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def publish_invalidations(session: Session, events: Iterable[InvalidationEvent]) -> None:
+    """
+    Append invalidation events to the log in the session's transaction.
+
+    The events are also kept on the session, so this worker's caches are
+    invalidated as soon as it commits, without waiting for the next poll.
+
+    :param session: Session of the transaction that changed the data
+    :param events: Events to publish; duplicates are written once
+    """
+    events = list(dict.fromkeys(events))
+    if not events:
+        return
+    connection = session.connection()
+    now = datetime.utcnow()
+    connection.execute(
+        CacheInvalidation.__table__.insert(),
+        [{"entity": e.entity, "entity_id": e.entity_id, "version": e.version, "created_at": now} for e in events],
+    )
+    if connection.dialect.name == "postgresql":
+        # Delivered on commit only, and dropped on rollback, like the rows
+        connection.execute(select(func.pg_notify(literal(CACHE_INVALIDATION_CHANNEL), literal(""))))
+    session.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+def pop_published(session: Session) -> List[InvalidationEvent]:
+    """Take the events published by the session's transaction."""
+    return session.info.pop(_PENDING_KEY, [])
+
+
+#=============================================================================================
+# ------------ Publishing on flush -----------------------------------------------------------
+# After the flush, so salaries attached through a relationship have their owner id set
+# Salary models and the attribute naming the timeline they belong to
+_SALARIES = {
+    EmployeeSalary: (EMPLOYEE_SALARY, "employee_id"),
+    PositionSalary: (POSITION_SALARY, "position_id"),
+}
+
+
+def _owners(target, attribute: str) -> Iterable[Optional[int]]:
+    """The timeline a salary row belongs to, and the one it was moved from."""
+    return {*inspect(target).attrs[attribute].history.deleted, getattr(target, attribute)}
+
+
+@event.listens_for(Session, "after_flush")
+def _salaries_flushed(session: Session, flush_context) -> None:
+    changed = [*session.new, *session.deleted, *(obj for obj in session.dirty if session.is_modified(obj))]
+    events = []
+    for target in changed:
+        watched = _SALARIES.get(type(target))
+        if watched is None:
+            continue
+        entity, attribute = watched
+        events.extend(
+            InvalidationEvent(entity, owner_id) for owner_id in _owners(target, attribute)
+            if owner_id is not None
+        )
+    publish_invalidations(session, events)
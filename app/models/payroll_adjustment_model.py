@@ -0,0 +1,26 @@
+from datetime import datetime
+from app.db.database_setup import Base
+from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey, Text
+
+
+class PayrollAdjustment(Base):
+    """
+    One component of a retroactive amendment.
+
+    When a retro run replaces a payroll with a new version, every total that
+    changed gets a row here holding the amount before and after, and the
+    difference. The sum of `delta` for `net_salary` is the arrears owed.
+    """
+    __tablename__ = "payroll_adjustments"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    payroll_id = Column(Integer, ForeignKey("payrolls.id", ondelete="CASCADE"), nullable=False, index=True)  # New version
+    previous_payroll_id = Column(Integer, ForeignKey("payrolls.id"), nullable=False)  # Version it replaces
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False, index=True)
+    component = Column(String(30), nullable=False)  # "gross_salary", "total_allowances", ..., "net_salary"
+    previous_amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False)
+    delta = Column(Numeric(12, 2), nullable=False)
+    reason = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,174 @@
+"""Inputs each draft payroll was computed from, and dirty marking when they change.
+
+A draft run stores one `PayrollDependency` row per input a payroll used:
+the salary it was paid from (the employee's own, or the position's), each
+allowance type, each tax and statutory deduction rule, and the employee's
+attendance, loans, insurance and pension. `version` records the value or
+rule version that was used, for review.
+
+Flushing an insert, update or delete of one of those inputs through the ORM
+marks the draft payrolls that depend on it `needs_recompute`, in the same
+transaction, with one UPDATE. Every mark also bumps the draft's
+`recompute_generation`. A recomputation only replaces a draft whose
+generation is still the one it read, which clears the mark in the same
+transaction, and an input changing meanwhile leaves the draft marked. Attendance only marks the drafts whose period
+contains the day, and only when the row is or was approved, since only
+approved hours reach payroll. A new or changed statutory deduction type
+applies to everyone, so it marks every draft. Writes that bypass the ORM must
+call `mark_dependents_dirty` themselves.
+"""
+from datetime import date
+from typing import Callable, Iterable, Optional, Tuple, Type
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, event, inspect, select, update
+from sqlalchemy.engine import Connection
+
+from app.db.database_setup import Base
+from app.domain.enums import AttendanceStatus
+from app.models.allowances_model import AllowanceType
+from app.models.attendance_model import Attendance
+from app.models.deductions_model import DeductionBracket, DeductionType
+from app.models.employee_model import Employee
+from app.models.insurance_model import Insurance
+from app.models.Loans_advances_model import Loan
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.pension_model import Pension
+from app.models.salary_model import EmployeeSalary, PositionSalary
+from app.models.tax_brackets import TaxBracket
+from app.models.tax_model import Tax
+
+# Dependency sources; `source_id` is the id of the row named
+EMPLOYEE = "employee"                  # Employee id (position held)
+EMPLOYEE_SALARY = "employee_salary"    # Employee id
+POSITION_SALARY = "position_salary"    # Position id
+ALLOWANCE_TYPE = "allowance_type"      # Allowance type id
+DEDUCTION_TYPE = "deduction_type"      # Deduction type id
+TAX = "tax"                            # Tax id
+ATTENDANCE = "attendance"              # Employee id
+LOAN = "loan"                          # Employee id
+INSURANCE = "insurance"                # Employee id
+PENSION = "pension"                    # Employee id
+
+
+class PayrollDependency(Base):
+    __tablename__ = "payroll_dependencies"
+    __table_args__ = (
+        Index("ix_payroll_dependencies_source_source_id", "source", "source_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    payroll_id = Column(Integer, ForeignKey("payrolls.id", ondelete="CASCADE"), nullable=False, index=True)
+    source = Column(String(30), nullable=False)
+    source_id = Column(Integer, nullable=False)
+    version = Column(String(64), nullable=True)  # Amount, hours or rule updated_at that was used
+
+
+def mark_dependents_dirty(
+        connection: Connection,
+        source: str,
+        source_ids: Optional[Iterable[int]],
+        day: Optional[date] = None,
+) -> int:
+    """
+    Flag the draft payrolls that depend on changed inputs for recomputation.
+
+    :param connection: Connection of the transaction that changed the inputs
+    :param source: Dependency source, e.g. `EMPLOYEE_SALARY`
+    :param source_ids: Ids of the changed rows, or None to mark every draft
+    :param day: Only drafts whose pay period contains this day
+    :return: How many drafts were marked
+    """
+    statement = (
+        update(Payroll)
+        .where(Payroll.status == PayrollStatus.DRAFT)
+        .values(needs_recompute=True, recompute_generation=Payroll.recompute_generation + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if source_ids is not None:
+        source_ids = sorted({source_id for source_id in source_ids if source_id is not None})
+        if not source_ids:
+            return 0
+        statement = statement.where(Payroll.id.in_(
+            select(PayrollDependency.payroll_id)
+            .where(PayrollDependency.source == source, PayrollDependency.source_id.in_(source_ids))
+        ))
+    if day is not None:
+        statement = statement.where(Payroll.pay_period_start <= day, Payroll.pay_period_end >= day)
+    return connection.execute(statement).rowcount
+
+
+#=============================================================================================
+# ------------ Marking on flush --------------------------------------------------------------
+def _previous(target, name: str):
+    history = inspect(target).attrs[name].history
+    return history.deleted[0] if history.deleted else getattr(target, name)
+
+
+def _changed(target, names: Iterable[str] = ()) -> bool:
+    attrs = inspect(target).attrs
+    return any(attrs[name].history.has_changes() for name in (names or attrs.keys()))
+
+
+def _attendance_counts(target: Attendance) -> bool:
+    return AttendanceStatus.APPROVED in (target.approved, _previous(target, "approved"))
+
+
+def _statutory_key(target: DeductionType) -> Optional[Iterable[int]]:
+    return None if target.is_statutory else [target.id]
+
+
+# (model, source, ids of the changed dependency from a row, whether the change matters on update)
+_WATCHED: Tuple[Tuple[Type, str, Callable, Callable], ...] = (
+    (Employee, EMPLOYEE, lambda t: [t.id], lambda t: _changed(t, ("position_id",))),
+    (EmployeeSalary, EMPLOYEE_SALARY, lambda t: [t.employee_id], _changed),
+    (PositionSalary, POSITION_SALARY, lambda t: [t.position_id], _changed),
+    (AllowanceType, ALLOWANCE_TYPE, lambda t: [t.id], _changed),
+    (DeductionType, DEDUCTION_TYPE, _statutory_key, _changed),
+    (DeductionBracket, DEDUCTION_TYPE, lambda t: [t.deduction_type_id], _changed),
+    (Tax, TAX, lambda t: [t.id], _changed),
+    (TaxBracket, TAX, lambda t: [t.tax_id], _changed),
+    (Loan, LOAN, lambda t: [t.employee_id], _changed),
+    (Insurance, INSURANCE, lambda t: [t.employee_id], _changed),
+    (Pension, PENSION, lambda t: [t.employee_id], _changed),
+)
+
+
+def _watch(model: Type, source: str, key: Callable, matters: Callable) -> None:
+    def changed(mapper, connection, target):
+        mark_dependents_dirty(connection, source, key(target))
+
+    def updated(mapper, connection, target):
+        if matters(target):
+            mark_dependents_dirty(connection, source, key(target))
+
+    event.listen(model, "after_insert", changed)
+    event.listen(model, "after_update", updated)
+    event.listen(model, "after_delete", changed)
+
+
+for _watched in _WATCHED:
+    _watch(*_watched)
+
+
+def _mark_attendance(connection: Connection, target: Attendance) -> None:
+    if not _attendance_counts(target):
+        return
+    for day in {_previous(target, "attendance_date"), target.attendance_date}:
+        if isinstance(day, date):
+            mark_dependents_dirty(connection, ATTENDANCE, [target.employee_id], day)
+
+
+@event.listens_for(Attendance, "after_insert")
+def _attendance_inserted(mapper, connection, target: Attendance) -> None:
+    _mark_attendance(connection, target)
+
+
+@event.listens_for(Attendance, "after_update")
+def _attendance_updated(mapper, connection, target: Attendance) -> None:
+    if _changed(target):
+        _mark_attendance(connection, target)
+
+
+@event.listens_for(Attendance, "after_delete")
+def _attendance_deleted(mapper, connection, target: Attendance) -> None:
+    _mark_attendance(connection, target)
@@ -0,0 +1,55 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+from app.db.database_setup import Base
+from sqlalchemy import Boolean, Column, Integer, Date, DateTime, Enum, ForeignKey, JSON, String, Text
+
+
+class PayrollJobStatus(PyEnum):
+    """Lifecycle of a background payroll run."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class PayrollJob(Base):
+    """
+    Durable state of a background payroll run.
+
+    Progress is saved after every committed chunk. `last_employee_id` is the
+    keyset watermark: every employee with a lower or equal id has been
+    processed, so a resumed job continues with `id > last_employee_id`.
+    `worker_id` and `heartbeat_at` record which process owns the job; the
+    owner refreshes the heartbeat from a timer while the job runs.
+    """
+    __tablename__ = "payroll_jobs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    pay_period_start = Column(Date, nullable=False)
+    pay_period_end = Column(Date, nullable=False)
+    status = Column(Enum(PayrollJobStatus), nullable=False, default=PayrollJobStatus.QUEUED, index=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    allowance_type_ids = Column(JSON, nullable=False, default=list)
+    tax_ids = Column(JSON, nullable=False, default=list)
+    chunk_size = Column(Integer, nullable=False)
+    draft = Column(Boolean, nullable=False, default=False)  # Write draft payrolls, for review
+    payment_date = Column(Date, nullable=True)  # Default: the period end
+
+    # --- Progress ---
+    total_employees = Column(Integer, nullable=True)  # Known once the job starts
+    processed = Column(Integer, nullable=False, default=0)
+    succeeded = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    last_employee_id = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # [{"employee_id": .., "error": ..}]
+    error_message = Column(Text, nullable=True)  # Fatal error that stopped the job
+
+    # --- Ownership ---
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
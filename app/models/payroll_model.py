@@ -4,7 +4,7 @@ from enum import Enum as PyEnum
 from app.db.database_setup import Base
 from sqlalchemy import (
     Column, Integer, Numeric, UniqueConstraint,Date, ForeignKey, String, DateTime, 
-    JSON, Enum, Text, Boolean
+    JSON, Enum, Text, Boolean, false
 )
 from sqlalchemy.orm import relationship
 
@@ -58,6 +58,8 @@ class Payroll(Base):
     amendment_reason = Column(Text, nullable=True)
     amended_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     notes = Column(Text, nullable=True)
+    needs_recompute = Column(Boolean, nullable=False, default=False, server_default=false())  # Draft inputs changed
+    recompute_generation = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every mark
 
     # === RELATIONSHIPS ===
     employee = relationship("Employee", back_populates="payrolls")
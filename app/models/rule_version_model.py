@@ -0,0 +1,112 @@
+"""Monotonic versions of the payroll rule sets, bumped by every rule write.
+
+There is one row per rule set: statutory deductions (`DeductionType` and its
+brackets), taxes (`Tax` and its brackets) and allowance types. Flushing an
+insert, update or delete of any of those rows through the ORM, or running an
+ORM bulk UPDATE or DELETE on them, increments the set's version in the same
+transaction, and publishes the new version on the cache invalidation log
+(see `cache_invalidation_model`). Rule caches in every worker compare the
+versions with the ones they were built from, so a committed change
+invalidates them everywhere and a rolled back one never does. Writes that
+bypass the ORM must call `bump_rule_versions` themselves.
+"""
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import Column, DateTime, Integer, String, event, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.database_setup import Base
+from app.models.allowances_model import AllowanceType
+from app.models.cache_invalidation_model import InvalidationEvent, publish_invalidations
+from app.models.deductions_model import DeductionBracket, DeductionType
+from app.models.tax_brackets import TaxBracket
+from app.models.tax_model import Tax
+from app.utils.bulk_insert import dialect_insert
+
+DEDUCTIONS = "deduction"
+TAXES = "tax"
+ALLOWANCES = "allowance"
+RULE_SETS = (DEDUCTIONS, TAXES, ALLOWANCES)
+
+# Rule set each rule table belongs to
+_RULE_SET_OF = {
+    DeductionType: DEDUCTIONS,
+    DeductionBracket: DEDUCTIONS,
+    Tax: TAXES,
+    TaxBracket: TAXES,
+    AllowanceType: ALLOWANCES,
+}
+
+
+class RuleSetVersion(Base):
+    __tablename__ = "rule_set_versions"
+
+    name = Column(String(30), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def get_rule_versions(connection) -> Dict[str, int]:
+    """
+    Current version of every rule set; sets never written are at 0.
+
+    :param connection: Session or connection to read through
+    """
+    versions = dict.fromkeys(RULE_SETS, 0)
+    versions.update(connection.execute(select(RuleSetVersion.name, RuleSetVersion.version)).all())
+    return versions
+
+
+def bump_rule_versions(connection: Connection, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Increment the versions of rule sets, creating missing rows.
+
+    :param connection: Connection of the transaction that changed the rules
+    :param names: Rule sets that changed
+    :return: The new version of each of them
+    """
+    table = RuleSetVersion.__table__
+    now = datetime.utcnow()
+    names = sorted(set(names))
+    for name in names:
+        statement = dialect_insert(connection, table)
+        if statement is not None:
+            connection.execute(
+                statement.values(name=name, version=1, updated_at=now).on_conflict_do_update(
+                    index_elements=[table.c.name],
+                    set_={"version": table.c.version + 1, "updated_at": now},
+                )
+            )
+            continue
+        result = connection.execute(
+            update(table).where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(name=name, version=1, updated_at=now))
+    return dict(connection.execute(select(table.c.name, table.c.version).where(table.c.name.in_(names))).all())
+
+
+def _bump_and_publish(session: Session, names: Iterable[str]) -> None:
+    versions = bump_rule_versions(session.connection(), names)
+    publish_invalidations(session, [InvalidationEvent(name, None, version) for name, version in versions.items()])
+
+
+#=============================================================================================
+# ------------ Bumping on write --------------------------------------------------------------
+@event.listens_for(Session, "before_flush")
+def _rules_flushed(session: Session, flush_context, instances) -> None:
+    changed = [*session.new, *session.deleted, *(obj for obj in session.dirty if session.is_modified(obj))]
+    names = {_RULE_SET_OF[type(obj)] for obj in changed if type(obj) in _RULE_SET_OF}
+    if names:
+        _bump_and_publish(session, names)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _rules_bulk_written(state) -> None:
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return
+    name = _RULE_SET_OF.get(state.bind_mapper.class_)
+    if name is not None:
+        _bump_and_publish(state.session, [name])
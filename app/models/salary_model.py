@@ -1,5 +1,5 @@
 from app.db.database_setup import Base
-from sqlalchemy import Column, Integer, Float, Enum, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Column, Integer, Float, Enum, DateTime, ForeignKey, Index, Numeric, String
 from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy.orm import relationship
@@ -10,6 +10,10 @@ class PayFrequency(str, PyEnum):
 
 class PositionSalary(Base):
     __tablename__ = "position_salaries"
+    __table_args__ = (
+        # Salary in effect for a position on a date: newest effective_from at or before it
+        Index("ix_position_salaries_position_id_effective_from", "position_id", "effective_from"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     position_id = Column(Integer, ForeignKey("positions.id"), nullable=False)
@@ -31,6 +35,10 @@ class PositionSalary(Base):
 
 class EmployeeSalary(Base):
     __tablename__ = "employee_salaries"
+    __table_args__ = (
+        # Salary in effect for an employee on a date: newest effective_from at or before it
+        Index("ix_employee_salaries_employee_id_effective_from", "employee_id", "effective_from"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -0,0 +1,537 @@
+"""
+Chunked, parallel payroll batch runner.
+
+Splits the employee population into chunks and resolves and computes each
+chunk in a worker process. Every finished chunk is persisted in its own
+transaction, so one bad chunk no longer rolls back the whole run.
+
+A draft run also records what each payroll depended on (see
+`payroll_dependency_model`). When HR then edits an input, only the drafts
+depending on it are marked, and `recompute_dirty` reprocesses just those
+employees instead of the whole population. The final run of the period
+replaces the drafts, in the same transaction as each chunk's payrolls.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import DATABASE_URL, PAYROLL_BATCH_CHUNK_SIZE, PAYROLL_BATCH_WORKERS
+from app.core.unit_of_work import UnitOfWork
+from app.db.database_setup import SessionLocal, build_engine
+from app.domain.exceptions.base import ConflictError, DomainError, PayrollComputeError
+from app.models import payroll_dependency_model as dependency
+from app.models.payroll_model import PayrollStatus
+from app.payroll.payroll_engine import PayrollEngine
+from app.payroll.rule_cache import rules_for
+from app.schemas.payroll_schema import (
+    PayrollBatchChunkReport,
+    PayrollBatchFailure,
+    PayrollBatchReport,
+    PayrollResult,
+    ResolvedPayrollInputs,
+)
+from app.services.payroll_resolution_service import PayrollResolutionService
+
+logger = logging.getLogger(__name__)
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+@dataclass(frozen=True)
+class ChunkOutcome:
+    """What a worker returns for one chunk."""
+    results: List[PayrollResult] = field(default_factory=list)
+    allowances: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)  # employee id -> allowance rows
+    deductions: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)  # employee id -> deduction rows
+    errors: Dict[int, str] = field(default_factory=dict)
+    compute_seconds: float = 0.0
+    dependencies: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)  # employee id -> dependency rows
+
+
+#=============================================================================================
+# ------------ Worker side -------------------------------------------------------------------
+_worker_sessions: Optional[sessionmaker] = None
+
+
+def _init_worker(database_url: str) -> None:
+    """Process pool initializer: give each worker its own engine and connection pool."""
+    global _worker_sessions
+    # A worker runs one chunk at a time, so a single connection is enough
+    overrides = {} if make_url(database_url).database in (None, "", ":memory:") else {"pool_size": 1, "max_overflow": 0}
+    engine = build_engine(database_url, **overrides)
+    _worker_sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _run_chunk(
+        employee_ids: Sequence[int],
+        period_start: date,
+        period_end: date,
+        allowance_type_ids: Sequence[int],
+        tax_ids: Sequence[int],
+) -> ChunkOutcome:
+    """Entry point executed in a worker process."""
+    return compute_chunk(_worker_sessions, employee_ids, period_start, period_end, allowance_type_ids, tax_ids)
+
+
+def compute_chunk(
+        session_factory: Callable[[], Session],
+        employee_ids: Sequence[int],
+        period_start: date,
+        period_end: date,
+        allowance_type_ids: Sequence[int] = (),
+        tax_ids: Sequence[int] = (),
+) -> ChunkOutcome:
+    """
+    Resolve and compute payroll for one chunk of employees.
+
+    Reads only; nothing is written from here. Computation fails per
+    employee, as in `compute_results`.
+
+    :return: Computed results with their allowance, deduction and dependency
+        rows, failures keyed by employee id, and elapsed seconds
+    """
+    started = time.perf_counter()
+    errors: Dict[int, str] = {}
+    db = session_factory()
+    try:
+        inputs = PayrollResolutionService(db).resolve_many(
+            employee_ids, period_start, period_end,
+            allowance_type_ids=allowance_type_ids, tax_ids=tax_ids, errors=errors, rules=rules_for(db),
+        )
+    finally:
+        db.close()
+
+    results = compute_results(inputs, errors)
+    by_employee = {item.employee_id: item for item in inputs}
+    allowances, deductions, dependencies = {}, {}, {}
+    for result in results:
+        item = by_employee[result.employee_id]
+        allowances[result.employee_id], deductions[result.employee_id] = _line_rows(item, result)
+        dependencies[result.employee_id] = _dependency_rows(item)
+    return ChunkOutcome(results, allowances, deductions, errors, time.perf_counter() - started, dependencies)
+
+
+def compute_results(inputs: Sequence[ResolvedPayrollInputs], errors: Dict[int, str]) -> List[PayrollResult]:
+    """
+    Compute resolved inputs with the batch engine.
+
+    If the batch computation fails, the inputs are recomputed one employee at
+    a time so a single bad record only fails that employee.
+
+    :param inputs: Resolved payroll inputs
+    :param errors: Failures are recorded here, keyed by employee id
+    :return: Results of the employees that computed
+    """
+    engine = PayrollEngine()
+    try:
+        return engine.compute_batch(inputs)
+    except PayrollComputeError:
+        results = []
+        for item in inputs:
+            try:
+                results.append(engine.compute(item))
+            except PayrollComputeError as e:
+                errors[item.employee_id] = str(e)
+        return results
+
+
+def _line_rows(inputs: ResolvedPayrollInputs, result: PayrollResult) -> Tuple[List[dict], List[dict]]:
+    """Build the allowance and deduction rows stored alongside a payroll."""
+    allowances = [
+        {
+            "allowance_type_id": allowance.allowance_type_id,
+            "name": allowance.name,
+            "code": allowance.code,
+            "amount": _money(allowance.amount),
+            "is_taxable": allowance.is_taxable,
+        }
+        for allowance in inputs.allowances
+    ]
+    # The engine emits one line item per statutory rule, in rule order.
+    # Tax rules are not deduction types, so only deduction-backed rules get a row.
+    deductions = [
+        {
+            "deduction_type_id": rule.deduction_type_id,
+            "amount": _money(line.amount),
+            "is_percentage": bool(rule.rate),
+        }
+        for rule, line in zip(inputs.statutory_deduction_rules, result.line_items)
+        if rule.rule_source == "deduction"
+    ]
+    return allowances, deductions
+
+
+def _dependency_rows(inputs: ResolvedPayrollInputs) -> List[dict]:
+    """Build the rows recording which inputs a payroll was computed from."""
+    employee_id = inputs.employee_id
+    from_position = inputs.salary_source == "position"
+    # An own salary added later takes precedence over the position's, so it is a dependency either way
+    sources = [
+        (dependency.EMPLOYEE, employee_id, inputs.position_id),
+        (dependency.EMPLOYEE_SALARY, employee_id, None if from_position else _money(inputs.base_salary)),
+        (dependency.ATTENDANCE, employee_id, f"{inputs.attendance.hours_worked}/{inputs.attendance.overtime_hours}"),
+        (dependency.LOAN, employee_id, _money(inputs.loan.monthly_repayment)),
+        (dependency.INSURANCE, employee_id, _money(inputs.insurance.employee_contribution)),
+        (dependency.PENSION, employee_id, _money(inputs.pension.employee_contribution)),
+    ]
+    if from_position:
+        sources.append((dependency.POSITION_SALARY, inputs.position_id, _money(inputs.base_salary)))
+    sources += [(dependency.ALLOWANCE_TYPE, item.allowance_type_id, _money(item.amount)) for item in inputs.allowances]
+    sources += [
+        (dependency.TAX if rule.rule_source == "tax" else dependency.DEDUCTION_TYPE, rule.deduction_type_id,
+         rule.updated_at.isoformat() if rule.updated_at else None)
+        for rule in inputs.statutory_deduction_rules
+    ]
+    return [
+        {"source": source, "source_id": source_id, "version": None if version is None else str(version)}
+        for source, source_id, version in sources
+        if source_id is not None
+    ]
+
+
+#=============================================================================================
+# ------------ Coordinator -------------------------------------------------------------------
+class PayrollBatchRunner:
+    """
+    Runs payroll for a pay period across the employee population.
+
+    Employees are split into chunks of `chunk_size`. Chunks are resolved and
+    computed in a process pool of `max_workers` processes, and each chunk's
+    payrolls are written in a separate transaction as soon as it completes.
+    Employees that already have a payroll for the period are skipped, which
+    makes re-running a partially failed period safe. Draft runs record each
+    payroll's inputs so that `recompute_dirty` can redo only the drafts whose
+    inputs changed since.
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            database_url: str = DATABASE_URL,
+            chunk_size: int = PAYROLL_BATCH_CHUNK_SIZE,
+            max_workers: int = PAYROLL_BATCH_WORKERS,
+    ):
+        if chunk_size <= 0:
+            raise DomainError("Batch chunk size must be positive")
+        self.session_factory = session_factory
+        self.database_url = database_url
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _chunks(self, employee_ids: List[int]) -> List[List[int]]:
+        return [employee_ids[i:i + self.chunk_size] for i in range(0, len(employee_ids), self.chunk_size)]
+
+    def _in_process(self, chunk_count: int) -> bool:
+        # An in-memory database is private to its process, so workers could not see it
+        database = make_url(self.database_url).database
+        return self.max_workers == 1 or chunk_count <= 1 or database in (None, "", ":memory:")
+
+    def pending_employee_ids(
+            self,
+            period_start: date,
+            period_end: date,
+            employee_ids: Optional[Iterable[int]] = None,
+            draft: bool = False,
+    ) -> Tuple[List[int], int]:
+        """
+        Split the population into employees still to be paid and a skipped count.
+
+        :param draft: For a draft run, employees with a draft are skipped too;
+            a final run replaces their drafts
+        :return: Pending employee ids in ascending order, and how many already have a payroll
+        """
+        db = self.session_factory()
+        try:
+            uow = UnitOfWork(db)
+            if employee_ids is None:
+                employee_ids = uow.employee_repo.get_all_employee_ids()
+            else:
+                employee_ids = sorted(set(employee_ids))
+            existing = uow.payroll_repo.get_employee_ids_with_payroll(period_start, period_end, include_drafts=draft)
+        finally:
+            db.close()
+        pending = [employee_id for employee_id in employee_ids if employee_id not in existing]
+        return pending, len(employee_ids) - len(pending)
+
+    def run(
+            self,
+            period_start: date,
+            period_end: date,
+            user_id: int,
+            employee_ids: Optional[Iterable[int]] = None,
+            allowance_type_ids: Sequence[int] = (),
+            tax_ids: Sequence[int] = (),
+            on_chunk: Optional[Callable[[PayrollBatchChunkReport, Sequence[int]], None]] = None,
+            draft: bool = False,
+            payment_date: Optional[date] = None,
+            stop: Optional[threading.Event] = None,
+    ) -> PayrollBatchReport:
+        """
+        Run payroll for every pending employee in the period.
+
+        A final run replaces the employees' drafts for the period, if any.
+
+        :param period_start: First day of the pay period
+        :param period_end: Last day of the pay period
+        :param user_id: User recorded in the audit trail
+        :param employee_ids: Restrict the run to these employees (default: everyone)
+        :param allowance_type_ids: Allowance types applied to every employee
+        :param tax_ids: Tax rules applied to every employee
+        :param on_chunk: Called with each chunk's report and employee ids once
+            the chunk is committed (chunks may complete out of order)
+        :param draft: Write draft payrolls and record their dependencies, for review
+        :param payment_date: Payment date of the payrolls (default: `period_end`)
+        :param stop: Once set, no further chunk is persisted and the run
+            returns with the chunks committed so far
+        :return: Per-chunk timing, successes and failures
+        :rtype: PayrollBatchReport
+        """
+        started = time.perf_counter()
+        pending, skipped = self.pending_employee_ids(period_start, period_end, employee_ids, draft=draft)
+        replace = None
+        if not draft:
+            db = self.session_factory()
+            try:
+                replace = UnitOfWork(db).payroll_repo.get_drafts(period_start, period_end)
+            finally:
+                db.close()
+        args = (period_start, period_end, tuple(allowance_type_ids), tuple(tax_ids))
+        payment_date = payment_date or period_end
+        reports = self._process(self._chunks(pending), args, user_id, payment_date, on_chunk, draft, replace, stop)
+        return self._report(period_start, period_end, reports, len(pending) + skipped, skipped, started)
+
+    def recompute_dirty(
+            self,
+            period_start: date,
+            period_end: date,
+            user_id: int,
+            allowance_type_ids: Sequence[int] = (),
+            tax_ids: Sequence[int] = (),
+            on_chunk: Optional[Callable[[PayrollBatchChunkReport, Sequence[int]], None]] = None,
+            payment_date: Optional[date] = None,
+    ) -> PayrollBatchReport:
+        """
+        Recompute only the draft payrolls of a period whose inputs changed.
+
+        Each recomputed draft replaces the old one, with fresh lines and
+        dependencies, in the chunk's transaction; that is also what clears the
+        mark. Drafts that fail, that are marked again while being recomputed,
+        or that a crashed call never got to stay marked for the next call.
+
+        :param period_start: First day of the pay period
+        :param period_end: Last day of the pay period
+        :param user_id: User recorded in the audit trail
+        :param allowance_type_ids: Allowance types of the draft run
+        :param tax_ids: Tax rules of the draft run
+        :param on_chunk: As for `run`
+        :param payment_date: Payment date of the draft run (default: `period_end`)
+        :return: The recomputed employees' chunks; `skipped` counts the period's other payrolls
+        :rtype: PayrollBatchReport
+        """
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            uow = UnitOfWork(db)
+            dirty = uow.payroll_repo.get_drafts(period_start, period_end, dirty_only=True)
+            employees = len(uow.payroll_repo.get_employee_ids_with_payroll(period_start, period_end))
+        finally:
+            db.close()
+        args = (period_start, period_end, tuple(allowance_type_ids), tuple(tax_ids))
+        payment_date = payment_date or period_end
+        reports = self._process(
+            self._chunks(sorted(dirty)), args, user_id, payment_date, on_chunk, draft=True, replace=dirty
+        )
+        return self._report(period_start, period_end, reports, employees, employees - len(dirty), started)
+
+    def _process(
+            self,
+            chunks: List[List[int]],
+            args: tuple,
+            user_id: int,
+            payment_date: date,
+            on_chunk: Optional[Callable[[PayrollBatchChunkReport, Sequence[int]], None]],
+            draft: bool,
+            replace: Optional[Dict[int, Tuple[int, int]]] = None,
+            stop: Optional[threading.Event] = None,
+    ) -> List[PayrollBatchChunkReport]:
+        """Compute the chunks, in process or in a pool, and persist each as it completes, until `stop` is set."""
+        reports: List[PayrollBatchChunkReport] = []
+        stopped = stop.is_set if stop is not None else lambda: False
+
+        if self._in_process(len(chunks)):
+            for number, chunk in enumerate(chunks, start=1):
+                if stopped():
+                    break
+                try:
+                    outcome = compute_chunk(self.session_factory, chunk, *args)
+                except Exception as e:
+                    outcome = self._failed_outcome(chunk, e)
+                if stopped():
+                    break
+                reports.append(self._persist_chunk(number, chunk, outcome, user_id, payment_date, draft, replace))
+                if on_chunk is not None:
+                    on_chunk(reports[-1], chunk)
+        else:
+            context = multiprocessing.get_context("spawn")
+            workers = min(self.max_workers, len(chunks))
+            with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.database_url,),
+            ) as pool:
+                futures = {
+                    pool.submit(_run_chunk, chunk, *args): (number, chunk)
+                    for number, chunk in enumerate(chunks, start=1)
+                }
+                for future in as_completed(futures):
+                    if stopped():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    number, chunk = futures[future]
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = self._failed_outcome(chunk, e)
+                    reports.append(self._persist_chunk(number, chunk, outcome, user_id, payment_date, draft, replace))
+                    if on_chunk is not None:
+                        on_chunk(reports[-1], chunk)
+        return sorted(reports, key=lambda report: report.chunk)
+
+    @staticmethod
+    def _report(
+            period_start: date,
+            period_end: date,
+            reports: List[PayrollBatchChunkReport],
+            employees: int,
+            skipped: int,
+            started: float,
+    ) -> PayrollBatchReport:
+        succeeded = sum(report.succeeded for report in reports)
+        failed = sum(len(report.failed) for report in reports)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Payroll batch %s..%s: %d succeeded, %d failed, %d skipped in %.2fs",
+            period_start, period_end, succeeded, failed, skipped, elapsed,
+        )
+        return PayrollBatchReport(
+            period_start=period_start,
+            period_end=period_end,
+            employees=employees,
+            skipped=skipped,
+            succeeded=succeeded,
+            failed=failed,
+            elapsed_seconds=elapsed,
+            chunks=reports,
+        )
+
+    @staticmethod
+    def _failed_outcome(chunk: Sequence[int], error: Exception) -> ChunkOutcome:
+        logger.exception("Payroll batch chunk failed", exc_info=error)
+        return ChunkOutcome(errors={employee_id: str(error) for employee_id in chunk})
+
+    def _persist_chunk(
+            self,
+            number: int,
+            chunk: Sequence[int],
+            outcome: ChunkOutcome,
+            user_id: int,
+            payment_date: date,
+            draft: bool = False,
+            replace: Optional[Dict[int, Tuple[int, int]]] = None,
+    ) -> PayrollBatchChunkReport:
+        """
+        Write one chunk's payrolls in a single transaction.
+
+        Payrolls, allowance lines and deduction lines are each inserted with
+        one set-based statement rather than an ORM flush per row. Drafts also
+        get their dependency rows. The chunk's employees in `replace`
+        (employee id -> draft payroll id and recompute generation) have those
+        drafts deleted first.
+        """
+        results, errors = outcome.results, outcome.errors
+        started = time.perf_counter()
+        succeeded = 0
+        status = PayrollStatus.DRAFT if draft else PayrollStatus.PROCESSED
+        if results:
+            db = self.session_factory()
+            try:
+                with UnitOfWork(db) as uow:
+                    if replace:
+                        previous = dict(
+                            replace[result.employee_id] for result in results if result.employee_id in replace
+                        )
+                        if uow.payroll_repo.delete_drafts(previous) != len(previous):
+                            raise ConflictError("Drafts were approved or changed again meanwhile; run again")
+                    payroll_ids = uow.payroll_repo.bulk_create([
+                        self._payroll_row(result, payment_date, status) for result in results
+                    ])
+                    allowance_rows, deduction_rows, dependency_rows = [], [], []
+                    for result, payroll_id in zip(results, payroll_ids):
+                        allowance_rows += [
+                            {**row, "payroll_id": payroll_id} for row in outcome.allowances.get(result.employee_id, ())
+                        ]
+                        deduction_rows += [
+                            {**row, "payroll_id": payroll_id} for row in outcome.deductions.get(result.employee_id, ())
+                        ]
+                        if draft:
+                            dependency_rows += [
+                                {**row, "payroll_id": payroll_id}
+                                for row in outcome.dependencies.get(result.employee_id, ())
+                            ]
+                    uow.allowance_repo.bulk_create(allowance_rows)
+                    uow.deduction_repo.bulk_create(deduction_rows)
+                    uow.payroll_repo.bulk_create_dependencies(dependency_rows)
+                    uow.audit_repo.log_action(user_id, "payroll_batch_chunk", {
+                        "chunk": number,
+                        "employee_ids": [result.employee_id for result in results],
+                    })
+                succeeded = len(results)
+            except Exception as e:
+                logger.exception("Failed to persist payroll batch chunk %d", number)
+                errors = {**errors, **{result.employee_id: f"Failed to persist chunk: {e}" for result in results}}
+            finally:
+                db.close()
+
+        return PayrollBatchChunkReport(
+            chunk=number,
+            employees=len(chunk),
+            succeeded=succeeded,
+            failed=[PayrollBatchFailure(employee_id=k, error=v) for k, v in sorted(errors.items())],
+            compute_seconds=outcome.compute_seconds,
+            persist_seconds=time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def _payroll_row(
+            result: PayrollResult,
+            payment_date: date,
+            status: PayrollStatus = PayrollStatus.PROCESSED,
+    ) -> Dict[str, Any]:
+        return {
+            "employee_id": result.employee_id,
+            "pay_period_start": result.period_start,
+            "pay_period_end": result.period_end,
+            "payment_date": payment_date,
+            "total_allowances": _money(result.allowances_total),
+            "total_deductions": _money(result.deductions_total),
+            "tax_amount": _money(result.tax_total),
+            "gross_salary": _money(result.gross_pay),
+            "net_salary": _money(result.net_pay),
+            "status": status,
+            "processed_at": datetime.utcnow(),
+        }
@@ -0,0 +1,193 @@
+"""
+Compiled bracket schedules for tiered deductions and taxes.
+
+A schedule stores the sorted lower bounds of a rule's brackets together with
+the cumulative tax owed at each bound, so the amount for any income is one
+binary search plus one multiply instead of a walk over every bracket.
+Schedules are immutable and cached by rule id and `updated_at`, which lets
+the payroll engine and `TaxService` share a single compiled copy per rule
+version.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from decimal import Decimal
+from threading import Lock
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+class BracketSchedule:
+    """
+    Immutable marginal-rate schedule.
+
+    Attributes:
+        lower_bounds: Sorted lower bound of every band.
+        upper_bounds: Upper bound of every band (None for the open-ended top band).
+        rates: Rate of every band as a fraction (0.1 for 10%).
+        cumulative: Tax owed at each lower bound (`cumulative[i]` is the sum of
+            all full bands below band `i`).
+    """
+
+    __slots__ = ("lower_bounds", "upper_bounds", "rates", "cumulative", "_zero")
+
+    def __init__(self, bands: Iterable[Tuple[Any, Optional[Any], Any]], zero: Any = Decimal("0")):
+        """Compile a schedule from `(lower, upper, rate_fraction)` bands."""
+        ordered = sorted(bands, key=lambda band: band[0])
+        for position, (lower, upper, _) in enumerate(ordered):
+            if upper is None and position != len(ordered) - 1:
+                raise ValueError("Only the highest bracket may be open-ended")
+            if upper is not None and upper < lower:
+                raise ValueError(f"Bracket upper bound {upper} is below its lower bound {lower}")
+
+        cumulative = [zero]
+        for lower, upper, rate in ordered:
+            if upper is not None:
+                cumulative.append(cumulative[-1] + (upper - lower) * rate)
+
+        self.lower_bounds: Tuple[Any, ...] = tuple(band[0] for band in ordered)
+        self.upper_bounds: Tuple[Optional[Any], ...] = tuple(band[1] for band in ordered)
+        self.rates: Tuple[Any, ...] = tuple(band[2] for band in ordered)
+        self.cumulative: Tuple[Any, ...] = tuple(cumulative)
+        self._zero = zero
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_brackets(cls, brackets: Sequence[Any]) -> "BracketSchedule":
+        """
+        Compile `DeductionBracket`/`TaxBracket` rows or bracket dicts.
+
+        Brackets carry `min_amount`, `max_amount` and `rate` as a percentage.
+        """
+        def field(bracket, name):
+            if isinstance(bracket, dict):
+                return bracket.get(name)
+            return getattr(bracket, name, None)
+
+        bands = []
+        for bracket in brackets:
+            lower = field(bracket, "min_amount")
+            upper = field(bracket, "max_amount")
+            rate = field(bracket, "rate")
+            bands.append((
+                Decimal(lower) if lower is not None else Decimal("0"),
+                Decimal(upper) if upper is not None else None,
+                Decimal(rate) / Decimal("100"),
+            ))
+        return cls(bands, zero=Decimal("0"))
+
+    @classmethod
+    def from_config(cls, brackets: Sequence[dict]) -> "BracketSchedule":
+        """
+        Compile the engine's `config['tax_brackets']` format.
+
+        Each entry has `lower`, `upper` and `rate` as a fraction.
+        """
+        return cls(
+            ((b.get("lower", 0), b.get("upper"), b.get("rate", 0)) for b in brackets),
+            zero=0.0,
+        )
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+    def _band_index(self, income) -> int:
+        return bisect_right(self.lower_bounds, income) - 1
+
+    def tax_for(self, income):
+        """Return the tax owed on `income`."""
+        index = self._band_index(income)
+        if index < 0:
+            return self._zero
+        upper = self.upper_bounds[index]
+        if upper is not None and income > upper:
+            # Income falls in a gap between two bands
+            return self.cumulative[index + 1]
+        return self.cumulative[index] + (income - self.lower_bounds[index]) * self.rates[index]
+
+    def breakdown(self, income) -> List[Tuple[Any, Any]]:
+        """
+        Return `(rate, amount)` for every band that `income` reaches.
+
+        The last entry is the partial band containing `income`.
+        """
+        index = self._band_index(income)
+        bands = []
+        for position in range(index + 1):
+            lower = self.lower_bounds[position]
+            upper = self.upper_bounds[position]
+            top = income if upper is None or income < upper else upper
+            taxable_in_band = top - lower
+            if taxable_in_band > 0:
+                bands.append((self.rates[position], taxable_in_band * self.rates[position]))
+        return bands
+
+    def __len__(self) -> int:
+        return len(self.lower_bounds)
+
+
+#=============================================================================================
+# ------------ Shared schedule cache ---------------------------------------------------------
+_CACHE_SIZE = 256
+_cache: "OrderedDict[Hashable, BracketSchedule]" = OrderedDict()
+_cache_lock = Lock()
+
+
+def get_schedule(
+        kind: str,
+        rule_id: int,
+        updated_at: Any,
+        build: Callable[[], BracketSchedule]
+) -> BracketSchedule:
+    """
+    Return the compiled schedule for a rule version, building it on a miss.
+
+    Args:
+        kind: Rule family, e.g. "deduction" or "tax".
+        rule_id: DeductionType or Tax id.
+        updated_at: The rule's `updated_at`; a new value yields a new entry.
+        build: Callable compiling the schedule when it is not cached.
+
+    Returns:
+        The shared BracketSchedule instance.
+    """
+    key = (kind, rule_id, updated_at)
+    with _cache_lock:
+        schedule = _cache.get(key)
+        if schedule is not None:
+            _cache.move_to_end(key)
+            return schedule
+
+    return put_schedule(kind, rule_id, updated_at, build())
+
+
+def put_schedule(kind: str, rule_id: int, updated_at: Any, schedule: BracketSchedule) -> BracketSchedule:
+    """
+    Store a compiled schedule for a rule version, replacing any cached one.
+
+    Used by the rule cache, which recompiles a rule whenever its rule set
+    changes, even if a bracket edit left `updated_at` as it was.
+
+    Args:
+        kind: Rule family, e.g. "deduction" or "tax".
+        rule_id: DeductionType or Tax id.
+        updated_at: The rule's `updated_at`.
+        schedule: The compiled schedule.
+
+    Returns:
+        `schedule`.
+    """
+    key = (kind, rule_id, updated_at)
+    with _cache_lock:
+        _cache[key] = schedule
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return schedule
+
+
+def clear_schedule_cache() -> None:
+    """Drop every cached schedule."""
+    with _cache_lock:
+        _cache.clear()
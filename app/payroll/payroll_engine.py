@@ -5,7 +5,7 @@ Handles precise calculations for allowances, deductions, gross pay, net pay.
 """
 
 from decimal import Decimal, ROUND_HALF_UP
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Sequence
 from app.schemas.payroll_schema import (
     ResolvedPayrollInputs,
     PayrollResult,
@@ -19,6 +19,11 @@ from app.schemas.payroll_schema import (
     AllowanceItem,
 )
 from app.domain.exceptions.base import PayrollComputeError
+from app.payroll.bracket_schedule import BracketSchedule, get_schedule
+from pydantic import TypeAdapter
+
+
+_PAYROLL_RESULTS = TypeAdapter(List[PayrollResult])
 
 
 class PayrollEngine:
@@ -30,6 +35,7 @@ class PayrollEngine:
 
     def __init__(self, config: dict | None = None):
         self.config = config or {}
+        self._tax_schedule = None
 
     def compute(self, inputs):
         # If a simple PayrollInput is provided (legacy), delegate to compute_simple
@@ -134,6 +140,101 @@ class PayrollEngine:
         except Exception as e:
             raise PayrollComputeError(f"Failed to compute payroll: {str(e)}")
 
+    def compute_batch(self, inputs: Sequence[ResolvedPayrollInputs]) -> List[PayrollResult]:
+        """
+        Compute payroll for a whole pay period in one pass.
+
+        Base salary, allowances, overtime and deductions are laid out as
+        columns (one list per quantity, one slot per employee) and every
+        stage runs over the full column before the next one starts. Each
+        distinct deduction rule is prepared once per batch instead of once
+        per employee. Arithmetic is identical to `compute`, so both paths
+        produce exactly the same cents.
+        """
+        if not inputs:
+            return []
+
+        employee_id = None
+        try:
+            rows = range(len(inputs))
+
+            # --- Input columns ---
+            base = [item.base_salary for item in inputs]
+            allowances_total = [sum(a.amount for a in item.allowances) for item in inputs]
+            taxable_allowances = [
+                sum(a.amount for a in item.allowances if a.is_taxable) for item in inputs
+            ]
+            overtime_hours = [item.attendance.overtime_hours for item in inputs]
+
+            # --- Gross and taxable columns ---
+            gross = [base[i] + allowances_total[i] for i in rows]
+            for i in rows:
+                if overtime_hours[i] > 0:
+                    overtime_rate = base[i] / Decimal('160')
+                    gross[i] += overtime_hours[i] * overtime_rate * Decimal('1.5')
+            taxable = [base[i] + taxable_allowances[i] for i in rows]
+
+            # --- Deduction columns ---
+            # Rules are shared between employees, so evaluators are keyed by
+            # rule identity and built once for the whole batch.
+            evaluators = {}
+            deductions_total = [Decimal('0')] * len(inputs)
+            line_items = [[] for _ in rows]
+            tax_breakdown = [[] for _ in rows]
+            for i in rows:
+                employee_id = inputs[i].employee_id
+                for rule in inputs[i].statutory_deduction_rules:
+                    evaluate = evaluators.get(id(rule))
+                    if evaluate is None:
+                        evaluate = evaluators[id(rule)] = PayrollEngine._deduction_evaluator(rule)
+                    amount = evaluate(taxable[i])
+                    deductions_total[i] += amount
+                    line_items[i].append(
+                        {"code": rule.code, "description": rule.name, "amount": float(amount)}
+                    )
+                    if rule.code.upper() == 'PAYE':
+                        tax_breakdown[i].append(
+                            {"name": rule.name, "amount": float(amount), "rate": float(rule.rate or 0)}
+                        )
+            employee_id = None
+
+            for i in rows:
+                for code, description, value in (
+                    ('LOAN', 'Loan Repayment', inputs[i].loan.monthly_repayment),
+                    ('INSURANCE', 'Insurance Contribution', inputs[i].insurance.employee_contribution),
+                    ('PENSION', 'Pension Contribution', inputs[i].pension.employee_contribution),
+                ):
+                    if value > 0:
+                        deductions_total[i] += value
+                        line_items[i].append(
+                            {"code": code, "description": description, "amount": float(value)}
+                        )
+
+            # --- Results ---
+            # Validated in a single call rather than one model per employee.
+            return _PAYROLL_RESULTS.validate_python([
+                {
+                    "employee_id": inputs[i].employee_id,
+                    "period_start": inputs[i].period_start,
+                    "period_end": inputs[i].period_end,
+                    "gross_pay": float(gross[i]),
+                    "taxable_income": float(taxable[i]),
+                    "tax_total": sum(item["amount"] for item in tax_breakdown[i]),
+                    "tax_breakdown": tax_breakdown[i],
+                    "deductions_total": float(deductions_total[i]),
+                    "allowances_total": float(allowances_total[i]),
+                    "net_pay": float(gross[i] - deductions_total[i]),
+                    "employer_costs": float(gross[i]),
+                    "line_items": line_items[i],
+                    "audit": {"computed_at": "now"},
+                }
+                for i in rows
+            ])
+
+        except Exception as e:
+            where = f" for employee {employee_id}" if employee_id is not None else ""
+            raise PayrollComputeError(f"Failed to compute payroll batch{where}: {str(e)}")
+
     def compute_simple(self, payload: PayrollInput) -> PayrollResult:
         """
         Compute payroll for simple PayrollInput (backwards compatibility).
@@ -160,22 +261,10 @@ class PayrollEngine:
             tax_breakdown = []
             brackets = self.config.get('tax_brackets') if hasattr(self, 'config') else None
             if brackets:
-                remaining = taxable_income
-                for b in brackets:
-                    lower = b.get('lower', 0)
-                    upper = b.get('upper')
-                    rate = b.get('rate', 0)
-                    if upper is None:
-                        taxable_in_band = max(0, remaining)
-                    else:
-                        taxable_in_band = max(0, min(remaining, upper - lower))
-                    band_tax = taxable_in_band * rate
-                    if taxable_in_band > 0:
-                        tax_breakdown.append(TaxBreakdownItem(name=f"{int(rate*100)}% band", amount=band_tax, rate=rate*100))
-                    tax_total += band_tax
-                    remaining -= taxable_in_band
-                    if remaining <= 0:
-                        break
+                schedule = self._config_tax_schedule(brackets)
+                for rate, band_tax in schedule.breakdown(taxable_income):
+                    tax_breakdown.append(TaxBreakdownItem(name=f"{int(rate*100)}% band", amount=band_tax, rate=rate*100))
+                tax_total = schedule.tax_for(taxable_income)
             else:
                 # default: no tax
                 tax_total = 0.0
@@ -215,31 +304,58 @@ class PayrollEngine:
         except Exception as e:
             raise PayrollComputeError(f"Failed to compute payroll: {str(e)}")
 
+    def _config_tax_schedule(self, brackets: list) -> BracketSchedule:
+        """
+        Return the compiled schedule for `config['tax_brackets']`, built once per engine.
+        """
+        if self._tax_schedule is None or self._tax_schedule[0] is not brackets:
+            self._tax_schedule = (brackets, BracketSchedule.from_config(brackets))
+        return self._tax_schedule[1]
+
+    @staticmethod
+    def _bracket_schedule(rule: ResolvedDeductionRule) -> BracketSchedule:
+        """
+        Return the compiled bracket schedule for a tiered rule.
+
+        Versioned rules share one schedule per (rule id, updated_at) with
+        `TaxService`; rules without a version are compiled on the spot.
+        """
+        if rule.updated_at is None:
+            return BracketSchedule.from_brackets(rule.brackets)
+        return get_schedule(
+            rule.rule_source, rule.deduction_type_id, rule.updated_at,
+            lambda: BracketSchedule.from_brackets(rule.brackets),
+        )
+
+    @staticmethod
+    def _deduction_evaluator(rule: ResolvedDeductionRule) -> Callable[[Decimal], Decimal]:
+        """
+        Return a callable computing the deduction amount for `rule`.
+        """
+        if rule.has_brackets and rule.brackets:
+            return PayrollEngine._bracket_schedule(rule).tax_for
+        elif rule.rate:
+            factor = rule.rate / Decimal('100')
+            return lambda taxable_income: taxable_income * factor
+        elif rule.fixed_amount:
+            fixed_amount = rule.fixed_amount
+            return lambda taxable_income: fixed_amount
+        else:
+            return lambda taxable_income: Decimal('0')
+
     @staticmethod
     def _calculate_deduction_amount(rule: ResolvedDeductionRule, taxable_income: Decimal) -> Decimal:
         """
         Calculate deduction amount based on rule.
+
+        Tiered rules use marginal rates: each bracket's rate applies only to
+        the part of the income between its min and max amount.
         """
         if rule.has_brackets and rule.brackets:
-            # Tiered calculation
-            amount = Decimal('0')
-            remaining = taxable_income
-            for bracket in rule.brackets:
-                if remaining <= 0:
-                    break
-                bracket_min = bracket.get('min_amount', Decimal('0'))
-                bracket_max = bracket.get('max_amount')
-                rate = bracket.get('rate', Decimal('0'))
-                if bracket_max is None or remaining < bracket_max:
-                    taxable_in_bracket = remaining - bracket_min
-                else:
-                    taxable_in_bracket = bracket_max - bracket_min
-                amount += taxable_in_bracket * (rate / Decimal('100'))
-                remaining -= taxable_in_bracket
-            return amount
+            return PayrollEngine._bracket_schedule(rule).tax_for(taxable_income)
         elif rule.rate:
             return taxable_income * (rule.rate / Decimal('100'))
         elif rule.fixed_amount:
             return rule.fixed_amount
         else:
-            return Decimal('0')
\ No newline at end of file
+            return Decimal('0')
@@ -0,0 +1,275 @@
+"""
+Retroactive payroll recalculation.
+
+When a salary, allowance, deduction or tax rule changes with a past effective
+date, the payrolls already run for the affected periods are out of date.
+`RetroPayrollEngine` takes the changed effective ranges and:
+
+1. Finds the current settled (approved, processed or paid) payroll of every
+   (employee, period) pair the changes touch: one query per change, narrowed
+   to the employee, the position's holders or the payrolls paying the
+   allowance type. Deduction and tax changes affect everyone paid in the
+   range. Drafts are left to `PayrollBatchRunner.recompute_dirty`.
+2. Recomputes only those pairs, per period and in chunks, with the same
+   resolution and batch engine as a normal run. Salary timelines and the
+   compiled rules are loaded once for the whole run and shared across periods.
+3. Compares the new totals with the current version. Unchanged pairs are
+   left alone. Changed ones get a new `Payroll` version (`is_amended`,
+   `amendment_reason`) in the status and with the payment date of the
+   version it replaces, with full allowance and deduction lines, one `PayrollAdjustment` per changed total,
+   and the old version is marked reversed. Each chunk is its own transaction.
+
+The report gives the arrears per period and in total: the net (and gross)
+difference between what was paid and what should have been.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import PAYROLL_BATCH_CHUNK_SIZE
+from app.core.unit_of_work import UnitOfWork
+from app.db.database_setup import SessionLocal
+from app.domain.exceptions.base import ConflictError, DomainError
+from app.models.payroll_model import PayrollStatus
+from app.payroll.batch_runner import PayrollBatchRunner, _line_rows, compute_results
+from app.payroll.rule_cache import rules_for
+from app.payroll.salary_timeline import SalaryTimelineCache
+from app.schemas.payroll_schema import (
+    PayrollBatchFailure,
+    PayrollResult,
+    RetroChange,
+    RetroPayrollReport,
+    RetroPeriodReport,
+)
+from app.services.payroll_resolution_service import PayrollResolutionService
+
+logger = logging.getLogger(__name__)
+
+# Payroll totals compared between versions
+COMPONENTS = ("gross_salary", "total_allowances", "total_deductions", "tax_amount", "net_salary")
+
+Period = Tuple[date, date]
+
+
+@dataclass(frozen=True)
+class _Current:
+    """The version of a payroll in force when the run started."""
+    payroll_id: int
+    employee_id: int
+    period: Period
+    version: int
+    status: PayrollStatus
+    payment_date: date
+    totals: Dict[str, Decimal]
+
+
+def _change_filter(change: RetroChange) -> Dict[str, List[int]]:
+    return {
+        "employee_salary": {"employee_ids": [change.target_id]},
+        "position_salary": {"position_ids": [change.target_id]},
+        "allowance_type": {"allowance_type_ids": [change.target_id]},
+    }.get(change.kind, {})
+
+
+class RetroPayrollEngine:
+    """
+    Recomputes the payrolls affected by backdated changes and writes amended versions.
+
+    Runs in the calling process: a retro run recomputes only the dependent
+    (employee, period) pairs, which is far fewer than a full pay run.
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            chunk_size: int = PAYROLL_BATCH_CHUNK_SIZE,
+    ):
+        if chunk_size <= 0:
+            raise DomainError("Retro chunk size must be positive")
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+
+    def find_affected(self, uow: UnitOfWork, changes: Iterable[RetroChange]) -> List[_Current]:
+        """
+        Current settled payrolls whose period overlaps a change's effective range.
+
+        :return: One entry per (employee, period), ordered by period then employee
+        """
+        found: Dict[Tuple[int, Period], _Current] = {}
+        for change in changes:
+            if change.effective_to is not None and change.effective_to < change.effective_from:
+                raise DomainError("effective_to must not be before effective_from")
+            for payroll in uow.payroll_repo.find_current_payrolls(
+                    change.effective_from, change.effective_to, **_change_filter(change)):
+                key = (payroll.employee_id, (payroll.pay_period_start, payroll.pay_period_end))
+                if key in found and found[key].version >= (payroll.version or 1):
+                    continue
+                found[key] = _Current(
+                    payroll_id=payroll.id,
+                    employee_id=payroll.employee_id,
+                    period=key[1],
+                    version=payroll.version or 1,
+                    status=payroll.status,
+                    payment_date=payroll.payment_date,
+                    totals={name: Decimal(getattr(payroll, name)) for name in COMPONENTS},
+                )
+        return sorted(found.values(), key=lambda current: (current.period, current.employee_id))
+
+    def run(
+            self,
+            changes: Sequence[RetroChange],
+            user_id: int,
+            reason: str,
+            tax_ids: Sequence[int],
+    ) -> RetroPayrollReport:
+        """
+        Recompute every payroll affected by `changes` and amend the ones that differ.
+
+        :param changes: Backdated changes with their effective ranges
+        :param user_id: User recorded as `amended_by` and in the audit trail
+        :param reason: Stored as the amendment reason
+        :param tax_ids: Tax rules applied to every recomputed payroll, as in the original runs.
+            Payrolls do not record which taxes were applied, so they must be given
+        :return: Amended, unchanged and failed pairs, and arrears per period
+        :rtype: RetroPayrollReport
+        :raises DomainError: A tax change's tax is not in `tax_ids`, or taxed payrolls would be recomputed without tax
+        """
+        started = time.perf_counter()
+        untaxed = sorted({change.target_id for change in changes if change.kind == "tax"} - set(tax_ids))
+        if untaxed:
+            raise DomainError(f"Changed taxes {untaxed} must be in tax_ids to be applied")
+        db = self.session_factory()
+        try:
+            uow = UnitOfWork(db)
+            affected = self.find_affected(uow, changes)
+            if not tax_ids and any(current.totals["tax_amount"] for current in affected):
+                raise DomainError("The affected payrolls were taxed; pass the tax_ids their runs applied")
+            allowance_types = uow.payroll_repo.get_allowance_type_ids([current.payroll_id for current in affected])
+
+            # Employees of a period are recomputed together when they were paid the same allowance types
+            groups: Dict[Tuple[Period, Tuple[int, ...]], List[_Current]] = {}
+            for current in affected:
+                key = (current.period, tuple(allowance_types.get(current.payroll_id, ())))
+                groups.setdefault(key, []).append(current)
+
+            resolution = PayrollResolutionService(db)
+            timelines = SalaryTimelineCache(resolution.input_repo)
+            timelines.load(sorted({current.employee_id for current in affected}))
+            rules = rules_for(db)
+            periods: Dict[Period, RetroPeriodReport] = {}
+            for (period, types), items in sorted(groups.items()):
+                report = periods.setdefault(period, RetroPeriodReport(
+                    period_start=period[0], period_end=period[1], recomputed=0, amended=0, unchanged=0))
+                for start in range(0, len(items), self.chunk_size):
+                    chunk = items[start:start + self.chunk_size]
+                    errors: Dict[int, str] = {}
+                    inputs = resolution.resolve_many(
+                        [current.employee_id for current in chunk], *period,
+                        allowance_type_ids=types, tax_ids=tax_ids, errors=errors, salary_timelines=timelines,
+                        rules=rules,
+                    )
+                    results = compute_results(inputs, errors)
+                    by_employee = {item.employee_id: item for item in inputs}
+                    lines = {result.employee_id: _line_rows(by_employee[result.employee_id], result) for result in results}
+                    self._amend(uow, report, chunk, results, lines, errors, user_id, reason)
+        finally:
+            db.close()
+
+        reports = [periods[period] for period in sorted(periods)]
+        amended = sum(report.amended for report in reports)
+        failed = sum(len(report.failed) for report in reports)
+        elapsed = time.perf_counter() - started
+        arrears_net = sum((report.arrears_net for report in reports), Decimal("0.00"))
+        logger.info(
+            "Retro payroll: %d pairs, %d amended, %d failed, arrears %s in %.2fs",
+            len(affected), amended, failed, arrears_net, elapsed,
+        )
+        return RetroPayrollReport(
+            affected=len(affected),
+            amended=amended,
+            unchanged=sum(report.unchanged for report in reports),
+            failed=failed,
+            arrears_gross=sum((report.arrears_gross for report in reports), Decimal("0.00")),
+            arrears_net=arrears_net,
+            elapsed_seconds=elapsed,
+            periods=reports,
+        )
+
+    def _amend(
+            self,
+            uow: UnitOfWork,
+            report: RetroPeriodReport,
+            chunk: Sequence[_Current],
+            results: Sequence[PayrollResult],
+            lines: Dict[int, Tuple[List[dict], List[dict]]],
+            errors: Dict[int, str],
+            user_id: int,
+            reason: str,
+    ) -> None:
+        """Write the new versions of one chunk's changed payrolls in a single transaction."""
+        by_employee = {current.employee_id: current for current in chunk}
+        changed: List[Tuple[_Current, Dict[str, Any], Dict[str, Decimal]]] = []
+        for result in results:
+            current = by_employee[result.employee_id]
+            row = PayrollBatchRunner._payroll_row(result, current.payment_date, current.status)
+            deltas = {name: row[name] - current.totals[name] for name in COMPONENTS if row[name] != current.totals[name]}
+            if deltas:
+                changed.append((current, row, deltas))
+            else:
+                report.unchanged += 1
+        report.recomputed += len(results)
+
+        if changed:
+            try:
+                with uow:
+                    previous_ids = [current.payroll_id for current, _, _ in changed]
+                    if uow.payroll_repo.supersede(previous_ids) != len(previous_ids):
+                        raise ConflictError("Payrolls were amended by another run meanwhile; run the retro again")
+                    payroll_ids = uow.payroll_repo.bulk_create([
+                        {**row, "version": current.version + 1, "is_amended": True,
+                         "amendment_reason": reason, "amended_by": user_id}
+                        for current, row, _ in changed
+                    ])
+                    allowance_rows, deduction_rows, adjustment_rows = [], [], []
+                    for (current, row, deltas), payroll_id in zip(changed, payroll_ids):
+                        allowances, deductions = lines[current.employee_id]
+                        allowance_rows += [{**line, "payroll_id": payroll_id} for line in allowances]
+                        deduction_rows += [{**line, "payroll_id": payroll_id} for line in deductions]
+                        adjustment_rows += [
+                            {
+                                "payroll_id": payroll_id,
+                                "previous_payroll_id": current.payroll_id,
+                                "employee_id": current.employee_id,
+                                "component": name,
+                                "previous_amount": current.totals[name],
+                                "amount": row[name],
+                                "delta": delta,
+                                "reason": reason,
+                                "created_by": user_id,
+                            }
+                            for name, delta in deltas.items()
+                        ]
+                    uow.allowance_repo.bulk_create(allowance_rows)
+                    uow.deduction_repo.bulk_create(deduction_rows)
+                    uow.payroll_repo.bulk_create_adjustments(adjustment_rows)
+                    uow.audit_repo.log_action(user_id, "payroll_retro_chunk", {
+                        "period_start": report.period_start,
+                        "period_end": report.period_end,
+                        "employee_ids": [current.employee_id for current, _, _ in changed],
+                        "reason": reason,
+                    })
+            except Exception as e:
+                logger.exception("Failed to amend retro payrolls for %s..%s", report.period_start, report.period_end)
+                errors.update({current.employee_id: f"Failed to amend: {e}" for current, _, _ in changed})
+            else:
+                report.amended += len(changed)
+                report.arrears_gross += sum(deltas.get("gross_salary", 0) for _, _, deltas in changed)
+                report.arrears_net += sum(deltas.get("net_salary", 0) for _, _, deltas in changed)
+
+        report.failed += [PayrollBatchFailure(employee_id=k, error=v) for k, v in sorted(errors.items())]
@@ -0,0 +1,303 @@
+"""
+Versioned in-process cache of the payroll rules.
+
+Deduction types, tax rules and allowance types change a few times a year but
+are read by every payroll run and rule lookup. `RuleCache` keeps an immutable
+`RuleSet` snapshot of all three, compiled once: rows are copied into frozen
+dataclasses, bracket schedules are built, and the engine's
+`ResolvedDeductionRule` for each tax and statutory deduction is prepared.
+
+Every read costs one query on `rule_set_versions` (see `rule_version_model`).
+A rule set whose version moved since the snapshot was built is reloaded on
+its own; the others are reused. Writes bump the version in their own
+transaction, so a snapshot never outlives a committed change in any worker.
+Caches are kept per process and per database engine; use `rules_for(db)`.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.orm import Session
+
+from app.domain.enums import AllowanceStatus, DeductionStatus
+from app.models.rule_version_model import ALLOWANCES, DEDUCTIONS, TAXES, get_rule_versions
+from app.models.tax_model import TaxType
+from app.payroll.bracket_schedule import BracketSchedule, put_schedule
+from app.repositories.allowance_repo import AllowanceRepository
+from app.repositories.deduction_repo import DeductionRepository
+from app.repositories.payroll_input_repo import PayrollInputRepository
+from app.schemas.payroll_schema import ResolvedDeductionRule
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BracketRule:
+    id: Optional[int]
+    min_amount: Any
+    max_amount: Any
+    rate: Any
+    fixed_amount: Any = None
+
+
+@dataclass(frozen=True)
+class DeductionTypeRule:
+    id: int
+    name: str
+    code: str
+    is_statutory: Optional[bool]
+    is_taxable: Optional[bool]
+    has_brackets: Optional[bool]
+    status: Optional[DeductionStatus]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    brackets: Tuple[BracketRule, ...] = ()
+    schedule: Optional[BracketSchedule] = None
+    resolved: Optional[ResolvedDeductionRule] = None  # Engine rule; statutory deductions only
+
+
+@dataclass(frozen=True)
+class TaxRule:
+    id: int
+    tax_code: str
+    name: str
+    description: Optional[str]
+    tax_type: TaxType
+    annual_exemption: Any
+    max_annual_tax: Any
+    is_cumulative: Optional[bool]
+    effective_date: Optional[datetime]
+    expiry_date: Optional[datetime]
+    status: Any
+    is_mandatory: Optional[bool]
+    is_deductible: Optional[bool]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    brackets: Tuple[BracketRule, ...] = ()
+    schedule: Optional[BracketSchedule] = None
+    resolved: Optional[ResolvedDeductionRule] = None
+
+
+@dataclass(frozen=True)
+class AllowanceTypeRule:
+    id: int
+    code: str
+    name: str
+    description: Optional[str]
+    is_taxable: Optional[bool]
+    is_recurring: Optional[bool]
+    calculation_type: Any
+    percentage_of: Any
+    default_amount: Any
+    max_amount: Any
+    min_amount: Any
+    status: Optional[AllowanceStatus]
+    created_at: Optional[datetime]
+
+
+def _copy(cls: Type[T], row, **compiled) -> T:
+    """Copy a row's columns into a frozen rule."""
+    values = {f.name: getattr(row, f.name, None) for f in fields(cls) if f.name not in compiled}
+    return cls(**values, **compiled)
+
+
+def _bracket_dicts(brackets: Sequence[BracketRule]):
+    return [{"min_amount": b.min_amount, "max_amount": b.max_amount, "rate": b.rate} for b in brackets]
+
+
+def _schedule(kind: str, rule_id: int, updated_at, brackets: Sequence[BracketRule]) -> Optional[BracketSchedule]:
+    if not brackets:
+        return None
+    # Replace the engine's cached copy too, in case a bracket edit left updated_at unchanged
+    return put_schedule(kind, rule_id, updated_at, BracketSchedule.from_brackets(brackets))
+
+
+def compile_tax(tax) -> TaxRule:
+    """Copy a `Tax` row, with its brackets, into an immutable rule ready for the engine."""
+    brackets = tuple(_copy(BracketRule, b) for b in sorted(tax.brackets, key=lambda b: b.min_amount or 0))
+    return _copy(
+        TaxRule, tax,
+        brackets=brackets,
+        schedule=_schedule("tax", tax.id, tax.updated_at, brackets),
+        resolved=ResolvedDeductionRule(
+            deduction_type_id=tax.id,
+            name=tax.name,
+            code=tax.tax_code,
+            is_statutory=bool(tax.is_mandatory),
+            has_brackets=bool(brackets),
+            brackets=_bracket_dicts(brackets) or None,
+            fixed_amount=tax.max_annual_tax if tax.tax_type == TaxType.FIXED else None,
+            rule_source="tax",
+            updated_at=tax.updated_at,
+        ),
+    )
+
+
+def compile_deduction_type(deduction_type) -> DeductionTypeRule:
+    """Copy a `DeductionType` row, with its brackets, into an immutable rule."""
+    brackets = tuple(
+        _copy(BracketRule, b) for b in sorted(deduction_type.brackets, key=lambda b: b.min_amount or 0)
+    )
+    resolved = None
+    if deduction_type.is_statutory:
+        resolved = ResolvedDeductionRule(
+            deduction_type_id=deduction_type.id,
+            name=deduction_type.name,
+            code=deduction_type.code,
+            is_statutory=True,
+            has_brackets=bool(deduction_type.has_brackets and brackets),
+            brackets=_bracket_dicts(brackets) or None,
+            rule_source="deduction",
+            updated_at=deduction_type.updated_at,
+        )
+    return _copy(
+        DeductionTypeRule, deduction_type,
+        brackets=brackets,
+        schedule=_schedule("deduction", deduction_type.id, deduction_type.updated_at, brackets),
+        resolved=resolved,
+    )
+
+
+def compile_allowance_type(allowance_type) -> AllowanceTypeRule:
+    return _copy(AllowanceTypeRule, allowance_type)
+
+
+class RuleSet:
+    """
+    Immutable snapshot of the payroll rules.
+
+    Attributes:
+        versions: Rule set versions the snapshot was built from.
+        deduction_types: Deduction types by id, in id order.
+        taxes: Tax rules by id, in id order.
+        allowance_types: Allowance types by id, in id order.
+        statutory_deductions: Active statutory deduction types, in id order.
+    """
+
+    __slots__ = ("versions", "deduction_types", "taxes", "allowance_types", "statutory_deductions")
+
+    def __init__(
+            self,
+            deduction_types: Iterable[DeductionTypeRule],
+            taxes: Iterable[TaxRule],
+            allowance_types: Iterable[AllowanceTypeRule],
+            versions: Optional[Mapping[str, int]] = None,
+    ):
+        self.versions: Mapping[str, int] = MappingProxyType(dict(versions or {}))
+        self.deduction_types = _by_id(deduction_types)
+        self.taxes = _by_id(taxes)
+        self.allowance_types = _by_id(allowance_types)
+        self.statutory_deductions: Tuple[DeductionTypeRule, ...] = tuple(
+            rule for rule in self.deduction_types.values()
+            if rule.is_statutory and rule.status in (None, DeductionStatus.ACTIVE)
+        )
+
+    @classmethod
+    def from_rows(cls, deduction_types=(), taxes=(), allowance_types=(), versions=None) -> "RuleSet":
+        """Compile ORM rows into a snapshot."""
+        return cls(
+            [compile_deduction_type(row) for row in deduction_types],
+            [compile_tax(row) for row in taxes],
+            [compile_allowance_type(row) for row in allowance_types],
+            versions,
+        )
+
+    def taxes_for(self, tax_ids: Iterable[int]) -> Tuple[TaxRule, ...]:
+        """Tax rules in the order given; unknown ids are skipped."""
+        return tuple(self.taxes[tax_id] for tax_id in dict.fromkeys(tax_ids) if tax_id in self.taxes)
+
+    def allowance_types_for(self, allowance_type_ids: Iterable[int]) -> Tuple[AllowanceTypeRule, ...]:
+        """Allowance types in the order given; unknown ids are skipped."""
+        return tuple(
+            self.allowance_types[type_id] for type_id in dict.fromkeys(allowance_type_ids)
+            if type_id in self.allowance_types
+        )
+
+    def engine_rules(self, tax_ids: Iterable[int]) -> List[ResolvedDeductionRule]:
+        """The engine's deduction rules: the given taxes, then the statutory deductions."""
+        return [rule.resolved for rule in self.taxes_for(tax_ids)] + [
+            rule.resolved for rule in self.statutory_deductions
+        ]
+
+
+def _by_id(rules: Iterable[T]) -> Mapping[int, T]:
+    return MappingProxyType({rule.id: rule for rule in sorted(rules, key=lambda rule: rule.id)})
+
+
+class RuleCache:
+    """
+    Latest `RuleSet` of one database, reloaded per rule set as versions move.
+
+    Thread-safe; concurrent misses may load twice, and the newest snapshot wins.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._snapshot: Optional[RuleSet] = None
+
+    def rules(self, db: Session) -> RuleSet:
+        """
+        Return the rules as of `db`'s view of the rule set versions.
+
+        :param db: Session to read versions, and changed rule sets, through
+        :return: A shared snapshot; never mutate it
+        """
+        versions = get_rule_versions(db)
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is not None and dict(snapshot.versions) == versions:
+            return snapshot
+
+        stale = {name for name in versions if snapshot is None or snapshot.versions.get(name) != versions[name]}
+        # Versions are read before the rules, so a write racing the load only makes the snapshot newer
+        fresh = RuleSet(
+            self._load_deductions(db) if DEDUCTIONS in stale else snapshot.deduction_types.values(),
+            self._load_taxes(db) if TAXES in stale else snapshot.taxes.values(),
+            self._load_allowances(db) if ALLOWANCES in stale else snapshot.allowance_types.values(),
+            versions,
+        )
+        with self._lock:
+            current = self._snapshot
+            if current is None or all(versions[name] >= current.versions.get(name, 0) for name in versions):
+                self._snapshot = fresh
+        return fresh
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    @staticmethod
+    def _load_deductions(db: Session):
+        return [compile_deduction_type(row) for row in DeductionRepository(db).get_all_deduction_types(with_brackets=True)]
+
+    @staticmethod
+    def _load_taxes(db: Session):
+        return [compile_tax(row) for row in PayrollInputRepository(db).get_all_tax_rules()]
+
+    @staticmethod
+    def _load_allowances(db: Session):
+        return [compile_allowance_type(row) for row in AllowanceRepository(db).get_all_allowance_types(active_only=False)]
+
+
+_caches: "WeakKeyDictionary[Any, RuleCache]" = WeakKeyDictionary()
+_caches_lock = Lock()
+
+
+def rule_cache_for(db: Session) -> RuleCache:
+    """The process-wide rule cache of the database `db` is bound to."""
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _caches_lock:
+        cache = _caches.get(engine)
+        if cache is None:
+            cache = _caches[engine] = RuleCache()
+        return cache
+
+
+def rules_for(db: Session) -> RuleSet:
+    """Shortcut for `rule_cache_for(db).rules(db)`."""
+    return rule_cache_for(db).rules(db)
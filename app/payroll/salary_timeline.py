@@ -0,0 +1,173 @@
+"""
+Effective-dated salary timelines.
+
+A timeline holds one employee's (or one position's) salary history as sorted
+`(effective_from, effective_to, amount)` intervals, so the salary in effect
+on a date or during a pay period is one binary search instead of a query.
+`SalaryTimelineCache` loads the timelines of a whole cohort with one query
+per table and keeps them for its own lifetime; retro-pay and batch runs that
+resolve many periods per employee create one per run. A cache kept for
+longer subscribes to an invalidation bus, which drops the timelines whose
+salaries other workers change.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, time
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from app.models.cache_invalidation_model import EMPLOYEE_SALARY, POSITION_SALARY, InvalidationEvent
+
+Interval = Tuple[Optional[datetime], Optional[datetime], Any]  # (effective_from, effective_to, amount)
+
+
+class SalaryTimeline:
+    """
+    Immutable salary history of one employee or position.
+
+    Attributes:
+        starts: Sorted `effective_from` of every interval (`datetime.min` when unset).
+        ends: `effective_to` of every interval (None while open-ended).
+        amounts: Salary amount of every interval.
+    """
+
+    __slots__ = ("starts", "ends", "amounts")
+
+    def __init__(self, intervals: Iterable[Interval]):
+        """Build a timeline from `(effective_from, effective_to, amount)` intervals, in any order."""
+        # Stable sort: of two intervals starting together, the one given last wins, like the newest row
+        ordered = sorted(
+            ((start or datetime.min, end, amount) for start, end, amount in intervals),
+            key=lambda interval: interval[0],
+        )
+        self.starts: Tuple[datetime, ...] = tuple(interval[0] for interval in ordered)
+        self.ends: Tuple[Optional[datetime], ...] = tuple(interval[1] for interval in ordered)
+        self.amounts: Tuple[Any, ...] = tuple(interval[2] for interval in ordered)
+
+    def amount_during(self, start: datetime, end: datetime) -> Optional[Any]:
+        """
+        Return the amount of the latest-starting interval that overlaps `[start, end]`.
+
+        Same choice as the period queries of `PayrollInputRepository`:
+        `effective_from <= end`, `effective_to` unset or `>= start`, newest first.
+        """
+        index = bisect_right(self.starts, end) - 1
+        while index >= 0:
+            effective_to = self.ends[index]
+            if effective_to is None or effective_to >= start:
+                return self.amounts[index]
+            index -= 1  # Ended before the period; an older open interval may still cover it
+        return None
+
+    def amount_on(self, when) -> Optional[Any]:
+        """Return the amount in effect at a moment, or at any time on a date."""
+        if isinstance(when, datetime):
+            return self.amount_during(when, when)
+        return self.amount_during(datetime.combine(when, time.min), datetime.combine(when, time.max))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+_EMPTY = SalaryTimeline(())
+
+
+class SalaryTimelineCache:
+    """
+    Salary timelines of employees and positions, loaded in bulk on first use.
+
+    Employee-specific salaries take precedence; employees without one fall
+    back to their position's salary, as in payroll resolution.
+    """
+
+    def __init__(self, repo):
+        """
+        Args:
+            repo: Provides `get_employee_salary_history(employee_ids)` and
+                `get_position_salary_history(position_ids)`, each returning
+                `{id: [(effective_from, effective_to, amount), ...]}`, e.g.
+                `PayrollInputRepository`.
+        """
+        self.repo = repo
+        self._employees: Dict[int, SalaryTimeline] = {}
+        self._positions: Dict[int, SalaryTimeline] = {}
+
+    def load(self, employee_ids: Sequence[int], position_ids: Sequence[int] = ()) -> None:
+        """Fetch the timelines not cached yet, with one query per table."""
+        self._fill(self._employees, employee_ids, self.repo.get_employee_salary_history)
+        self._fill(self._positions, position_ids, self.repo.get_position_salary_history)
+
+    @staticmethod
+    def _fill(cache: Dict[int, SalaryTimeline], ids: Sequence[int], fetch) -> None:
+        missing = sorted({key for key in ids if key is not None and key not in cache})
+        if not missing:
+            return
+        history = fetch(missing)
+        for key in missing:
+            intervals = history.get(key)
+            cache[key] = SalaryTimeline(intervals) if intervals else _EMPTY
+
+    def employee(self, employee_id: int) -> SalaryTimeline:
+        if employee_id not in self._employees:
+            self.load([employee_id])
+        return self._employees[employee_id]
+
+    def position(self, position_id: int) -> SalaryTimeline:
+        if position_id not in self._positions:
+            self.load((), [position_id])
+        return self._positions[position_id]
+
+    def amount_during(self, employee_id: int, position_id: Optional[int], start: datetime, end: datetime):
+        """Salary of an employee during `[start, end]`, falling back to the position's; None if neither."""
+        amount = self.employee(employee_id).amount_during(start, end)
+        if amount is None and position_id is not None:
+            amount = self.position(position_id).amount_during(start, end)
+        return amount
+
+    def amount_on(self, employee_id: int, position_id: Optional[int], when) -> Optional[Any]:
+        """Salary of an employee at a moment or on a date, falling back to the position's."""
+        amount = self.employee(employee_id).amount_on(when)
+        if amount is None and position_id is not None:
+            amount = self.position(position_id).amount_on(when)
+        return amount
+
+    def invalidate_employee(self, employee_id: int) -> None:
+        """Drop an employee's timeline so the next lookup reloads it."""
+        self._employees.pop(employee_id, None)
+
+    def invalidate_position(self, position_id: int) -> None:
+        """Drop a position's timeline so the next lookup reloads it."""
+        self._positions.pop(position_id, None)
+
+    def clear(self) -> None:
+        self._employees.clear()
+        self._positions.clear()
+
+    def subscribe(self, bus) -> Callable[[], None]:
+        """
+        Drop timelines as salary invalidation events arrive on `bus`.
+
+        Args:
+            bus: An `InvalidationBus`.
+
+        Returns:
+            A callable that unsubscribes the cache.
+        """
+        def employee_changed(invalidation: InvalidationEvent) -> None:
+            if invalidation.entity_id is None:
+                self._employees.clear()
+            else:
+                self.invalidate_employee(invalidation.entity_id)
+
+        def position_changed(invalidation: InvalidationEvent) -> None:
+            if invalidation.entity_id is None:
+                self._positions.clear()
+            else:
+                self.invalidate_position(invalidation.entity_id)
+
+        unsubscribers = (bus.subscribe(EMPLOYEE_SALARY, employee_changed), bus.subscribe(POSITION_SALARY, position_changed))
+
+        def unsubscribe() -> None:
+            for unsubscriber in unsubscribers:
+                unsubscriber()
+
+        return unsubscribe
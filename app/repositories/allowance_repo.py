@@ -1,7 +1,8 @@
 """Repository for managing Allowance and AllowanceType entities in the database."""
 from sqlalchemy.orm import Session
 from app.models.allowances_model import Allowance, AllowanceType
-from typing import Optional, List
+from typing import Any, Optional, List, Mapping, Sequence, Union
+from app.utils.bulk_insert import bulk_insert
 from app.domain.enums import AllowanceStatus
 
 
@@ -31,6 +32,19 @@ class AllowanceRepository:
         self.db.add(allowance)
         return allowance
 
+    def bulk_create(
+            self,
+            rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]],
+            columns: Optional[Sequence[str]] = None
+    ) -> None:
+        """Insert many allowance line rows in one statement.
+        
+        Args:
+            rows: Column-value dicts, or tuples ordered like `columns`.
+            columns: Column names for tuple rows.
+        """
+        bulk_insert(self.db, Allowance, rows, columns=columns)
+
     def update_allowance(self, allowance: Allowance) -> Allowance:
         """Update an existing allowance record.
         
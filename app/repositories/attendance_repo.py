@@ -1,9 +1,39 @@
 """Repository for managing Attendance records in the database."""
+from sqlalchemy import and_, case, func, inspect, or_, select, tuple_, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, timedelta
 from app.models.attendance_model import Attendance
-from typing import Optional
+from app.models.attendance_summary_model import (
+    COUNTERS,
+    AttendanceMonthlySummary,
+    apply_attendance_deltas,
+    contribution,
+    month_of,
+)
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 from app.domain.enums import AttendanceStatus
+from app.schemas.attendance_schema import AttendancePeriodSummary
+from app.utils.bulk_insert import IN_BATCH_SIZE, dialect_insert
+
+EmployeeDay = Tuple[int, date]  # (employee id, attendance date)
+
+
+def _daily_contributions():
+    """Daily rows as summary counters; must match `attendance_summary_model.contribution`."""
+    checked_out = Attendance.check_out.isnot(None)
+    approved = Attendance.approved == AttendanceStatus.APPROVED
+    hours = {
+        "regular_hours": func.coalesce(Attendance.regular_hours, 0),
+        "overtime_hours": func.coalesce(Attendance.overtime_hours, 0),
+        "hours_worked": func.coalesce(Attendance.hours_worked, 0),
+    }
+    columns = [case((checked_out, 1), else_=0).label("worked_days")]
+    columns += [case((checked_out, value), else_=0).label(name) for name, value in hours.items()]
+    columns += [case((approved, 1), else_=0).label("approved_days")]
+    columns += [case((approved, value), else_=0).label(f"approved_{name}") for name, value in hours.items()]
+    return columns
 
 
 class AttendanceRepository:
@@ -32,6 +62,94 @@ class AttendanceRepository:
         self.db.add(attendance)
         return attendance
     
+    def insert_if_absent(self, attendance: Attendance) -> Optional[Attendance]:
+        """Insert a new attendance record unless the employee already has one that day.
+        
+        The unique (employee_id, attendance_date) index decides, through
+        `INSERT ... ON CONFLICT DO NOTHING`, instead of a read before the
+        write. Two concurrent check-ins for the same day cannot both succeed.
+        
+        Args:
+            attendance: New, unsaved Attendance instance with its date set.
+            
+        Returns:
+            The stored Attendance instance, or None if that day was already recorded.
+        """
+        values = {
+            column.key: getattr(attendance, column.key)
+            for column in inspect(Attendance).column_attrs
+            if column.key != "id" and getattr(attendance, column.key) is not None
+        }
+        statement = dialect_insert(self.db.get_bind(), Attendance)
+        if statement is None:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(attendance)
+                return attendance
+            except IntegrityError:
+                return None
+
+        attendance_id = self.db.execute(
+            statement.values(values)
+            .on_conflict_do_nothing(index_elements=["employee_id", "attendance_date"])
+            .returning(Attendance.id)
+        ).scalar()
+        if attendance_id is None:
+            return None
+        # Bypassed the ORM, so keep the monthly summary current by hand (a plain check-in adds nothing)
+        apply_attendance_deltas(self.db.connection(), {
+            (attendance.employee_id, month_of(attendance.attendance_date)): contribution(
+                attendance.check_out, attendance.approved, attendance.regular_hours,
+                attendance.overtime_hours, attendance.hours_worked),
+        })
+        return self.db.get(Attendance, attendance_id)
+    
+    def bulk_insert_if_absent(self, rows: Sequence[Mapping[str, Any]]) -> Dict[EmployeeDay, int]:
+        """Insert many new attendance records, skipping employee-days already recorded.
+        
+        One multi-row `INSERT ... ON CONFLICT DO NOTHING RETURNING` per call
+        on PostgreSQL and SQLite; a savepoint per row elsewhere. Monthly
+        summaries of the inserted rows are updated by hand, as the ORM is
+        bypassed.
+        
+        Args:
+            rows: Attendance column values; every row needs `employee_id` and
+                `attendance_date`, and all rows must have the same keys.
+            
+        Returns:
+            Mapping of (employee_id, attendance_date) to the new record's id,
+            for the rows that were inserted.
+        """
+        if not rows:
+            return {}
+        statement = dialect_insert(self.db.get_bind(), Attendance)
+        if statement is None:
+            inserted = {}
+            for values in rows:
+                attendance = self.insert_if_absent(Attendance(**values))
+                if attendance is not None:
+                    self.db.flush()
+                    inserted[(attendance.employee_id, attendance.attendance_date)] = attendance.id
+            return inserted
+
+        result = self.db.execute(
+            statement.values(list(rows))
+            .on_conflict_do_nothing(index_elements=["employee_id", "attendance_date"])
+            .returning(Attendance.id, Attendance.employee_id, Attendance.attendance_date)
+        )
+        inserted = {(employee_id, day): attendance_id for attendance_id, employee_id, day in result}
+        deltas: Dict[Tuple[int, date], Dict[str, float]] = {}
+        for values in rows:
+            if (values["employee_id"], values["attendance_date"]) not in inserted:
+                continue
+            totals = deltas.setdefault((values["employee_id"], month_of(values["attendance_date"])), {})
+            for name, value in contribution(
+                    values.get("check_out"), values.get("approved", AttendanceStatus.PENDING),
+                    values.get("regular_hours"), values.get("overtime_hours"), values.get("hours_worked")).items():
+                totals[name] = totals.get(name, 0) + value
+        apply_attendance_deltas(self.db.connection(), deltas)
+        return inserted
+    
     def update_attendance(self, attendance: Attendance) -> Attendance:
         """Update an existing attendance record.
         
@@ -93,6 +211,98 @@ class AttendanceRepository:
             .first()
         )
 
+    def get_by_employee_days(self, keys: Iterable[EmployeeDay]) -> Dict[EmployeeDay, Attendance]:
+        """Retrieve the attendance records of many employee-days at once.
+        
+        Looks the pairs up with `(employee_id, attendance_date) IN (...)`
+        queries of at most `IN_BATCH_SIZE` pairs, served by the unique index.
+        
+        Args:
+            keys: (employee_id, attendance_date) pairs.
+            
+        Returns:
+            Mapping of (employee_id, attendance_date) to the stored record, for the pairs that have one.
+        """
+        keys = sorted(set(keys))
+        found: Dict[EmployeeDay, Attendance] = {}
+        pair = tuple_(Attendance.employee_id, Attendance.attendance_date)
+        for start in range(0, len(keys), IN_BATCH_SIZE):
+            for attendance in self.db.query(Attendance).filter(pair.in_(keys[start:start + IN_BATCH_SIZE])):
+                found[(attendance.employee_id, attendance.attendance_date)] = attendance
+        return found
+
+    def get_pending_approvals(self, limit: int = 100, after: Optional[Tuple[date, int]] = None) -> List[Attendance]:
+        """Retrieve attendance records awaiting approval, oldest first.
+        
+        Served by the partial index on pending rows, so the queue stays fast
+        however much approved history accumulates.
+        
+        Args:
+            limit: Maximum number of records to return.
+            after: (attendance_date, id) of the last record of the previous page.
+            
+        Returns:
+            Pending Attendance instances ordered by date, then id.
+        """
+        query = self.db.query(Attendance).filter(Attendance.approved == AttendanceStatus.PENDING)
+        if after is not None:
+            after_date, after_id = after
+            query = query.filter(or_(
+                Attendance.attendance_date > after_date,
+                and_(Attendance.attendance_date == after_date, Attendance.id > after_id),
+            ))
+        return query.order_by(Attendance.attendance_date, Attendance.id).limit(limit).all()
+
+    def summarize_period(
+            self,
+            employee_ids: Sequence[int],
+            period_start: date,
+            period_end: date,
+    ) -> Dict[int, AttendancePeriodSummary]:
+        """Aggregate attendance per employee over a period with one GROUP BY.
+        
+        Months the period covers entirely are read from the maintained
+        `attendance_monthly_summaries` by primary key. Only the days of a
+        partly covered first or last month are read from the daily rows.
+        
+        Args:
+            employee_ids: Employees to summarize.
+            period_start: First day of the period.
+            period_end: Last day of the period.
+            
+        Returns:
+            Mapping of employee id to totals; employees without attendance are left out.
+        """
+        employee_ids = sorted(set(employee_ids))
+        if not employee_ids or period_end < period_start:
+            return {}
+        first_full = period_start if period_start.day == 1 else month_of(month_of(period_start) + timedelta(days=31))
+        after_full = month_of(period_end + timedelta(days=1))
+
+        in_cohort = Attendance.employee_id.in_(employee_ids)
+        if first_full >= after_full:
+            parts = [
+                select(Attendance.employee_id, *_daily_contributions())
+                .where(in_cohort, Attendance.attendance_date.between(period_start, period_end))
+            ]
+        else:
+            summary = AttendanceMonthlySummary
+            parts = [
+                select(summary.employee_id, *(getattr(summary, name) for name in COUNTERS))
+                .where(summary.employee_id.in_(employee_ids), summary.month >= first_full, summary.month < after_full),
+                select(Attendance.employee_id, *_daily_contributions())
+                .where(in_cohort, or_(
+                    and_(Attendance.attendance_date >= period_start, Attendance.attendance_date < first_full),
+                    and_(Attendance.attendance_date >= after_full, Attendance.attendance_date <= period_end),
+                )),
+            ]
+        combined = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+        rows = self.db.execute(
+            select(combined.c.employee_id, *(func.sum(combined.c[name]).label(name) for name in COUNTERS))
+            .group_by(combined.c.employee_id)
+        ).mappings()
+        return {row["employee_id"]: AttendancePeriodSummary(**row) for row in rows}
+
     def delete_attendance(self, attendance: Attendance) -> None:
         """Delete an attendance record from the database.
         
@@ -101,3 +311,48 @@ class AttendanceRepository:
         """
         self.db.delete(attendance)
 
+
+class AsyncAttendanceRepository:
+    """Read-only attendance lookups on an `AsyncSession`, for routes that run on the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the repository.
+
+        Args:
+            db: SQLAlchemy async session for database operations.
+        """
+        self.db = db
+
+    async def get_latest_attendance(self, employee_id: int) -> Optional[Attendance]:
+        """Retrieve the latest attendance record for an employee.
+
+        Args:
+            employee_id: The employee's ID.
+
+        Returns:
+            Most recent Attendance instance for the employee, or None if not found.
+        """
+        result = await self.db.execute(
+            select(Attendance)
+            .where(Attendance.employee_id == employee_id)
+            .order_by(Attendance.attendance_date.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def get_by_employee_and_date(self, employee_id: int, attendance_date: date) -> Optional[Attendance]:
+        """Retrieve attendance record for a specific employee and date.
+
+        Args:
+            employee_id: The employee's ID.
+            attendance_date: The date of attendance.
+
+        Returns:
+            Attendance instance if found for that date, None otherwise.
+        """
+        result = await self.db.execute(
+            select(Attendance)
+            .where(Attendance.employee_id == employee_id, Attendance.attendance_date == attendance_date)
+            .limit(1)
+        )
+        return result.scalars().first()
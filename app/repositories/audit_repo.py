@@ -1,47 +1,243 @@
 """Repository for managing Audit Log entities in the database."""
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, delete, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from app.core import audit_policy, audit_sink
+from app.core.audit_sink import AuditEvent, AuditSink
+from app.core.audit_policy import AuditPolicy, ReadAuditCounters, ReadSummary
+from app.db.audit_partitions import LIST_SQLITE_PARTITIONS, overlapping, partition_table
+from app.domain.exceptions.base import InvalidCursorError
 from app.models.audit_model import AuditLog
-from typing import List
+from app.utils.bulk_insert import bulk_insert
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple, Union
+import base64
+import binascii
 import json
 
+# A page of logs, newest first, and the cursor for the next page (None on the last page)
+AuditLogPage = Tuple[List[AuditLog], Optional[str]]
+
+_TICK = timedelta(microseconds=1)
+
+
+def encode_cursor(log: AuditLog) -> str:
+    """Opaque cursor pointing just past `log` in (timestamp, id) descending order."""
+    raw = f"{log.timestamp.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of `encode_cursor`; raises InvalidCursorError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, log_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError() from e
+
+
+def _conditions(columns, key: Optional[Tuple[datetime, int]], user_id, action, since, until) -> list:
+    conditions = []
+    if user_id is not None:
+        conditions.append(columns.user_id == user_id)
+    if action is not None:
+        conditions.append(columns.action == action)
+    if since is not None:
+        conditions.append(columns.timestamp >= since)
+    if until is not None:
+        conditions.append(columns.timestamp < until)
+    if key is not None:
+        # The plain bound lets the planner skip partitions newer than the cursor
+        conditions.append(columns.timestamp <= key[0])
+        conditions.append(tuple_(columns.timestamp, columns.id) < key)
+    return conditions
+
+
+def _logs_query(
+        partitions: Sequence[str],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+) -> Select:
+    """Logs newest first, read from ``audit_logs`` and the month tables that overlap the time range.
+
+    `partitions` lists the SQLite month tables; it is empty on PostgreSQL, where
+    ``audit_logs`` is partitioned natively and the planner prunes partitions itself.
+    """
+    key = decode_cursor(cursor) if cursor is not None else None
+    filters = (key, user_id, action, since, until)
+    upper = until
+    if key is not None:
+        upper = min(until, key[0] + _TICK) if until is not None else key[0] + _TICK
+    tables = [partition_table(name) for name in overlapping(partitions, since, upper)]
+    if not tables:
+        stmt = select(AuditLog).where(*_conditions(AuditLog, *filters))
+        stmt = stmt.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+        return stmt.limit(limit) if limit is not None else stmt
+
+    branches = []
+    for table in [AuditLog.__table__, *tables]:
+        branch = select(*table.c).where(*_conditions(table.c, *filters))
+        if limit is not None:
+            # Each table contributes at most one page; SQLite only allows LIMIT in a subquery of a UNION
+            branch = branch.order_by(table.c.timestamp.desc(), table.c.id.desc()).limit(limit)
+        branches.append(select(branch.subquery()))
+    logs = aliased(AuditLog, union_all(*branches).subquery("audit_logs_all"), adapt_on_names=True)
+    stmt = select(logs).order_by(logs.timestamp.desc(), logs.id.desc())
+    return stmt.limit(limit) if limit is not None else stmt
+
+
+def _to_page(logs: Sequence[AuditLog], limit: int) -> AuditLogPage:
+    if len(logs) > limit:
+        logs = logs[:limit]
+        return list(logs), encode_cursor(logs[-1])
+    return list(logs), None
+
 
 class AuditRepository:
     """Repository for audit log database operations.
     
     Handles creation and retrieval of audit logs for tracking user actions
-    and maintaining an immutable audit trail.
+    and maintaining an immutable audit trail. Writes are always recorded;
+    reads go through `log_read` and are handled by the `AuditPolicy`.
     """
-    def __init__(self, db: Session):
+    def __init__(
+            self,
+            db: Session,
+            policy: Optional[AuditPolicy] = None,
+            counters: Optional[ReadAuditCounters] = None,
+            sink: Optional[AuditSink] = None,
+    ):
         """Initialize the audit repository.
         
         Args:
             db: SQLAlchemy session for database operations.
+            policy: Read audit policy; defaults to the configured one.
+            counters: Read counters for the aggregate policy; defaults to the process-wide ones.
+            sink: Audit sink for writes; defaults to the process-wide one while it is running.
         """
         self.db = db
+        self.policy = policy or audit_policy.default_policy
+        self.counters = counters if counters is not None else audit_policy.read_counters
+        self.sink = sink if sink is not None else audit_sink.active_sink()
 
-    def log_action(self, user_id: int, action: str, metadata: dict = None) -> AuditLog:
+    def log_action(self, user_id: int, action: str, metadata: Union[dict, str, None] = None) -> Optional[AuditLog]:
         """Log a user action to the audit trail.
+
+        While the process-wide `AuditSink` is running, the event is held until
+        this session commits and then written in the background; nothing is
+        added to the session. Otherwise (scripts, workers, tests) the row is
+        added to the session directly.
         
         Args:
             user_id: The ID of the user performing the action.
             action: Description of the action performed.
-            metadata: Optional dictionary containing additional information about the action.
+            metadata: Optional dictionary (stored as JSON) or string with additional information.
             
         Returns:
-            The created AuditLog instance.
+            The AuditLog instance added to the session, or None when the sink takes the event.
         """
-        metadata_str = json.dumps(metadata) if metadata else None
-        log = AuditLog(user_id=user_id, action=action, metadata=metadata_str)
+        if metadata is None or isinstance(metadata, str):
+            metadata_str = metadata
+        else:
+            metadata_str = json.dumps(metadata, default=str)
+        if self.sink is not None:
+            audit_sink.defer_until_commit(self.db, self.sink, AuditEvent(user_id, action, metadata_str))
+            return None
+        log = AuditLog(user_id=user_id, action=action, meta_data=metadata_str)
         self.db.add(log)
         return log
 
+    def log_read(self, user_id: int, action: str, resource: str, metadata: Optional[dict] = None) -> Optional[AuditLog]:
+        """Record a read event according to the audit policy.
+
+        Only the ``record`` policy and sampled reads add a row to the session;
+        the default ``aggregate`` policy just increments an in-memory counter.
+
+        Args:
+            user_id: The ID of the user the read is attributed to.
+            action: Kind of read, e.g. ``employee_read``.
+            resource: What was read, e.g. ``employee:42``.
+            metadata: Optional extra information for recorded rows.
+
+        Returns:
+            The AuditLog instance if a row was added, None otherwise.
+        """
+        mode = self.policy.read_mode
+        if mode == "aggregate":
+            self.counters.increment(user_id, action, resource)
+            return None
+        if mode == "record" or (mode == "sample" and self.policy.sampled()):
+            details = {"resource": resource, **(metadata or {})}
+            if mode == "sample":
+                details["sample_rate"] = self.policy.sample_rate
+            return self.log_action(user_id, action, details)
+        return None
+
+    def add_read_summaries(self, summaries: Sequence[ReadSummary]) -> int:
+        """Insert one audit row per aggregated read window.
+
+        Args:
+            summaries: Drained read counters.
+
+        Returns:
+            Number of rows inserted.
+        """
+        if not summaries:
+            return 0
+        bulk_insert(self.db, AuditLog, [
+            {
+                "user_id": summary.user_id,
+                "action": summary.action,
+                "timestamp": summary.window_end,
+                "meta_data": json.dumps(summary.as_metadata()),
+            }
+            for summary in summaries
+        ])
+        return len(summaries)
+
     def get_all_logs(self) -> List[AuditLog]:
         """Retrieve all audit logs ordered by most recent first.
         
         Returns:
             List of all AuditLog instances in reverse chronological order.
         """
-        return self.db.query(AuditLog).order_by(AuditLog.timestamp.desc()).all()
+        return list(self.db.execute(_logs_query(self._partitions())).scalars().all())
+
+    def get_logs_page(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            user_id: Optional[int] = None,
+            action: Optional[str] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+    ) -> AuditLogPage:
+        """Retrieve one page of audit logs, most recent first.
+
+        Pages are keyed on (timestamp, id), so each page is an index range
+        scan however deep the caller has paged.
+
+        Args:
+            limit: Maximum number of logs to return.
+            cursor: Cursor returned with the previous page, or None for the first page.
+            user_id: Only logs of this user.
+            action: Only logs with this action.
+            since: Only logs at or after this time.
+            until: Only logs before this time.
+
+        Returns:
+            The logs and the cursor for the next page, which is None on the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        stmt = _logs_query(self._partitions(), limit + 1, cursor, user_id, action, since, until)
+        return _to_page(self.db.execute(stmt).scalars().all(), limit)
 
     def delete_log(self, log_id: int) -> None:
         """Delete a specific audit log by ID.
@@ -52,10 +248,71 @@ class AuditRepository:
         log = self.db.query(AuditLog).filter(AuditLog.id == log_id).first()
         if log:
             self.db.delete(log)
+            return
+        for name in self._partitions():
+            table = partition_table(name)
+            self.db.execute(delete(table).where(table.c.id == log_id))
     
     def delete_all_logs(self) -> None:
         """Delete all audit logs from the database.
         
         Warning: This permanently removes all audit trail records.
         """
-        self.db.query(AuditLog).delete()
\ No newline at end of file
+        self.db.query(AuditLog).delete()
+        for name in self._partitions():
+            self.db.execute(delete(partition_table(name)))
+
+    def _partitions(self) -> List[str]:
+        """SQLite month tables; none on PostgreSQL, which partitions ``audit_logs`` itself."""
+        if self.db.get_bind().dialect.name != "sqlite":
+            return []
+        return list(self.db.execute(LIST_SQLITE_PARTITIONS).scalars())
+
+
+class AsyncAuditRepository:
+    """Read-only audit log queries on an `AsyncSession`, for routes that run on the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the repository.
+
+        Args:
+            db: SQLAlchemy async session for database operations.
+        """
+        self.db = db
+
+    async def get_all_logs(self) -> List[AuditLog]:
+        """Retrieve all audit logs ordered by most recent first.
+
+        Returns:
+            List of all AuditLog instances in reverse chronological order.
+        """
+        result = await self.db.execute(_logs_query(await self._partitions()))
+        return list(result.scalars().all())
+
+    async def get_logs_page(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            user_id: Optional[int] = None,
+            action: Optional[str] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+    ) -> AuditLogPage:
+        """Retrieve one page of audit logs, most recent first.
+
+        See `AuditRepository.get_logs_page` for the arguments.
+
+        Returns:
+            The logs and the cursor for the next page, which is None on the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        stmt = _logs_query(await self._partitions(), limit + 1, cursor, user_id, action, since, until)
+        result = await self.db.execute(stmt)
+        return _to_page(result.scalars().all(), limit)
+
+    async def _partitions(self) -> List[str]:
+        if self.db.get_bind().dialect.name != "sqlite":
+            return []
+        return list((await self.db.execute(LIST_SQLITE_PARTITIONS)).scalars())
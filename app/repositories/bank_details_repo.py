@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Iterable, Mapping, Optional, Sequence, Set
 from app.models.employee_bank_account import EmployeeBankAccount
+from app.utils.bulk_insert import bulk_insert, existing_values
 
 
 class BankDetailsRepository:
@@ -14,4 +15,11 @@ class BankDetailsRepository:
     def save(self, bank_account: EmployeeBankAccount) -> None:
         """Save a new or existing EmployeeBankAccount instance to the database."""
         self.db.add(bank_account)
-        
+
+    def get_existing_account_numbers(self, account_numbers: Iterable[str]) -> Set[str]:
+        """Return which of the given account numbers are already registered."""
+        return existing_values(self.db, EmployeeBankAccount.account_number, account_numbers)
+
+    def bulk_create(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert many EmployeeBankAccount rows in one statement, bypassing the session."""
+        bulk_insert(self.db, EmployeeBankAccount, rows)
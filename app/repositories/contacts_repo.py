@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Iterable, Mapping, Optional, Sequence, Set
 from app.models.employee_contacts_details import EmployeeContact
+from app.utils.bulk_insert import bulk_insert, existing_values
 
 class ContactsRepository:
     def __init__(self, db: Session):
@@ -13,4 +14,16 @@ class ContactsRepository:
     def save(self, contact: EmployeeContact) -> Optional[EmployeeContact]:
         """Save a new or existing EmployeeContact instance to the database."""
         self.db.add(contact)
-        return contact
\ No newline at end of file
+        return contact
+
+    def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Return which of the given emails are already registered."""
+        return existing_values(self.db, EmployeeContact.email, emails)
+
+    def get_existing_phones(self, phones: Iterable[str]) -> Set[str]:
+        """Return which of the given phone numbers are already registered."""
+        return existing_values(self.db, EmployeeContact.phone, phones)
+
+    def bulk_create(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert many EmployeeContact rows in one statement, bypassing the session."""
+        bulk_insert(self.db, EmployeeContact, rows)
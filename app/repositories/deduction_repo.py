@@ -1,7 +1,8 @@
 """Repository for managing Deduction and DeductionType entities in the database."""
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.models.deductions_model import Deduction, DeductionType, DeductionBracket
-from typing import Optional, List
+from typing import Any, Optional, List, Mapping, Sequence, Union
+from app.utils.bulk_insert import bulk_insert
 from decimal import Decimal
 
 
@@ -31,6 +32,19 @@ class DeductionRepository:
         self.db.add(deduction)
         return deduction
 
+    def bulk_create(
+            self,
+            rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]],
+            columns: Optional[Sequence[str]] = None
+    ) -> None:
+        """Insert many deduction line rows in one statement.
+        
+        Args:
+            rows: Column-value dicts, or tuples ordered like `columns`.
+            columns: Column names for tuple rows.
+        """
+        bulk_insert(self.db, Deduction, rows, columns=columns)
+
     def update_deduction(self, deduction: Deduction) -> Deduction:
         """Update an existing deduction record.
         
@@ -143,13 +157,19 @@ class DeductionRepository:
         return self.db.query(DeductionType).filter(DeductionType.code == code).first()
 
 
-    def get_all_deduction_types(self) -> List[DeductionType]:
+    def get_all_deduction_types(self, with_brackets: bool = False) -> List[DeductionType]:
         """Retrieve all deduction types.
         
+        Args:
+            with_brackets: Load every type's brackets in one extra query.
+            
         Returns:
             List of all DeductionType instances in the database.
         """
-        return self.db.query(DeductionType).all()
+        query = self.db.query(DeductionType)
+        if with_brackets:
+            query = query.options(selectinload(DeductionType.brackets))
+        return query.all()
 
 
     def delete_deduction_type(self, deduction_type: DeductionType) -> None:
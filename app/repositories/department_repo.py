@@ -1,6 +1,6 @@
 """Repository for managing Department and Position entities in the database."""
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from app.models.department_model import Department
 from app.models.Position_model import Position
 
@@ -64,6 +64,17 @@ class DepartmentRepository:
         """
         return self.db.query(Department).filter(Department.name == department_name).first()
 
+    def get_departments_by_names(self, department_names: Iterable[str]) -> List[Department]:
+        """Retrieve the departments with any of the given names in one query.
+        
+        Args:
+            department_names: Department names to look up.
+            
+        Returns:
+            The Department instances found; unknown names are left out.
+        """
+        return self.db.query(Department).filter(Department.name.in_(set(department_names))).all()
+
     def get_all_departments(self) -> List[Department]:
         """Retrieve all departments.
         
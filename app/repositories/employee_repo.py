@@ -1,6 +1,9 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from typing import Optional, List
+from typing import Any, Iterable, Optional, List, Mapping, Sequence, Set
 from app.models.employee_model import Employee
+from app.utils.bulk_insert import bulk_insert, existing_values
 
 class EmployeeRepository:
     """Repository for managing Employee entities."""
@@ -15,6 +18,11 @@ class EmployeeRepository:
         return employee
     
 
+    def bulk_create(self, rows: Sequence[Mapping[str, Any]]) -> List[int]:
+        """Insert many Employee rows in one statement, bypassing the session; returns their ids in order."""
+        return bulk_insert(self.db, Employee, rows, returning=Employee.id)
+    
+
     def update(self, employee: Employee) -> Employee:
         """Update an existing Employee instance in the database."""
         self.db.merge(employee)
@@ -40,6 +48,17 @@ class EmployeeRepository:
         return query.all()
 
 
+    def get_all_employee_ids(self, after_id: int = 0) -> List[int]:
+        """Retrieve Employee ids greater than `after_id` in ascending order, without loading rows."""
+        query = self.db.query(Employee.id).filter(Employee.id > after_id).order_by(Employee.id)
+        return [row[0] for row in query.all()]
+
+
+    def get_existing_ids(self, employee_ids: Iterable[int]) -> Set[int]:
+        """Return which of `employee_ids` belong to stored Employees, with batched IN queries."""
+        return existing_values(self.db, Employee.id, employee_ids)
+
+
     def get_by_user_id(self, user_id: int) -> Optional[Employee]:
         """Retrieve an Employee by associated User ID."""
         return self.db.query(Employee).filter(Employee.user_id == user_id).first()
@@ -56,3 +75,23 @@ class EmployeeRepository:
         return self.db.query(User).filter(User.username == username).first()
 
 
+class AsyncEmployeeRepository:
+    """Read-only Employee queries on an `AsyncSession`, for routes that run on the event loop."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+
+    async def get_by_id(self, employee_id: int) -> Optional[Employee]:
+        """Retrieve an Employee by ID, including related User, Department, and Position."""
+        result = await self.db.execute(
+            select(Employee)
+            .options(joinedload(Employee.user), joinedload(Employee.department), joinedload(Employee.position))
+            .where(Employee.id == employee_id)
+        )
+        return result.scalars().first()
+
+
+    async def get_by_user_id(self, user_id: int) -> Optional[Employee]:
+        """Retrieve an Employee by associated User ID."""
+        result = await self.db.execute(select(Employee).where(Employee.user_id == user_id))
+        return result.scalars().first()
@@ -0,0 +1,314 @@
+"""Repository loading payroll inputs for a whole cohort of employees."""
+
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, selectinload
+
+from app.domain.enums import DeductionStatus
+from app.models.allowances_model import AllowanceType
+from app.models.deductions_model import DeductionType
+from app.models.department_model import Department
+from app.models.employee_model import Employee
+from app.models.insurance_model import Insurance, InsuranceStatus
+from app.models.Loans_advances_model import Loan
+from app.models.pension_model import Pension
+from app.models.Position_model import Position
+from app.models.salary_model import EmployeeSalary, PositionSalary
+from app.models.tax_model import Tax
+from app.repositories.attendance_repo import AttendanceRepository
+
+
+# Loan statuses that no longer produce a repayment
+_CLOSED_LOAN_STATUSES = ("paid", "completed", "closed", "cancelled")
+
+
+class PayrollInputRepository:
+    """Set-based reads for payroll resolution.
+
+    Every method takes the ids of a whole cohort and issues a single query
+    (or a single GROUP BY), so the number of round trips needed to resolve
+    a pay period does not grow with the number of employees.
+    """
+    def __init__(self, db: Session):
+        """Initialize the payroll input repository.
+
+        Args:
+            db: SQLAlchemy session for database operations.
+        """
+        self.db = db
+
+    @staticmethod
+    def _period_bounds(period_start: date, period_end: date):
+        return datetime.combine(period_start, time.min), datetime.combine(period_end, time.max)
+
+    def get_employees(self, employee_ids: Sequence[int]) -> Dict[int, dict]:
+        """Retrieve employees with their position and department names.
+
+        Args:
+            employee_ids: Ids of the cohort.
+
+        Returns:
+            Mapping of employee id to a dict with `position_id`,
+            `position_title` and `department_name`.
+        """
+        rows = (
+            self.db.query(Employee.id, Employee.position_id, Position.title, Department.name)
+            .outerjoin(Position, Position.id == Employee.position_id)
+            .outerjoin(Department, Department.id == Employee.department_id)
+            .filter(Employee.id.in_(employee_ids))
+            .all()
+        )
+        return {
+            row[0]: {"position_id": row[1], "position_title": row[2], "department_name": row[3]}
+            for row in rows
+        }
+
+    def get_employee_salaries(self, employee_ids: Sequence[int], period_start: date, period_end: date) -> Dict[int, EmployeeSalary]:
+        """Retrieve the salary in effect for each employee during the period.
+
+        Args:
+            employee_ids: Ids of the cohort.
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+
+        Returns:
+            Mapping of employee id to the latest effective EmployeeSalary.
+        """
+        start, end = self._period_bounds(period_start, period_end)
+        rows = (
+            self.db.query(EmployeeSalary)
+            .filter(
+                EmployeeSalary.employee_id.in_(employee_ids),
+                or_(EmployeeSalary.effective_from.is_(None), EmployeeSalary.effective_from <= end),
+                or_(EmployeeSalary.effective_to.is_(None), EmployeeSalary.effective_to >= start),
+            )
+            .order_by(EmployeeSalary.employee_id, EmployeeSalary.effective_from.desc())
+            .all()
+        )
+        salaries = {}
+        for row in rows:
+            salaries.setdefault(row.employee_id, row)
+        return salaries
+
+    def get_position_salaries(self, position_ids: Sequence[int], period_start: date, period_end: date) -> Dict[int, PositionSalary]:
+        """Retrieve the salary in effect for each position during the period.
+
+        Args:
+            position_ids: Ids of the positions held by the cohort.
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+
+        Returns:
+            Mapping of position id to the latest effective PositionSalary.
+        """
+        if not position_ids:
+            return {}
+        start, end = self._period_bounds(period_start, period_end)
+        rows = (
+            self.db.query(PositionSalary)
+            .filter(
+                PositionSalary.position_id.in_(position_ids),
+                or_(PositionSalary.effective_from.is_(None), PositionSalary.effective_from <= end),
+                or_(PositionSalary.effective_to.is_(None), PositionSalary.effective_to >= start),
+            )
+            .order_by(PositionSalary.position_id, PositionSalary.effective_from.desc())
+            .all()
+        )
+        salaries = {}
+        for row in rows:
+            salaries.setdefault(row.position_id, row)
+        return salaries
+
+    def get_employee_salary_history(self, employee_ids: Sequence[int]) -> Dict[int, List[Tuple[Optional[datetime], Optional[datetime], Any]]]:
+        """Retrieve every salary interval of each employee, for `SalaryTimeline`.
+
+        Args:
+            employee_ids: Ids of the cohort.
+
+        Returns:
+            Mapping of employee id to `(effective_from, effective_to, amount)`
+            intervals, oldest first; employees without salaries are left out.
+        """
+        rows = (
+            self.db.query(EmployeeSalary.employee_id, EmployeeSalary.effective_from,
+                          EmployeeSalary.effective_to, EmployeeSalary.amount)
+            .filter(EmployeeSalary.employee_id.in_(employee_ids))
+            .order_by(EmployeeSalary.employee_id, EmployeeSalary.effective_from, EmployeeSalary.id)
+            .all()
+        )
+        history: Dict[int, list] = {}
+        for employee_id, effective_from, effective_to, amount in rows:
+            history.setdefault(employee_id, []).append((effective_from, effective_to, amount))
+        return history
+
+    def get_position_salary_history(self, position_ids: Sequence[int]) -> Dict[int, List[Tuple[Optional[datetime], Optional[datetime], Any]]]:
+        """Retrieve every salary interval of each position, for `SalaryTimeline`.
+
+        Args:
+            position_ids: Ids of the positions held by the cohort.
+
+        Returns:
+            Mapping of position id to `(effective_from, effective_to, amount)`
+            intervals, oldest first; positions without salaries are left out.
+        """
+        if not position_ids:
+            return {}
+        rows = (
+            self.db.query(PositionSalary.position_id, PositionSalary.effective_from,
+                          PositionSalary.effective_to, PositionSalary.amount)
+            .filter(PositionSalary.position_id.in_(position_ids))
+            .order_by(PositionSalary.position_id, PositionSalary.effective_from, PositionSalary.id)
+            .all()
+        )
+        history: Dict[int, list] = {}
+        for position_id, effective_from, effective_to, amount in rows:
+            history.setdefault(position_id, []).append((effective_from, effective_to, amount))
+        return history
+
+    def get_allowance_types(self, allowance_type_ids: Sequence[int]) -> List[AllowanceType]:
+        """Retrieve allowance types by id.
+
+        Args:
+            allowance_type_ids: Allowance types applied to the cohort.
+
+        Returns:
+            List of AllowanceType instances.
+        """
+        if not allowance_type_ids:
+            return []
+        return self.db.query(AllowanceType).filter(AllowanceType.id.in_(allowance_type_ids)).all()
+
+    def get_tax_rules(self, tax_ids: Sequence[int]) -> List[Tax]:
+        """Retrieve tax rules with their brackets.
+
+        Args:
+            tax_ids: Tax rules applied to the cohort.
+
+        Returns:
+            List of Tax instances with brackets loaded.
+        """
+        if not tax_ids:
+            return []
+        return (
+            self.db.query(Tax)
+            .options(selectinload(Tax.brackets))
+            .filter(Tax.id.in_(tax_ids))
+            .all()
+        )
+
+    def get_all_tax_rules(self) -> List[Tax]:
+        """Retrieve every tax rule with its brackets.
+
+        Returns:
+            List of Tax instances with brackets loaded, in id order.
+        """
+        return self.db.query(Tax).options(selectinload(Tax.brackets)).order_by(Tax.id).all()
+
+    def get_statutory_deduction_types(self) -> List[DeductionType]:
+        """Retrieve active statutory deduction types with their brackets.
+
+        Returns:
+            List of DeductionType instances with brackets loaded.
+        """
+        return (
+            self.db.query(DeductionType)
+            .options(selectinload(DeductionType.brackets))
+            .filter(DeductionType.is_statutory.is_(True), DeductionType.status == DeductionStatus.ACTIVE)
+            .order_by(DeductionType.id)
+            .all()
+        )
+
+    def get_attendance_totals(self, employee_ids: Sequence[int], period_start: date, period_end: date) -> Dict[int, tuple]:
+        """Sum approved attendance per employee over the period.
+
+        Reads the monthly attendance summaries for whole months; see
+        `AttendanceRepository.summarize_period`.
+
+        Args:
+            employee_ids: Ids of the cohort.
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+
+        Returns:
+            Mapping of employee id to `(hours_worked, overtime_hours)`, for
+            employees with approved attendance in the period.
+        """
+        summaries = AttendanceRepository(self.db).summarize_period(employee_ids, period_start, period_end)
+        return {
+            employee_id: (summary.approved_hours_worked, summary.approved_overtime_hours)
+            for employee_id, summary in summaries.items()
+            if summary.approved_days
+        }
+
+    def get_loan_totals(self, employee_ids: Sequence[int]) -> Dict[int, tuple]:
+        """Sum open loan instalments and balances per employee.
+
+        Args:
+            employee_ids: Ids of the cohort.
+
+        Returns:
+            Mapping of employee id to `(monthly_repayment, outstanding_balance)`.
+        """
+        rows = (
+            self.db.query(
+                Loan.employee_id,
+                func.coalesce(func.sum(Loan.installment_amount), 0),
+                func.sum(Loan.balance_amount),
+            )
+            .filter(
+                Loan.employee_id.in_(employee_ids),
+                or_(Loan.status.is_(None), func.lower(Loan.status).notin_(_CLOSED_LOAN_STATUSES)),
+            )
+            .group_by(Loan.employee_id)
+            .all()
+        )
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def get_insurance_totals(self, employee_ids: Sequence[int], period_start: date, period_end: date) -> Dict[int, int]:
+        """Sum employee contributions of active policies per employee.
+
+        Args:
+            employee_ids: Ids of the cohort.
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+
+        Returns:
+            Mapping of employee id to the total employee contribution.
+        """
+        start, end = self._period_bounds(period_start, period_end)
+        rows = (
+            self.db.query(Insurance.employee_id, func.coalesce(func.sum(Insurance.employee_contribution), 0))
+            .filter(
+                Insurance.employee_id.in_(employee_ids),
+                Insurance.status == InsuranceStatus.ACTIVE.value,
+                or_(Insurance.start_date.is_(None), Insurance.start_date <= end),
+                or_(Insurance.end_date.is_(None), Insurance.end_date >= start),
+            )
+            .group_by(Insurance.employee_id)
+            .all()
+        )
+        return {row[0]: row[1] for row in rows}
+
+    def get_pension_totals(self, employee_ids: Sequence[int], period_end: date) -> Dict[int, int]:
+        """Sum monthly pension contributions per employee.
+
+        Args:
+            employee_ids: Ids of the cohort.
+            period_end: Last day of the pay period.
+
+        Returns:
+            Mapping of employee id to the total monthly contribution.
+        """
+        _, end = self._period_bounds(period_end, period_end)
+        rows = (
+            self.db.query(Pension.employee_id, func.coalesce(func.sum(Pension.monthly_contribution), 0))
+            .filter(
+                Pension.employee_id.in_(employee_ids),
+                or_(Pension.start_date.is_(None), Pension.start_date <= end),
+            )
+            .group_by(Pension.employee_id)
+            .all()
+        )
+        return {row[0]: row[1] for row in rows}
@@ -0,0 +1,153 @@
+"""Repository for managing PayrollJob entities in the database."""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.payroll_job_model import PayrollJob, PayrollJobStatus
+
+
+_ACTIVE_STATUSES = (PayrollJobStatus.QUEUED, PayrollJobStatus.RUNNING)
+
+
+class PayrollJobRepository:
+    """Repository for background payroll job state.
+    
+    Besides plain CRUD it provides the compare-and-swap claim that lets
+    several application processes share the job table without running the
+    same job twice.
+    """
+    def __init__(self, db: Session):
+        """Initialize the payroll job repository.
+        
+        Args:
+            db: SQLAlchemy session for database operations.
+        """
+        self.db = db
+
+    def create(self, job: PayrollJob) -> PayrollJob:
+        """Add a new job and flush it so its id is available.
+        
+        Args:
+            job: PayrollJob instance to create.
+            
+        Returns:
+            The saved PayrollJob instance.
+        """
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def get_by_id(self, job_id: int) -> Optional[PayrollJob]:
+        """Retrieve a job by ID.
+        
+        Args:
+            job_id: The job's ID.
+            
+        Returns:
+            PayrollJob instance if found, None otherwise.
+        """
+        return self.db.query(PayrollJob).filter(PayrollJob.id == job_id).first()
+
+    def get_owned(self, job_id: int, worker_id: str) -> Optional[PayrollJob]:
+        """Retrieve a job for update, only while `worker_id` still owns it.
+        
+        The row stays locked until the transaction ends, so a takeover
+        cannot slip in between the ownership check and the write.
+        
+        Args:
+            job_id: The job's ID.
+            worker_id: Identifier of the owning process.
+            
+        Returns:
+            PayrollJob instance, or None if another worker has taken the job over.
+        """
+        return (
+            self.db.query(PayrollJob)
+            .filter(PayrollJob.id == job_id, PayrollJob.worker_id == worker_id)
+            .with_for_update()
+            .first()
+        )
+
+    def get_resumable_job_ids(self, stale_before: datetime) -> List[int]:
+        """Retrieve unfinished jobs that no live process is working on.
+        
+        Args:
+            stale_before: Jobs whose heartbeat is older than this are considered abandoned.
+            
+        Returns:
+            Job ids in submission order.
+        """
+        rows = (
+            self.db.query(PayrollJob.id)
+            .filter(
+                PayrollJob.status.in_(_ACTIVE_STATUSES),
+                or_(PayrollJob.heartbeat_at.is_(None), PayrollJob.heartbeat_at < stale_before),
+            )
+            .order_by(PayrollJob.id)
+            .all()
+        )
+        return [row[0] for row in rows]
+
+    def claim(self, job_id: int, worker_id: str, stale_before: datetime) -> bool:
+        """Atomically take ownership of an unfinished job.
+        
+        The update only matches when the job is unowned, already owned by
+        `worker_id`, or its owner has stopped sending heartbeats.
+        
+        Args:
+            job_id: The job's ID.
+            worker_id: Identifier of the claiming process.
+            stale_before: Heartbeats older than this no longer protect a job.
+            
+        Returns:
+            True if this worker now owns the job.
+        """
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(PayrollJob)
+            .where(
+                PayrollJob.id == job_id,
+                PayrollJob.status.in_(_ACTIVE_STATUSES),
+                or_(
+                    PayrollJob.worker_id.is_(None),
+                    PayrollJob.worker_id == worker_id,
+                    PayrollJob.heartbeat_at.is_(None),
+                    PayrollJob.heartbeat_at < stale_before,
+                ),
+            )
+            .values(
+                worker_id=worker_id,
+                heartbeat_at=now,
+                status=PayrollJobStatus.RUNNING,
+                started_at=func.coalesce(PayrollJob.started_at, now),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Refresh the heartbeat of a running job owned by `worker_id`.
+        
+        Args:
+            job_id: The job's ID.
+            worker_id: Identifier of the owning process.
+            
+        Returns:
+            False if the job finished or another worker has taken it over.
+        """
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(PayrollJob)
+            .where(
+                PayrollJob.id == job_id,
+                PayrollJob.worker_id == worker_id,
+                PayrollJob.status == PayrollJobStatus.RUNNING,
+            )
+            .values(heartbeat_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
@@ -1,8 +1,18 @@
 """Repository for managing Payroll entities in the database."""
 
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.payroll_model import Payroll
-from typing import List, Optional
+from app.models.allowances_model import Allowance
+from app.models.deductions_model import Deduction
+from app.models.payroll_adjustment_model import PayrollAdjustment
+from app.models.payroll_dependency_model import PayrollDependency
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.employee_model import Employee
+from app.models.user_model import User
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from app.utils.bulk_insert import bulk_insert
 
 
 class PayrollRepository:
@@ -31,6 +41,22 @@ class PayrollRepository:
         self.db.add(payroll)
         return payroll
 
+    def bulk_create(
+            self,
+            rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]],
+            columns: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        """Insert many payroll records in one statement.
+        
+        Args:
+            rows: Column-value dicts, or tuples ordered like `columns`.
+            columns: Column names for tuple rows.
+            
+        Returns:
+            The new payroll ids, in the same order as `rows`.
+        """
+        return bulk_insert(self.db, Payroll, rows, columns=columns, returning=Payroll.id)
+
     def get_by_id(self, payroll_id: int) -> Optional[Payroll]:
         """Retrieve a payroll record by ID.
         
@@ -53,6 +79,255 @@ class PayrollRepository:
         """
         return self.db.query(Payroll).filter(Payroll.employee_id == employee_id).all()
 
+    def get_employee_ids_with_payroll(
+            self,
+            period_start: date,
+            period_end: date,
+            employee_ids: Optional[Sequence[int]] = None,
+            include_drafts: bool = True,
+    ) -> Set[int]:
+        """Retrieve the employees that already have a payroll for a pay period.
+        
+        Reversed versions are not counted: a newer version always replaces them.
+        
+        Args:
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+            employee_ids: Optional ids to restrict the lookup to.
+            include_drafts: Count draft payrolls too; a final run replaces them instead.
+            
+        Returns:
+            Set of employee ids with an existing payroll record for the period.
+        """
+        ignored = [PayrollStatus.REVERSED] if include_drafts else [PayrollStatus.REVERSED, PayrollStatus.DRAFT]
+        query = self.db.query(Payroll.employee_id).filter(
+            Payroll.pay_period_start == period_start,
+            Payroll.pay_period_end == period_end,
+            Payroll.status.notin_(ignored),
+        )
+        if employee_ids is not None:
+            query = query.filter(Payroll.employee_id.in_(employee_ids))
+        return {row[0] for row in query.distinct().all()}
+
+    REGISTER_COLUMNS = (
+        "payroll_id", "employee_id", "first_name", "last_name", "pay_period_start", "pay_period_end",
+        "payment_date", "gross_salary", "total_allowances", "total_deductions", "tax_amount",
+        "net_salary", "status",
+    )
+
+    def iter_register_rows(
+            self,
+            period_start: date,
+            period_end: date,
+            batch_size: int = 1000,
+            current_only: bool = True,
+    ) -> Iterator[Tuple]:
+        """Stream payroll register rows for a pay period.
+        
+        Selects plain columns (no ORM objects) through a server-side cursor
+        and fetches `batch_size` rows at a time, so memory use does not grow
+        with the size of the register.
+        
+        Args:
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+            batch_size: Rows fetched per round trip.
+            current_only: Leave out reversed versions and drafts, so totals
+                count each employee and period once.
+            
+        Yields:
+            Tuples ordered like `REGISTER_COLUMNS`.
+        """
+        statement = (
+            select(
+                Payroll.id, Payroll.employee_id, User.first_name, User.last_name,
+                Payroll.pay_period_start, Payroll.pay_period_end, Payroll.payment_date,
+                Payroll.gross_salary, Payroll.total_allowances, Payroll.total_deductions,
+                Payroll.tax_amount, Payroll.net_salary, Payroll.status,
+            )
+            .outerjoin(Employee, Employee.id == Payroll.employee_id)
+            .outerjoin(User, User.id == Employee.user_id)
+            .where(Payroll.pay_period_start >= period_start, Payroll.pay_period_end <= period_end)
+            .order_by(Payroll.employee_id, Payroll.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        if current_only:
+            statement = statement.where(Payroll.status.notin_([PayrollStatus.REVERSED, PayrollStatus.DRAFT]))
+        for row in self.db.execute(statement):
+            yield tuple(row)
+
+    # Signed off or paid out; drafts, pending and failed payrolls are still being worked on
+    SETTLED_STATUSES = (PayrollStatus.APPROVED, PayrollStatus.PROCESSED, PayrollStatus.PAID)
+
+    def find_current_payrolls(
+            self,
+            period_start: date,
+            period_end: Optional[date] = None,
+            employee_ids: Optional[Sequence[int]] = None,
+            position_ids: Optional[Sequence[int]] = None,
+            allowance_type_ids: Optional[Sequence[int]] = None,
+    ) -> List[Payroll]:
+        """Retrieve the current settled version of every payroll whose period overlaps a date range.
+        
+        Drafts are left out: they have not been paid, and `recompute_dirty`
+        brings them up to date.
+        
+        Args:
+            period_start: First day of the range.
+            period_end: Last day of the range, or None for open-ended.
+            employee_ids: Only payrolls of these employees.
+            position_ids: Only payrolls of employees now holding these positions.
+            allowance_type_ids: Only payrolls paying one of these allowance types.
+            
+        Returns:
+            Payroll instances that are approved, processed or paid.
+        """
+        query = self.db.query(Payroll).filter(
+            Payroll.pay_period_end >= period_start,
+            Payroll.status.in_(self.SETTLED_STATUSES),
+        )
+        if period_end is not None:
+            query = query.filter(Payroll.pay_period_start <= period_end)
+        if employee_ids is not None:
+            query = query.filter(Payroll.employee_id.in_(employee_ids))
+        if position_ids is not None:
+            query = query.join(Employee, Employee.id == Payroll.employee_id).filter(Employee.position_id.in_(position_ids))
+        if allowance_type_ids is not None:
+            query = query.filter(
+                select(Allowance.id)
+                .where(Allowance.payroll_id == Payroll.id, Allowance.allowance_type_id.in_(allowance_type_ids))
+                .exists()
+            )
+        return query.order_by(Payroll.id).all()
+
+    def get_allowance_type_ids(self, payroll_ids: Sequence[int]) -> Dict[int, List[int]]:
+        """Retrieve the allowance types paid on each payroll.
+        
+        Args:
+            payroll_ids: Payroll ids.
+            
+        Returns:
+            Mapping of payroll id to sorted allowance type ids; payrolls without allowances are left out.
+        """
+        rows = (
+            self.db.query(Allowance.payroll_id, Allowance.allowance_type_id)
+            .filter(Allowance.payroll_id.in_(payroll_ids))
+            .distinct()
+            .order_by(Allowance.payroll_id, Allowance.allowance_type_id)
+            .all()
+        )
+        types: Dict[int, List[int]] = {}
+        for payroll_id, allowance_type_id in rows:
+            types.setdefault(payroll_id, []).append(allowance_type_id)
+        return types
+
+    def supersede(self, payroll_ids: Sequence[int]) -> int:
+        """Mark payrolls as reversed because a newer version replaces them.
+        
+        Only settled payrolls are marked, so comparing the returned count
+        with `len(payroll_ids)` detects a concurrent amendment or status change.
+        
+        Args:
+            payroll_ids: Ids of the versions being replaced.
+            
+        Returns:
+            How many payrolls were marked.
+        """
+        if not payroll_ids:
+            return 0
+        result = self.db.execute(
+            update(Payroll)
+            .where(Payroll.id.in_(payroll_ids), Payroll.status.in_(self.SETTLED_STATUSES))
+            .values(status=PayrollStatus.REVERSED, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def bulk_create_adjustments(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert many payroll adjustment rows in one statement.
+        
+        Args:
+            rows: PayrollAdjustment column-value dicts.
+        """
+        bulk_insert(self.db, PayrollAdjustment, rows)
+
+    def bulk_create_dependencies(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert many payroll dependency rows in one statement.
+        
+        Args:
+            rows: PayrollDependency column-value dicts.
+        """
+        bulk_insert(self.db, PayrollDependency, rows)
+
+    def get_drafts(
+            self,
+            period_start: date,
+            period_end: date,
+            dirty_only: bool = False,
+    ) -> Dict[int, Tuple[int, int]]:
+        """Retrieve the draft payrolls of a period, e.g. those marked for recomputation.
+        
+        The mark stays set until `delete_drafts` replaces the draft, so a
+        recomputation that dies halfway is picked up again by the next one.
+        
+        Args:
+            period_start: First day of the pay period.
+            period_end: Last day of the pay period.
+            dirty_only: Only drafts marked for recomputation.
+        
+        Returns:
+            Mapping of employee id to the id and recompute generation of their draft.
+        """
+        query = self.db.query(Payroll.employee_id, Payroll.id, Payroll.recompute_generation).filter(
+            Payroll.pay_period_start == period_start,
+            Payroll.pay_period_end == period_end,
+            Payroll.status == PayrollStatus.DRAFT,
+        )
+        if dirty_only:
+            query = query.filter(Payroll.needs_recompute.is_(True))
+        rows = query.order_by(Payroll.employee_id).all()
+        return {employee_id: (payroll_id, generation) for employee_id, payroll_id, generation in rows}
+
+    def delete_drafts(self, drafts: Mapping[int, int]) -> int:
+        """Delete draft payrolls being replaced, with their lines and dependencies.
+        
+        Only drafts still at the recompute generation that was read are
+        deleted, so comparing the returned count with `len(drafts)` detects a
+        draft that was approved, replaced or marked again meanwhile.
+        
+        Args:
+            drafts: Mapping of the ids of the drafts being replaced to their recompute generation when read.
+        
+        Returns:
+            How many payrolls were deleted.
+        """
+        if not drafts:
+            return 0
+        rows = self.db.execute(
+            select(Payroll.id, Payroll.recompute_generation)
+            .where(Payroll.id.in_(list(drafts)), Payroll.status == PayrollStatus.DRAFT)
+        ).all()
+        by_generation: Dict[int, List[int]] = {}
+        for payroll_id, generation in rows:
+            if drafts[payroll_id] == generation:
+                by_generation.setdefault(generation, []).append(payroll_id)
+        replaceable = [payroll_id for payroll_ids in by_generation.values() for payroll_id in payroll_ids]
+        if not replaceable:
+            return 0
+        for model in (Allowance, Deduction, PayrollDependency):
+            self.db.execute(
+                delete(model).where(model.payroll_id.in_(replaceable)).execution_options(synchronize_session=False)
+            )
+        deleted = 0
+        for generation, payroll_ids in by_generation.items():
+            # Checked again here, in case a mark committed after the select
+            deleted += self.db.execute(
+                delete(Payroll)
+                .where(Payroll.id.in_(payroll_ids), Payroll.recompute_generation == generation)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        return deleted
+
     def update(self, payroll: Payroll) -> Payroll:
         """Update an existing payroll record.
         
@@ -63,3 +338,31 @@ class PayrollRepository:
             The updated Payroll instance.
         """
         return payroll
+
+
+class AsyncPayrollRepository:
+    """Read-only payroll queries on an `AsyncSession`, for routes that run on the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the repository.
+
+        Args:
+            db: SQLAlchemy async session for database operations.
+        """
+        self.db = db
+
+    async def get_by_employee(self, employee_id: int) -> List[Payroll]:
+        """Retrieve all payroll records for an employee, most recent period first.
+
+        Args:
+            employee_id: The employee's ID.
+
+        Returns:
+            List of Payroll instances for the specified employee.
+        """
+        result = await self.db.execute(
+            select(Payroll)
+            .where(Payroll.employee_id == employee_id)
+            .order_by(Payroll.pay_period_start.desc(), Payroll.id.desc())
+        )
+        return list(result.scalars().all())
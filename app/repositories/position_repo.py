@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterable, List, Optional
 from app.models.Position_model import Position
 from app.models.department_model import Department
 from app.repositories.department_repo import DepartmentRepository
@@ -23,3 +23,10 @@ class PositionRepository:
         
 
         
+
+
+    def get_positions_in_departments(self, department_ids: Iterable[int]) -> List[Position]:
+        """
+        Get every position of the given departments in one query
+        """
+        return self.db.query(Position).filter(Position.department_id.in_(set(department_ids))).all()
@@ -1,7 +1,7 @@
 """Repository for managing Role entities in the database."""
 from app.models.roles_model import Role
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterable, List, Optional
 
 class RoleRepository:
     """Repository for role database operations.
@@ -37,3 +37,14 @@ class RoleRepository:
             Role instance if found, None otherwise.
         """
         return self.db.query(Role).filter(Role.role_name == rolename).first()
+
+    def get_roles_by_names(self, rolenames: Iterable[str]) -> List[Role]:
+        """Retrieve the roles with any of the given names in one query.
+        
+        Args:
+            rolenames: Role names to look up.
+            
+        Returns:
+            The Role instances found; unknown names are left out.
+        """
+        return self.db.query(Role).filter(Role.role_name.in_(set(rolenames))).all()
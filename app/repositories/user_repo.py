@@ -1,7 +1,8 @@
 """Repository for managing User entities in the database."""
 from app.models.user_model import User
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Set
+from app.utils.bulk_insert import bulk_insert, existing_values
 
 class UserRepository:
     """Repository for user database operations.
@@ -69,3 +70,25 @@ class UserRepository:
             user: User instance to delete.
         """
         self.db.delete(user)
+
+    def get_existing_usernames(self, usernames: Iterable[str]) -> Set[str]:
+        """Return which of the given usernames are already taken.
+        
+        Args:
+            usernames: Usernames to look up.
+            
+        Returns:
+            The usernames that already exist.
+        """
+        return existing_values(self.db, User.username, usernames)
+
+    def bulk_create(self, rows: Sequence[Mapping[str, Any]]) -> List[int]:
+        """Insert many users in one statement, bypassing the session.
+        
+        Args:
+            rows: Column-value dicts, all with the same keys.
+            
+        Returns:
+            The new user ids, in the same order as `rows`.
+        """
+        return bulk_insert(self.db, User, rows, returning=User.id)
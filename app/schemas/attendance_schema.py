@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import date, datetime
 from app.domain.enums import AttendanceStatus
 
@@ -25,4 +25,43 @@ class AttendanceResponse(BaseModel):
     approved: Optional[AttendanceStatus]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class AttendancePeriodSummary(BaseModel):
+    employee_id: int
+    worked_days: int = 0                      # Checked-out days, approved or not
+    regular_hours: float = 0.0
+    overtime_hours: float = 0.0
+    hours_worked: float = 0.0
+    approved_days: int = 0
+    approved_regular_hours: float = 0.0
+    approved_overtime_hours: float = 0.0
+    approved_hours_worked: float = 0.0
+
+    model_config = {"from_attributes": True}
+
+
+class AttendanceEvent(BaseModel):
+    employee_id: int
+    event_type: Literal["check_in", "check_out"]
+    timestamp: datetime                       # Naive timestamps are taken as EAT
+    attendance_date: Optional[date] = Field(default=None)  # Defaults to the timestamp's EAT date
+    remarks: Optional[str] = Field(default=None)
+
+
+class AttendanceEventResult(BaseModel):
+    event: int                                # 1-based position in the request
+    employee_id: Optional[int] = None
+    event_type: Optional[str] = None
+    attendance_date: Optional[date] = None
+    status: str                               # "applied" or "rejected"
+    attendance_id: Optional[int] = None
+    errors: List[str] = []
+
+
+class AttendanceIngestReport(BaseModel):
+    events: int
+    applied: int
+    rejected: int
+    elapsed_seconds: float
+    results: List[AttendanceEventResult] = []
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.employee_model import SalaryTypeEnum
 
 
@@ -72,4 +72,20 @@ class EmployeeCreateResponse(BaseModel):
     temporary_password: str
     message: str = Field(default="Employee created successfully")
     model_config = {"from_attributes": True}
-   
\ No newline at end of file
+
+
+class EmployeeImportRowResult(BaseModel):
+    row: int                                  # Line of the CSV/XLSX sheet (header is 1), or 1-based JSON index
+    username: Optional[str] = None
+    status: str                               # "created" or "failed"
+    employee_id: Optional[int] = None
+    temporary_password: Optional[str] = None
+    errors: List[str] = []
+
+
+class EmployeeImportReport(BaseModel):
+    rows: int
+    created: int
+    failed: int
+    elapsed_seconds: float
+    results: List[EmployeeImportRowResult] = []
@@ -1,8 +1,8 @@
 from pydantic import BaseModel
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from decimal import Decimal
-from datetime import date
-from typing import List, Optional, Dict
+from datetime import date, datetime
+from typing import List, Literal, Optional, Dict
 from app.schemas.deduction_schema import DeductionBracket
 
 
@@ -19,9 +19,11 @@ class ResolvedDeductionRule(BaseModel):
     code: str                      # e.g. "PAYE"
     is_statutory: bool
     has_brackets: bool
-    brackets:  Optional[DeductionBracket] = None # List of bracket dicts if tiered
+    brackets: Optional[List[Dict[str, Optional[Decimal]]]] = None  # List of bracket dicts if tiered
     rate: Optional[Decimal] = None          # If flat percentage
     fixed_amount: Optional[Decimal] = None
+    rule_source: str = "deduction"          # "deduction" or "tax"; keys the bracket schedule cache
+    updated_at: Optional[datetime] = None   # Rule version; compiled brackets are cached per version
 
 class ResolvedAttendance(BaseModel):
     hours_worked: Decimal = Decimal('0')
@@ -52,6 +54,8 @@ class ResolvedPayrollInputs(BaseModel):
     pension: ResolvedPension
     position_title: Optional[str] = None
     department_name: Optional[str] = None
+    position_id: Optional[int] = None
+    salary_source: Optional[Literal["employee", "position"]] = None  # Whose salary `base_salary` came from
 
     class Config:
         from_attributes = True
@@ -80,6 +84,119 @@ class PayrollRunResponse(BaseModel):
         orm_mode = True
 
 
+class PayslipResponse(BaseModel):
+    id: int
+    employee_id: int
+    pay_period_start: date
+    pay_period_end: date
+    payment_date: date
+    gross_salary: Decimal
+    total_allowances: Decimal
+    total_deductions: Decimal
+    tax_amount: Decimal
+    net_salary: Decimal
+    status: str
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def _status_value(cls, value):
+        return getattr(value, "value", value)
+
+    class Config:
+        from_attributes = True
+
+
+# --- Batch run report ---
+class PayrollBatchFailure(BaseModel):
+    employee_id: int
+    error: str
+
+
+class PayrollBatchChunkReport(BaseModel):
+    chunk: int                     # 1-based chunk number
+    employees: int                 # Employees submitted in this chunk
+    succeeded: int
+    failed: List[PayrollBatchFailure] = []
+    compute_seconds: float         # Resolve + compute, measured in the worker
+    persist_seconds: float         # Transaction time in the coordinating process
+
+
+class PayrollBatchReport(BaseModel):
+    period_start: date
+    period_end: date
+    employees: int                 # Employees considered for the period
+    skipped: int                   # Already had a payroll for the period
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+    chunks: List[PayrollBatchChunkReport] = []
+
+
+# --- Background payroll jobs ---
+class PayrollJobCreate(BaseModel):
+    period_start: date
+    period_end: date
+    allowance_type_ids: List[int] = []
+    tax_ids: List[int] = []
+    draft: bool = False
+    payment_date: Optional[date] = None     # Default: period_end
+
+
+class PayrollJobResponse(BaseModel):
+    id: int
+    status: str
+    period_start: date
+    period_end: date
+    total: Optional[int] = None            # Employees in the run, known once started
+    processed: int = 0                     # Succeeded + failed + skipped
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    throughput_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    errors: List[PayrollBatchFailure] = []
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# --- Retroactive recalculation ---
+class RetroChange(BaseModel):
+    kind: Literal["employee_salary", "position_salary", "allowance_type", "deduction_type", "tax"]
+    target_id: int                         # Employee, position, allowance type, deduction type or tax id
+    effective_from: date
+    effective_to: Optional[date] = None    # None: still in effect
+
+
+class RetroPayrollRequest(BaseModel):
+    changes: List[RetroChange]
+    reason: str
+    tax_ids: List[int]                     # Tax rules the original runs applied; required, none are assumed
+
+
+class RetroPeriodReport(BaseModel):
+    period_start: date
+    period_end: date
+    recomputed: int                        # Employees recomputed for the period
+    amended: int                           # Got a new version
+    unchanged: int
+    failed: List[PayrollBatchFailure] = []
+    arrears_gross: Decimal = Decimal("0.00")
+    arrears_net: Decimal = Decimal("0.00")
+
+
+class RetroPayrollReport(BaseModel):
+    affected: int                          # (employee, period) pairs found from the changes
+    amended: int
+    unchanged: int
+    failed: int
+    arrears_gross: Decimal = Decimal("0.00")
+    arrears_net: Decimal = Decimal("0.00")  # Owed to employees (negative: overpaid)
+    elapsed_seconds: float
+    periods: List[RetroPeriodReport] = []
+
+
 # --- Backwards-compatible types used by the older PayrollEngine & tests ---
 class EarningItem(BaseModel):
     code: str
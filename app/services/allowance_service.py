@@ -4,6 +4,8 @@ from app.schemas.allowance_schema import AllowanceCreate, AllowanceTypeCreate
 from app.domain.exceptions.base import AllowanceTypeNotFoundError, AllowanceRecordNotFoundError
 import random
 from app.core.unit_of_work import UnitOfWork
+from app.domain.enums import AllowanceStatus
+from app.payroll.rule_cache import rules_for
 
 
 
@@ -97,7 +99,9 @@ class AllowanceTypeService:
     
 
     def get_allowance_types(self):
-        allowance_types = self.uow.allowance_repo.get_all_allowance_types()
+        # Served from the versioned rule cache; immutable copies of the active types
+        rules = rules_for(self.uow.session)
+        allowance_types = [t for t in rules.allowance_types.values() if t.status == AllowanceStatus.ACTIVE]
         return allowance_types
     
     def get_allowance_type(self, id:int):
@@ -0,0 +1,260 @@
+"""
+Bulk attendance ingestion for badge and turnstile feeds.
+
+`AttendanceService.check_in`/`check_out` record one event per request, with
+a read, a write and an audit row each. Turnstile controllers instead deliver
+thousands of events at shift change. `AttendanceIngestService` takes them as
+one list:
+
+1. Each event is validated on its own against the schema; naive timestamps
+   are taken as EAT.
+2. Unknown employees and the attendance already stored for every
+   employee-day in the list are fetched with a few set-based queries.
+3. Events are grouped per employee-day and replayed in time order with the
+   same `attendance_rules` as the single-event endpoints: a check-in opens
+   the day, the following check-out closes it, and hours are computed with
+   `calculate_hours` and `split_regular_and_overtime`.
+4. New days are written with one `INSERT ... ON CONFLICT DO NOTHING` per
+   batch of employee-days; days that were already open get their check-out
+   in the same transaction. If a batch fails, its days are retried one by
+   one so only the offending day is rejected.
+
+A rejected event never stops the others. The report lists every event with
+either the attendance record it was applied to, or its errors.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pydantic import ValidationError as SchemaValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import ATTENDANCE_INGEST_BATCH_SIZE, ATTENDANCE_INGEST_MAX_EVENTS
+from app.core.unit_of_work import UnitOfWork
+from app.domain.enums import AttendanceStatus
+from app.domain.exceptions.base import AttendanceAlreadyExistsError, DomainError, ValidationError
+from app.domain.rules import attendance_rules
+from app.models.attendance_model import EAT, Attendance
+from app.schemas.attendance_schema import AttendanceEvent, AttendanceEventResult, AttendanceIngestReport
+
+logger = logging.getLogger(__name__)
+
+EmployeeDay = Tuple[int, date]  # (employee id, attendance date)
+
+
+@dataclass
+class _Event:
+    number: int
+    data: Optional[AttendanceEvent] = None
+    timestamp: Optional[datetime] = None      # EAT-aware
+    attendance_date: Optional[date] = None
+    errors: List[str] = field(default_factory=list)
+    attendance_id: Optional[int] = None
+
+    @property
+    def key(self) -> EmployeeDay:
+        return self.data.employee_id, self.attendance_date
+
+    def result(self) -> AttendanceEventResult:
+        data = self.data
+        return AttendanceEventResult(
+            event=self.number,
+            employee_id=data.employee_id if data else None,
+            event_type=data.event_type if data else None,
+            attendance_date=self.attendance_date,
+            status="rejected" if self.errors or self.attendance_id is None else "applied",
+            attendance_id=None if self.errors else self.attendance_id,
+            errors=self.errors,
+        )
+
+
+@dataclass
+class _Day:
+    """One employee-day while its events are replayed; duck-types `Attendance` for the rules."""
+    stored: Optional[Attendance]
+    check_in: Optional[datetime] = None
+    check_out: Optional[datetime] = None
+    remarks: Optional[str] = None
+    regular_hours: Optional[Decimal] = None
+    overtime_hours: Optional[Decimal] = None
+    hours_worked: Optional[Decimal] = None
+    applied: List[_Event] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, stored: Optional[Attendance]) -> "_Day":
+        if stored is None:
+            return cls(stored=None)
+        return cls(stored=stored, check_in=stored.check_in, check_out=stored.check_out, remarks=stored.remarks)
+
+
+class AttendanceIngestService:
+    def __init__(
+            self,
+            uow: UnitOfWork,
+            batch_size: int = ATTENDANCE_INGEST_BATCH_SIZE,
+            max_events: int = ATTENDANCE_INGEST_MAX_EVENTS,
+    ):
+        self.uow = uow
+        self.batch_size = max(1, batch_size)
+        self.max_events = max_events
+
+    def ingest_events(self, events: Sequence[Any]) -> AttendanceIngestReport:
+        """
+        Validate and record many check-in and check-out events at once.
+
+        :param events: Objects with `AttendanceEvent`'s fields, in any order
+        :return: One result per event, in the order given: the attendance
+            record it was applied to, or why it was rejected
+        :rtype: AttendanceIngestReport
+        :raises ValidationError: If there are more than `max_events` events
+        """
+        started = time.perf_counter()
+        if len(events) > self.max_events:
+            raise ValidationError(f"An ingest takes at most {self.max_events} events, got {len(events)}")
+
+        parsed = [self._parse(number, values) for number, values in enumerate(events, start=1)]
+        self._check_employees([event for event in parsed if not event.errors])
+
+        days: Dict[EmployeeDay, List[_Event]] = {}
+        for event in sorted((event for event in parsed if not event.errors), key=lambda event: event.timestamp):
+            days.setdefault(event.key, []).append(event)
+        keys = list(days)
+        for start in range(0, len(keys), self.batch_size):
+            self._apply({key: days[key] for key in keys[start:start + self.batch_size]})
+
+        results = [event.result() for event in parsed]
+        applied = sum(result.status == "applied" for result in results)
+        elapsed = time.perf_counter() - started
+        logger.info("Attendance ingest: %d applied, %d rejected in %.2fs", applied, len(results) - applied, elapsed)
+        return AttendanceIngestReport(
+            events=len(results),
+            applied=applied,
+            rejected=len(results) - applied,
+            elapsed_seconds=elapsed,
+            results=results,
+        )
+
+    # ------------ Validation ----------------------------------------------------------------
+    @staticmethod
+    def _parse(number: int, values: Any) -> _Event:
+        if not isinstance(values, Mapping):
+            return _Event(number, errors=["Expected an object of event fields"])
+        event = _Event(number)
+        try:
+            event.data = AttendanceEvent.model_validate(dict(values))
+        except SchemaValidationError as e:
+            event.errors.extend(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            return event
+        timestamp = event.data.timestamp
+        event.timestamp = EAT.localize(timestamp) if timestamp.tzinfo is None else timestamp.astimezone(EAT)
+        event.attendance_date = event.data.attendance_date or event.timestamp.date()
+        return event
+
+    def _check_employees(self, events: List[_Event]) -> None:
+        known = self.uow.employee_repo.get_existing_ids(event.data.employee_id for event in events)
+        for event in events:
+            if event.data.employee_id not in known:
+                event.errors.append(f"Employee {event.data.employee_id} does not exist")
+
+    @staticmethod
+    def _replay(key: EmployeeDay, stored: Optional[Attendance], events: List[_Event]) -> _Day:
+        """Run a day's events, oldest first, through the attendance rules."""
+        day = _Day.of(stored)
+        for event in events:
+            try:
+                if event.data.event_type == "check_in":
+                    if day.stored is not None or day.check_in is not None:
+                        raise AttendanceAlreadyExistsError("Attendance for this employee exists")
+                    attendance_rules.validate_check_in_time(event.timestamp, key[1])
+                    day.check_in, day.remarks = event.timestamp, event.data.remarks
+                else:
+                    attendance_rules.ensure_can_checkout(day)
+                    attendance_rules.validate_checkout(day.check_in, event.timestamp)
+                    hours_worked = attendance_rules.calculate_hours(day.check_in, event.timestamp)
+                    attendance_rules.validate_total_working_hours(hours_worked)
+                    regular, overtime = attendance_rules.split_regular_and_overtime(hours_worked)
+                    attendance_rules.validate_overtime_hours(overtime)
+                    attendance_rules.deny_recheckout(day)
+                    day.check_out, day.regular_hours, day.overtime_hours, day.hours_worked = (
+                        event.timestamp, regular, overtime, hours_worked)
+                    day.remarks = event.data.remarks or day.remarks
+            except DomainError as e:
+                event.errors.append(str(e))
+            else:
+                day.applied.append(event)
+        return day
+
+    # ------------ Persistence ---------------------------------------------------------------
+    def _apply(self, batch: Dict[EmployeeDay, List[_Event]]) -> None:
+        for events in batch.values():
+            for event in events:
+                event.errors.clear()
+                event.attendance_id = None
+        try:
+            self._apply_batch(batch)
+        except SQLAlchemyError as e:
+            if len(batch) > 1:
+                logger.warning("Attendance ingest batch of %d days failed; retrying day by day", len(batch))
+                for key, events in batch.items():
+                    self._apply({key: events})
+            else:
+                for events in batch.values():
+                    for event in events:
+                        event.attendance_id = None
+                        event.errors.append(f"Could not be saved: {getattr(e, 'orig', None) or e}")
+
+    def _apply_batch(self, batch: Dict[EmployeeDay, List[_Event]]) -> None:
+        with self.uow:
+            stored = self.uow.attendance_repo.get_by_employee_days(batch)
+            days = {key: self._replay(key, stored.get(key), events) for key, events in batch.items()}
+
+            new_rows = []
+            for (employee_id, attendance_date), day in days.items():
+                if not day.applied:
+                    continue
+                if day.stored is None:
+                    new_rows.append({
+                        "employee_id": employee_id,
+                        "attendance_date": attendance_date,
+                        "check_in": day.check_in,
+                        "check_out": day.check_out,
+                        "regular_hours": day.regular_hours or 0.0,
+                        "overtime_hours": day.overtime_hours or 0.0,
+                        "hours_worked": day.hours_worked or 0.0,
+                        "remarks": day.remarks,
+                        "approved": AttendanceStatus.PENDING,
+                    })
+                else:
+                    attendance = day.stored
+                    attendance.check_out = day.check_out
+                    attendance.regular_hours = day.regular_hours
+                    attendance.overtime_hours = day.overtime_hours
+                    attendance.hours_worked = day.hours_worked
+                    attendance.remarks = day.remarks
+                    self.uow.attendance_repo.update_attendance(attendance)
+            inserted = self.uow.attendance_repo.bulk_insert_if_absent(new_rows)
+
+            for key, day in days.items():
+                attendance_id = day.stored.id if day.stored is not None else inserted.get(key)
+                for event in day.applied:
+                    if attendance_id is None:
+                        # Recorded by someone else since the lookup above
+                        event.errors.append("Attendance for this employee exists")
+                        continue
+                    event.attendance_id = attendance_id
+                    self.uow.audit_repo.log_action(
+                        user_id=event.data.employee_id,
+                        action=event.data.event_type,
+                        metadata={
+                            "attendance_id": attendance_id,
+                            "timestamp": event.timestamp.isoformat(),
+                            "attendance_date": event.attendance_date.isoformat(),
+                            "source": "ingest",
+                        },
+                    )
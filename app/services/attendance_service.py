@@ -3,10 +3,12 @@ import pytz
 from app.models.attendance_model import Attendance
 from app.domain.enums import AttendanceStatus
 from app.domain.exceptions.base import (
-    AttendanceNotApprovedError, AttendanceRecordNotFoundError, DomainError)
+    AttendanceNotApprovedError, AttendanceRecordNotFoundError, DomainError, ValidationError)
 from app.domain.rules import attendance_rules
 from app.core.unit_of_work import UnitOfWork
 from datetime import datetime, date
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.schemas.attendance_schema import AttendancePeriodSummary
 
 
 class AttendanceService:
@@ -45,11 +47,9 @@ class AttendanceService:
         with self.uow:
             attendance_date = attendance_date or check_in_time.date()
 
-            existing = self.uow.attendance_repo.get_by_employee_and_date(employee_id, attendance_date)
             attendance_rules.validate_check_in_time(check_in_time, attendance_date)
-            attendance_rules.ensure_not_duplicate(existing_attendance=existing)
             
-            # Create new attendance record
+            # Create new attendance record; the unique index rejects a second one for the day
             attendance = Attendance(
                 employee_id = employee_id,
                 attendance_date = attendance_date,
@@ -57,7 +57,8 @@ class AttendanceService:
                 remarks = remarks
 
             )
-            attendance = self.uow.attendance_repo.save_attendance(attendance)
+            attendance = self.uow.attendance_repo.insert_if_absent(attendance)
+            attendance_rules.ensure_not_duplicate(inserted_attendance=attendance)
             self.uow.audit_repo.log_action(
                 user_id=employee_id,
                 action="check_in",
@@ -140,4 +141,43 @@ class AttendanceService:
                 metadata=f"Attendance approved for {attendance.attendance_date.isoformat()}"
            )
            return attendance
-       
+
+
+    def get_pending_approvals(
+            self,
+            limit: int = 100,
+            after: Optional[Tuple[date, int]] = None)->List[Attendance]:
+        """
+        Attendance records awaiting approval, oldest first
+
+        :param limit: Maximum number of records to return
+        :type limit: int
+        :param after: (attendance_date, id) of the last record of the previous page
+        :type after: Optional[Tuple[date, int]]
+        :return: Pending attendance records ordered by date, then id
+        :rtype: List[Attendance]
+        """
+        return self.uow.attendance_repo.get_pending_approvals(limit=limit, after=after)
+
+
+    def summarize_period(
+            self,
+            employee_ids: Sequence[int],
+            period_start: date,
+            period_end: date)->Dict[int, AttendancePeriodSummary]:
+        """
+        Attendance totals per employee over a period
+
+        :param employee_ids: Employees to summarize
+        :type employee_ids: Sequence[int]
+        :param period_start: First day of the period
+        :type period_start: date
+        :param period_end: Last day of the period
+        :type period_end: date
+        :return: Worked and approved days and hours per employee with attendance in the period
+        :rtype: Dict[int, AttendancePeriodSummary]
+        """
+        if period_end < period_start:
+            raise ValidationError("period_end must not be before period_start")
+        return self.uow.attendance_repo.summarize_period(employee_ids, period_start, period_end)
+
@@ -1,8 +1,14 @@
+import logging
 from app.core.unit_of_work import UnitOfWork
 from datetime import datetime, date
+from app.core.audit_policy import ReadAuditCounters
+from app.core import audit_policy
+from app.db.database_setup import SessionLocal
 from app.repositories.audit_repo import AuditRepository
 from app.domain.exceptions.base import DomainError
 
+logger = logging.getLogger(__name__)
+
 
 class AuditService:
     """
@@ -78,4 +84,44 @@ class AuditService:
         :rtype: None
         """
         with self.uow:
-            self.uow.audit_repo.delete_all_logs()
\ No newline at end of file
+            self.uow.audit_repo.delete_all_logs()
+
+    def flush_read_summaries(
+            self,
+            include_open: bool = False,
+            counters: ReadAuditCounters | None = None,
+    ) -> int:
+        """
+        Writes aggregated read counts as audit rows, one per actor, action, resource and window.
+
+        :param self: Refers to the AuditService instance
+        :param include_open: Also write the current, unfinished window (e.g. on shutdown)
+        :type include_open: bool
+        :param counters: Counters to drain; defaults to the process-wide ones
+        :type counters: ReadAuditCounters | None
+        :return: Number of summary rows written
+        :rtype: int
+        """
+        counters = counters if counters is not None else audit_policy.read_counters
+        summaries = counters.drain(include_open=include_open)
+        if not summaries:
+            return 0
+        try:
+            with self.uow:
+                return self.uow.audit_repo.add_read_summaries(summaries)
+        except Exception:
+            # Keep the counts for the next flush rather than losing them
+            counters.restore(summaries)
+            raise
+
+
+def flush_read_audit_summaries(include_open: bool = False) -> int:
+    """Scheduler entry point: flush read summaries in a session of its own."""
+    db = SessionLocal()
+    try:
+        return AuditService(UnitOfWork(db)).flush_read_summaries(include_open=include_open)
+    except Exception:
+        logger.exception("Failed to write read audit summaries")
+        return 0
+    finally:
+        db.close()
@@ -1,7 +1,9 @@
 """Authentication service for user login, password management, and token generation."""
 from app.core.unit_of_work import UnitOfWork
 from sqlalchemy.exc import SQLAlchemyError
-from app.core.hashing import verify_password, hash_password
+from starlette.concurrency import run_in_threadpool
+from app.core.hashing import hash_password, hash_password_async, needs_rehash, verify_password, verify_password_async
+from app.core.rehash_queue import active_rehash_queue
 from app.core.security import create_login_token
 from app.domain.exceptions.base import DomainError,InvalidCredentialsError, UserNotFoundError
 from app.domain.rules.employee_rules import validate_password_strength
@@ -92,9 +94,44 @@ class AuthService:
             InvalidCredentialsError: If username or password is incorrect.
             DomainError: If database error occurs or user role not found.
         """
+        user = self._get_user(username)
+        verified = verify_password(user.password_hash, password) if user else None
+        self._schedule_rehash(user, verified, password)
+        return self._login(user, verified)
+
+    async def authenticate_user_async(self, username: str, password: str) -> dict:
+        """Async variant of `authenticate_user` for async routes.
+
+        Database work runs on the threadpool and the Argon2 check on the
+        hashing pool, so no request thread is held while the hash runs.
+
+        Raises:
+            InvalidCredentialsError: If username or password is incorrect.
+            PasswordHashingBusyError: If the hashing pool is saturated.
+            DomainError: If database error occurs or user role not found.
+        """
+        user = await run_in_threadpool(self._get_user, username)
+        verified = await verify_password_async(user.password_hash, password) if user else None
+        self._schedule_rehash(user, verified, password)
+        return await run_in_threadpool(self._login, user, verified)
+
+    @staticmethod
+    def _schedule_rehash(user, verified: str | None, password: str) -> None:
+        # Outdated hashes are upgraded in the background rather than on the login path
+        rehash_queue = active_rehash_queue()
+        if verified and rehash_queue is not None and needs_rehash(verified):
+            rehash_queue.enqueue(user.id, verified, password)
+
+    def _get_user(self, username: str):
         try:
-            user = self.uow.user_repo.get_user(username)
-            if not user or not verify_password(user.password_hash, password):
+            return self.uow.user_repo.get_user(username)
+        except SQLAlchemyError as e:
+            raise DomainError(f"Database error: {e}")
+
+    def _login(self, user, verified: str | None) -> dict:
+        """Issue the token for a user whose password check returned `verified`."""
+        try:
+            if not user or not verified:
                raise InvalidCredentialsError("Invalid username or password")
             
             role = self.uow.role_repo.get_role_by_id(user.role_id)
@@ -143,6 +180,22 @@ class AuthService:
             UserNotFoundError: If user with given ID does not exist.
             DomainError: If password validation fails or database error occurs.
         """
+        user = self._get_user_for_password_change(user_id, new_password)
+        return self._set_password(user, hash_password(new_password))
+
+    async def change_password_async(self, user_id: int, new_password: str) -> dict:
+        """Async variant of `change_password`; the new hash is computed on the hashing pool.
+
+        Raises:
+            UserNotFoundError: If user with given ID does not exist.
+            PasswordHashingBusyError: If the hashing pool is saturated.
+            DomainError: If password validation fails or database error occurs.
+        """
+        user = await run_in_threadpool(self._get_user_for_password_change, user_id, new_password)
+        password_hash = await hash_password_async(new_password)
+        return await run_in_threadpool(self._set_password, user, password_hash)
+
+    def _get_user_for_password_change(self, user_id: int, new_password: str):
         # Fetch user first so UserNotFoundError is raised before strength checks
         try:
             user = self.uow.user_repo.get_user_by_id(user_id)
@@ -153,12 +206,14 @@ class AuthService:
 
         # Validate new password strength after verifying user exists
         validate_password_strength(new_password)
+        return user
 
+    def _set_password(self, user, password_hash: str) -> dict:
         with self.uow:
-            user.password_hash = hash_password(new_password)
+            user.password_hash = password_hash
             user.must_change_password = False
             self.uow.user_repo.update(user)
             # Log password change
-            self.uow.audit_repo.log_action(user_id, "password_change")
+            self.uow.audit_repo.log_action(user.id, "password_change")
 
         return {"message": "Password changed successfully. You can now login!"}
@@ -4,9 +4,11 @@ from app.domain.exceptions.base import DomainError, DeductionNotFoundError
 from app.utils.tax_bracket_validator import validate_no_overlaps
 import uuid
 from app.core.unit_of_work import UnitOfWork
+from app.payroll.rule_cache import rules_for
 from app.domain.rules.domain_rules import validate_id
 from app.domain.rules.deduction_rules import ensure_no_duplicate_deduction_type
 from typing import Optional
+from datetime import datetime, timezone
 
 class DeductionService:
     def __init__(self, uow: UnitOfWork):
@@ -91,7 +93,8 @@ class DeductionService:
 
 
     def list_deductions(self, skip: int = 0, limit: int = 100):
-        all_deductions = self.uow.deduction_repo.get_all_deduction_types()
+        # Served from the versioned rule cache; immutable copies of the rows
+        all_deductions = list(rules_for(self.uow.session).deduction_types.values())
         return all_deductions[skip:skip + limit]
 
     def update_deduction(self, deduction_id: int, payload):
@@ -109,6 +112,8 @@ class DeductionService:
         existing.is_statutory = payload.is_statutory
         existing.is_taxable = payload.is_taxable
         existing.has_brackets = payload.has_brackets
+        # Bump the version explicitly; compiled bracket schedules are cached per updated_at
+        existing.updated_at = datetime.now(timezone.utc)
 
             
         if existing.has_brackets and getattr(payload, 'brackets', None):
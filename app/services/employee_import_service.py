@@ -0,0 +1,364 @@
+"""
+Bulk employee onboarding.
+
+`EmployeeService.create_employee` handles one employee per request: it looks
+up the username, role, department, position, email and bank account one
+query at a time, hashes one temporary password and flushes several times.
+`EmployeeImportService` takes a whole CSV/XLSX file or JSON array instead:
+
+1. Each row is validated on its own, against the schema and the employee rules.
+2. Roles, departments and positions, and the usernames, emails, phone numbers
+   and account numbers already in use, are fetched with a few set-based
+   queries for the whole import. Values repeated within the import are caught
+   as well.
+3. Temporary passwords for the valid rows are hashed with
+   `app.core.hashing.hash_passwords`, in a small bounded process pool.
+4. Users, employees, contacts and bank accounts are inserted with one
+   executemany per table per batch. Each batch is its own transaction. If a
+   batch fails (e.g. a username was taken meanwhile), its rows are retried one
+   by one so only the conflicting row fails.
+
+A failing row never stops the others. The report lists every row with either
+its new employee id and temporary password, or its errors.
+"""
+
+import csv
+import io
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+from pydantic import ValidationError as SchemaValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import EMPLOYEE_IMPORT_BATCH_SIZE, EMPLOYEE_IMPORT_HASH_WORKERS, EMPLOYEE_IMPORT_MAX_ROWS
+from app.core.hashing import hash_passwords
+from app.core.security import create_temporary_password
+from app.core.unit_of_work import UnitOfWork
+from app.domain.exceptions.base import DomainError, ValidationError
+from app.domain.rules.employee_rules import validate_age, validate_hire_date_not_future, validate_phone_number
+from app.schemas.employee_schema import EmployeeCreate, EmployeeImportReport, EmployeeImportRowResult
+
+logger = logging.getLogger(__name__)
+
+ImportRows = Sequence[Tuple[int, Any]]  # (row number, field values) pairs
+
+# Fields that must not repeat, within the import or against stored employees
+_UNIQUE_FIELDS = (
+    ("username", "Username"),
+    ("email", "Email"),
+    ("phone", "Phone number"),
+    ("account_number", "Account number"),
+)
+
+
+#=============================================================================================
+# ------------ Reading uploads ---------------------------------------------------------------
+def _header(name) -> str:
+    return str(name or "").strip().lower().replace(" ", "_")
+
+
+def _cell(value):
+    """Spreadsheet cell to what `EmployeeCreate` expects: text, or a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # Phone and account numbers typed as numbers
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+
+def _records(header: Sequence, rows: Iterable[Tuple[int, Sequence]]) -> List[Tuple[int, Dict[str, Any]]]:
+    keys = [_header(name) for name in header]
+    records = []
+    for number, row in rows:
+        values = [_cell(value) for value in row]
+        if all(value is None for value in values):
+            continue  # Blank line
+        records.append((number, {key: value for key, value in zip(keys, values) if key}))
+    return records
+
+
+def read_csv(content: bytes) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Read employee rows from a CSV file whose first line holds the field names.
+
+    :param content: The uploaded file, UTF-8 encoded (a BOM is accepted)
+    :return: (line number, field values) per non-blank row
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValidationError("CSV files must be UTF-8 encoded")
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if header is None:
+        return []
+    return _records(header, ((reader.line_num, row) for row in reader))
+
+
+def read_xlsx(content: bytes) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Read employee rows from the first sheet of a workbook whose first row holds the field names.
+
+    :param content: The uploaded .xlsx file
+    :return: (sheet row number, field values) per non-blank row
+    """
+    try:
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    except Exception as e:
+        raise ValidationError(f"Could not read the workbook: {e}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return []
+        return _records(header, enumerate(rows, start=2))
+    finally:
+        workbook.close()
+
+
+def read_import_file(filename: Optional[str], content: bytes) -> List[Tuple[int, Dict[str, Any]]]:
+    """Read an uploaded .csv or .xlsx file of employees."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return read_csv(content)
+    if extension == ".xlsx":
+        return read_xlsx(content)
+    raise ValidationError("Upload a .csv or .xlsx file")
+
+
+#=============================================================================================
+# ------------ Import ------------------------------------------------------------------------
+@dataclass
+class _ImportRow:
+    number: int
+    username: Optional[str] = None
+    data: Optional[EmployeeCreate] = None
+    errors: List[str] = field(default_factory=list)
+    role_id: Optional[int] = None
+    department_id: Optional[int] = None
+    position_id: Optional[int] = None
+    temporary_password: Optional[str] = field(default=None, repr=False)
+    password_hash: Optional[str] = field(default=None, repr=False)
+    employee_id: Optional[int] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.data is not None and not self.errors
+
+    def result(self) -> EmployeeImportRowResult:
+        if self.errors or self.employee_id is None:
+            return EmployeeImportRowResult(row=self.number, username=self.username, status="failed",
+                                           errors=self.errors)
+        return EmployeeImportRowResult(row=self.number, username=self.username, status="created",
+                                       employee_id=self.employee_id, temporary_password=self.temporary_password)
+
+
+class EmployeeImportService:
+    def __init__(
+            self,
+            uow: UnitOfWork,
+            batch_size: int = EMPLOYEE_IMPORT_BATCH_SIZE,
+            hash_workers: int = EMPLOYEE_IMPORT_HASH_WORKERS,
+            max_rows: int = EMPLOYEE_IMPORT_MAX_ROWS,
+    ):
+        self.uow = uow
+        self.batch_size = max(1, batch_size)
+        self.hash_workers = max(1, hash_workers)
+        self.max_rows = max_rows
+
+    def import_employees(self, rows: ImportRows) -> EmployeeImportReport:
+        """
+        Validate and create many employees at once.
+
+        :param rows: (row number, field values) pairs, as returned by
+            `read_import_file`; the values use `EmployeeCreate`'s field names
+        :return: One result per row: the new employee id and temporary
+            password, or why the row was not imported
+        :rtype: EmployeeImportReport
+        :raises ValidationError: If there are more than `max_rows` rows
+        """
+        started = time.perf_counter()
+        if len(rows) > self.max_rows:
+            raise ValidationError(f"An import takes at most {self.max_rows} rows, got {len(rows)}")
+
+        parsed = [self._parse(number, values) for number, values in rows]
+        self._check_repeated(parsed)
+        self._resolve_references([row for row in parsed if row.data is not None])
+        self._check_existing([row for row in parsed if row.data is not None])
+
+        valid = [row for row in parsed if row.valid]
+        passwords = [create_temporary_password() for _ in valid]
+        for row, password, password_hash in zip(valid, passwords, hash_passwords(passwords, self.hash_workers)):
+            row.temporary_password, row.password_hash = password, password_hash
+        for start in range(0, len(valid), self.batch_size):
+            self._insert(valid[start:start + self.batch_size])
+
+        results = [row.result() for row in parsed]
+        created = sum(result.status == "created" for result in results)
+        elapsed = time.perf_counter() - started
+        logger.info("Employee import: %d created, %d failed in %.2fs", created, len(results) - created, elapsed)
+        return EmployeeImportReport(
+            rows=len(results),
+            created=created,
+            failed=len(results) - created,
+            elapsed_seconds=elapsed,
+            results=results,
+        )
+
+    # ------------ Validation ----------------------------------------------------------------
+    @staticmethod
+    def _parse(number: int, values: Any) -> _ImportRow:
+        if not isinstance(values, Mapping):
+            return _ImportRow(number, errors=["Expected an object of employee fields"])
+        username = values.get("username")
+        row = _ImportRow(number, username=None if username is None else str(username))
+        try:
+            row.data = EmployeeCreate.model_validate(dict(values))
+        except SchemaValidationError as e:
+            row.errors.extend(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            return row
+
+        for rule, value in (
+                (validate_age, row.data.date_of_birth),
+                (validate_hire_date_not_future, row.data.date_hired),
+                (validate_phone_number, row.data.phone),
+        ):
+            try:
+                rule(value)
+            except DomainError as e:
+                row.errors.append(str(e))
+        return row
+
+    @staticmethod
+    def _check_repeated(rows: List[_ImportRow]) -> None:
+        for name, label in _UNIQUE_FIELDS:
+            first_seen: Dict[str, int] = {}
+            for row in rows:
+                if row.data is None:
+                    continue
+                value = getattr(row.data, name)
+                if value in first_seen:
+                    row.errors.append(f"{label} '{value}' is already used on row {first_seen[value]}")
+                else:
+                    first_seen[value] = row.number
+
+    def _resolve_references(self, rows: List[_ImportRow]) -> None:
+        roles = {
+            role.role_name: role.id
+            for role in self.uow.role_repo.get_roles_by_names(row.data.role_name for row in rows)
+        }
+        departments = {
+            department.name: department.id
+            for department in self.uow.department_repo.get_departments_by_names(
+                row.data.department_name for row in rows)
+        }
+        positions = {
+            (position.department_id, position.title): position.id
+            for position in self.uow.position_repo.get_positions_in_departments(departments.values())
+        }
+
+        for row in rows:
+            data = row.data
+            row.role_id = roles.get(data.role_name)
+            if row.role_id is None:
+                row.errors.append(f"Role '{data.role_name}' does not exist")
+            row.department_id = departments.get(data.department_name)
+            if row.department_id is None:
+                row.errors.append(f"Department '{data.department_name}' does not exist")
+                continue
+            row.position_id = positions.get((row.department_id, data.position_title))
+            if row.position_id is None:
+                row.errors.append(
+                    f"Position '{data.position_title}' does not exist in the {data.department_name} department")
+
+    def _check_existing(self, rows: List[_ImportRow]) -> None:
+        existing = {
+            "username": self.uow.user_repo.get_existing_usernames(row.data.username for row in rows),
+            "email": self.uow.contacts_repo.get_existing_emails(row.data.email for row in rows),
+            "phone": self.uow.contacts_repo.get_existing_phones(row.data.phone for row in rows),
+            "account_number": self.uow.bank_details_repo.get_existing_account_numbers(
+                row.data.account_number for row in rows),
+        }
+        for row in rows:
+            for name, label in _UNIQUE_FIELDS:
+                value = getattr(row.data, name)
+                if value in existing[name]:
+                    row.errors.append(f"{label} '{value}' already exists")
+
+    # ------------ Persistence ---------------------------------------------------------------
+    def _insert(self, rows: List[_ImportRow]) -> None:
+        try:
+            employee_ids = self._insert_batch(rows)
+        except SQLAlchemyError as e:
+            if len(rows) > 1:
+                logger.warning("Employee import batch of %d rows failed; retrying row by row", len(rows))
+                for row in rows:
+                    self._insert([row])
+            else:
+                rows[0].errors.append(f"Could not be saved: {getattr(e, 'orig', None) or e}")
+            return
+        for row, employee_id in zip(rows, employee_ids):
+            row.employee_id = employee_id
+
+    def _insert_batch(self, rows: List[_ImportRow]) -> List[int]:
+        with self.uow:
+            user_ids = self.uow.user_repo.bulk_create([
+                {
+                    "first_name": row.data.first_name,
+                    "last_name": row.data.last_name,
+                    "username": row.data.username,
+                    "gender": row.data.gender,
+                    "date_of_birth": row.data.date_of_birth,
+                    "password_hash": row.password_hash,
+                    "role_id": row.role_id,
+                }
+                for row in rows
+            ])
+            employee_ids = self.uow.employee_repo.bulk_create([
+                {
+                    "user_id": user_id,
+                    "department_id": row.department_id,
+                    "position_id": row.position_id,
+                    "hire_date": row.data.date_hired or date.today(),
+                    "salary_type": row.data.salary_type,
+                }
+                for row, user_id in zip(rows, user_ids)
+            ])
+            self.uow.contacts_repo.bulk_create([
+                {
+                    "employee_id": employee_id,
+                    "email": row.data.email,
+                    "phone": row.data.phone,
+                    "address": row.data.address,
+                    "city": row.data.city,
+                    "country": row.data.country,
+                }
+                for row, employee_id in zip(rows, employee_ids)
+            ])
+            self.uow.bank_details_repo.bulk_create([
+                {
+                    "employee_id": employee_id,
+                    "bank_name": row.data.bank_name,
+                    "account_number": row.data.account_number,
+                    "account_type": row.data.account_type,
+                }
+                for row, employee_id in zip(rows, employee_ids)
+            ])
+            for row, user_id, employee_id in zip(rows, user_ids, employee_ids):
+                self.uow.audit_repo.log_action(
+                    user_id=user_id,
+                    action=f"Created employee {employee_id} with user {row.data.username}",
+                    metadata={"employee_id": employee_id, "username": row.data.username, "source": "import"},
+                )
+        return employee_ids
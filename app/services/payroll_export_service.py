@@ -0,0 +1,99 @@
+"""
+Streaming payroll register export.
+
+Rows are read from a server-side cursor in batches and encoded as they
+arrive, so exporting a register of any size uses a bounded amount of memory.
+Each generator opens and closes its own session: a `StreamingResponse` keeps
+iterating after the request's `get_db` dependency has already been closed.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Iterator
+
+from openpyxl import Workbook
+from sqlalchemy.orm import Session
+
+from app.core.config import PAYROLL_EXPORT_BATCH_SIZE
+from app.db.database_setup import SessionLocal
+from app.domain.exceptions.base import ValidationError
+from app.repositories.payroll_repo import PayrollRepository
+
+_FILE_CHUNK_SIZE = 64 * 1024
+
+
+class PayrollExportService:
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            batch_size: int = PAYROLL_EXPORT_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def _rows(self, period_start: date, period_end: date) -> Iterator[tuple]:
+        if period_end < period_start:
+            raise ValidationError("period_end must not be before period_start")
+        db = self.session_factory()
+        try:
+            for row in PayrollRepository(db).iter_register_rows(period_start, period_end, self.batch_size):
+                yield tuple(value.value if isinstance(value, Enum) else value for value in row)
+        finally:
+            db.close()
+
+    def register_csv(self, period_start: date, period_end: date) -> Iterator[bytes]:
+        """
+        Stream the payroll register for a period as CSV.
+
+        One encoded chunk is yielded per fetched batch of rows.
+
+        :param period_start: First day of the pay period
+        :param period_end: Last day of the pay period
+        :return: UTF-8 encoded CSV chunks, header first
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(PayrollRepository.REGISTER_COLUMNS)
+        pending = 0
+        for row in self._rows(period_start, period_end):
+            writer.writerow(row)
+            pending += 1
+            if pending >= self.batch_size:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate(0)
+                pending = 0
+        yield buffer.getvalue().encode("utf-8")
+
+    def register_xlsx(self, period_start: date, period_end: date) -> Iterator[bytes]:
+        """
+        Stream the payroll register for a period as an XLSX workbook.
+
+        The sheet is built in openpyxl's write-only mode, which writes each
+        row straight to a temporary file instead of keeping cells in memory.
+        An XLSX file is a zip archive that can only be finished once every
+        row is written, so the bytes are sent after the sheet is complete.
+
+        :param period_start: First day of the pay period
+        :param period_end: Last day of the pay period
+        :return: Chunks of the finished workbook
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Payroll Register")
+        sheet.append(PayrollRepository.REGISTER_COLUMNS)
+        for row in self._rows(period_start, period_end):
+            # Numeric columns come back as Decimal; store them as numbers, not text
+            sheet.append([float(value) if isinstance(value, Decimal) else value for value in row])
+
+        with tempfile.TemporaryFile() as output:
+            workbook.save(output)
+            output.seek(0)
+            while True:
+                chunk = output.read(_FILE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
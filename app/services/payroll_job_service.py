@@ -0,0 +1,332 @@
+"""
+Background payroll runs.
+
+A submitted run is stored as a `PayrollJob` row and executed on a background
+thread through `PayrollBatchRunner`. Progress is written to the job row after
+every committed chunk, so the state survives restarts. While a job runs, its
+owner refreshes the heartbeat from a timer thread, so a chunk that takes
+longer than the stale timeout does not let another process claim the job.
+If another process takes the job over anyway, e.g. after a long database
+outage, this one stops before its next chunk and leaves the job row alone.
+On startup, jobs whose owner stopped sending heartbeats are claimed again and
+resume after the last contiguous finished chunk.
+"""
+
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import PAYROLL_BATCH_CHUNK_SIZE, PAYROLL_JOB_HEARTBEAT_SECONDS, PAYROLL_JOB_STALE_SECONDS
+from app.core.unit_of_work import UnitOfWork
+from app.db.database_setup import SessionLocal
+from app.domain.exceptions.base import PayrollJobNotFoundError, ValidationError
+from app.models.payroll_job_model import PayrollJob, PayrollJobStatus
+from app.payroll.batch_runner import PayrollBatchRunner
+from app.schemas.payroll_schema import PayrollBatchChunkReport, PayrollBatchFailure, PayrollJobResponse
+
+logger = logging.getLogger(__name__)
+
+# One coordinating thread per process; jobs queue behind each other
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payroll-job")
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+_MAX_STORED_ERRORS = 1000
+
+
+class _Heartbeat:
+    """Refreshes a running job's heartbeat every `interval` seconds until stopped; sets `lost` on takeover."""
+
+    def __init__(self, session_factory: Callable[[], Session], job_id: int, interval: float):
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"payroll-job-{self.job_id}-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def beat(self) -> bool:
+        db = self.session_factory()
+        try:
+            with UnitOfWork(db) as uow:
+                return uow.payroll_job_repo.heartbeat(self.job_id, _WORKER_ID)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            try:
+                if not self.beat():
+                    self.lost.set()
+                    return
+            except Exception:
+                logger.exception("Could not refresh the heartbeat of payroll job %d", self.job_id)
+
+
+class PayrollJobService:
+    def __init__(
+            self,
+            session_factory: Callable[[], Session] = SessionLocal,
+            runner_factory: Callable[[int], PayrollBatchRunner] = lambda chunk_size: PayrollBatchRunner(chunk_size=chunk_size),
+            executor: Optional[Executor] = None,
+            stale_after: int = PAYROLL_JOB_STALE_SECONDS,
+            heartbeat_interval: float = PAYROLL_JOB_HEARTBEAT_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.runner_factory = runner_factory
+        self.executor = executor or _executor
+        self.stale_after = timedelta(seconds=stale_after)
+        self.heartbeat_interval = heartbeat_interval
+
+    def _stale_before(self) -> datetime:
+        return datetime.utcnow() - self.stale_after
+
+    #=========================================================================================
+    # ------------ Submission and polling -----------------------------------------------------
+    def submit(
+            self,
+            period_start: date,
+            period_end: date,
+            user_id: int,
+            allowance_type_ids: Sequence[int] = (),
+            tax_ids: Sequence[int] = (),
+            draft: bool = False,
+            payment_date: Optional[date] = None,
+    ) -> PayrollJobResponse:
+        """
+        Record a payroll run and schedule it in the background.
+
+        :param period_start: First day of the pay period
+        :param period_end: Last day of the pay period
+        :param user_id: User requesting the run
+        :param allowance_type_ids: Allowance types applied to every employee
+        :param tax_ids: Tax rules applied to every employee
+        :param draft: Write draft payrolls and record their dependencies, for review
+        :param payment_date: Payment date of the payrolls (default: `period_end`)
+        :return: The queued job
+        :rtype: PayrollJobResponse
+        """
+        if period_end < period_start:
+            raise ValidationError("period_end must not be before period_start")
+
+        db = self.session_factory()
+        try:
+            with UnitOfWork(db) as uow:
+                job = uow.payroll_job_repo.create(PayrollJob(
+                    pay_period_start=period_start,
+                    pay_period_end=period_end,
+                    requested_by=user_id,
+                    allowance_type_ids=list(allowance_type_ids),
+                    tax_ids=list(tax_ids),
+                    chunk_size=PAYROLL_BATCH_CHUNK_SIZE,
+                    draft=draft,
+                    payment_date=payment_date,
+                    status=PayrollJobStatus.QUEUED,
+                ))
+                uow.audit_repo.log_action(user_id, "payroll_job_submitted", {"job_id": job.id})
+            response = self._to_response(job)
+        finally:
+            db.close()
+
+        self.executor.submit(self.run_job, response.id)
+        return response
+
+    def get_job(self, job_id: int) -> PayrollJobResponse:
+        """
+        Report a job's progress, throughput and estimated time remaining.
+
+        :param job_id: The job's ID
+        :rtype: PayrollJobResponse
+        """
+        db = self.session_factory()
+        try:
+            job = UnitOfWork(db).payroll_job_repo.get_by_id(job_id)
+            if job is None:
+                raise PayrollJobNotFoundError(f"Payroll job with ID {job_id} not found")
+            return self._to_response(job)
+        finally:
+            db.close()
+
+    def resume_pending(self) -> List[int]:
+        """
+        Schedule unfinished jobs whose owner is gone, e.g. after a restart.
+
+        :return: Ids of the jobs scheduled in this process
+        """
+        db = self.session_factory()
+        try:
+            job_ids = UnitOfWork(db).payroll_job_repo.get_resumable_job_ids(self._stale_before())
+        finally:
+            db.close()
+        for job_id in job_ids:
+            logger.info("Resuming payroll job %d", job_id)
+            self.executor.submit(self.run_job, job_id)
+        return job_ids
+
+    #=========================================================================================
+    # ------------ Execution ------------------------------------------------------------------
+    def run_job(self, job_id: int) -> None:
+        """
+        Claim and execute a job. Returns immediately if another process owns it.
+
+        Counters and the `last_employee_id` watermark only advance over
+        contiguous finished chunks. Chunks that finished out of order before
+        a crash are picked up again on resume, where their employees already
+        have payrolls and are counted as skipped.
+        """
+        db = self.session_factory()
+        try:
+            with UnitOfWork(db) as uow:
+                if not uow.payroll_job_repo.claim(job_id, _WORKER_ID, self._stale_before()):
+                    logger.info("Payroll job %d is owned by another worker", job_id)
+                    return
+            with UnitOfWork(db) as uow:
+                job = uow.payroll_job_repo.get_by_id(job_id)
+                if job.total_employees is None:
+                    job.total_employees = len(uow.employee_repo.get_all_employee_ids())
+                employee_ids = uow.employee_repo.get_all_employee_ids(after_id=job.last_employee_id)
+                period_start, period_end = job.pay_period_start, job.pay_period_end
+                allowance_type_ids, tax_ids, chunk_size = job.allowance_type_ids, job.tax_ids, job.chunk_size
+                draft, payment_date = job.draft, job.payment_date
+                user_id = job.requested_by
+        finally:
+            db.close()
+
+        heartbeat = _Heartbeat(self.session_factory, job_id, self.heartbeat_interval)
+        heartbeat.start()
+        try:
+            runner = self.runner_factory(chunk_size)
+            pending, skipped = runner.pending_employee_ids(period_start, period_end, employee_ids, draft=draft)
+            if not self._record_progress(job_id, skipped=skipped):
+                heartbeat.lost.set()
+
+            finished: Dict[int, PayrollBatchChunkReport] = {}
+            chunk_ids: Dict[int, Sequence[int]] = {}
+            next_chunk = [1]
+
+            def on_chunk(report: PayrollBatchChunkReport, ids: Sequence[int]) -> None:
+                finished[report.chunk], chunk_ids[report.chunk] = report, ids
+                contiguous = []
+                while next_chunk[0] in finished:
+                    contiguous.append(finished.pop(next_chunk[0]))
+                    next_chunk[0] += 1
+                watermark = max(chunk_ids[contiguous[-1].chunk]) if contiguous else None
+                if not self._record_progress(job_id, reports=contiguous, last_employee_id=watermark):
+                    heartbeat.lost.set()
+
+            runner.run(
+                period_start,
+                period_end,
+                user_id,
+                employee_ids=pending,
+                allowance_type_ids=allowance_type_ids,
+                tax_ids=tax_ids,
+                on_chunk=on_chunk,
+                draft=draft,
+                payment_date=payment_date,
+                stop=heartbeat.lost,
+            )
+            if heartbeat.lost.is_set():
+                logger.warning("Payroll job %d was taken over by another worker; stopped", job_id)
+                return
+            self._finish(job_id, PayrollJobStatus.COMPLETED)
+        except Exception as e:
+            logger.exception("Payroll job %d failed", job_id)
+            self._finish(job_id, PayrollJobStatus.FAILED, error_message=str(e))
+        finally:
+            heartbeat.stop()
+
+    def _record_progress(
+            self,
+            job_id: int,
+            reports: Sequence[PayrollBatchChunkReport] = (),
+            skipped: int = 0,
+            last_employee_id: Optional[int] = None,
+    ) -> bool:
+        """Fold finished chunks into the job row and refresh the heartbeat; False if the job was taken over."""
+        db = self.session_factory()
+        try:
+            with UnitOfWork(db) as uow:
+                job = uow.payroll_job_repo.get_owned(job_id, _WORKER_ID)
+                if job is None:
+                    return False
+                succeeded = sum(report.succeeded for report in reports)
+                failures = [failure.model_dump() for report in reports for failure in report.failed]
+                job.succeeded += succeeded
+                job.failed += len(failures)
+                job.skipped += skipped
+                job.processed += succeeded + len(failures) + skipped
+                if failures and len(job.errors) < _MAX_STORED_ERRORS:
+                    job.errors = (job.errors + failures)[:_MAX_STORED_ERRORS]
+                if last_employee_id is not None:
+                    job.last_employee_id = last_employee_id
+                job.heartbeat_at = datetime.utcnow()
+            return True
+        finally:
+            db.close()
+
+    def _finish(self, job_id: int, status: PayrollJobStatus, error_message: Optional[str] = None) -> None:
+        db = self.session_factory()
+        try:
+            with UnitOfWork(db) as uow:
+                job = uow.payroll_job_repo.get_owned(job_id, _WORKER_ID)
+                if job is None:
+                    logger.warning("Payroll job %d was taken over by another worker; not marked %s",
+                                   job_id, status.value)
+                    return
+                job.status = status
+                job.error_message = error_message
+                job.finished_at = datetime.utcnow()
+                job.heartbeat_at = job.finished_at
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_response(job: PayrollJob) -> PayrollJobResponse:
+        throughput = eta = None
+        if job.started_at is not None and job.processed:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+            if elapsed > 0:
+                throughput = job.processed / elapsed
+                if job.total_employees is not None and job.status == PayrollJobStatus.RUNNING:
+                    eta = max(job.total_employees - job.processed, 0) / throughput
+        return PayrollJobResponse(
+            id=job.id,
+            status=job.status.value,
+            period_start=job.pay_period_start,
+            period_end=job.pay_period_end,
+            total=job.total_employees,
+            processed=job.processed or 0,
+            succeeded=job.succeeded or 0,
+            failed=job.failed or 0,
+            skipped=job.skipped or 0,
+            throughput_per_second=throughput,
+            eta_seconds=eta,
+            errors=[PayrollBatchFailure(**error) for error in (job.errors or [])],
+            error_message=job.error_message,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
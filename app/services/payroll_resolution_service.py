@@ -8,8 +8,23 @@ from app.services.insurance_service import InsuranceService
 from app.services.pension_service import PensionService
 from app.services.department_service import DepartmentService
 from app.services.user_service import EmployeeService
-from datetime import date
-from app.schemas.payroll_schema import ResolvedPayrollInputs
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.payroll_input_repo import PayrollInputRepository
+from app.payroll.rule_cache import RuleSet
+from app.payroll.salary_timeline import SalaryTimelineCache
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence
+from app.schemas.payroll_schema import (
+    ResolvedPayrollInputs,
+    ResolvedAllowance,
+    ResolvedAttendance,
+    ResolvedLoan,
+    ResolvedInsurance,
+    ResolvedPension,
+)
+from app.domain.enums import AllowanceCalculationType, AllowanceStatus
+from app.domain.exceptions.base import DomainError, EmployeeNotFoundError, SalaryNotFoundError
 
 
 
@@ -24,7 +39,8 @@ class PayrollResolutionService:
         self.insurance_service = InsuranceService(db)
         self.pension_service = PensionService(db)
         self.department_service = DepartmentService(db)
-        self.user_service = EmployeeService(db)
+        self.user_service = EmployeeService(UnitOfWork(db))
+        self.input_repo = PayrollInputRepository(db)
 
     def get_employee(self, employee_id:int):
         employee = self.user_service.get_employee_by_id(employee_id)
@@ -62,9 +78,9 @@ class PayrollResolutionService:
         loan = self.loan_service.get_employee_loan(employee_id)
         return loan
     
-    def get_attendance(self, employee_id:int):
-        attendance = self.attendance_service.get_employee_attendance(employee_id)
-        return attendance
+    def get_attendance(self, employee_id:int, period_start:date, period_end:date):
+        attendance = self.input_repo.get_attendance_totals([employee_id], period_start, period_end)
+        return attendance.get(employee_id, (0, 0))
     
     def get_pension_details(self, employee_id:int):
         pension = self.pension_service.get_employee_pension(employee_id)
@@ -88,30 +104,143 @@ class PayrollResolutionService:
             period_start:date,
             period_end:date
     )->ResolvedPayrollInputs:
-        employee = self.get_employee(employee_id)
-        base_salary = self.get_base_salary(employee_id)
+        """
+        Resolve payroll inputs for a single employee.
 
-        if base_salary is None:
-            position = self.get_position(employee_id)
-            base_salary = self.get_current_position_salary(position.id)
-        
-        allowances = self.get_allowance_type(allowance_type_id)
-        tax_brackets = self.get_tax_details(tax_id)
-        attendance = self.get_attendance(employee_id)
-        loans = self.get_loan_details(employee_id)
-        insurance = self.get_insurance_details(employee_id)
-        pension = self.get_pension_details(employee_id)
-        
-        return ResolvedPayrollInputs(
-        employee=employee.id,
-        base_salary=base_salary,
-        allowances=allowances,
-        tax_brackets=tax_brackets,
-        hours_worked=attendance.hours_worked,
-        overtime_hours=attendance.overtime_hours,
-        loans=loans,
-        insurance_contribution=insurance.employee_contribution,
-        pension_contribution=pension.monthly_contribution,
-        period_start=period_start,
-        period_end=period_end
-    )
\ No newline at end of file
+        Thin wrapper over `resolve_many` for a cohort of one.
+        """
+        return self.resolve_many(
+            [employee_id],
+            period_start,
+            period_end,
+            allowance_type_ids=[allowance_type_id] if allowance_type_id else (),
+            tax_ids=[tax_id] if tax_id else (),
+        )[0]
+
+    def resolve_many(
+            self,
+            employee_ids: Sequence[int],
+            period_start: date,
+            period_end: date,
+            allowance_type_ids: Iterable[int] = (),
+            tax_ids: Iterable[int] = (),
+            errors: Optional[Dict[int, str]] = None,
+            salary_timelines: Optional[SalaryTimelineCache] = None,
+            rules: Optional[RuleSet] = None,
+    ) -> List[ResolvedPayrollInputs]:
+        """
+        Resolve payroll inputs for a whole cohort of employees.
+
+        Each source table is read once for the entire cohort, so the number
+        of queries is the same for one employee or ten thousand. Nothing is
+        written; in particular no audit rows are produced.
+
+        :param employee_ids: Employees to resolve
+        :param period_start: First day of the pay period
+        :param period_end: Last day of the pay period
+        :param allowance_type_ids: Allowance types applied to every employee
+        :param tax_ids: Tax rules applied to every employee, ahead of statutory deductions
+        :param errors: When given, employees that cannot be resolved are recorded
+            here (employee id -> message) and skipped instead of raising
+        :param salary_timelines: Salary timelines to reuse across calls, e.g. when
+            resolving several periods for the same cohort; loaded for this call otherwise
+        :param rules: Compiled rule snapshot, e.g. `rules_for(db)`; only the rules
+            this call needs are loaded otherwise
+        :return: Resolved inputs in the order of `employee_ids`
+        :rtype: List[ResolvedPayrollInputs]
+        """
+        employee_ids = list(dict.fromkeys(employee_ids))
+        if not employee_ids:
+            return []
+        allowance_type_ids, tax_ids = list(allowance_type_ids), list(tax_ids)
+
+        repo = self.input_repo
+        employees = repo.get_employees(employee_ids)
+        start, end = datetime.combine(period_start, time.min), datetime.combine(period_end, time.max)
+        timelines = salary_timelines or SalaryTimelineCache(repo)
+        timelines.load(employee_ids)
+        timelines.load((), [
+            emp["position_id"] for emp_id, emp in employees.items()
+            if timelines.employee(emp_id).amount_during(start, end) is None
+        ])
+        if rules is None:
+            rules = RuleSet.from_rows(
+                deduction_types=repo.get_statutory_deduction_types(),
+                taxes=repo.get_tax_rules(tax_ids),
+                allowance_types=repo.get_allowance_types(allowance_type_ids),
+            )
+        allowance_types = [
+            allowance_type for allowance_type in rules.allowance_types_for(allowance_type_ids)
+            if allowance_type.status in (None, AllowanceStatus.ACTIVE)
+        ]
+        deduction_rules = rules.engine_rules(tax_ids)
+        attendance = repo.get_attendance_totals(employee_ids, period_start, period_end)
+        loans = repo.get_loan_totals(employee_ids)
+        insurance = repo.get_insurance_totals(employee_ids, period_start, period_end)
+        pensions = repo.get_pension_totals(employee_ids, period_end)
+
+        resolved = []
+        for employee_id in employee_ids:
+            try:
+                employee = employees.get(employee_id)
+                if employee is None:
+                    raise EmployeeNotFoundError(f"Employee with ID {employee_id} not found")
+
+                amount = timelines.employee(employee_id).amount_during(start, end)
+                salary_source = "employee"
+                if amount is None and employee["position_id"] is not None:
+                    amount = timelines.position(employee["position_id"]).amount_during(start, end)
+                    salary_source = "position"
+                if amount is None:
+                    raise SalaryNotFoundError(f"Salary not found for employee {employee_id}")
+                base_salary = Decimal(amount)
+
+                hours_worked, overtime_hours = attendance.get(employee_id, (0, 0))
+                monthly_repayment, outstanding_balance = loans.get(employee_id, (0, None))
+                resolved.append(ResolvedPayrollInputs(
+                    employee_id=employee_id,
+                    period_start=period_start,
+                    period_end=period_end,
+                    base_salary=base_salary,
+                    allowances=[self._allowance(allowance_type, base_salary) for allowance_type in allowance_types],
+                    attendance=ResolvedAttendance(
+                        hours_worked=Decimal(str(hours_worked)),
+                        overtime_hours=Decimal(str(overtime_hours)),
+                        approved=employee_id in attendance,
+                    ),
+                    statutory_deduction_rules=deduction_rules,
+                    loan=ResolvedLoan(
+                        monthly_repayment=Decimal(monthly_repayment),
+                        outstanding_balance=Decimal(outstanding_balance) if outstanding_balance is not None else None,
+                    ),
+                    insurance=ResolvedInsurance(employee_contribution=Decimal(insurance.get(employee_id, 0))),
+                    pension=ResolvedPension(employee_contribution=Decimal(pensions.get(employee_id, 0))),
+                    position_title=employee["position_title"],
+                    department_name=employee["department_name"],
+                    position_id=employee["position_id"],
+                    salary_source=salary_source,
+                ))
+            except DomainError as e:
+                if errors is None:
+                    raise
+                errors[employee_id] = str(e)
+        return resolved
+
+    @staticmethod
+    def _allowance(allowance_type, base_salary: Decimal) -> ResolvedAllowance:
+        """Resolve an allowance type's amount for one employee."""
+        amount = Decimal(allowance_type.default_amount or 0)
+        if allowance_type.calculation_type == AllowanceCalculationType.PERCENTAGE:
+            # Gross is not known before allowances, so both bases use the base salary
+            amount = (base_salary * amount / Decimal("100")).quantize(Decimal("0.01"))
+        if allowance_type.min_amount is not None:
+            amount = max(amount, Decimal(allowance_type.min_amount))
+        if allowance_type.max_amount is not None:
+            amount = min(amount, Decimal(allowance_type.max_amount))
+        return ResolvedAllowance(
+            allowance_type_id=allowance_type.id,
+            name=allowance_type.name,
+            code=allowance_type.code,
+            amount=amount,
+            is_taxable=allowance_type.is_taxable if allowance_type.is_taxable is not None else True,
+        )
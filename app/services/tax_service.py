@@ -6,6 +6,9 @@ from app.models.tax_model import TaxType, Tax
 from app.models.tax_brackets import TaxBracket
 from app.domain.exceptions.base import DomainError, TaxRuleNotFoundError, InvalidTaxBracketsError
 from datetime import datetime
+from decimal import Decimal
+from app.payroll.bracket_schedule import BracketSchedule
+from app.payroll.rule_cache import TaxRule, rules_for
 
 
 class TaxService:
@@ -72,18 +75,39 @@ class TaxService:
             raise DomainError(f"Failed to add tax rule: {e}")
         return new_tax_rule
     
-    def get_tax_rule(self, tax_id:int):
+    def _load_tax_rule(self, tax_id:int) -> Tax:
+        """Fetch the Tax row itself, for writes."""
         tax_rule = self.db.query(Tax).filter(Tax.id == tax_id).first()
         if not tax_rule:
             raise TaxRuleNotFoundError(f"Tax rule with ID {tax_id} not found")
         return tax_rule
+
+    def get_tax_rule(self, tax_id:int) -> TaxRule:
+        """Return a tax rule from the versioned rule cache, as an immutable copy."""
+        tax_rule = rules_for(self.db).taxes.get(tax_id)
+        if not tax_rule:
+            raise TaxRuleNotFoundError(f"Tax rule with ID {tax_id} not found")
+        return tax_rule
     
+    def get_bracket_schedule(self, tax_id:int) -> BracketSchedule:
+        """
+        Return the compiled bracket schedule for a tax rule.
+
+        The schedule is compiled once per rule set version by the rule cache
+        and shared with the payroll engine.
+        """
+        return self.get_tax_rule(tax_id).schedule or BracketSchedule.from_brackets(())
+
+    def calculate_tax(self, tax_id:int, taxable_income:Decimal) -> Decimal:
+        """Return the tax owed on `taxable_income` under a tiered tax rule."""
+        return self.get_bracket_schedule(tax_id).tax_for(Decimal(taxable_income))
+
     def get_fixed_tax_rules(self, tax_id:int):
         fixed_taxes = self.db.query(Tax).filter(Tax.tax_type == TaxType.FIXED, Tax.id == tax_id).first()
         return fixed_taxes
     
     def update_tax_rule(self, tax_id:int, payload:TaxCreate):
-        tax_rule = self.get_tax_rule(tax_id)
+        tax_rule = self._load_tax_rule(tax_id)
     
         tax_rule.name = payload.name
         tax_rule.description = payload.description
@@ -101,7 +125,7 @@ class TaxService:
         return tax_rule
     
     def update_tax_brackets(self, tax_id:int, brackets:list[TaxBracketCreate]):
-        tax_rule = self.get_tax_rule(tax_id)
+        tax_rule = self._load_tax_rule(tax_id)
         is_valid, error_message = validate_no_overlaps(brackets)
         if not is_valid:
             raise InvalidTaxBracketsError(error_message)
@@ -120,6 +144,8 @@ class TaxService:
                 )
                 self.db.add(new_bracket)
 
+            # Brackets live in their own table, so bump the rule version by hand
+            tax_rule.updated_at = datetime.utcnow()
             self.db.commit()
             self.db.refresh(tax_rule)
         except Exception as e:
@@ -129,7 +155,7 @@ class TaxService:
         return tax_rule
     
     def delete_tax_rule(self, tax_id:int):
-        tax_rule = self.get_tax_rule(tax_id)
+        tax_rule = self._load_tax_rule(tax_id)
         try:
             self.db.delete(tax_rule)
             self.db.commit()
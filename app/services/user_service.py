@@ -257,10 +257,10 @@ class EmployeeService:
         employee = self.uow.employee_repo.get_by_id(employee_id)
         if not employee:
             raise EmployeeNotFoundError(f"Employee with ID {employee_id} not found")
-        self.uow.audit_repo.log_action(
+        self.uow.audit_repo.log_read(
             user_id=employee.user_id,
-            action=f"Retrieved employee {employee_id}",
-            metadata={"employee_id": employee_id}
+            action="employee_read",
+            resource=f"employee:{employee_id}"
         )
         return employee
     
@@ -274,10 +274,10 @@ class EmployeeService:
             raise EmployeeNotFoundError(f"Employee with id: {employee_id} not found")
         if not employee.position:
             raise PositionNotFoundError(f"No position for employee: {employee_id} was found.")
-        self.uow.audit_repo.log_action(
+        self.uow.audit_repo.log_read(
             user_id=employee.user_id,
-            action=f"Retrieved position for employee {employee_id}",
-            metadata={"employee_id": employee_id}
+            action="employee_position_read",
+            resource=f"employee:{employee_id}"
         )
         return employee.position
     
@@ -290,10 +290,10 @@ class EmployeeService:
             raise EmployeeNotFoundError(f"Employee with id: {employee_id} not found.")
         if not employee.department:
             raise DepartmentNotFoundError(f"No departments associated with employee Id: {employee_id}")
-        self.uow.audit_repo.log_action(
+        self.uow.audit_repo.log_read(
             user_id=employee.user_id,
-            action=f"Retrieved department for employee {employee_id}",
-            metadata={"employee_id": employee_id}
+            action="employee_department_read",
+            resource=f"employee:{employee_id}"
         )
         return employee.department
     
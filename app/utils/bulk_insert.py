@@ -0,0 +1,90 @@
+"""Set-based helpers shared by the repositories' bulk methods."""
+
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Set, Union
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+# Values per IN (...) list, well below the bind parameter limits of SQLite and PostgreSQL
+IN_BATCH_SIZE = 500
+
+
+def bulk_insert(
+        session: Session,
+        model,
+        rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]],
+        columns: Optional[Sequence[str]] = None,
+        returning=None,
+) -> List[Any]:
+    """Insert many rows of `model` with a single executemany statement.
+
+    Rows bypass the ORM unit of work: no objects are created and nothing is
+    added to the session's identity map. Python-side column defaults
+    (e.g. `created_at`) are still applied. SQLAlchemy splits large inputs
+    into multi-row `INSERT ... VALUES` pages.
+
+    Args:
+        session: Session whose transaction the insert joins.
+        model: Mapped class to insert into.
+        rows: Dicts keyed by column name, or tuples ordered like `columns`.
+            Every row must provide the same keys.
+        columns: Column names for tuple rows.
+        returning: Optional column to return, e.g. the primary key.
+
+    Returns:
+        The `returning` values in the same order as `rows`, or an empty list.
+    """
+    if not rows:
+        return []
+    if columns is not None:
+        rows = [dict(zip(columns, row)) for row in rows]
+
+    statement = insert(model)
+    if returning is None:
+        session.execute(statement, rows)
+        return []
+    result = session.execute(statement.returning(returning, sort_by_parameter_order=True), rows)
+    return list(result.scalars())
+
+
+
+def dialect_insert(bind, table):
+    """Return an `INSERT` for `table` that supports `on_conflict_do_*` on `bind`'s dialect.
+
+    Args:
+        bind: Engine or connection the statement will run on.
+        table: Table (or mapped class) to insert into.
+
+    Returns:
+        A PostgreSQL or SQLite `Insert`, or None on other databases.
+    """
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    elif bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    else:
+        return None
+    return upsert(table)
+
+
+def existing_values(session: Session, column, values: Iterable[Any], batch_size: int = IN_BATCH_SIZE) -> Set[Any]:
+    """Return which of `values` are already stored in `column`.
+
+    Looks values up with `IN (...)` queries of at most `batch_size` values
+    each, instead of one query per value.
+
+    Args:
+        session: Session to query with.
+        column: Mapped column to look in, e.g. `User.username`.
+        values: Candidate values; duplicates and None are ignored.
+        batch_size: Values per query.
+
+    Returns:
+        The subset of `values` found in `column`.
+    """
+    candidates = sorted({value for value in values if value is not None})
+    found: Set[Any] = set()
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        found.update(session.execute(select(column).where(column.in_(batch))).scalars())
+    return found
@@ -0,0 +1,170 @@
+"""Benchmark attendance hot paths before and after the composite and pending-queue indexes.
+
+Usage:
+    python -m scripts.bench_attendance_indexes [--employees 20000] [--years 5] [--postgres-url URL]
+
+Fills the attendance table with one row per employee per day (20k employees
+over 5 years is 36.5M rows; pass smaller numbers for a quick run). Rows older
+than 30 days are approved, the rest pending. Each hot path is timed on random
+employees and dates without the indexes, then again after creating them:
+
+- the day lookup that check-out uses (employee and date),
+- the latest record that approval uses (employee, newest date first),
+- a page of the pending-approval queue,
+- check-in: read-then-insert before, INSERT ... ON CONFLICT DO NOTHING after.
+
+SQLite runs against a temporary file. PostgreSQL runs when --postgres-url (or
+BENCH_POSTGRES_URL) is given; point it at a scratch database, because all
+tables are dropped and recreated there.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database_setup import Base
+import app.models  # noqa: F401
+from app.domain.enums import AttendanceStatus
+from app.models.attendance_model import Attendance
+from app.models.employee_model import Employee
+from app.models.user_model import User
+from app.repositories.attendance_repo import AttendanceRepository
+
+INDEXES = ("uq_attendance_employee_id_attendance_date", "ix_attendance_pending_attendance_date_id")
+CHUNK_ROWS = 50_000
+
+
+def _indexes():
+    return [index for index in Attendance.__table__.indexes if index.name in INDEXES]
+
+
+def prepare(engine, employees: int, days: int, today: date) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    for index in _indexes():
+        index.drop(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": n, "username": f"bench{n}", "password_hash": "x"}
+                                    for n in range(1, employees + 1)])
+        conn.execute(insert(Employee), [{"id": n, "user_id": n, "hire_date": today - timedelta(days=days)}
+                                        for n in range(1, employees + 1)])
+    approved_before = today - timedelta(days=30)
+    rows = []
+    with engine.begin() as conn:
+        for offset in range(days, 0, -1):
+            day = today - timedelta(days=offset)
+            start = datetime.combine(day, datetime.min.time()) + timedelta(hours=8)
+            status = AttendanceStatus.APPROVED if day < approved_before else AttendanceStatus.PENDING
+            for employee_id in range(1, employees + 1):
+                rows.append({
+                    "employee_id": employee_id, "attendance_date": day, "check_in": start,
+                    "check_out": start + timedelta(hours=9), "regular_hours": 8.0, "overtime_hours": 1.0,
+                    "hours_worked": 9.0, "approved": status,
+                })
+                if len(rows) >= CHUNK_ROWS:
+                    conn.execute(insert(Attendance), rows)
+                    rows = []
+        if rows:
+            conn.execute(insert(Attendance), rows)
+
+
+def _timings(sessions, samples: int, fn) -> list:
+    timings = []
+    with sessions() as db:
+        repo = AttendanceRepository(db)
+        for _ in range(samples):
+            started = time.perf_counter()
+            fn(db, repo)
+            timings.append((time.perf_counter() - started) * 1000)
+            db.rollback()
+    return timings
+
+
+def _check_in_before(employees: int, today: date):
+    def run(db, repo):
+        employee_id = random.randint(1, employees)
+        if repo.get_by_employee_and_date(employee_id, today) is None:
+            repo.save_attendance(Attendance(employee_id=employee_id, attendance_date=today,
+                                            check_in=datetime.now()))
+            db.flush()
+    return run
+
+
+def _check_in_after(employees: int, today: date):
+    def run(db, repo):
+        repo.insert_if_absent(Attendance(employee_id=random.randint(1, employees), attendance_date=today,
+                                         check_in=datetime.now()))
+    return run
+
+
+def hot_paths(employees: int, days: int, today: date) -> dict:
+    def random_day():
+        return today - timedelta(days=random.randint(1, days))
+    return {
+        "day lookup": lambda db, repo: repo.get_by_employee_and_date(random.randint(1, employees), random_day()),
+        "latest record": lambda db, repo: repo.get_attendance(random.randint(1, employees)),
+        "pending page": lambda db, repo: repo.get_pending_approvals(limit=100),
+    }
+
+
+def _percentiles(timings: list) -> tuple:
+    ordered = sorted(timings)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95) - 1]
+
+
+def bench(label: str, url: str, employees: int, years: int, samples: int) -> None:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    today, days = date.today(), years * 365
+    try:
+        started = time.perf_counter()
+        prepare(engine, employees, days, today)
+        print(f"{label}: {employees * days:,} rows loaded in {time.perf_counter() - started:.1f}s")
+
+        paths = hot_paths(employees, days, today)
+        before = {name: _timings(sessions, samples, fn) for name, fn in paths.items()}
+        before["check-in"] = _timings(sessions, samples, _check_in_before(employees, today))
+
+        started = time.perf_counter()
+        for index in _indexes():
+            index.create(engine)
+        print(f"{label}: indexes built in {time.perf_counter() - started:.1f}s")
+
+        after = {name: _timings(sessions, samples, fn) for name, fn in paths.items()}
+        after["check-in"] = _timings(sessions, samples, _check_in_after(employees, today))
+
+        print(f"{'path':>14} {'before p50':>11} {'before p95':>11} {'after p50':>10} {'after p95':>10} {'speedup':>8}")
+        for name in before:
+            (b50, b95), (a50, a95) = _percentiles(before[name]), _percentiles(after[name])
+            print(f"{name:>14} {b50:>9.3f}ms {b95:>9.3f}ms {a50:>8.3f}ms {a95:>8.3f}ms {b50 / a50:>7.1f}x")
+        Base.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=20_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("sqlite", f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.employees, args.years, args.samples)
+    if args.postgres_url:
+        bench("postgresql", args.postgres_url, args.employees, args.years, args.samples)
+    else:
+        print("PostgreSQL skipped: pass --postgres-url or set BENCH_POSTGRES_URL")
+
+
+if __name__ == "__main__":
+    main()
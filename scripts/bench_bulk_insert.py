@@ -0,0 +1,147 @@
+"""Benchmark ORM inserts against the repositories' bulk_create path for payroll output.
+
+Usage:
+    python -m scripts.bench_bulk_insert [--employees 1000 10000] [--postgres-url URL]
+
+Each employee produces one Payroll row, 3 Allowance rows and 4 Deduction rows.
+The ORM path adds objects to the session one by one; the bulk path calls
+PayrollRepository/AllowanceRepository/DeductionRepository.bulk_create. Both
+write everything in a single transaction.
+
+SQLite runs against a temporary file. PostgreSQL runs when --postgres-url (or
+BENCH_POSTGRES_URL) is given; point it at a scratch database, because the
+payroll tables are dropped and recreated there.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database_setup import Base
+import app.models  # noqa: F401
+from app.core.unit_of_work import UnitOfWork
+from app.models.allowances_model import Allowance, AllowanceType
+from app.models.deductions_model import Deduction, DeductionType
+from app.models.employee_model import Employee
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.user_model import User
+
+
+PERIOD_START, PERIOD_END = date(2025, 12, 1), date(2025, 12, 31)
+ALLOWANCES = [(1, "Housing", "HOUS"), (2, "Meal", "MEAL"), (3, "Transport", "TRAN")]
+DEDUCTIONS = [(1, "PAYE"), (2, "SHIF"), (3, "NSSF"), (4, "AHL")]
+
+
+def _payroll_values(employee_id: int) -> dict:
+    return {
+        "employee_id": employee_id,
+        "pay_period_start": PERIOD_START,
+        "pay_period_end": PERIOD_END,
+        "payment_date": PERIOD_END,
+        "total_allowances": Decimal("7500.00"),
+        "total_deductions": Decimal("12000.00"),
+        "tax_amount": Decimal("9000.00"),
+        "gross_salary": Decimal("57500.00"),
+        "net_salary": Decimal("45500.00"),
+        "status": PayrollStatus.PROCESSED,
+    }
+
+
+def _allowance_values(type_id, name, code) -> dict:
+    return {"allowance_type_id": type_id, "name": name, "code": code, "amount": Decimal("2500.00"), "is_taxable": True}
+
+
+def _deduction_values(type_id) -> dict:
+    return {"deduction_type_id": type_id, "amount": Decimal("3000.00"), "is_percentage": False}
+
+
+def prepare(engine, employees: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(id=1, username="bench", password_hash="x"))
+        db.flush()
+        db.add_all(AllowanceType(id=i, name=name, code=code) for i, name, code in ALLOWANCES)
+        db.add_all(DeductionType(id=i, name=code, code=code) for i, code in DEDUCTIONS)
+        db.flush()
+        db.add_all(Employee(id=i, user_id=1) for i in range(1, employees + 1))
+        db.commit()
+
+
+def clear(engine) -> None:
+    with engine.begin() as conn:
+        for model in (Allowance, Deduction, Payroll):
+            conn.execute(delete(model))
+
+
+def orm_path(sessions, employees: int) -> None:
+    with sessions() as db:
+        with UnitOfWork(db) as uow:
+            for employee_id in range(1, employees + 1):
+                payroll = Payroll(**_payroll_values(employee_id))
+                payroll.allowances = [Allowance(**_allowance_values(*a)) for a in ALLOWANCES]
+                payroll.deductions = [Deduction(**_deduction_values(d[0])) for d in DEDUCTIONS]
+                uow.payroll_repo.create(payroll)
+
+
+def bulk_path(sessions, employees: int) -> None:
+    with sessions() as db:
+        with UnitOfWork(db) as uow:
+            ids = uow.payroll_repo.bulk_create([_payroll_values(i) for i in range(1, employees + 1)])
+            uow.allowance_repo.bulk_create([
+                {**_allowance_values(*a), "payroll_id": payroll_id} for payroll_id in ids for a in ALLOWANCES
+            ])
+            uow.deduction_repo.bulk_create([
+                {**_deduction_values(d[0]), "payroll_id": payroll_id} for payroll_id in ids for d in DEDUCTIONS
+            ])
+
+
+def _timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def bench(label: str, url: str, sizes, repeat: int) -> None:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        for size in sizes:
+            prepare(engine, size)
+            orm, bulk = float("inf"), float("inf")
+            for _ in range(repeat):
+                orm = min(orm, _timed(orm_path, sessions, size))
+                clear(engine)
+                bulk = min(bulk, _timed(bulk_path, sessions, size))
+                clear(engine)
+            rows = size * (1 + len(ALLOWANCES) + len(DEDUCTIONS))
+            print(f"{label:>10} {size:>10} {orm:>10.3f} {bulk:>10.3f} {orm / bulk:>7.2f}x {rows / bulk:>12.0f}")
+        Base.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    print(f"{'backend':>10} {'employees':>10} {'orm (s)':>10} {'bulk (s)':>10} {'speedup':>8} {'bulk rows/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("sqlite", f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.employees, args.repeat)
+    if args.postgres_url:
+        bench("postgresql", args.postgres_url, args.employees, args.repeat)
+    else:
+        print("PostgreSQL skipped: pass --postgres-url or set BENCH_POSTGRES_URL")
+
+
+if __name__ == "__main__":
+    main()
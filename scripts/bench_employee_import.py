@@ -0,0 +1,111 @@
+"""Benchmark one-by-one employee creation against the bulk employee import.
+
+Usage:
+    python -m scripts.bench_employee_import [--employees 100 500] [--hash-workers 0] [--postgres-url URL]
+
+The single path calls EmployeeService.create_employee once per employee, with
+its own lookups, Argon2 hash and transaction. The import path hands every
+row to EmployeeImportService.import_employees: set-based lookups, temporary
+passwords hashed in a process pool (--hash-workers, 0 = one per CPU) and
+batched inserts. Argon2 dominates both; --skip-single leaves the slow path out.
+
+SQLite runs against a temporary file. PostgreSQL runs when --postgres-url (or
+BENCH_POSTGRES_URL) is given; point it at a scratch database, because all
+tables are dropped and recreated there.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database_setup import Base
+import app.models  # noqa: F401
+from app.core.unit_of_work import UnitOfWork
+from app.models.Position_model import Position
+from app.models.department_model import Department
+from app.models.roles_model import Role
+from app.schemas.employee_schema import EmployeeCreate
+from app.services.employee_import_service import EmployeeImportService
+from app.services.user_service import EmployeeService
+
+
+def _row(n: int, prefix: str) -> dict:
+    return {
+        "first_name": "Bench", "last_name": f"Employee{n}", "username": f"{prefix}{n}", "gender": "F",
+        "date_of_birth": "1990-05-01", "role_name": "employee", "department_name": "Finance",
+        "position_title": "Accountant", "date_hired": "2024-01-15", "email": f"{prefix}{n}@example.com",
+        "phone": f"07{ord(prefix[0]) % 10}{n:07d}", "bank_name": "KCB", "account_number": f"{prefix.upper()}-{n:08d}",
+    }
+
+
+def prepare(engine) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Role(id=1, role_name="employee"))
+        db.add(Department(id=1, name="Finance"))
+        db.flush()
+        db.add(Position(id=1, title="Accountant", department_id=1))
+        db.commit()
+
+
+def single_path(sessions, employees: int) -> None:
+    for n in range(employees):
+        with sessions() as db:
+            EmployeeService(UnitOfWork(db)).create_employee(EmployeeCreate(**_row(n, "single")))
+
+
+def import_path(sessions, employees: int, hash_workers: int) -> None:
+    with sessions() as db:
+        report = EmployeeImportService(UnitOfWork(db), hash_workers=hash_workers).import_employees(
+            [(n, _row(n, "bulk")) for n in range(1, employees + 1)]
+        )
+    assert report.created == employees, report.results[0].errors
+
+
+def _timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def bench(label: str, url: str, sizes, hash_workers: int, skip_single: bool) -> None:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        for size in sizes:
+            prepare(engine)
+            single = float("nan") if skip_single else _timed(single_path, sessions, size)
+            bulk = _timed(import_path, sessions, size, hash_workers)
+            print(f"{label:>10} {size:>10} {single:>10.2f} {bulk:>10.2f} {single / bulk:>7.2f}x "
+                  f"{size / single:>10.1f} {size / bulk:>10.1f}")
+        Base.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--hash-workers", type=int, default=0)
+    parser.add_argument("--skip-single", action="store_true")
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    print(f"{'backend':>10} {'employees':>10} {'single (s)':>10} {'import (s)':>10} {'speedup':>8} "
+          f"{'single/s':>10} {'import/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("sqlite", f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.employees, args.hash_workers,
+              args.skip_single)
+    if args.postgres_url:
+        bench("postgresql", args.postgres_url, args.employees, args.hash_workers, args.skip_single)
+    else:
+        print("PostgreSQL skipped: pass --postgres-url or set BENCH_POSTGRES_URL")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark PayrollEngine.compute (per employee) against PayrollEngine.compute_batch.
+
+Usage:
+    python -m scripts.bench_payroll_engine [--sizes 1000 10000 100000] [--repeat 3]
+
+Both paths are fed the same synthetic pay period. The script also checks that
+the batch results match the scalar results cent for cent. The cyclic garbage
+collector is paused while a run is timed (pass --gc to keep it running), so
+collection pauses do not skew the comparison.
+"""
+import argparse
+import gc
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from app.payroll.payroll_engine import PayrollEngine
+from app.schemas.payroll_schema import (
+    ResolvedPayrollInputs,
+    ResolvedAllowance,
+    ResolvedAttendance,
+    ResolvedDeductionRule,
+    ResolvedLoan,
+    ResolvedInsurance,
+    ResolvedPension,
+)
+
+
+RULES = [
+    ResolvedDeductionRule(
+        deduction_type_id=1, name="PAYE", code="PAYE", is_statutory=True, has_brackets=True,
+        brackets=[
+            {"min_amount": Decimal("0"), "max_amount": Decimal("24000"), "rate": Decimal("10")},
+            {"min_amount": Decimal("24000"), "max_amount": Decimal("32333"), "rate": Decimal("25")},
+            {"min_amount": Decimal("32333"), "max_amount": Decimal("500000"), "rate": Decimal("30")},
+            {"min_amount": Decimal("500000"), "max_amount": Decimal("800000"), "rate": Decimal("32.5")},
+            {"min_amount": Decimal("800000"), "max_amount": None, "rate": Decimal("35")},
+        ],
+    ),
+    ResolvedDeductionRule(
+        deduction_type_id=2, name="SHIF", code="SHIF", is_statutory=True, has_brackets=False,
+        rate=Decimal("2.75"),
+    ),
+    ResolvedDeductionRule(
+        deduction_type_id=3, name="Housing Levy", code="AHL", is_statutory=True, has_brackets=False,
+        rate=Decimal("1.5"),
+    ),
+]
+
+
+def make_inputs(count: int, seed: int = 42) -> list[ResolvedPayrollInputs]:
+    rng = random.Random(seed)
+    inputs = []
+    for employee_id in range(1, count + 1):
+        base = Decimal(rng.randrange(1_500_000, 50_000_000)) / Decimal(100)
+        inputs.append(ResolvedPayrollInputs(
+            employee_id=employee_id,
+            period_start=date(2025, 12, 1),
+            period_end=date(2025, 12, 31),
+            base_salary=base,
+            allowances=[
+                ResolvedAllowance(allowance_type_id=1, name="Housing", code="HOUS",
+                                  amount=(base * Decimal("0.15")).quantize(Decimal("0.01"))),
+                ResolvedAllowance(allowance_type_id=2, name="Meal", code="MEAL",
+                                  amount=Decimal("2500.00"), is_taxable=False),
+            ],
+            attendance=ResolvedAttendance(overtime_hours=Decimal(rng.randrange(0, 2000)) / Decimal(100)),
+            statutory_deduction_rules=RULES,
+            loan=ResolvedLoan(monthly_repayment=Decimal(rng.choice([0, 0, 0, 5000]))),
+            insurance=ResolvedInsurance(employee_contribution=Decimal("500")),
+            pension=ResolvedPension(employee_contribution=min(base * Decimal("0.06"), Decimal("4320"))),
+        ))
+    return inputs
+
+
+def _best_of(repeat: int, fn, collect: bool = False):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        if not collect:
+            gc.disable()
+        try:
+            started = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--gc", action="store_true", help="keep the garbage collector running while timing")
+    args = parser.parse_args()
+
+    engine = PayrollEngine()
+    print(f"{'employees':>10} {'scalar (s)':>12} {'batch (s)':>12} {'speedup':>8} {'batch emp/s':>12}")
+    for size in args.sizes:
+        inputs = make_inputs(size)
+        scalar_time, scalar = _best_of(args.repeat, lambda: [engine.compute(item) for item in inputs], args.gc)
+        batch_time, batch = _best_of(args.repeat, lambda: engine.compute_batch(inputs), args.gc)
+
+        mismatches = sum(1 for a, b in zip(scalar, batch) if a.model_dump() != b.model_dump())
+        if mismatches:
+            raise SystemExit(f"{mismatches} of {size} batch results differ from the scalar path")
+
+        print(f"{size:>10} {scalar_time:>12.3f} {batch_time:>12.3f} "
+              f"{scalar_time / batch_time:>7.2f}x {size / batch_time:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark salary-as-of-date: one indexed query per lookup vs a bisect on cached timelines.
+
+Usage:
+    python -m scripts.bench_salary_timeline [--employees 5000] [--changes 6] [--dates 24] [--postgres-url URL]
+
+Gives every employee `--changes` salary changes, then resolves the salary on
+`--dates` month ends per employee, as a retro-pay run over two years would:
+
+- query: the `get_effective_employee_salary` query for each (employee, date),
+  timed without and with the (employee_id, effective_from) index;
+- timeline: `SalaryTimelineCache` loaded for the cohort in one query, then a
+  bisect per (employee, date).
+
+SQLite runs against a temporary file. PostgreSQL runs when --postgres-url (or
+BENCH_POSTGRES_URL) is given; point it at a scratch database, because all
+tables are dropped and recreated there.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database_setup import Base
+import app.models  # noqa: F401
+from app.models.employee_model import Employee
+from app.models.salary_model import EmployeeSalary
+from app.models.user_model import User
+from app.payroll.salary_timeline import SalaryTimelineCache
+from app.repositories.payroll_input_repo import PayrollInputRepository
+
+INDEX = "ix_employee_salaries_employee_id_effective_from"
+
+
+def _index():
+    return next(index for index in EmployeeSalary.__table__.indexes if index.name == INDEX)
+
+
+def prepare(engine, employees: int, changes: int, start: date) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _index().drop(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": n, "username": f"bench{n}", "password_hash": "x"}
+                                    for n in range(1, employees + 1)])
+        conn.execute(insert(Employee), [{"id": n, "user_id": n, "hire_date": start}
+                                        for n in range(1, employees + 1)])
+        conn.execute(insert(EmployeeSalary), [
+            {"employee_id": n, "amount": Decimal(40000 + 1000 * change), "created_by": 1,
+             "effective_from": datetime.combine(start, datetime.min.time()) + timedelta(days=120 * change)}
+            for n in range(1, employees + 1) for change in range(changes)
+        ])
+
+
+def _month_ends(start: date, count: int):
+    days = []
+    year, month = start.year, start.month
+    for _ in range(count):
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        days.append(date(year, month, 1) - timedelta(days=1))
+    return days
+
+
+def by_query(db, employees: int, days) -> float:
+    started = time.perf_counter()
+    for employee_id in range(1, employees + 1):
+        for day in days:
+            (
+                db.query(EmployeeSalary)
+                .filter(EmployeeSalary.employee_id == employee_id, EmployeeSalary.effective_from <= day)
+                .filter((EmployeeSalary.effective_to == None) | (EmployeeSalary.effective_to >= day))  # noqa: E711
+                .order_by(EmployeeSalary.effective_from.desc())
+                .first()
+            )
+    return time.perf_counter() - started
+
+
+def by_timeline(db, employees: int, days) -> float:
+    started = time.perf_counter()
+    cache = SalaryTimelineCache(PayrollInputRepository(db))
+    cache.load(list(range(1, employees + 1)))
+    for employee_id in range(1, employees + 1):
+        for day in days:
+            cache.amount_on(employee_id, None, day)
+    return time.perf_counter() - started
+
+
+def bench(label: str, url: str, employees: int, changes: int, dates: int) -> None:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    start = date(2024, 1, 1)
+    days = _month_ends(start, dates)
+    lookups = employees * len(days)
+    try:
+        prepare(engine, employees, changes, start)
+        with sessions() as db:
+            no_index = by_query(db, employees, days)
+        _index().create(engine)
+        with sessions() as db:
+            indexed = by_query(db, employees, days)
+            timeline = by_timeline(db, employees, days)
+
+        print(f"{label}: {employees:,} employees x {len(days)} dates = {lookups:,} lookups")
+        print(f"{'method':>18} {'seconds':>9} {'lookups/s':>11}")
+        for name, seconds in (("query, no index", no_index), ("query, indexed", indexed), ("timeline", timeline)):
+            print(f"{name:>18} {seconds:>9.2f} {lookups / seconds:>11,.0f}")
+        Base.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5_000)
+    parser.add_argument("--changes", type=int, default=6)
+    parser.add_argument("--dates", type=int, default=24)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("sqlite", f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.employees, args.changes, args.dates)
+    if args.postgres_url:
+        bench("postgresql", args.postgres_url, args.employees, args.changes, args.dates)
+    else:
+        print("PostgreSQL skipped: pass --postgres-url or set BENCH_POSTGRES_URL")
+
+
+if __name__ == "__main__":
+    main()
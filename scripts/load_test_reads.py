@@ -0,0 +1,142 @@
+"""Load-test the sync and async read paths for employee payslip views.
+
+Usage:
+    python -m scripts.load_test_reads [--employees 2000] [--requests 2000] [--concurrency 10 50 200]
+                                      [--postgres-url URL]
+
+Two endpoints serve the same query, PayrollRepository.get_by_employee. One is a
+plain `def` handler on a `get_db`-style Session, which FastAPI runs in its
+threadpool. The other is an `async def` handler on AsyncPayrollRepository and
+an AsyncSession. Both engines come from `build_engine`/`build_async_engine`, so
+they use the same pool limits. Requests are sent in-process through
+httpx.ASGITransport, which leaves out network and auth and measures only the
+handler and database path.
+
+SQLite runs against a temporary file. PostgreSQL runs when --postgres-url (or
+BENCH_POSTGRES_URL) is given. Point it at a scratch database, because the tables
+are dropped and recreated there.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.database_setup import Base, build_async_engine, build_engine, request_sessions
+import app.models  # noqa: F401
+from app.models.employee_model import Employee
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.repositories.payroll_repo import AsyncPayrollRepository, PayrollRepository
+from app.schemas.payroll_schema import PayslipResponse
+
+
+def seed(url: str, employees: int) -> None:
+    engine = build_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(Employee(id=employee_id, user_id=employee_id) for employee_id in range(1, employees + 1))
+    db.add_all(
+        Payroll(employee_id=employee_id, pay_period_start=date(2025, month, 1), pay_period_end=date(2025, month, 28),
+                payment_date=date(2025, month, 28), gross_salary=Decimal("57500.00"), net_salary=Decimal("45500.00"),
+                status=PayrollStatus.PAID)
+        for employee_id in range(1, employees + 1) for month in range(1, 13)
+    )
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+def build_app(url: str):
+    engine = build_engine(url)
+    async_engine = build_async_engine(url)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    get_db = request_sessions(sessions)
+
+    async def get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/{employee_id}", response_model=List[PayslipResponse])
+    def sync_payslips(employee_id: int, db: Session = Depends(get_db)):
+        return PayrollRepository(db).get_by_employee(employee_id)
+
+    @app.get("/async/{employee_id}", response_model=List[PayslipResponse])
+    async def async_payslips(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+        return await AsyncPayrollRepository(db).get_by_employee(employee_id)
+
+    return app, engine, async_engine
+
+
+async def hammer(client: httpx.AsyncClient, path: str, employees: int, requests: int, concurrency: int):
+    latencies: List[float] = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for _ in queue:
+            started = time.perf_counter()
+            response = await client.get(f"/{path}/{random.randint(1, employees)}")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return (
+        requests / elapsed,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    )
+
+
+async def bench(label: str, url: str, employees: int, requests: int, levels) -> None:
+    seed(url, employees)
+    app, engine, async_engine = build_app(url)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for concurrency in levels:
+                for path in ("sync", "async"):
+                    await hammer(client, path, employees, min(requests, 100), concurrency)  # warm up
+                    rate, p50, p95 = await hammer(client, path, employees, requests, concurrency)
+                    print(f"{label:>10} {path:>6} {concurrency:>11} {rate:>10.0f} {p50:>9.1f} {p95:>9.1f}")
+    finally:
+        await async_engine.dispose()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    print(f"{'backend':>10} {'path':>6} {'concurrency':>11} {'req/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(bench("sqlite", url, args.employees, args.requests, args.concurrency))
+    if args.postgres_url:
+        asyncio.run(bench("postgresql", args.postgres_url, args.employees, args.requests, args.concurrency))
+    else:
+        print("PostgreSQL skipped: pass --postgres-url or set BENCH_POSTGRES_URL")
+
+
+if __name__ == "__main__":
+    main()
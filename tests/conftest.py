@@ -0,0 +1,91 @@
+"""Shared database fixtures.
+
+`engine` is a fresh database with every table, in memory by default and shared
+by all threads through a single connection. Modules whose code opens the
+database from other engines, worker processes or the async driver use a
+SQLite file instead::
+
+    pytestmark = pytest.mark.database_file
+
+Each module seeds only the rows its tests need, by overriding `session` or
+`session_factory` on top of these fixtures, with `add_employees` and
+`add_payroll_rules` for the rows most tests share.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database_setup import Base
+import app.models  # noqa: F401
+from app.models.allowances_model import AllowanceType
+from app.models.deductions_model import DeductionBracket, DeductionType
+from app.models.employee_model import Employee
+from app.models.tax_brackets import TaxBracket
+from app.models.tax_model import Tax, TaxType
+from app.models.user_model import User
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "database_file: run against a SQLite file instead of an in-memory database")
+
+
+@pytest.fixture
+def engine(request, tmp_path):
+    if request.node.get_closest_marker("database_file"):
+        engine = create_engine(f"sqlite:///{tmp_path / 'payroll.db'}", connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def database_url(engine):
+    return engine.url.render_as_string(hide_password=False)
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def session(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def add_employees():
+    """Adds, for each id, a user and an employee with that id, then commits."""
+    def add(db, *ids, users=True, **user_fields):
+        for n in ids:
+            if users:
+                db.add(User(id=n, username=f"user{n}", password_hash="x", **user_fields))
+            db.add(Employee(id=n, user_id=n))
+        db.commit()
+    return add
+
+
+@pytest.fixture
+def add_payroll_rules():
+    """Adds tax 1 (PAYE, 10%), allowance type 1 (HOUS, 100) and deduction type 1 (LEVY, 1.5%), then commits."""
+    def add(db):
+        tax = Tax(id=1, tax_code="PAYE", name="PAYE", tax_type=TaxType.TIERED)
+        tax.brackets = [TaxBracket(min_amount=Decimal("0"), max_amount=None, rate=Decimal("10"))]
+        db.add(tax)
+        db.add(AllowanceType(id=1, code="HOUS", name="Housing", default_amount=Decimal("100")))
+        levy = DeductionType(id=1, name="Levy", code="LEVY", is_statutory=True, has_brackets=True)
+        levy.brackets = [DeductionBracket(min_amount=Decimal("0"), max_amount=None, rate=Decimal("1.5"))]
+        db.add(levy)
+        db.commit()
+    return add
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database_setup import async_database_url, build_async_engine, get_async_db
+import app.models  # noqa: F401
+from app.core.security import create_login_token
+from app.models.attendance_model import Attendance
+from app.models.audit_model import AuditLog
+from app.models.employee_model import Employee
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.repositories.attendance_repo import AsyncAttendanceRepository
+from app.repositories.audit_repo import AsyncAuditRepository
+from app.repositories.employee_repo import AsyncEmployeeRepository
+from app.repositories.payroll_repo import AsyncPayrollRepository
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def engine(engine):
+    with sessionmaker(bind=engine)() as db:
+        for employee_id in (1, 2):
+            db.add(Employee(id=employee_id, user_id=employee_id + 10))
+        for month in (11, 12):
+            db.add(Payroll(employee_id=1, pay_period_start=date(2025, month, 1), pay_period_end=date(2025, month, 28),
+                           payment_date=date(2025, month, 28), gross_salary=Decimal("1000"),
+                           net_salary=Decimal("900"), status=PayrollStatus.PAID))
+        db.add(Attendance(employee_id=1, attendance_date=date(2025, 12, 1), check_in=datetime(2025, 12, 1, 8)))
+        db.add(Attendance(employee_id=1, attendance_date=date(2025, 12, 2), check_in=datetime(2025, 12, 2, 8)))
+        db.add(AuditLog(user_id=11, action="first", timestamp=datetime(2025, 12, 1)))
+        db.add(AuditLog(user_id=11, action="second", timestamp=datetime(2025, 12, 2)))
+        db.commit()
+    return engine
+
+
+def test_async_url_swaps_driver():
+    assert async_database_url("sqlite:///./payroll.db") == "sqlite+aiosqlite:///./payroll.db"
+    assert async_database_url("postgresql://u:p@db/payroll") == "postgresql+asyncpg://u:p@db/payroll"
+
+
+def test_async_repositories_read_on_the_event_loop(database_url):
+    async def scenario():
+        engine = build_async_engine(database_url)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                employee = await AsyncEmployeeRepository(db).get_by_id(1)
+                payslips = await AsyncPayrollRepository(db).get_by_employee(1)
+                latest = await AsyncAttendanceRepository(db).get_latest_attendance(1)
+                on_date = await AsyncAttendanceRepository(db).get_by_employee_and_date(1, date(2025, 12, 1))
+                logs = await AsyncAuditRepository(db).get_all_logs()
+                return employee, payslips, latest, on_date, logs
+        finally:
+            await engine.dispose()
+
+    employee, payslips, latest, on_date, logs = asyncio.run(scenario())
+
+    assert employee.user_id == 11
+    assert [p.pay_period_start.month for p in payslips] == [12, 11]
+    assert latest.attendance_date == date(2025, 12, 2)
+    assert on_date.attendance_date == date(2025, 12, 1)
+    assert [log.action for log in logs] == ["second", "first"]
+
+
+def test_payslip_routes_use_async_session(database_url):
+    from app.main import app
+
+    sessions = async_sessionmaker(build_async_engine(database_url), expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        client = TestClient(app)
+        employee = {"Authorization": f"Bearer {create_login_token({'sub': '11', 'role': 'employee'})}"}
+        other = {"Authorization": f"Bearer {create_login_token({'sub': '12', 'role': 'employee'})}"}
+
+        mine = client.get("/api/v1/payrolls/me", headers=employee)
+        assert mine.status_code == 200
+        assert [row["status"] for row in mine.json()] == ["paid", "paid"]
+        assert client.get("/api/v1/employees/1/payrolls", headers=other).status_code == 403
+        assert client.get("/api/v1/attendance/me", headers=employee).json()["attendance_date"] == "2025-12-02"
+        assert client.get("/api/v1/attendance/me?attendance_date=2025-11-30", headers=employee).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
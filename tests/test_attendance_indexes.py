@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+import app.models  # noqa: F401
+from app.core.unit_of_work import UnitOfWork
+from app.domain.enums import AttendanceStatus
+from app.domain.exceptions.base import AttendanceAlreadyExistsError
+from app.models.attendance_model import EAT, Attendance
+from app.repositories.attendance_repo import AttendanceRepository
+from app.services.attendance_service import AttendanceService
+
+
+@pytest.fixture
+def session(session, add_employees):
+    add_employees(session, 1, 2)
+    return session
+
+
+def test_second_check_in_for_a_day_is_rejected_by_the_index(session):
+    service = AttendanceService(UnitOfWork(session))
+    check_in = EAT.localize(datetime(2025, 11, 3, 8))
+
+    attendance = service.check_in(1, date(2025, 11, 3), check_in, "on time")
+    assert (attendance.id, attendance.approved, attendance.remarks) == (1, AttendanceStatus.PENDING, "on time")
+    with pytest.raises(AttendanceAlreadyExistsError):
+        service.check_in(1, date(2025, 11, 3), check_in + timedelta(minutes=5), None)
+    assert service.check_in(2, date(2025, 11, 3), check_in, None).id == 2
+    assert session.query(Attendance).count() == 2
+
+    repo = AttendanceRepository(session)
+    duplicate = Attendance(employee_id=1, attendance_date=date(2025, 11, 3), check_in=check_in)
+    assert repo.insert_if_absent(duplicate) is None
+
+
+def test_pending_queue_pages_oldest_first(session):
+    for n in range(5):
+        session.add(Attendance(employee_id=1 + n % 2, attendance_date=date(2025, 11, 1 + n // 2),
+                               approved=AttendanceStatus.APPROVED if n == 2 else AttendanceStatus.PENDING))
+    session.commit()
+    repo = AttendanceRepository(session)
+
+    first = repo.get_pending_approvals(limit=2)
+    rest = repo.get_pending_approvals(limit=10, after=(first[-1].attendance_date, first[-1].id))
+    assert [row.id for row in first + rest] == [1, 2, 4, 5]
+
+
+@pytest.mark.parametrize("query, index", [
+    ("SELECT * FROM attendance WHERE employee_id = 1 AND attendance_date = '2025-11-03'",
+     "uq_attendance_employee_id_attendance_date"),
+    ("SELECT * FROM attendance WHERE employee_id = 1 ORDER BY attendance_date DESC LIMIT 1",
+     "uq_attendance_employee_id_attendance_date"),
+    ("SELECT * FROM attendance WHERE approved = 'PENDING' ORDER BY attendance_date, id LIMIT 100",
+     "ix_attendance_pending_attendance_date_id"),
+])
+def test_hot_paths_use_the_indexes(session, query, index):
+    plan = " ".join(row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+    assert index in plan
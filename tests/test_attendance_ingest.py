@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.database_setup import get_db
+import app.models  # noqa: F401
+from app.core.security import admin_access
+from app.core.unit_of_work import UnitOfWork
+from app.domain.exceptions.base import ValidationError
+from app.models.attendance_model import EAT, Attendance
+from app.models.attendance_summary_model import AttendanceMonthlySummary
+from app.services.attendance_ingest_service import AttendanceIngestService
+from app.services.attendance_service import AttendanceService
+
+
+@pytest.fixture
+def session(session, add_employees):
+    add_employees(session, 1, 2, 3)
+    return session
+
+
+def _event(employee_id, event_type, hour, minute=0, day=3, **extra):
+    return {"employee_id": employee_id, "event_type": event_type,
+            "timestamp": datetime(2025, 11, day, hour, minute).isoformat(), **extra}
+
+
+def test_events_are_paired_per_employee_day_and_rejected_one_by_one(session):
+    AttendanceService(UnitOfWork(session)).check_in(2, date(2025, 11, 3), EAT.localize(datetime(2025, 11, 3, 7)), None)
+    events = [
+        _event(1, "check_out", 18, remarks="left late"),   # Out listed before its in
+        _event(1, "check_in", 8),
+        _event(2, "check_out", 16),                         # Closes the day opened above
+        _event(1, "check_in", 8, 5),                         # Second badge at the gate
+        _event(3, "check_out", 17),                         # Never checked in
+        _event(1, "check_out", 19),                         # Already checked out
+        _event(99, "check_in", 8),
+        {"employee_id": 1, "event_type": "lunch", "timestamp": "2025-11-03T12:00:00"},
+        "not an event",
+    ]
+    report = AttendanceIngestService(UnitOfWork(session)).ingest_events(events)
+
+    assert (report.events, report.applied, report.rejected) == (9, 3, 6)
+    by_event = {result.event: result for result in report.results}
+    assert [by_event[n].status for n in (1, 2, 3)] == ["applied"] * 3
+    assert by_event[1].attendance_id == by_event[2].attendance_id
+    assert by_event[4].errors == ["Attendance for this employee exists"]
+    assert by_event[5].errors == ["No check-in so can not check-out"]
+    assert by_event[6].errors == ["Can not re-checkout"]
+    assert by_event[7].errors == ["Employee 99 does not exist"]
+    assert by_event[8].errors[0].startswith("event_type:") and by_event[9].employee_id is None
+
+    session.expire_all()
+    first = session.get(Attendance, by_event[1].attendance_id)
+    assert (first.hours_worked, first.regular_hours, first.overtime_hours, first.remarks) == (10, 8, 2, "left late")
+    second = session.query(Attendance).filter_by(employee_id=2).one()
+    assert (second.hours_worked, second.overtime_hours) == (9, 1)
+    summaries = {row.employee_id: row for row in session.query(AttendanceMonthlySummary)}
+    assert (summaries[1].worked_days, summaries[1].hours_worked, summaries[2].hours_worked) == (1, 10, 9)
+
+
+def test_a_day_recorded_meanwhile_is_rejected_without_failing_the_batch(session, monkeypatch):
+    service = AttendanceIngestService(UnitOfWork(session), batch_size=10)
+    repo = service.uow.attendance_repo
+    get_by_employee_days = repo.get_by_employee_days
+
+    def recorded_meanwhile(keys):
+        found = get_by_employee_days(keys)
+        # A single check-in lands after the lookup, as a concurrent request would
+        repo.insert_if_absent(Attendance(employee_id=2, attendance_date=date(2025, 11, 3),
+                                         check_in=EAT.localize(datetime(2025, 11, 3, 7))))
+        return found
+
+    monkeypatch.setattr(repo, "get_by_employee_days", recorded_meanwhile)
+    report = service.ingest_events([_event(1, "check_in", 8), _event(2, "check_in", 8)])
+
+    assert [result.status for result in report.results] == ["applied", "rejected"]
+    assert session.query(Attendance).count() == 2
+
+
+def test_ingest_route_and_event_limit(session):
+    from app.main import app
+
+    with pytest.raises(ValidationError):
+        AttendanceIngestService(UnitOfWork(session), max_events=1).ingest_events(
+            [_event(1, "check_in", 8), _event(2, "check_in", 8)])
+
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[admin_access] = lambda: {"user_id": "1", "role": "admin"}
+    try:
+        response = TestClient(app).post("/api/v1/attendance/events",
+                                        json=[_event(1, "check_in", 8), _event(1, "check_out", 17)])
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(admin_access, None)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] == 2 and body["results"][1]["attendance_date"] == "2025-11-03"
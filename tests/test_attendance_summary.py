@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import app.models  # noqa: F401
+from app.core.unit_of_work import UnitOfWork
+from app.domain.enums import AttendanceStatus
+from app.models.attendance_model import EAT, Attendance
+from app.models.attendance_summary_model import AttendanceMonthlySummary
+from app.repositories.attendance_repo import AttendanceRepository
+from app.services.attendance_service import AttendanceService
+
+
+@pytest.fixture
+def session(session, add_employees):
+    add_employees(session, 1, 2)
+    return session
+
+
+def _summary(session, employee_id, month):
+    session.expire_all()
+    return session.get(AttendanceMonthlySummary, (employee_id, month))
+
+
+def test_check_out_and_approval_update_the_month(session):
+    service = AttendanceService(UnitOfWork(session))
+    day = date(2025, 11, 3)
+    service.check_in(1, day, EAT.localize(datetime(2025, 11, 3, 8)), None)
+    assert _summary(session, 1, date(2025, 11, 1)) is None
+
+    service.check_out(1, day, EAT.localize(datetime(2025, 11, 3, 18)), None)
+    summary = _summary(session, 1, date(2025, 11, 1))
+    assert (summary.worked_days, summary.regular_hours, summary.overtime_hours, summary.approved_days) == (1, 8, 2, 0)
+
+    service.approve_attendance(1)
+    summary = _summary(session, 1, date(2025, 11, 1))
+    assert (summary.approved_days, summary.approved_hours_worked, summary.approved_overtime_hours) == (1, 10, 2)
+
+
+def _add_days(session, employee_id, start, days):
+    for n in range(days):
+        day = start + timedelta(days=n)
+        session.add(Attendance(
+            employee_id=employee_id, attendance_date=day, check_in=datetime.combine(day, datetime.min.time()),
+            check_out=datetime.combine(day, datetime.min.time()) + timedelta(hours=9),
+            regular_hours=8.0, overtime_hours=1.0, hours_worked=9.0,
+            approved=AttendanceStatus.APPROVED if n % 3 else AttendanceStatus.PENDING,
+        ))
+    session.commit()
+
+
+def _from_daily_rows(session, employee_id, start, end):
+    rows = session.query(Attendance).filter(
+        Attendance.employee_id == employee_id, Attendance.attendance_date.between(start, end)).all()
+    approved = [row for row in rows if row.approved == AttendanceStatus.APPROVED]
+    return len(rows), sum(row.hours_worked for row in rows), len(approved), sum(row.overtime_hours for row in approved)
+
+
+@pytest.mark.parametrize("start, end", [
+    (date(2025, 10, 1), date(2025, 12, 31)),    # Whole months only
+    (date(2025, 10, 15), date(2025, 12, 14)),   # Partial months on both ends
+    (date(2025, 11, 5), date(2025, 11, 20)),    # Inside a single month
+])
+def test_period_summary_matches_the_daily_rows(session, start, end):
+    _add_days(session, 1, date(2025, 9, 20), 110)
+    _add_days(session, 2, date(2025, 11, 1), 10)
+
+    summaries = AttendanceRepository(session).summarize_period([1, 2, 3], start, end)
+
+    for employee_id, summary in summaries.items():
+        assert (summary.worked_days, summary.hours_worked, summary.approved_days, summary.approved_overtime_hours) \
+            == _from_daily_rows(session, employee_id, start, end)
+    assert 3 not in summaries
+
+
+def test_rejection_and_delete_are_taken_back_out(session):
+    _add_days(session, 1, date(2025, 11, 1), 3)  # Day 1 pending, days 2 and 3 approved
+    rows = session.query(Attendance).order_by(Attendance.attendance_date).all()
+
+    rows[1].approved = AttendanceStatus.REJECTED
+    session.delete(rows[2])
+    session.commit()
+    summary = _summary(session, 1, date(2025, 11, 1))
+    assert (summary.worked_days, summary.approved_days, summary.approved_hours_worked) == (2, 0, 0)
+
+    rows[0].approved = AttendanceStatus.APPROVED
+    session.flush()
+    assert _summary(session, 1, date(2025, 11, 1)).approved_days == 1
+    session.rollback()
+    assert _summary(session, 1, date(2025, 11, 1)).approved_days == 0
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database_setup import build_async_engine, get_async_db, get_async_sessionmaker
+import app.models  # noqa: F401
+from app.core.security import create_login_token
+from app.domain.exceptions.base import InvalidCursorError
+from app.models.audit_model import AuditLog
+from app.models.user_model import User
+from app.repositories.audit_repo import AuditRepository
+
+START = datetime(2025, 12, 1, 9)
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def engine(engine):
+    with sessionmaker(bind=engine)() as db:
+        for user_id in (1, 2):
+            db.add(User(id=user_id, username=f"user{user_id}", password_hash="x", first_name="A", last_name="B"))
+        # Pairs of rows share a timestamp, so pages must break ties on id
+        for n in range(10):
+            db.add(AuditLog(user_id=1 + n % 2, action="login" if n < 6 else "logout",
+                            timestamp=START + timedelta(minutes=n // 2)))
+        db.commit()
+    return engine
+
+
+def _walk(repo, limit, **filters):
+    ids, cursor = [], None
+    while True:
+        logs, cursor = repo.get_logs_page(limit, cursor, **filters)
+        ids.extend(log.id for log in logs)
+        if cursor is None:
+            return ids
+
+
+def test_pages_cover_every_row_once_in_order(session):
+    expected = [log.id for log in session.query(AuditLog).order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())]
+
+    assert _walk(AuditRepository(session), limit=3) == expected
+    assert _walk(AuditRepository(session), limit=10) == expected
+
+
+def test_filters_apply_to_every_page(session):
+    repo = AuditRepository(session)
+    rows = [repo.db.get(AuditLog, log_id) for log_id in _walk(repo, limit=2, user_id=2, action="login",
+                                                               since=START + timedelta(minutes=1))]
+
+    assert [(row.user_id, row.action) for row in rows] == [(2, "login"), (2, "login")]
+    assert all(row.timestamp >= START + timedelta(minutes=1) for row in rows)
+    assert len(_walk(repo, limit=2, until=START + timedelta(minutes=1))) == 2
+
+
+def test_malformed_cursor_is_rejected(session):
+    with pytest.raises(InvalidCursorError):
+        AuditRepository(session).get_logs_page(10, cursor="not-a-cursor")
+
+
+def test_routes_page_and_stream_as_ndjson(database_url):
+    from app.main import app
+
+    sessions = async_sessionmaker(build_async_engine(database_url), expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: sessions
+    try:
+        client = TestClient(app)
+        admin = {"Authorization": f"Bearer {create_login_token({'sub': '1', 'role': 'admin'})}"}
+
+        first = client.get("/audit/logs?limit=4&action=login", headers=admin)
+        assert first.status_code == 200
+        assert len(first.json()) == 4
+        second = client.get(f"/audit/logs?limit=4&action=login&cursor={first.headers['X-Next-Cursor']}", headers=admin)
+        assert len(second.json()) == 2
+        assert "X-Next-Cursor" not in second.headers
+
+        stream = client.get("/audit/logs/stream?user_id=1", headers=admin)
+        assert stream.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in stream.text.splitlines()]
+        assert len(rows) == 5 and {row["user_id"] for row in rows} == {1}
+
+        assert client.get("/audit/logs?cursor=bogus", headers=admin).status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_async_sessionmaker, None)
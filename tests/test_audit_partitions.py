@@ -0,0 +1,98 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.audit_retention import AuditArchiver
+from app.db.audit_partitions import AuditPartitions, overlapping
+from app.models.audit_model import AuditLog
+from app.models.user_model import User
+from app.repositories.audit_repo import AuditRepository
+
+MONTHS = [datetime(2025, 11, 20), datetime(2025, 12, 5), datetime(2025, 12, 25), datetime(2026, 1, 3)]
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def engine(engine):
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(id=1, username="jane", password_hash="x", first_name="Jane", last_name="Doe"))
+        for timestamp in MONTHS:
+            db.add(AuditLog(user_id=1, action="login", timestamp=timestamp))
+        db.commit()
+    return engine
+
+
+def _tables(engine):
+    return sorted(name for name in inspect(engine).get_table_names() if name.startswith("audit_logs_y"))
+
+
+def test_closed_months_move_to_their_own_tables(engine):
+    assert AuditPartitions(engine).ensure(now=datetime(2026, 1, 15)) == ["audit_logs_y2025m11", "audit_logs_y2025m12"]
+
+    db = sessionmaker(bind=engine)()
+    assert [log.timestamp for log in db.query(AuditLog)] == [datetime(2026, 1, 3)]
+    # Reads still see every month, in order, across pages
+    repo = AuditRepository(db)
+    first, cursor = repo.get_logs_page(3)
+    rest, end = repo.get_logs_page(3, cursor)
+    assert [log.timestamp for log in first + rest] == MONTHS[::-1]
+    assert end is None
+    assert [log.timestamp for log in repo.get_all_logs()] == MONTHS[::-1]
+    db.close()
+
+
+def test_time_range_only_reads_overlapping_months(engine):
+    AuditPartitions(engine).ensure(now=datetime(2026, 1, 15))
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    db = sessionmaker(bind=engine)()
+    logs, _ = AuditRepository(db).get_logs_page(10, since=datetime(2025, 12, 10))
+    db.close()
+
+    assert [log.timestamp for log in logs] == [datetime(2026, 1, 3), datetime(2025, 12, 25)]
+    assert "audit_logs_y2025m12" in statements[-1]
+    assert "audit_logs_y2025m11" not in statements[-1]
+
+
+def test_ids_are_not_reused_after_a_roll_over(engine):
+    AuditPartitions(engine).ensure(now=datetime(2026, 2, 1))
+    db = sessionmaker(bind=engine)()
+    log = AuditLog(user_id=1, action="login")
+    db.add(log)
+    db.commit()
+
+    assert log.id == len(MONTHS) + 1
+    db.close()
+
+
+def test_expired_partitions_are_archived_then_dropped(engine, tmp_path):
+    archiver = AuditArchiver(engine, archive_dir=str(tmp_path / "archive"), retention_months=1)
+
+    archived = archiver.run(now=datetime(2026, 2, 10))
+
+    assert [(entry.partition, entry.rows) for entry in archived] == [("audit_logs_y2025m11", 1), ("audit_logs_y2025m12", 2)]
+    assert archiver.manifest() == archived
+    assert _tables(engine) == ["audit_logs_y2026m01"]
+    with gzip.open(tmp_path / "archive" / "audit_logs_y2025m12.jsonl.gz", "rt") as archive:
+        rows = [json.loads(line) for line in archive]
+    assert [row["timestamp"] for row in rows] == ["2025-12-05T00:00:00", "2025-12-25T00:00:00"]
+    # Nothing left to do on the next run
+    assert archiver.run(now=datetime(2026, 2, 11)) == []
+
+
+def test_overlapping_prunes_by_month():
+    names = ["audit_logs_y2025m12", "audit_logs_y2025m11", "audit_logs_y2026m01", "audit_logs_archive"]
+
+    assert overlapping(names) == ["audit_logs_y2025m11", "audit_logs_y2025m12", "audit_logs_y2026m01"]
+    assert overlapping(names, since=datetime(2025, 12, 31), until=datetime(2026, 1, 1)) == ["audit_logs_y2025m12"]
@@ -0,0 +1,118 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+import app.models  # noqa: F401
+from app.core.audit_policy import AuditPolicy, ReadAuditCounters
+from app.core.unit_of_work import UnitOfWork
+from app.models.audit_model import AuditLog
+from app.repositories.audit_repo import AuditRepository
+from app.services.audit_service import AuditService
+from app.services.user_service import EmployeeService
+
+
+@pytest.fixture
+def session(session, add_employees):
+    add_employees(session, 1, first_name="Jane", last_name="Doe")
+    return session
+
+
+def _uow(session, policy, counters):
+    uow = UnitOfWork(session)
+    uow._audit_repo = AuditRepository(session, policy=policy, counters=counters)
+    return uow
+
+
+def test_aggregated_reads_never_insert(session):
+    counters = ReadAuditCounters(window_seconds=3600)
+    service = EmployeeService(_uow(session, AuditPolicy(read_mode="aggregate"), counters))
+
+    for _ in range(3):
+        service.get_employee_by_id(1)
+    session.commit()
+
+    assert session.query(AuditLog).count() == 0
+    summaries = counters.drain(include_open=True)
+    assert [(s.user_id, s.action, s.resource, s.count) for s in summaries] == [(1, "employee_read", "employee:1", 3)]
+
+
+def test_closed_windows_are_flushed_as_summary_rows(session):
+    counters = ReadAuditCounters(window_seconds=60)
+    counters.increment(1, "employee_read", "employee:1", at=datetime(2025, 12, 1, 9, 0, 10))
+    counters.increment(1, "employee_read", "employee:1", at=datetime(2025, 12, 1, 9, 0, 50))
+    counters.increment(1, "employee_read", "employee:1")  # current window stays in memory
+
+    service = AuditService(_uow(session, AuditPolicy(), counters))
+    assert service.flush_read_summaries(counters=counters) == 1
+
+    row = session.query(AuditLog).one()
+    assert row.action == "employee_read"
+    assert json.loads(row.meta_data)["count"] == 2
+    assert len(counters) == 1
+
+
+def test_windows_are_utc_whatever_the_server_time_zone(monkeypatch):
+    monkeypatch.setenv("TZ", "Pacific/Honolulu")
+    time.tzset()
+    try:
+        counters = ReadAuditCounters(window_seconds=3600)
+        counters.increment(1, "employee_read", "employee:1", at=datetime(2025, 12, 1, 9, 10))
+        counters.increment(1, "employee_read", "employee:2", at=datetime.utcnow() - timedelta(hours=1))
+        counters.increment(1, "employee_read", "employee:3")
+
+        drained = counters.drain()
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert [s.resource for s in drained] == ["employee:1", "employee:2"]
+    assert (drained[0].window_start, drained[0].window_end) == (datetime(2025, 12, 1, 9), datetime(2025, 12, 1, 10))
+    assert len(counters) == 1
+
+
+def test_failed_flush_keeps_the_counts(session):
+    counters = ReadAuditCounters(window_seconds=60)
+    counters.increment(999, "employee_read", "employee:999", at=datetime(2025, 12, 1, 9))  # no such user
+    session.execute(text("PRAGMA foreign_keys=ON"))
+
+    with pytest.raises(IntegrityError):
+        AuditService(_uow(session, AuditPolicy(), counters)).flush_read_summaries(counters=counters)
+    assert len(counters) == 1
+
+
+@pytest.mark.parametrize("policy, expected", [
+    (AuditPolicy(read_mode="record"), 1),
+    (AuditPolicy(read_mode="sample", sample_rate=1), 1),
+    (AuditPolicy(read_mode="sample", sample_rate=0), 0),
+    (AuditPolicy(read_mode="off"), 0),
+])
+def test_row_per_read_policies(session, policy, expected):
+    repo = AuditRepository(session, policy=policy, counters=ReadAuditCounters(3600))
+    repo.log_read(1, "employee_read", "employee:1")
+    session.commit()
+
+    rows = session.query(AuditLog).all()
+    assert len(rows) == expected
+    if rows:
+        assert json.loads(rows[0].meta_data)["resource"] == "employee:1"
+
+
+def test_writes_are_always_recorded_with_metadata(session):
+    repo = AuditRepository(session, policy=AuditPolicy(read_mode="off"))
+    repo.log_action(1, "payroll_run", {"payroll_id": 5})
+    repo.log_action(1, "check_in", "Checked in")
+    session.commit()
+
+    assert [row.meta_data for row in session.query(AuditLog).order_by(AuditLog.id)] == ['{"payroll_id": 5}', "Checked in"]
+
+
+def test_unknown_read_mode_is_rejected():
+    with pytest.raises(ValueError):
+        AuditPolicy(read_mode="sometimes")
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+
+import pytest
+
+import app.models  # noqa: F401
+from app.core.audit_sink import AuditEvent, AuditSink
+from app.core.unit_of_work import UnitOfWork
+from app.models.audit_model import AuditLog
+from app.models.user_model import User
+from app.repositories.audit_repo import AuditRepository
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def sessions(session_factory):
+    with session_factory() as db:
+        db.add(User(id=1, username="jane", password_hash="x", first_name="Jane", last_name="Doe"))
+        db.commit()
+    return session_factory
+
+
+def _count(sessions):
+    db = sessions()
+    try:
+        return db.query(AuditLog).count()
+    finally:
+        db.close()
+
+
+def _uow(sessions, sink):
+    db = sessions()
+    uow = UnitOfWork(db)
+    uow._audit_repo = AuditRepository(db, sink=sink)
+    return uow
+
+
+def test_committed_events_are_written_in_batches(sessions, tmp_path):
+    sink = AuditSink(session_factory=sessions, batch_size=100, flush_interval_ms=50, spill_dir=str(tmp_path / "spill"))
+    sink.start()
+    uow = _uow(sessions, sink)
+    with uow:
+        for n in range(250):
+            assert uow.audit_repo.log_action(1, "check_in", {"n": n}) is None
+        # Nothing is written on the request's transaction
+        assert not uow.session.new
+    sink.stop()
+
+    assert (sink.written, _count(sessions)) == (250, 250)
+
+
+def test_rolled_back_events_are_dropped(sessions, tmp_path):
+    sink = AuditSink(session_factory=sessions, spill_dir=str(tmp_path / "spill"))
+    sink.start()
+    uow = _uow(sessions, sink)
+    with pytest.raises(RuntimeError):
+        with uow:
+            uow.audit_repo.log_action(1, "employee_update")
+            raise RuntimeError("update failed")
+    with uow:
+        uow.audit_repo.log_action(1, "login")
+    sink.stop()
+
+    db = sessions()
+    assert [row.action for row in db.query(AuditLog)] == ["login"]
+    db.close()
+
+
+def test_events_spill_to_disk_and_replay_when_the_database_is_back(sessions, tmp_path):
+    healthy = [False]
+
+    def flaky_sessions():
+        if not healthy[0]:
+            raise ConnectionError("database unavailable")
+        return sessions()
+
+    sink = AuditSink(session_factory=flaky_sessions, batch_size=10, flush_interval_ms=10, spill_dir=str(tmp_path / "spill"))
+    sink.start()
+    sink.emit([AuditEvent(1, "login") for _ in range(5)])
+    sink.stop()
+    assert (sink.spilled, _count(sessions)) == (5, 0)
+    assert sink.spill_path.exists()
+
+    # A new process replays the orphaned spill file on start-up
+    healthy[0] = True
+    replacement = AuditSink(session_factory=flaky_sessions, spill_dir=str(tmp_path / "spill"))
+    replacement.spill_path = tmp_path / "spill" / "audit-other-host-1.jsonl"
+    replacement.start()
+    replacement.stop()
+
+    assert _count(sessions) == 5
+    assert not list((tmp_path / "spill").iterdir())
+
+
+def test_full_queue_spills_instead_of_blocking(sessions, tmp_path):
+    sink = AuditSink(session_factory=sessions, max_queue=2, spill_dir=str(tmp_path / "spill"))
+    sink.emit([AuditEvent(1, "login", timestamp=datetime(2025, 12, 1)) for _ in range(5)])
+
+    assert sink.spilled == 3
+    sink.start()
+    sink.stop()
+    assert _count(sessions) == 5
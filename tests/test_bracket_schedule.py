@@ -0,0 +1,84 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from app.payroll.bracket_schedule import BracketSchedule, get_schedule, clear_schedule_cache
+from app.services.payroll_engine import PayrollEngine
+from app.schemas.payroll_schema import ResolvedDeductionRule
+
+
+PAYE_BRACKETS = [
+    {"min_amount": Decimal("24000"), "max_amount": Decimal("32333"), "rate": Decimal("25")},
+    {"min_amount": Decimal("0"), "max_amount": Decimal("24000"), "rate": Decimal("10")},
+    {"min_amount": Decimal("32333"), "max_amount": None, "rate": Decimal("30")},
+]
+
+
+def _walk(brackets, income):
+    """Reference marginal calculation, one bracket at a time."""
+    tax = Decimal("0")
+    for bracket in brackets:
+        upper = bracket["max_amount"]
+        top = income if upper is None else min(income, upper)
+        if top > bracket["min_amount"]:
+            tax += (top - bracket["min_amount"]) * bracket["rate"] / Decimal("100")
+    return tax
+
+
+@pytest.mark.parametrize("income", ["0", "1", "23999.99", "24000", "30000", "32333", "32333.01", "50000", "1000000"])
+def test_tax_for_matches_bracket_walk(income):
+    schedule = BracketSchedule.from_brackets(PAYE_BRACKETS)
+    assert schedule.tax_for(Decimal(income)) == _walk(PAYE_BRACKETS, Decimal(income))
+
+
+def test_schedule_is_sorted_with_cumulative_tax_at_each_bound():
+    schedule = BracketSchedule.from_brackets(PAYE_BRACKETS)
+    assert schedule.lower_bounds == (Decimal("0"), Decimal("24000"), Decimal("32333"))
+    assert schedule.cumulative == (Decimal("0"), Decimal("2400.00"), Decimal("4483.25"))
+
+
+def test_income_in_gap_between_brackets_keeps_lower_bracket_total():
+    schedule = BracketSchedule.from_brackets([
+        {"min_amount": Decimal("0"), "max_amount": Decimal("100"), "rate": Decimal("10")},
+        {"min_amount": Decimal("200"), "max_amount": None, "rate": Decimal("20")},
+    ])
+    assert schedule.tax_for(Decimal("150")) == Decimal("10")
+    assert schedule.tax_for(Decimal("250")) == Decimal("20")
+
+
+def test_schedule_accepts_orm_rows():
+    rows = [SimpleNamespace(**bracket) for bracket in PAYE_BRACKETS]
+    assert BracketSchedule.from_brackets(rows).tax_for(Decimal("40000")) == _walk(PAYE_BRACKETS, Decimal("40000"))
+
+
+def test_open_ended_bracket_must_be_last():
+    with pytest.raises(ValueError):
+        BracketSchedule([(Decimal("0"), None, Decimal("0.1")), (Decimal("100"), Decimal("200"), Decimal("0.2"))])
+
+
+def test_cache_is_keyed_by_rule_version():
+    clear_schedule_cache()
+    v1, v2 = datetime(2025, 1, 1), datetime(2025, 6, 1)
+    first = get_schedule("tax", 1, v1, lambda: BracketSchedule.from_brackets(PAYE_BRACKETS))
+    again = get_schedule("tax", 1, v1, lambda: pytest.fail("schedule rebuilt for an unchanged rule"))
+    bumped = get_schedule("tax", 1, v2, lambda: BracketSchedule.from_brackets(PAYE_BRACKETS[:1]))
+    assert first is again
+    assert bumped is not first
+
+
+def test_engine_shares_cached_schedule_for_versioned_rules():
+    clear_schedule_cache()
+    version = datetime(2025, 1, 1)
+    rule = ResolvedDeductionRule(
+        deduction_type_id=9, name="PAYE", code="PAYE", is_statutory=True, has_brackets=True,
+        brackets=PAYE_BRACKETS, rule_source="tax", updated_at=version,
+    )
+    amount = PayrollEngine._calculate_deduction_amount(rule, Decimal("50000"))
+
+    shared = get_schedule("tax", 9, version, lambda: pytest.fail("engine did not cache the schedule"))
+    assert amount == shared.tax_for(Decimal("50000")) == _walk(PAYE_BRACKETS, Decimal("50000"))
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+from decimal import Decimal
+
+import app.models  # noqa: F401
+from app.core.unit_of_work import UnitOfWork
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.deductions_model import Deduction
+
+
+def test_payroll_bulk_create_returns_ids_in_row_order(session):
+    rows = [
+        {
+            "employee_id": employee_id,
+            "pay_period_start": date(2025, 12, 1),
+            "pay_period_end": date(2025, 12, 31),
+            "payment_date": date(2025, 12, 31),
+            "gross_salary": Decimal(employee_id * 1000),
+            "net_salary": Decimal(employee_id * 900),
+        }
+        for employee_id in (5, 3, 9)
+    ]
+    with UnitOfWork(session) as uow:
+        ids = uow.payroll_repo.bulk_create(rows)
+
+    stored = {p.id: p for p in session.query(Payroll).all()}
+    assert [stored[i].employee_id for i in ids] == [5, 3, 9]
+    # Python-side column defaults still apply
+    assert all(p.status == PayrollStatus.DRAFT and p.created_at is not None for p in stored.values())
+
+
+def test_deduction_bulk_create_accepts_tuples(session):
+    with UnitOfWork(session) as uow:
+        uow.deduction_repo.bulk_create(
+            [(1, 2, Decimal("10.50")), (1, 3, Decimal("7.25"))],
+            columns=("payroll_id", "deduction_type_id", "amount"),
+        )
+        uow.allowance_repo.bulk_create([])
+
+    assert sorted((d.deduction_type_id, d.amount) for d in session.query(Deduction).all()) == [
+        (2, Decimal("10.50")), (3, Decimal("7.25")),
+    ]
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.database_setup import MeteredQueuePool, build_engine, engine_options, pool_metrics, request_sessions
+
+
+def test_postgres_gets_bounded_pool_without_sqlite_arguments():
+    options = engine_options("postgresql://payroll_user:secret@db:5432/payroll_db", pool_size=8)
+
+    assert "connect_args" not in options
+    assert options["poolclass"] is MeteredQueuePool
+    assert options["pool_size"] == 8
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] > 0
+
+
+def test_sqlite_file_connections_are_tuned(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'payroll.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics_count_checkouts_and_timeouts(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'payroll.db'}", pool_size=1, max_overflow=0, pool_timeout=0.05)
+    try:
+        with engine.connect():
+            assert pool_metrics(engine)["checked_out"] == 1
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        with engine.connect():
+            pass
+
+        metrics = pool_metrics(engine)
+        assert (metrics["checkouts"], metrics["timeouts"], metrics["checked_out"]) == (2, 1, 0)
+        assert metrics["wait_seconds_max"] >= 0.05
+    finally:
+        engine.dispose()
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    engine = build_engine("sqlite://")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert "checkouts" not in pool_metrics(engine)
+    finally:
+        engine.dispose()
+
+
+def test_request_sessions_wait_for_a_free_slot():
+    closed = []
+
+    class FakeSession:
+        def close(self):
+            closed.append(self)
+
+    get_db = request_sessions(FakeSession, limit=1)
+
+    async def scenario():
+        first = get_db()
+        await first.__anext__()
+        second = asyncio.ensure_future(get_db().__anext__())
+        await asyncio.sleep(0.05)
+        assert not second.done()  # waits on the event loop, not on the pool
+        await first.aclose()
+        await asyncio.wait_for(second, timeout=1)
+
+    asyncio.run(scenario())
+    assert len(closed) == 1
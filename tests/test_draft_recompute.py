@@ -0,0 +1,207 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import app.models  # noqa: F401
+from app.domain.enums import AttendanceStatus
+from app.models.allowances_model import Allowance
+from app.models.attendance_model import Attendance
+from app.models.employee_model import Employee
+from app.models.payroll_dependency_model import PayrollDependency
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.Position_model import Position
+from app.models.salary_model import EmployeeSalary, PositionSalary
+from app.models.tax_model import Tax
+from app.payroll import batch_runner
+from app.payroll.batch_runner import PayrollBatchRunner
+
+NOVEMBER = (date(2025, 11, 1), date(2025, 11, 30))
+DECEMBER = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def sessions(session_factory, add_payroll_rules, add_employees):
+    with session_factory() as db:
+        add_payroll_rules(db)
+        add_employees(db, *range(1, 5), users=False)
+        for employee_id in range(1, 5):
+            db.add(EmployeeSalary(id=employee_id, employee_id=employee_id, amount=Decimal("1000") * (employee_id + 1),
+                                  effective_from=datetime(2025, 1, 1), created_by=1))
+        db.commit()
+    return session_factory
+
+
+def _runner(factory, chunk_size=500):
+    return PayrollBatchRunner(session_factory=factory, database_url="sqlite://", chunk_size=chunk_size, max_workers=1)
+
+
+def _dirty(factory):
+    db = factory()
+    try:
+        return sorted(
+            (p.employee_id, p.pay_period_start.month)
+            for p in db.query(Payroll).filter(Payroll.needs_recompute.is_(True))
+        )
+    finally:
+        db.close()
+
+
+def test_draft_run_records_dependencies_and_recomputes_only_the_edited_employee(sessions):
+    runner = _runner(sessions, chunk_size=2)
+    report = runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1], draft=True)
+    assert (report.succeeded, report.failed) == (4, 0)
+
+    db = sessions()
+    first = {p.employee_id: p.id for p in db.query(Payroll)}
+    assert {p.status for p in db.query(Payroll)} == {PayrollStatus.DRAFT}
+    dependencies = {(d.source, d.source_id): d.version for d in db.query(PayrollDependency).filter_by(payroll_id=first[2])}
+    assert dependencies[("employee_salary", 2)] == "3000.00" and dependencies[("allowance_type", 1)] == "100.00"
+    assert dependencies[("attendance", 2)] == "0/0"
+    assert {("tax", 1), ("deduction_type", 1), ("loan", 2), ("insurance", 2), ("pension", 2)} <= set(dependencies)
+
+    # HR corrects one salary: only that employee's draft depends on it
+    db.get(EmployeeSalary, 2).amount = Decimal("3500")
+    db.commit()
+    db.close()
+    assert _dirty(sessions) == [(2, 12)]
+
+    again = runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert (again.employees, again.skipped, again.succeeded, again.failed) == (4, 3, 1, 0)
+
+    db = sessions()
+    payrolls = {p.employee_id: p for p in db.query(Payroll)}
+    assert payrolls[2].gross_salary == Decimal("3600.00") and payrolls[2].status == PayrollStatus.DRAFT
+    assert [payrolls[e].id == first[e] for e in (1, 2, 3, 4)] == [True, False, True, True]
+    assert db.query(Allowance).filter_by(payroll_id=first[2]).count() == 0
+    assert db.query(PayrollDependency).filter_by(payroll_id=first[2]).count() == 0
+    assert ("employee_salary", 2, "3500.00") in {
+        (d.source, d.source_id, d.version) for d in db.query(PayrollDependency).filter_by(payroll_id=payrolls[2].id)}
+    db.close()
+    assert _dirty(sessions) == []
+
+    nothing = runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert (nothing.succeeded, nothing.skipped) == (0, 4)
+
+
+def test_changes_mark_only_dependent_drafts(sessions):
+    runner = _runner(sessions)
+    runner.run(*NOVEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1], draft=True)
+
+    # Pending attendance does not reach payroll; approving it marks the draft of that month only
+    db = sessions()
+    db.add(Attendance(employee_id=3, attendance_date=date(2025, 12, 5), hours_worked=8, regular_hours=8))
+    db.commit()
+    assert _dirty(sessions) == []
+    attendance = db.query(Attendance).one()
+    attendance.approved = AttendanceStatus.APPROVED
+    db.commit()
+    assert _dirty(sessions) == [(3, 12)]
+
+    # A tax bracket change reaches every draft, but never the processed November payrolls
+    tax = db.get(Tax, 1)
+    tax.brackets[0].rate = Decimal("12")
+    tax.updated_at = datetime.utcnow()  # As the tax service does, so the compiled brackets are rebuilt
+    db.commit()
+    db.close()
+    assert _dirty(sessions) == [(1, 12), (2, 12), (3, 12), (4, 12)]
+
+    report = runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert (report.succeeded, report.failed) == (4, 0)
+    db = sessions()
+    december = db.query(Payroll).filter_by(employee_id=1, pay_period_start=DECEMBER[0]).one()
+    november = db.query(Payroll).filter_by(employee_id=1, pay_period_start=NOVEMBER[0]).one()
+    # Gross 2100: tax now 12%
+    assert (december.tax_amount, november.tax_amount) == (Decimal("252.00"), Decimal("210.00"))
+    db.close()
+
+
+def test_own_salary_added_to_a_draft_paid_from_the_position(sessions):
+    db = sessions()
+    db.add(Position(id=1, title="Clerk"))
+    db.add(PositionSalary(position_id=1, amount=Decimal("3000"), effective_from=datetime(2025, 1, 1), created_by=1))
+    db.add(Employee(id=5, user_id=5, position_id=1))
+    db.commit()
+    runner = _runner(sessions)
+    runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1], employee_ids=[5], draft=True)
+
+    draft = db.query(Payroll).filter_by(employee_id=5).one()
+    dependencies = {(d.source, d.source_id): d.version for d in db.query(PayrollDependency).filter_by(payroll_id=draft.id)}
+    assert dependencies[("position_salary", 1)] == "3000.00" and dependencies[("employee_salary", 5)] is None
+
+    # HR gives the employee their own salary during review
+    db.add(EmployeeSalary(employee_id=5, amount=Decimal("5000"), effective_from=datetime(2025, 1, 1), created_by=1))
+    db.commit()
+    db.close()
+    assert _dirty(sessions) == [(5, 12)]
+
+    runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    db = sessions()
+    assert db.query(Payroll).filter_by(employee_id=5).one().gross_salary == Decimal("5100.00")
+    db.close()
+
+
+def test_marks_survive_a_crash_and_changes_made_during_the_recompute(sessions, monkeypatch):
+    compute = batch_runner.compute_chunk
+    runner = _runner(sessions)
+    runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1], draft=True)
+    db = sessions()
+    db.get(EmployeeSalary, 1).amount = Decimal("2500")
+    db.commit()
+    db.close()
+
+    # The worker dies after reading the dirty drafts: they stay marked
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(batch_runner, "compute_chunk", crash)
+    with pytest.raises(KeyboardInterrupt):
+        runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert _dirty(sessions) == [(1, 12)]
+
+    # HR edits the salary again while the draft is being recomputed: the stale result is not kept
+    def edited_meanwhile(*args, **kwargs):
+        outcome = compute(*args, **kwargs)
+        db = sessions()
+        db.get(EmployeeSalary, 1).amount = Decimal("2600")
+        db.commit()
+        db.close()
+        return outcome
+    monkeypatch.setattr(batch_runner, "compute_chunk", edited_meanwhile)
+    report = runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert (report.succeeded, report.failed) == (0, 1)
+    assert _dirty(sessions) == [(1, 12)]
+
+    monkeypatch.undo()
+    report = runner.recompute_dirty(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert (report.succeeded, report.failed) == (1, 0)
+    assert _dirty(sessions) == []
+    db = sessions()
+    assert db.query(Payroll).filter_by(employee_id=1).one().gross_salary == Decimal("2700.00")
+    db.close()
+
+
+def test_final_run_replaces_the_drafts_of_the_period(sessions):
+    runner = _runner(sessions, chunk_size=2)
+    runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1], draft=True, employee_ids=[1, 2, 3])
+
+    again = runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1], draft=True)
+    assert (again.skipped, again.succeeded) == (3, 1)
+
+    report = runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    assert (report.skipped, report.succeeded, report.failed) == (0, 4, 0)
+
+    db = sessions()
+    payrolls = db.query(Payroll).order_by(Payroll.employee_id).all()
+    assert [(p.employee_id, p.status) for p in payrolls] == [(e, PayrollStatus.PROCESSED) for e in range(1, 5)]
+    assert db.query(PayrollDependency).count() == 0
+    assert db.query(Allowance).count() == 4  # The drafts' lines went with them
+    db.close()
+    assert runner.run(*DECEMBER, user_id=1, tax_ids=[1], allowance_type_ids=[1]).skipped == 4
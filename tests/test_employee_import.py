@@ -0,0 +1,130 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+
+from app.db.database_setup import get_db
+import app.models  # noqa: F401
+from app.core.hashing import verify_password
+from app.core.security import admin_access
+from app.core.unit_of_work import UnitOfWork
+from app.domain.exceptions.base import ValidationError
+from app.models.Position_model import Position
+from app.models.department_model import Department
+from app.models.employee_bank_account import EmployeeBankAccount
+from app.models.employee_contacts_details import EmployeeContact
+from app.models.employee_model import Employee
+from app.models.roles_model import Role
+from app.models.user_model import User
+from app.services.employee_import_service import EmployeeImportService, read_csv, read_xlsx
+
+
+@pytest.fixture
+def session(session):
+    session.add(Role(id=1, role_name="employee"))
+    session.add_all([Department(id=1, name="Finance"), Department(id=2, name="Sales")])
+    session.add_all([Position(id=1, title="Accountant", department_id=1),
+                     Position(id=2, title="Rep", department_id=2)])
+    session.add(User(id=1, username="taken", password_hash="x", first_name="T", last_name="K", role_id=1))
+    session.commit()
+    return session
+
+
+def _row(n, **overrides):
+    row = {
+        "first_name": f"First{n}", "last_name": f"Last{n}", "username": f"user{n}", "gender": "F",
+        "date_of_birth": "1990-05-01", "role_name": "employee", "department_name": "Finance",
+        "position_title": "Accountant", "date_hired": "2024-01-15", "email": f"user{n}@example.com",
+        "phone": f"07123456{n:02d}", "bank_name": "KCB", "account_number": f"ACC-0000{n:04d}",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_valid_rows_are_created_and_failures_reported_per_row(session):
+    rows = [
+        _row(1),
+        _row(2, department_name="Sales", position_title="Rep"),
+        _row(3, username="taken"),
+        _row(4, position_title="Rep"),  # Rep belongs to Sales, not Finance
+        _row(5, email="user1@example.com"),
+        _row(6, date_of_birth="2020-01-01", phone="12345"),
+        {"username": "incomplete"},
+    ]
+    report = EmployeeImportService(UnitOfWork(session), hash_workers=1).import_employees(
+        list(enumerate(rows, start=1)))
+
+    assert (report.rows, report.created, report.failed) == (7, 2, 5)
+    by_row = {result.row: result for result in report.results}
+    assert by_row[3].errors == ["Username 'taken' already exists"]
+    assert by_row[4].errors == ["Position 'Rep' does not exist in the Finance department"]
+    assert by_row[5].errors == ["Email 'user1@example.com' is already used on row 1"]
+    assert len(by_row[6].errors) == 2
+    assert by_row[7].username == "incomplete" and by_row[7].status == "failed"
+
+    created = by_row[2]
+    employee = session.get(Employee, created.employee_id)
+    assert (employee.department_id, employee.position_id) == (2, 2)
+    assert verify_password(employee.user.password_hash, created.temporary_password)
+    assert session.query(EmployeeContact).filter_by(employee_id=employee.id).one().email == "user2@example.com"
+    assert session.query(EmployeeBankAccount).filter_by(employee_id=employee.id).one().account_number == "ACC-00000002"
+
+
+def test_a_failing_batch_is_retried_row_by_row(session, monkeypatch):
+    service = EmployeeImportService(UnitOfWork(session), hash_workers=1, batch_size=10)
+    # Taken after validation ran, as a concurrent request would
+    check_existing = service._check_existing
+
+    def taken_meanwhile(rows):
+        check_existing(rows)
+        session.add(User(username="user2", password_hash="x"))
+        session.commit()
+
+    monkeypatch.setattr(service, "_check_existing", taken_meanwhile)
+    report = service.import_employees([(1, _row(1)), (2, _row(2))])
+
+    assert [result.status for result in report.results] == ["created", "failed"]
+    assert report.results[1].errors[0].startswith("Could not be saved")
+    assert session.query(Employee).count() == 1
+
+
+def test_csv_and_xlsx_rows_are_numbered_like_the_sheet():
+    csv_rows = read_csv(b"\xef\xbb\xbfUsername,Email\nalice,alice@example.com\n,\nbob, bob@example.com \n")
+    assert csv_rows == [(2, {"username": "alice", "email": "alice@example.com"}),
+                        (4, {"username": "bob", "email": "bob@example.com"})]
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["username", "phone", "account number"])
+    sheet.append(["carol", 712345678, "ACC-1"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    assert read_xlsx(buffer.getvalue()) == [(2, {"username": "carol", "phone": "712345678", "account_number": "ACC-1"})]
+
+
+def test_file_upload_route_and_row_limit(session):
+    from app.main import app
+
+    with pytest.raises(ValidationError):
+        EmployeeImportService(UnitOfWork(session), max_rows=1).import_employees([(1, _row(1)), (2, _row(2))])
+
+    header = list(_row(1))
+    content = ",".join(header) + "\n" + ",".join(str(_row(1)[key]) for key in header) + "\n"
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[admin_access] = lambda: {"user_id": "1", "role": "admin"}
+    try:
+        client = TestClient(app)
+        response = client.post("/api/v1/employees/import/file", files={"file": ("staff.csv", content, "text/csv")})
+        rejected = client.post("/api/v1/employees/import/file", files={"file": ("staff.txt", content, "text/plain")})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(admin_access, None)
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 1 and response.json()["results"][0]["row"] == 2
+    assert rejected.status_code == 400
@@ -0,0 +1,130 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.database_setup import get_db
+import app.models  # noqa: F401
+from app.core import hashing
+from app.core.hashing import HashingPool, _hash, verify_password_async
+from app.core.unit_of_work import UnitOfWork
+from app.domain.exceptions.base import PasswordHashingBusyError
+from app.models.roles_model import Role
+from app.models.user_model import User
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture
+def blocked_pool():
+    release = threading.Event()
+    pool = HashingPool(workers=1, queue_size=1, queue_timeout_ms=5000)
+    yield pool, release
+    release.set()
+    pool.shutdown()
+
+
+def test_pool_admits_workers_plus_queue_then_rejects(blocked_pool):
+    pool, release = blocked_pool
+    running = pool.submit("verify", release.wait)
+    queued = pool.submit("verify", lambda: "done")
+
+    with pytest.raises(PasswordHashingBusyError):
+        pool.submit("verify", lambda: "rejected")
+    time.sleep(0.05)
+    metrics = pool.metrics()
+    assert (metrics["running"], metrics["queue_depth"], metrics["rejected"]) == (1, 1, 1)
+
+    release.set()
+    assert running.result(timeout=1) is True
+    assert queued.result(timeout=1) == "done"
+    assert pool.metrics()["operations"]["verify"]["calls"] == 2
+
+
+def test_calls_that_waited_too_long_are_dropped():
+    pool = HashingPool(workers=1, queue_size=1, queue_timeout_ms=10)
+    try:
+        pool.submit("hash", time.sleep, 0.05)
+        stale = pool.submit("hash", lambda: "never")
+        with pytest.raises(PasswordHashingBusyError):
+            stale.result(timeout=1)
+        assert pool.metrics()["expired"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_batches_are_hashed_one_at_a_time(monkeypatch):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_hash(password):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return f"hashed-{password}"
+
+    monkeypatch.setattr(hashing, "_hash", slow_hash)
+    results = {}
+
+    def run_import(n):
+        results[n] = hashing.hash_passwords([f"{n}a", f"{n}b"], workers=1)
+
+    imports = [threading.Thread(target=run_import, args=(n,)) for n in range(3)]
+    for thread in imports:
+        thread.start()
+    for thread in imports:
+        thread.join()
+
+    assert results == {n: [f"hashed-{n}a", f"hashed-{n}b"] for n in range(3)}
+    assert peak[0] == 1
+
+
+def test_async_verify_runs_on_the_pool():
+    stored = _hash("Secret123!")
+
+    assert asyncio.run(verify_password_async(stored, "Secret123!")) == stored
+    assert asyncio.run(verify_password_async(stored, "wrong")) is None
+    assert hashing.hashing_pool.metrics()["operations"]["verify"]["calls"] >= 2
+
+
+@pytest.fixture
+def session(session):
+    session.add(Role(id=1, role_name="employee"))
+    session.add(User(id=11, username="jane", password_hash=_hash("Secret123!"), first_name="Jane", last_name="Doe",
+                     role_id=1))
+    session.commit()
+    return session
+
+
+def test_async_login_and_password_change(session):
+    service = AuthService(UnitOfWork(session))
+
+    token = asyncio.run(service.authenticate_user_async("jane", "Secret123!"))
+    assert token["role"] == "employee"
+    asyncio.run(service.change_password_async(11, "N3w-Secret!pass"))
+    assert asyncio.run(verify_password_async(session.get(User, 11).password_hash, "N3w-Secret!pass"))
+
+
+def test_login_returns_503_when_hashing_is_saturated(session, blocked_pool, monkeypatch):
+    from app.main import app
+
+    pool, release = blocked_pool
+    pool.submit("verify", release.wait)
+    pool.submit("verify", release.wait)
+    monkeypatch.setattr(hashing, "hashing_pool", pool)
+    app.dependency_overrides[get_db] = lambda: session
+    try:
+        response = TestClient(app).post("/auth/login", data={"username": "jane", "password": "Secret123!"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
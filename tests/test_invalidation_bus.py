@@ -0,0 +1,189 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import subprocess
+import textwrap
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.invalidation_bus import InvalidationBus
+from app.models.cache_invalidation_model import CacheInvalidation, InvalidationEvent
+from app.models.rule_version_model import get_rule_versions
+from app.models.salary_model import EmployeeSalary
+from app.models.tax_model import Tax, TaxType
+from app.payroll.salary_timeline import SalaryTimelineCache
+from app.repositories.payroll_input_repo import PayrollInputRepository
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ON = datetime(2025, 12, 15)
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def url(session_factory, database_url, add_employees):
+    with session_factory() as db:
+        add_employees(db, 1, 2, 3, users=False)
+        for employee_id in (1, 2, 3):
+            db.add(EmployeeSalary(id=employee_id, employee_id=employee_id, amount=Decimal("1000"),
+                                  effective_from=datetime(2025, 1, 1), created_by=1))
+        db.commit()
+    return database_url
+
+
+@pytest.fixture
+def worker(url):
+    # The reading worker: its own engine, bus and long-lived salary cache
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    factory = sessionmaker(bind=engine)
+    bus = InvalidationBus(factory, poll_interval_ms=10)
+    bus.poll()
+    db = factory()
+    timelines = SalaryTimelineCache(PayrollInputRepository(db))
+    timelines.subscribe(bus)
+    timelines.load([1, 2, 3])
+    yield bus, timelines
+    db.close()
+    engine.dispose()
+
+
+def _amount(timelines, employee_id):
+    timelines.repo.db.rollback()  # Start a fresh read transaction, as a new request would
+    return timelines.amount_on(employee_id, None, ON)
+
+
+def test_committed_writes_reach_other_workers_and_rolled_back_ones_do_not(url, worker):
+    bus, timelines = worker
+    received = []
+    bus.subscribe("tax", received.append)
+
+    engine = create_engine(url)
+    writer = sessionmaker(bind=engine)()
+    writer.get(EmployeeSalary, 1).amount = Decimal("1500")
+    writer.add(Tax(id=1, tax_code="PAYE", name="PAYE", tax_type=TaxType.TIERED))
+    writer.commit()
+    writer.get(EmployeeSalary, 2).amount = Decimal("9999")
+    writer.flush()
+    writer.rollback()
+
+    assert _amount(timelines, 1) == Decimal("1000")  # Not read from the log yet
+    assert bus.poll() == 2
+    assert _amount(timelines, 1) == Decimal("1500")
+    assert received == [InvalidationEvent("tax", None, get_rule_versions(writer)["tax"])]
+    assert _amount(timelines, 2) == Decimal("1000")
+    assert bus.poll() == 0
+    writer.close()
+    engine.dispose()
+
+
+_CHILD = textwrap.dedent("""
+    import sys
+    from decimal import Decimal
+    sys.path.insert(0, {root!r})
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import app.models
+    from app.models.salary_model import EmployeeSalary
+
+    engine = create_engine({url!r}, connect_args={{"timeout": 30}})
+    db = sessionmaker(bind=engine)()
+    db.get(EmployeeSalary, int(sys.argv[1])).amount = Decimal(sys.argv[2])
+    db.commit()
+""")
+
+
+def test_worker_processes_invalidate_each_others_caches(url, worker):
+    bus, timelines = worker
+    bus.start()
+    try:
+        script = _CHILD.format(root=ROOT, url=url)
+        children = [
+            subprocess.Popen([sys.executable, "-c", script, str(employee_id), amount])
+            for employee_id, amount in ((2, "2200"), (3, "3300"))
+        ]
+        assert [child.wait(timeout=60) for child in children] == [0, 0]
+
+        deadline = time.monotonic() + 5
+        while bus.delivered < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        bus.stop()
+    assert [_amount(timelines, employee_id) for employee_id in (1, 2, 3)] == [
+        Decimal("1000"), Decimal("2200"), Decimal("3300")]
+
+
+def test_late_commits_below_the_cursor_and_long_outages(url, worker):
+    bus, timelines = worker
+    received = []
+    bus.subscribe("employee_salary", received.append)
+    engine = create_engine(url)
+    factory = sessionmaker(bind=engine)
+
+    def append(event_id, employee_id):
+        db = factory()
+        db.add(CacheInvalidation(id=event_id, entity="employee_salary", entity_id=employee_id))
+        db.commit()
+        db.close()
+
+    # Id 102 was taken by a transaction that commits after id 103, as with PostgreSQL sequences
+    append(101, 1)
+    append(103, 3)
+    assert bus.poll() == 2
+    append(102, 2)
+    assert bus.poll() == 1
+    assert [event.entity_id for event in received] == [1, 3, 2]
+
+    # Not read for longer than the retention period: events may be gone, so caches drop everything
+    bus.retention_seconds = 0
+    time.sleep(0.01)
+    bus.poll()
+    assert received[-1] == InvalidationEvent("employee_salary") and bus.resets == 1
+    assert timelines._employees == {}
+    engine.dispose()
+
+
+def test_events_published_after_the_log_was_pruned_are_read(url, worker):
+    bus, _ = worker
+    received = []
+    bus.subscribe("employee_salary", received.append)
+    engine = create_engine(url)
+    factory = sessionmaker(bind=engine)
+
+    def append(employee_id):
+        db = factory()
+        db.add(CacheInvalidation(entity="employee_salary", entity_id=employee_id))
+        db.commit()
+        db.close()
+
+    for employee_id in (1, 2, 3):
+        append(employee_id)
+    assert bus.poll() == 3
+    retention, bus.retention_seconds = bus.retention_seconds, 0
+    time.sleep(0.01)
+    assert bus.prune() == 6  # With the events of the fixture's salaries
+    bus.retention_seconds = retention
+
+    # Pruned ids are never handed out again
+    append(2)
+    assert bus.poll() == 1 and received[-1] == InvalidationEvent("employee_salary", 2)
+
+    # Ids starting over below the cursor, e.g. a recreated table: the worker drops everything
+    db = factory()
+    db.execute(text("DELETE FROM cache_invalidations"))
+    db.execute(text("DELETE FROM sqlite_sequence WHERE name = 'cache_invalidations'"))
+    db.commit()
+    db.close()
+    append(3)
+    assert bus.poll() == 0 and bus.resets == 1
+    assert received[-1] == InvalidationEvent("employee_salary")
+    append(1)
+    assert bus.poll() == 1 and received[-1] == InvalidationEvent("employee_salary", 1)
+    engine.dispose()
@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from app.services.payroll_engine import PayrollEngine
+from app.schemas.payroll_schema import (
+    ResolvedPayrollInputs,
+    ResolvedAllowance,
+    ResolvedAttendance,
+    ResolvedDeductionRule,
+    ResolvedLoan,
+    ResolvedInsurance,
+    ResolvedPension,
+)
+from app.domain.exceptions.base import PayrollComputeError
+
+
+PAYE = ResolvedDeductionRule(
+    deduction_type_id=1, name="PAYE", code="PAYE", is_statutory=True, has_brackets=True,
+    brackets=[
+        {"min_amount": Decimal("0"), "max_amount": Decimal("24000"), "rate": Decimal("10")},
+        {"min_amount": Decimal("24000"), "max_amount": Decimal("32333"), "rate": Decimal("25")},
+        {"min_amount": Decimal("32333"), "max_amount": None, "rate": Decimal("30")},
+    ],
+)
+NHIF = ResolvedDeductionRule(
+    deduction_type_id=2, name="NHIF", code="NHIF", is_statutory=True, has_brackets=False,
+    rate=Decimal("2.75"),
+)
+LEVY = ResolvedDeductionRule(
+    deduction_type_id=3, name="Levy", code="LEVY", is_statutory=True, has_brackets=False,
+    fixed_amount=Decimal("150"),
+)
+
+
+def _inputs(employee_id, base, overtime="0", allowances=(), loan="0", insurance="0", pension="0"):
+    return ResolvedPayrollInputs(
+        employee_id=employee_id,
+        period_start=date(2025, 12, 1),
+        period_end=date(2025, 12, 31),
+        base_salary=Decimal(base),
+        allowances=[
+            ResolvedAllowance(allowance_type_id=idx, name=code, code=code, amount=Decimal(amount), is_taxable=taxable)
+            for idx, (code, amount, taxable) in enumerate(allowances, start=1)
+        ],
+        attendance=ResolvedAttendance(overtime_hours=Decimal(overtime)),
+        statutory_deduction_rules=[PAYE, NHIF, LEVY],
+        loan=ResolvedLoan(monthly_repayment=Decimal(loan)),
+        insurance=ResolvedInsurance(employee_contribution=Decimal(insurance)),
+        pension=ResolvedPension(employee_contribution=Decimal(pension)),
+    )
+
+
+def test_compute_batch_matches_scalar_compute():
+    engine = PayrollEngine()
+    batch = [
+        _inputs(1, "50000.00"),
+        _inputs(2, "33333.33", overtime="7.25", allowances=[("HOUS", "5000", True), ("MEAL", "1234.56", False)]),
+        _inputs(3, "18000", loan="2500", insurance="500.50", pension="1080"),
+        _inputs(4, "120000.01", overtime="12", allowances=[("TRAN", "3000", True)], pension="4320"),
+    ]
+
+    results = engine.compute_batch(batch)
+
+    assert [r.employee_id for r in results] == [1, 2, 3, 4]
+    for inputs, result in zip(batch, results):
+        assert result.model_dump() == engine.compute(inputs).model_dump()
+
+
+def test_compute_batch_empty_returns_empty_list():
+    assert PayrollEngine().compute_batch([]) == []
+
+
+def test_compute_batch_reports_failing_employee():
+    bad = _inputs(7, "1000")
+    bad.statutory_deduction_rules = [PAYE.model_copy(update={"brackets": [{"min_amount": Decimal("0"), "rate": None}]})]
+
+    with pytest.raises(PayrollComputeError, match="employee 7"):
+        PayrollEngine().compute_batch([_inputs(6, "1000"), bad])
@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import app.models  # noqa: F401
+from app.models.payroll_model import Payroll
+from app.models.salary_model import EmployeeSalary
+from app.models.attendance_model import Attendance  # noqa: F401
+from app.models.allowances_model import Allowance
+from app.models.deductions_model import Deduction
+from app.payroll.batch_runner import PayrollBatchRunner
+
+
+PERIOD = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def database(session_factory, database_url, add_payroll_rules, add_employees):
+    with session_factory() as db:
+        add_payroll_rules(db)
+        add_employees(db, *range(1, 11), users=False)
+        for employee_id in range(1, 11):
+            # Employee 4 has no salary and cannot be resolved
+            if employee_id != 4:
+                db.add(EmployeeSalary(employee_id=employee_id, amount=Decimal("1000") * employee_id,
+                                      effective_from=datetime(2025, 1, 1), created_by=1))
+        db.commit()
+    return database_url, session_factory
+
+
+def _payrolls(sessions):
+    db = sessions()
+    try:
+        return {p.employee_id: p for p in db.query(Payroll).all()}
+    finally:
+        db.close()
+
+
+def test_runner_persists_each_chunk_and_reports_failures(database):
+    url, sessions = database
+    runner = PayrollBatchRunner(session_factory=sessions, database_url=url, chunk_size=3, max_workers=1)
+
+    report = runner.run(*PERIOD, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+
+    assert [chunk.employees for chunk in report.chunks] == [3, 3, 3, 1]
+    assert report.succeeded == 9 and report.failed == 1
+    assert report.chunks[1].failed[0].employee_id == 4
+    payrolls = _payrolls(sessions)
+    assert sorted(payrolls) == [1, 2, 3, 5, 6, 7, 8, 9, 10]
+    assert payrolls[2].tax_amount == Decimal("210.00")
+    assert payrolls[2].net_salary == Decimal("1858.50")
+
+    db = sessions()
+    try:
+        allowances = db.query(Allowance).filter(Allowance.payroll_id == payrolls[2].id).all()
+        deductions = db.query(Deduction).filter(Deduction.payroll_id == payrolls[2].id).all()
+        assert [(a.code, a.amount) for a in allowances] == [("HOUS", Decimal("100.00"))]
+        assert [(d.deduction_type_id, d.amount) for d in deductions] == [(1, Decimal("31.50"))]
+        assert db.query(Allowance).count() == 9
+    finally:
+        db.close()
+
+
+def test_runner_skips_employees_already_paid_for_the_period(database):
+    url, sessions = database
+    runner = PayrollBatchRunner(session_factory=sessions, database_url=url, chunk_size=4, max_workers=1)
+    runner.run(*PERIOD, user_id=1, employee_ids=[1, 2])
+
+    report = runner.run(*PERIOD, user_id=1, payment_date=date(2026, 1, 5))
+
+    assert report.skipped == 2
+    assert report.employees == 10
+    payrolls = _payrolls(sessions)
+    assert len(payrolls) == 9
+    # Paid on the last day of the period unless the run says otherwise
+    assert (payrolls[1].payment_date, payrolls[3].payment_date) == (PERIOD[1], date(2026, 1, 5))
+
+
+def test_runner_computes_chunks_in_worker_processes(database):
+    url, sessions = database
+    runner = PayrollBatchRunner(session_factory=sessions, database_url=url, chunk_size=5, max_workers=2)
+
+    report = runner.run(*PERIOD, user_id=1, tax_ids=[1])
+
+    assert [chunk.chunk for chunk in report.chunks] == [1, 2]
+    assert report.succeeded == 9
+    assert len(_payrolls(sessions)) == 9
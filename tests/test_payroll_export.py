@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from openpyxl import load_workbook
+
+import app.models  # noqa: F401
+from app.models.employee_model import Employee
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.user_model import User
+from app.services.payroll_export_service import PayrollExportService
+
+
+PERIOD = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def sessions(session_factory):
+    with session_factory() as db:
+        for employee_id in range(1, 26):
+            db.add(User(id=employee_id, username=f"user{employee_id}", password_hash="x",
+                        first_name="Jane", last_name=f"Doe{employee_id}"))
+            db.add(Employee(id=employee_id, user_id=employee_id))
+            db.add(Payroll(employee_id=employee_id, pay_period_start=PERIOD[0], pay_period_end=PERIOD[1],
+                           payment_date=PERIOD[1], gross_salary=Decimal("1000.50"), net_salary=Decimal("900.25"),
+                           status=PayrollStatus.PROCESSED))
+        # Another period, must not be exported
+        db.add(Payroll(employee_id=1, pay_period_start=date(2025, 11, 1), pay_period_end=date(2025, 11, 30),
+                       payment_date=date(2025, 11, 30), gross_salary=Decimal("1"), net_salary=Decimal("1")))
+        db.commit()
+    return session_factory
+
+
+def test_register_csv_is_streamed_in_batches(sessions):
+    chunks = list(PayrollExportService(session_factory=sessions, batch_size=10).register_csv(*PERIOD))
+
+    # Header + 25 rows, flushed every 10 rows
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0][:3] == ["payroll_id", "employee_id", "first_name"]
+    assert len(rows) == 26
+    assert rows[1][1:4] == ["1", "Jane", "Doe1"]
+    assert rows[1][-1] == "processed"
+    assert rows[1][7] == "1000.50"
+
+
+def test_register_xlsx_contains_every_row(sessions):
+    content = b"".join(PayrollExportService(session_factory=sessions, batch_size=7).register_xlsx(*PERIOD))
+
+    sheet = load_workbook(io.BytesIO(content), read_only=True)["Payroll Register"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert len(rows) == 26
+    assert rows[25][1] == 25
+    assert rows[25][7] == 1000.5
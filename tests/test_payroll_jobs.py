@@ -0,0 +1,191 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+import app.models  # noqa: F401
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.payroll_job_model import PayrollJob, PayrollJobStatus
+from app.models.salary_model import EmployeeSalary
+from app.domain.exceptions.base import PayrollJobNotFoundError
+from app.payroll.batch_runner import PayrollBatchRunner
+from app.services.payroll_job_service import PayrollJobService
+
+
+PERIOD = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+class InlineExecutor:
+    """Runs submitted work immediately so tests can assert on the result."""
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def service(session_factory, database_url, add_employees):
+    with session_factory() as db:
+        add_employees(db, *range(1, 11), users=False)
+        for employee_id in range(1, 11):
+            if employee_id != 7:
+                db.add(EmployeeSalary(employee_id=employee_id, amount=Decimal("1000"),
+                                      effective_from=datetime(2025, 1, 1), created_by=1))
+        db.commit()
+
+    return PayrollJobService(
+        session_factory=session_factory,
+        runner_factory=lambda chunk_size: PayrollBatchRunner(
+            session_factory=session_factory, database_url=database_url, chunk_size=3, max_workers=1
+        ),
+        executor=InlineExecutor(),
+    ), session_factory
+
+
+def _add_job(sessions, **values):
+    db = sessions()
+    job = PayrollJob(pay_period_start=PERIOD[0], pay_period_end=PERIOD[1], requested_by=1, chunk_size=3, **values)
+    db.add(job)
+    db.commit()
+    job_id = job.id
+    db.close()
+    return job_id
+
+
+def _paid_employee_ids(sessions):
+    db = sessions()
+    try:
+        return sorted(row[0] for row in db.query(Payroll.employee_id).all())
+    finally:
+        db.close()
+
+
+def test_submitted_job_reports_progress_and_errors(service):
+    jobs, sessions = service
+
+    submitted = jobs.submit(*PERIOD, user_id=1)
+    job = jobs.get_job(submitted.id)
+
+    assert submitted.status == "queued"
+    assert job.status == "completed"
+    assert (job.total, job.processed, job.succeeded, job.failed) == (10, 10, 9, 1)
+    assert job.errors[0].employee_id == 7
+    assert job.throughput_per_second is not None and job.eta_seconds is None
+    assert len(_paid_employee_ids(sessions)) == 9
+
+
+def test_abandoned_job_resumes_after_last_finished_chunk(service):
+    jobs, sessions = service
+    job_id = _add_job(
+        sessions,
+        status=PayrollJobStatus.RUNNING,
+        worker_id="dead-host:1",
+        heartbeat_at=datetime.utcnow() - timedelta(hours=1),
+        started_at=datetime.utcnow() - timedelta(hours=1),
+        total_employees=10,
+        processed=3,
+        succeeded=3,
+        last_employee_id=3,
+    )
+
+    assert jobs.resume_pending() == [job_id]
+
+    job = jobs.get_job(job_id)
+    assert job.status == "completed"
+    assert (job.processed, job.succeeded, job.failed) == (10, 9, 1)
+    # Employees 1-3 were finished before the crash and are not recomputed
+    assert _paid_employee_ids(sessions) == [4, 5, 6, 8, 9, 10]
+
+
+def test_job_owned_by_live_worker_is_left_alone(service):
+    jobs, sessions = service
+    job_id = _add_job(sessions, status=PayrollJobStatus.RUNNING, worker_id="other-host:1", heartbeat_at=datetime.utcnow())
+
+    assert jobs.resume_pending() == []
+    jobs.run_job(job_id)
+
+    assert jobs.get_job(job_id).processed == 0
+    assert _paid_employee_ids(sessions) == []
+
+
+def test_unknown_job_raises_not_found(service):
+    jobs, _ = service
+    with pytest.raises(PayrollJobNotFoundError):
+        jobs.get_job(404)
+
+
+def test_heartbeat_is_refreshed_while_a_chunk_runs(service):
+    jobs, sessions = service
+    job_id = _add_job(sessions, draft=True)
+    runner_factory = jobs.runner_factory
+    heartbeats = []
+
+    def heartbeat_at():
+        db = sessions()
+        try:
+            return db.get(PayrollJob, job_id).heartbeat_at
+        finally:
+            db.close()
+
+    class SlowRunner:
+        # Stands in for a long chunk: nothing is committed, so only the timer can refresh the heartbeat
+        def __init__(self, chunk_size):
+            self.runner = runner_factory(chunk_size)
+
+        def pending_employee_ids(self, *args, **kwargs):
+            return self.runner.pending_employee_ids(*args, **kwargs)
+
+        def run(self, *args, **kwargs):
+            heartbeats.append(heartbeat_at())
+            deadline = time.monotonic() + 5
+            while heartbeat_at() == heartbeats[0] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            heartbeats.append(heartbeat_at())
+            return self.runner.run(*args, **kwargs)
+
+    jobs.runner_factory, jobs.heartbeat_interval = SlowRunner, 0.01
+    jobs.run_job(job_id)
+
+    assert heartbeats[1] > heartbeats[0]
+    assert jobs.get_job(job_id).status == "completed"
+    assert not any(thread.name.endswith("-heartbeat") for thread in threading.enumerate())
+    db = sessions()
+    assert {row[0] for row in db.query(Payroll.status).all()} == {PayrollStatus.DRAFT}
+    db.close()
+
+
+def test_worker_stops_and_leaves_the_job_alone_once_taken_over(service):
+    jobs, sessions = service
+    job_id = _add_job(sessions)
+    runner_factory = jobs.runner_factory
+
+    class TakenOverRunner:
+        # Another worker claims the job while the first chunk is being committed
+        def __init__(self, chunk_size):
+            self.runner = runner_factory(chunk_size)
+
+        def pending_employee_ids(self, *args, **kwargs):
+            return self.runner.pending_employee_ids(*args, **kwargs)
+
+        def run(self, *args, on_chunk, **kwargs):
+            def take_over(report, ids):
+                db = sessions()
+                db.get(PayrollJob, job_id).worker_id = "other-host:1"
+                db.commit()
+                db.close()
+                on_chunk(report, ids)
+            return self.runner.run(*args, on_chunk=take_over, **kwargs)
+
+    jobs.runner_factory = TakenOverRunner
+    jobs.run_job(job_id)
+
+    job = jobs.get_job(job_id)
+    assert (job.status, job.processed, job.finished_at) == ("running", 0, None)
+    assert _paid_employee_ids(sessions) == [1, 2, 3]
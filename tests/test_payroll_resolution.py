@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+import app.models  # noqa: F401
+from app.models.employee_model import Employee
+from app.models.salary_model import EmployeeSalary, PositionSalary
+from app.models.attendance_model import Attendance
+from app.models.Loans_advances_model import Loan
+from app.models.insurance_model import Insurance
+from app.models.pension_model import Pension
+from app.models.Position_model import Position
+from app.models.allowances_model import AllowanceType
+from app.models.tax_model import Tax, TaxType
+from app.models.tax_brackets import TaxBracket
+from app.domain.enums import AttendanceStatus, AllowanceCalculationType
+from app.domain.exceptions.base import EmployeeNotFoundError
+from app.services.payroll_resolution_service import PayrollResolutionService
+
+
+PERIOD = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+def _seed(db, count):
+    db.add(Position(id=1, title="Clerk"))
+    db.add(PositionSalary(position_id=1, amount=Decimal("30000"), effective_from=datetime(2025, 1, 1), created_by=1))
+    db.add(AllowanceType(id=1, code="HOUS", name="Housing", calculation_type=AllowanceCalculationType.PERCENTAGE,
+                         default_amount=Decimal("10")))
+    tax = Tax(id=1, tax_code="PAYE", name="PAYE", tax_type=TaxType.TIERED)
+    tax.brackets = [
+        TaxBracket(min_amount=Decimal("0"), max_amount=Decimal("24000"), rate=Decimal("10")),
+        TaxBracket(min_amount=Decimal("24000"), max_amount=None, rate=Decimal("25")),
+    ]
+    db.add(tax)
+    for employee_id in range(1, count + 1):
+        db.add(Employee(id=employee_id, user_id=employee_id, position_id=1))
+        if employee_id % 2:
+            db.add(EmployeeSalary(employee_id=employee_id, amount=Decimal("50000"),
+                                  effective_from=datetime(2025, 1, 1), created_by=1))
+        db.add(Attendance(employee_id=employee_id, attendance_date=date(2025, 12, 2),
+                          hours_worked=10.0, overtime_hours=2.0, approved=AttendanceStatus.APPROVED))
+        db.add(Attendance(employee_id=employee_id, attendance_date=date(2025, 12, 3),
+                          hours_worked=8.0, overtime_hours=1.0, approved=AttendanceStatus.PENDING))
+        db.add(Loan(employee_id=employee_id, installment_amount=1000, balance_amount=5000, status="active"))
+        db.add(Insurance(employee_id=employee_id, insurance_provider="Acme", policy_number=f"P-{employee_id}",
+                         premium_amount=900, employer_contribution=400, employee_contribution=500,
+                         start_date=datetime(2025, 1, 1)))
+        db.add(Pension(employee_id=employee_id, monthly_contribution=1080, start_date=datetime(2025, 1, 1)))
+    db.commit()
+
+
+def _count_queries(db, fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    return result, len(statements)
+
+
+def test_resolve_many_query_count_is_independent_of_cohort_size(session):
+    _seed(session, 40)
+    service = PayrollResolutionService(session)
+
+    small, small_queries = _count_queries(
+        session, lambda: service.resolve_many([1, 2], *PERIOD, allowance_type_ids=[1], tax_ids=[1])
+    )
+    large, large_queries = _count_queries(
+        session, lambda: service.resolve_many(list(range(1, 41)), *PERIOD, allowance_type_ids=[1], tax_ids=[1])
+    )
+
+    assert len(small) == 2 and len(large) == 40
+    assert small_queries == large_queries
+
+
+def test_resolve_many_builds_inputs_in_memory(session):
+    _seed(session, 2)
+    service = PayrollResolutionService(session)
+
+    first, second = service.resolve_many([1, 2], *PERIOD, allowance_type_ids=[1], tax_ids=[1])
+
+    assert first.base_salary == Decimal("50000")
+    assert second.base_salary == Decimal("30000")  # falls back to the position salary
+    assert second.position_title == "Clerk"
+    assert [a.amount for a in first.allowances] == [Decimal("5000.00")]
+    assert first.attendance.overtime_hours == Decimal("2.0")  # pending rows are ignored
+    assert first.loan.monthly_repayment == Decimal("1000")
+    assert first.insurance.employee_contribution == Decimal("500")
+    assert first.pension.employee_contribution == Decimal("1080")
+    assert first.statutory_deduction_rules[0].code == "PAYE"
+    assert first.statutory_deduction_rules[0].rule_source == "tax"
+    assert len(first.statutory_deduction_rules[0].brackets) == 2
+
+
+def test_resolve_many_collects_unresolvable_employees(session):
+    _seed(session, 1)
+    service = PayrollResolutionService(session)
+
+    errors = {}
+    resolved = service.resolve_many([1, 99], *PERIOD, errors=errors)
+    assert [r.employee_id for r in resolved] == [1]
+    assert list(errors) == [99]
+
+    with pytest.raises(EmployeeNotFoundError):
+        service.resolve_many([99], *PERIOD)
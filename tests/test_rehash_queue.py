@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+import pytest
+from argon2 import PasswordHasher
+
+import app.models  # noqa: F401
+from app.core.hashing import HashingPool, needs_rehash, verify_password
+from app.core.rehash_queue import RehashQueue
+from app.core.unit_of_work import UnitOfWork
+from app.models.roles_model import Role
+from app.models.user_model import User
+from app.services import auth_service
+from app.services.auth_service import AuthService
+
+# Parameters an older release might have used
+OUTDATED = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1).hash("Secret123!")
+
+
+@pytest.fixture
+def sessions(session_factory):
+    with session_factory() as db:
+        db.add(Role(id=1, role_name="employee"))
+        db.add(User(id=11, username="jane", password_hash=OUTDATED, first_name="Jane", last_name="Doe", role_id=1))
+        db.commit()
+    return session_factory
+
+
+def _stored_hash(sessions):
+    db = sessions()
+    try:
+        return db.get(User, 11).password_hash
+    finally:
+        db.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_login_queues_outdated_hash_and_worker_upgrades_it(sessions, monkeypatch):
+    rehash_queue = RehashQueue(session_factory=sessions, flush_interval_ms=10)
+    rehash_queue.start()
+    monkeypatch.setattr(auth_service, "active_rehash_queue", lambda: rehash_queue)
+    db = sessions()
+    try:
+        assert AuthService(UnitOfWork(db)).authenticate_user("jane", "Secret123!")["role"] == "employee"
+        _wait_for(lambda: rehash_queue.rehashed == 1)
+    finally:
+        rehash_queue.stop()
+        db.close()
+
+    upgraded = _stored_hash(sessions)
+    assert upgraded != OUTDATED and not needs_rehash(upgraded)
+    assert verify_password(upgraded, "Secret123!") == upgraded
+
+
+def test_password_changed_meanwhile_is_not_overwritten(sessions):
+    rehash_queue = RehashQueue(session_factory=sessions, flush_interval_ms=10)
+    rehash_queue.enqueue(11, "$argon2id$v=19$m=8,t=1,p=1$no-longer-stored", "Secret123!")
+    rehash_queue.start()
+    try:
+        _wait_for(lambda: not rehash_queue._queued_users)
+    finally:
+        rehash_queue.stop()
+
+    assert _stored_hash(sessions) == OUTDATED
+
+
+def test_duplicates_and_overflow_are_not_queued():
+    rehash_queue = RehashQueue(max_queue=1)
+
+    assert rehash_queue.enqueue(11, OUTDATED, "Secret123!") is True
+    assert rehash_queue.enqueue(11, OUTDATED, "Secret123!") is False
+    assert rehash_queue.enqueue(12, OUTDATED, "Secret123!") is False
+    assert rehash_queue.dropped == 1
+
+
+def test_background_work_only_takes_an_idle_hashing_worker():
+    release = threading.Event()
+    pool = HashingPool(workers=1, queue_size=4)
+    try:
+        pool.submit("verify", release.wait)
+        assert pool.submit_if_idle("rehash", lambda: "new") is None
+        release.set()
+        _wait_for(lambda: pool.metrics()["running"] == 0)
+        assert pool.submit_if_idle("rehash", lambda: "new").result(timeout=1) == "new"
+    finally:
+        release.set()
+        pool.shutdown()
@@ -0,0 +1,132 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import app.models  # noqa: F401
+from app.models.allowances_model import Allowance
+from app.models.payroll_adjustment_model import PayrollAdjustment
+from app.models.payroll_model import Payroll, PayrollStatus
+from app.models.salary_model import EmployeeSalary
+from app.payroll.batch_runner import PayrollBatchRunner
+from app.domain.exceptions.base import DomainError
+from app.payroll.retro_engine import RetroPayrollEngine
+from app.repositories.payroll_repo import PayrollRepository
+from app.schemas.payroll_schema import RetroChange
+
+NOVEMBER = (date(2025, 11, 1), date(2025, 11, 30))
+DECEMBER = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def sessions(session_factory, database_url, add_payroll_rules, add_employees):
+    with session_factory() as db:
+        add_payroll_rules(db)
+        add_employees(db, *range(1, 4), users=False)
+        for employee_id in range(1, 4):
+            db.add(EmployeeSalary(id=employee_id, employee_id=employee_id, amount=Decimal("1000") * (employee_id + 1),
+                                  effective_from=datetime(2025, 1, 1), created_by=1))
+        db.commit()
+
+    runner = PayrollBatchRunner(session_factory=session_factory, database_url=database_url, max_workers=1)
+    for period in (NOVEMBER, DECEMBER):
+        runner.run(*period, user_id=1, tax_ids=[1], allowance_type_ids=[1])
+    return session_factory
+
+
+def _raise_from_december(factory, employee_id, amount):
+    db = factory()
+    db.get(EmployeeSalary, employee_id).effective_to = datetime(2025, 11, 30, 23, 59, 59)
+    db.add(EmployeeSalary(employee_id=employee_id, amount=amount, effective_from=datetime(2025, 12, 1), created_by=1))
+    db.commit()
+    db.close()
+
+
+def test_backdated_raise_amends_only_the_dependent_period(sessions):
+    _raise_from_december(sessions, 1, Decimal("3000"))
+    change = RetroChange(kind="employee_salary", target_id=1, effective_from=date(2025, 12, 1))
+
+    report = RetroPayrollEngine(sessions).run([change], user_id=1, reason="Backdated raise", tax_ids=[1])
+
+    assert (report.affected, report.amended, report.unchanged, report.failed) == (1, 1, 0, 0)
+    assert [(period.period_start, period.amended) for period in report.periods] == [(date(2025, 12, 1), 1)]
+    # Gross 2100 -> 3100; tax (10%) and levy (1.5%) take 115 of the 1000
+    assert (report.arrears_gross, report.arrears_net) == (Decimal("1000.00"), Decimal("885.00"))
+
+    db = sessions()
+    versions = db.query(Payroll).filter_by(employee_id=1, pay_period_start=DECEMBER[0]).order_by(Payroll.version).all()
+    assert [(p.version, p.status, p.is_amended) for p in versions] == [
+        (1, PayrollStatus.REVERSED, False), (2, PayrollStatus.PROCESSED, True)]
+    assert versions[1].amendment_reason == "Backdated raise" and versions[1].gross_salary == Decimal("3100.00")
+    assert db.query(Allowance).filter_by(payroll_id=versions[1].id).count() == 1
+    adjustments = {a.component: a.delta for a in db.query(PayrollAdjustment).filter_by(payroll_id=versions[1].id)}
+    assert adjustments["net_salary"] == Decimal("885.00") and "total_allowances" not in adjustments
+    november = db.query(Payroll).filter_by(employee_id=1, pay_period_start=NOVEMBER[0]).one()
+    assert (november.version, november.status) == (1, PayrollStatus.PROCESSED)
+    db.close()
+
+
+def test_rule_change_recomputes_everyone_but_only_amends_differences(sessions):
+    _raise_from_december(sessions, 2, Decimal("4000"))
+    change = RetroChange(kind="deduction_type", target_id=1, effective_from=date(2025, 11, 15))
+    engine = RetroPayrollEngine(sessions, chunk_size=2)
+
+    report = engine.run([change], user_id=1, reason="Levy review", tax_ids=[1])
+    assert (report.affected, report.amended, report.unchanged) == (6, 1, 5)
+
+    # Running again finds the amended version as current and nothing left to change
+    again = engine.run([change], user_id=1, reason="Levy review", tax_ids=[1])
+    assert (again.affected, again.amended, again.unchanged, again.arrears_net) == (6, 0, 6, Decimal("0.00"))
+
+
+def test_drafts_are_left_alone_and_amendments_keep_the_status_and_payment_date(sessions):
+    db = sessions()
+    december = {p.employee_id: p for p in db.query(Payroll).filter_by(pay_period_start=DECEMBER[0])}
+    december[1].status = PayrollStatus.PAID
+    december[1].payment_date = date(2026, 1, 5)
+    december[2].status = PayrollStatus.DRAFT
+    db.commit()
+    db.close()
+    for employee_id in (1, 2):
+        _raise_from_december(sessions, employee_id, Decimal("5000"))
+    change = RetroChange(kind="deduction_type", target_id=1, effective_from=date(2025, 12, 1))
+
+    report = RetroPayrollEngine(sessions).run([change], user_id=1, reason="Raises", tax_ids=[1])
+    assert (report.affected, report.amended, report.unchanged) == (2, 1, 1)
+
+    db = sessions()
+    rows = db.query(Payroll).filter_by(pay_period_start=DECEMBER[0]).order_by(Payroll.employee_id, Payroll.version)
+    assert [(p.employee_id, p.version, p.status) for p in rows] == [
+        (1, 1, PayrollStatus.REVERSED), (1, 2, PayrollStatus.PAID),
+        (2, 1, PayrollStatus.DRAFT), (3, 1, PayrollStatus.PROCESSED)]
+    assert rows[1].payment_date == date(2026, 1, 5)
+
+    # The register counts each employee once, at the amended amounts
+    columns = PayrollRepository.REGISTER_COLUMNS
+    register = [dict(zip(columns, row)) for row in PayrollRepository(db).iter_register_rows(*DECEMBER)]
+    assert [(row["employee_id"], row["status"]) for row in register] == [
+        (1, PayrollStatus.PAID), (3, PayrollStatus.PROCESSED)]
+    assert register[0]["gross_salary"] == rows[1].gross_salary
+    assert len(list(PayrollRepository(db).iter_register_rows(*DECEMBER, current_only=False))) == 4
+    db.close()
+
+
+def test_taxes_are_never_dropped_silently(sessions):
+    engine = RetroPayrollEngine(sessions)
+    salary = RetroChange(kind="employee_salary", target_id=1, effective_from=date(2025, 12, 1))
+    with pytest.raises(DomainError, match="tax_ids"):
+        engine.run([salary], user_id=1, reason="Review", tax_ids=[])
+    tax = RetroChange(kind="tax", target_id=1, effective_from=date(2025, 12, 1))
+    with pytest.raises(DomainError, match=r"\[1\]"):
+        engine.run([tax], user_id=1, reason="Review", tax_ids=[2])
+
+    db = sessions()
+    assert db.query(Payroll).filter(Payroll.status == PayrollStatus.REVERSED).count() == 0
+    db.close()
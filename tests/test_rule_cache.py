@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataclasses
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.models.allowances_model import AllowanceType
+from app.models.deductions_model import DeductionBracket
+from app.models.rule_version_model import get_rule_versions
+from app.models.salary_model import EmployeeSalary
+from app.payroll.rule_cache import RuleCache, rules_for
+from app.schemas.tax_schema import TaxBracketCreate
+from app.services.payroll_resolution_service import PayrollResolutionService
+from app.services.tax_service import TaxService
+
+PERIOD = (date(2025, 12, 1), date(2025, 12, 31))
+
+
+pytestmark = pytest.mark.database_file
+
+
+@pytest.fixture
+def sessions(session_factory, database_url, add_payroll_rules, add_employees):
+    with session_factory() as db:
+        add_payroll_rules(db)
+        add_employees(db, 1, users=False)
+        db.add(EmployeeSalary(employee_id=1, amount=Decimal("2000"), effective_from=datetime(2025, 1, 1), created_by=1))
+        db.commit()
+    # A second engine on the same file stands in for another gunicorn worker
+    other = create_engine(database_url, connect_args={"check_same_thread": False})
+    yield [session_factory, sessionmaker(bind=other)]
+    other.dispose()
+
+
+def _statements(db, fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        return fn(), statements
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+
+def test_snapshot_is_reused_until_a_rule_set_version_moves(sessions):
+    db = sessions[0]()
+    cache = RuleCache()
+    first = cache.rules(db)
+    assert get_rule_versions(db) == {"deduction": 1, "tax": 1, "allowance": 1}
+    assert first.taxes[1].schedule.tax_for(Decimal("1000")) == Decimal("100")
+    assert [rule.code for rule in first.engine_rules([1])] == ["PAYE", "LEVY"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.taxes[1].name = "Changed"
+
+    again, statements = _statements(db, lambda: cache.rules(db))
+    assert again is first and len(statements) == 1  # the version check only
+
+    # Another worker replaces the brackets; only the tax rule set is reloaded here
+    TaxService(sessions[1]()).update_tax_brackets(
+        1, [TaxBracketCreate(min_amount=Decimal("1"), max_amount=None, rate=Decimal("12"))])
+    db.rollback()
+    fresh, statements = _statements(db, lambda: cache.rules(db))
+    assert fresh is not first and fresh.versions["tax"] > first.versions["tax"]
+    assert fresh.taxes[1].schedule.rates == (Decimal("0.12"),)
+    assert fresh.deduction_types[1] is first.deduction_types[1]
+    assert not any("deduction_types" in statement or "allowance_types" in statement for statement in statements)
+    db.close()
+
+
+def test_rolled_back_writes_do_not_invalidate(sessions):
+    writer = sessions[1]()
+    writer.get(AllowanceType, 1).default_amount = Decimal("250")
+    writer.flush()
+    writer.rollback()
+    writer.close()
+
+    db = sessions[0]()
+    assert get_rule_versions(db)["allowance"] == 1
+    assert rules_for(db).allowance_types[1].default_amount == Decimal("100")
+    db.close()
+
+
+def test_resolution_reads_no_rule_tables_from_a_warm_snapshot(sessions):
+    db = sessions[0]()
+    service = PayrollResolutionService(db)
+    rules_for(db)
+
+    # Bracket edited without touching the rule's updated_at: the version still moves
+    db.query(DeductionBracket).one().rate = Decimal("2")
+    db.commit()
+
+    (resolved,), statements = _statements(db, lambda: service.resolve_many(
+        [1], *PERIOD, allowance_type_ids=[1], tax_ids=[1], rules=rules_for(db)))
+    assert [allowance.amount for allowance in resolved.allowances] == [Decimal("100")]
+    assert resolved.statutory_deduction_rules[1].brackets[0]["rate"] == Decimal("2")
+    reads = [s for s in statements if "FROM tax " in s or "FROM allowance_types" in s]
+    assert reads == []  # only the changed deduction set was reloaded
+
+    warm, statements = _statements(db, lambda: service.resolve_many(
+        [1], *PERIOD, allowance_type_ids=[1], tax_ids=[1], rules=rules_for(db)))
+    assert not any(table in s for s in statements for table in ("deduction_types", "FROM tax ", "allowance_types"))
+    db.close()
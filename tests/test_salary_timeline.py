@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, text
+
+import app.models  # noqa: F401
+from app.models.employee_model import Employee
+from app.models.Position_model import Position
+from app.models.salary_model import EmployeeSalary, PositionSalary
+from app.payroll.salary_timeline import SalaryTimeline, SalaryTimelineCache
+from app.repositories.payroll_input_repo import PayrollInputRepository
+
+
+def _latest_overlapping(intervals, start, end):
+    """Reference: the period query, one interval at a time."""
+    matches = [
+        (effective_from or datetime.min, position, amount)
+        for position, (effective_from, effective_to, amount) in enumerate(intervals)
+        if (effective_from is None or effective_from <= end) and (effective_to is None or effective_to >= start)
+    ]
+    return max(matches)[2] if matches else None
+
+
+def test_amount_during_matches_the_period_query():
+    rng = random.Random(7)
+    for _ in range(200):
+        intervals = []
+        for _ in range(rng.randint(0, 6)):
+            effective_from = None if rng.random() < 0.1 else datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 700))
+            effective_to = None if rng.random() < 0.5 else (effective_from or datetime(2024, 1, 1)) + timedelta(days=rng.randint(0, 200))
+            intervals.append((effective_from, effective_to, Decimal(rng.randint(1, 9) * 10000)))
+        timeline = SalaryTimeline(intervals)
+        for _ in range(20):
+            start = datetime(2024, 1, 1) + timedelta(days=rng.randint(-30, 760))
+            end = start + timedelta(days=rng.randint(0, 31))
+            assert timeline.amount_during(start, end) == _latest_overlapping(intervals, start, end)
+
+
+def test_amount_on_a_date_covers_the_whole_day():
+    timeline = SalaryTimeline([
+        (datetime(2025, 1, 1), datetime(2025, 6, 30, 12), Decimal("100")),
+        (datetime(2025, 6, 30, 13), None, Decimal("200")),
+    ])
+    assert timeline.amount_on(date(2024, 12, 31)) is None
+    assert timeline.amount_on(date(2025, 6, 30)) == Decimal("200")
+    assert timeline.amount_on(datetime(2025, 6, 30, 9)) == Decimal("100")
+
+
+def test_cache_loads_a_cohort_once_and_falls_back_to_the_position(session):
+    session.add(Position(id=1, title="Clerk"))
+    session.add(PositionSalary(position_id=1, amount=Decimal("30000"), effective_from=datetime(2025, 1, 1), created_by=1))
+    for employee_id in range(1, 11):
+        session.add(Employee(id=employee_id, user_id=employee_id, position_id=1))
+        if employee_id % 2:
+            session.add(EmployeeSalary(employee_id=employee_id, amount=Decimal("50000"),
+                                       effective_from=datetime(2025, 1, 1), created_by=1))
+            session.add(EmployeeSalary(employee_id=employee_id, amount=Decimal("55000"),
+                                       effective_from=datetime(2025, 7, 1), created_by=1))
+    session.commit()
+
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    cache = SalaryTimelineCache(PayrollInputRepository(session))
+    cache.load(list(range(1, 11)), [1])
+    months = [date(2025, month, 15) for month in range(1, 13)]
+    amounts = {(employee_id, day): cache.amount_on(employee_id, 1, day) for employee_id in (1, 2) for day in months}
+
+    assert len(statements) == 2
+    assert amounts[(1, date(2025, 6, 15))] == Decimal("50000") and amounts[(1, date(2025, 7, 15))] == Decimal("55000")
+    assert {amounts[(2, day)] for day in months} == {Decimal("30000")}
+
+
+@pytest.mark.parametrize("query, index", [
+    ("SELECT * FROM employee_salaries WHERE employee_id = 1 AND effective_from <= '2025-11-03' "
+     "ORDER BY effective_from DESC LIMIT 1", "ix_employee_salaries_employee_id_effective_from"),
+    ("SELECT * FROM position_salaries WHERE position_id = 1 AND effective_from <= '2025-11-03' "
+     "ORDER BY effective_from DESC LIMIT 1", "ix_position_salaries_position_id_effective_from"),
+])
+def test_effective_salary_lookups_use_the_indexes(session, query, index):
+    plan = " ".join(row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+    assert index in plan
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import app.models  # noqa: F401
+from app.core import security
+from app.core.security import create_login_token, get_current_employee, get_current_user
+from app.core.token_cache import TokenIdentityCache, token_cache
+from app.models.employee_model import Employee
+from app.models.roles_model import Role
+from app.models.user_model import User
+
+
+@pytest.fixture
+def session(session):
+    session.add_all([Role(id=1, role_name="employee"), Role(id=2, role_name="hr")])
+    session.add(User(id=11, username="jane", password_hash="x", first_name="Jane", last_name="Doe", role_id=1))
+    session.add(Employee(id=1, user_id=11))
+    session.commit()
+    token_cache.clear()
+    yield session
+    token_cache.clear()
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+
+def _token():
+    return create_login_token({"sub": "11", "role": "employee"})
+
+
+def test_token_is_verified_and_resolved_once(session, decodes, monkeypatch):
+    lookups = []
+    get_by_user_id = security.EmployeeRepository.get_by_user_id
+    monkeypatch.setattr(security.EmployeeRepository, "get_by_user_id",
+                        lambda repo, user_id: lookups.append(user_id) or get_by_user_id(repo, user_id))
+    token = _token()
+
+    assert get_current_user(token) == {"user_id": "11", "role": "employee"}
+    for _ in range(3):
+        assert get_current_employee(token, session) == {"user_id": "11", "employee_id": 1, "role": "employee"}
+
+    assert (len(decodes), lookups) == (1, [11])
+
+
+def test_invalid_tokens_are_not_cached(session):
+    with pytest.raises(HTTPException):
+        get_current_user("not-a-token")
+    assert len(token_cache) == 0
+
+
+def test_committed_employee_delete_invalidates(session, decodes):
+    token = _token()
+    get_current_employee(token, session)
+
+    session.delete(session.get(Employee, 1))
+    session.rollback()
+    get_current_employee(token, session)
+    assert len(decodes) == 1  # rolled back, entry kept
+
+    session.delete(session.get(Employee, 1))
+    session.commit()
+    with pytest.raises(security.ValidationError):
+        get_current_employee(token, session)
+    assert len(decodes) == 2
+
+
+def test_role_change_invalidates(session, decodes):
+    token = _token()
+    get_current_user(token)
+
+    session.get(User, 11).first_name = "Janet"
+    session.commit()
+    get_current_user(token)
+    assert len(decodes) == 1
+
+    session.get(User, 11).role_id = 2
+    session.commit()
+    get_current_user(token)
+    assert len(decodes) == 2
+
+
+def test_entries_expire_with_the_token_and_are_evicted_lru():
+    cache = TokenIdentityCache(maxsize=2, ttl_seconds=300)
+    cache.put("expired", "1", "admin", exp=time.time() - 1)
+    assert cache.get("expired") is None
+
+    cache.put("a", "1", "admin", exp=None)
+    cache.put("b", "2", "admin", exp=None)
+    cache.get("a")
+    cache.put("c", "3", "admin", exp=None)
+    assert [cache.get(token) is not None for token in ("a", "b", "c")] == [True, False, True]